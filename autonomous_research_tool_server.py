@@ -588,9 +588,20 @@ class ResearchQuestionGenerator:
 class ResearchExecutor:
     """Executes research plans using available tools and sources"""
 
-    def __init__(self, web_search_available: bool = True, file_system_available: bool = True):
+    def __init__(self, web_search_available: bool = True, file_system_available: bool = True,
+                 max_concurrent_questions: int = 3, confidence_target: Optional[float] = 0.85):
+        """
+        Args:
+            web_search_available: Use web search as a source
+            file_system_available: Use local documents as a source
+            max_concurrent_questions: Fan-out limit for questions researched at once
+            confidence_target: Stop early (cancelling the remaining questions) once
+                               a finding reaches this confidence; None = answer all
+        """
         self.web_search_available = web_search_available
         self.file_system_available = file_system_available
+        self.max_concurrent_questions = max(1, max_concurrent_questions)
+        self.confidence_target = confidence_target
         self.active_research_sessions = {}
 
     async def create_research_plan(self, knowledge_gap: KnowledgeGap,
@@ -627,34 +638,97 @@ class ResearchExecutor:
 
     async def execute_research_plan(self, research_plan: ResearchPlan,
                                   user_id: str,
-                                  progress_callback=None) -> List[ResearchFinding]:
-        """Execute a research plan and return findings"""
-        findings = []
+                                  progress_callback=None,
+                                  max_concurrency: Optional[int] = None,
+                                  confidence_target: Optional[float] = None) -> List[ResearchFinding]:
+        """
+        Execute a research plan and return findings.
+
+        Questions are researched concurrently (at most max_concurrency at a
+        time, started in priority order). The plan's time_limit is split into
+        per-question deadlines so every wave of questions fits inside it; a
+        question that overruns is dropped. Once a finding reaches
+        confidence_target the questions still running or queued are cancelled.
+
+        Args:
+            research_plan: Plan from create_research_plan()
+            user_id: Requesting user
+            progress_callback: Called (sync or async) with a progress dict each
+                               time a question finishes
+            max_concurrency: Override max_concurrent_questions for this plan
+            confidence_target: Override the executor's confidence_target
+
+        Returns:
+            Findings in the plan's question order
+        """
+        questions = research_plan.research_questions
+        concurrency = max(1, max_concurrency or self.max_concurrent_questions)
+        target = confidence_target if confidence_target is not None else self.confidence_target
         start_time = time.time()
+        deadline = start_time + research_plan.time_limit
+        waves = max(1, -(-len(questions) // concurrency))  # ceil
+        question_budget = research_plan.time_limit / waves
 
         # Update plan status
         research_plan.status = ResearchStatus.IN_PROGRESS
         self.active_research_sessions[research_plan.plan_id] = research_plan
 
+        semaphore = asyncio.Semaphore(concurrency)
+        results: Dict[str, List[ResearchFinding]] = {}
+        errors: List[Exception] = []
+
+        async def run_question(question: ResearchQuestion):
+            """Returns (question, findings, error) so failures don't escape as_completed"""
+            async with semaphore:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return question, [], None
+                try:
+                    findings = await asyncio.wait_for(
+                        self._research_question(question, research_plan, user_id),
+                        timeout=min(remaining, question_budget)
+                    )
+                    return question, findings, None
+                except asyncio.TimeoutError:
+                    print(f"⏱️ Research question timed out: {question.question}")
+                    return question, [], None
+                except Exception as e:
+                    print(f"⚠️ Research question failed: {e}")
+                    return question, [], e
+
+        tasks = [asyncio.ensure_future(run_question(q)) for q in questions]
+        best = 0.0
+
         try:
-            for i, question in enumerate(research_plan.research_questions):
-                # Check time limit
-                elapsed_time = time.time() - start_time
-                if elapsed_time > research_plan.time_limit:
-                    break
+            for done in asyncio.as_completed(tasks):
+                question, question_findings, error = await done
+                results[question.question_id] = question_findings
+                if error is not None:
+                    errors.append(error)
+                best = max([best] + [f.confidence_level for f in question_findings])
 
-                # Report progress
                 if progress_callback:
-                    await progress_callback({
+                    update = progress_callback({
                         "plan_id": research_plan.plan_id,
-                        "progress": (i / len(research_plan.research_questions)) * 100,
+                        "progress": (len(results) / len(questions)) * 100,
+                        "completed_questions": len(results),
+                        "total_questions": len(questions),
                         "current_question": question.question,
-                        "elapsed_time": elapsed_time
+                        "findings": sum(len(fs) for fs in results.values()),
+                        "best_confidence": best,
+                        "elapsed_time": time.time() - start_time
                     })
+                    if asyncio.iscoroutine(update):
+                        await update
 
-                # Research the question
-                question_findings = await self._research_question(question, research_plan, user_id)
-                findings.extend(question_findings)
+                if target is not None and best >= target and len(results) < len(questions):
+                    print(f"✅ Research confidence {best:.2f} reached target {target:.2f}; "
+                          f"cancelling {len(questions) - len(results)} remaining question(s)")
+                    break
+
+            # Every question failed outright: surface the failure as before
+            if errors and len(errors) == len(results) == len(questions):
+                raise errors[0]
 
             research_plan.status = ResearchStatus.COMPLETED
 
@@ -663,26 +737,31 @@ class ResearchExecutor:
             raise
 
         finally:
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
             if research_plan.plan_id in self.active_research_sessions:
                 del self.active_research_sessions[research_plan.plan_id]
 
-        return findings
+        return [f for q in questions for f in results.get(q.question_id, [])]
 
     async def _research_question(self, question: ResearchQuestion,
                                plan: ResearchPlan, user_id: str) -> List[ResearchFinding]:
-        """Research a specific question"""
+        """Research a specific question (web and document search run concurrently)"""
         findings = []
-        sources = []
+        searches = []
 
         # Perform web search if available
         if "web" in plan.source_types and self.web_search_available:
-            web_sources = await self._web_search(question.question, user_id)
-            sources.extend(web_sources)
+            searches.append(self._web_search(question.question, user_id))
 
         # Search documents if available
         if "documents" in plan.source_types and self.file_system_available:
-            doc_sources = await self._document_search(question.question, user_id)
-            sources.extend(doc_sources)
+            searches.append(self._document_search(question.question, user_id))
+
+        sources = [source for batch in await asyncio.gather(*searches) for source in batch]
 
         # Synthesize findings from sources
         if sources:
@@ -15,6 +15,8 @@ from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 from urllib.parse import urlparse
 
+from src.tools.http_pool import get_search_http_pool
+
 # Load environment variables from .env file
 try:
     from dotenv import load_dotenv
@@ -138,7 +140,15 @@ class BraveSearchAPI:
 
         self.base_url = "https://api.search.brave.com/res/v1/web/search"
         self.usage_tracker = BraveSearchUsageTracker()
+        self.http_pool = get_search_http_pool()
         self.session = None
+        self.timeout = 10
+        self.headers = {
+            'X-Subscription-Token': self.api_key,
+            'Accept': 'application/json',
+            'Accept-Encoding': 'gzip',
+            'User-Agent': 'Penny-AI-Assistant/1.0'
+        }
 
         # Spam domains to filter out (from real-world experience)
         self.spam_domains = {
@@ -146,22 +156,23 @@ class BraveSearchAPI:
         }
 
     async def __aenter__(self):
-        """Async context manager entry"""
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=10),
-            headers={
-                'X-Subscription-Token': self.api_key,
-                'Accept': 'application/json',
-                'Accept-Encoding': 'gzip',
-                'User-Agent': 'Penny-AI-Assistant/1.0'
-            }
-        )
+        """Async context manager entry (uses the shared search HTTP pool)"""
+        self.session = await self.http_pool.session()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit"""
-        if self.session:
-            await self.session.close()
+        """Async context manager exit (the pooled session stays open)"""
+        self.session = None
+
+    async def _reserve_search(self):
+        """Count one API call against the monthly quota (cache hits are free)"""
+        allowed, remaining, status = await self.usage_tracker.track_search()
+
+        if not allowed:
+            raise BraveSearchError(f"Usage limit exceeded: {status}")
+
+        if "Warning" in status:
+            print(f"⚠️ Brave Search: {status}")
 
     def optimize_query_for_brave(self, original_query: str) -> str:
         """
@@ -226,31 +237,32 @@ class BraveSearchAPI:
             try:
                 print(f"🔍 Brave Search attempt {attempt + 1}: '{query}' (count: {count})")
 
-                async with self.session.get(self.base_url, params=params) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        print(f"✅ Brave Search successful")
-                        return result
-
-                    elif response.status == 429:
-                        # Rate limited - wait and retry (rare but happens)
-                        wait_time = 2 ** attempt
-                        print(f"⚠️ Brave Search rate limited, waiting {wait_time}s...")
-                        await asyncio.sleep(wait_time)
-                        continue
+                response = await self.http_pool.get(
+                    "brave", self.base_url, query=query, params=params, headers=self.headers,
+                    timeout=self.timeout, before_fetch=self._reserve_search
+                )
+                if response.status == 200:
+                    result = response.json()
+                    print(f"✅ Brave Search successful{' (cached)' if response.from_cache else ''}")
+                    return result
+
+                elif response.status == 429:
+                    # Rate limited - wait and retry (rare but happens)
+                    wait_time = 2 ** attempt
+                    print(f"⚠️ Brave Search rate limited, waiting {wait_time}s...")
+                    await asyncio.sleep(wait_time)
+                    continue
 
-                    elif response.status == 401:
-                        raise BraveSearchError("Invalid Brave Search API key")
+                elif response.status == 401:
+                    raise BraveSearchError("Invalid Brave Search API key")
 
-                    elif response.status == 400:
-                        error_text = await response.text()
-                        raise BraveSearchError(f"Bad request: {error_text}")
+                elif response.status == 400:
+                    raise BraveSearchError(f"Bad request: {response.text}")
 
-                    else:
-                        # Log but don't crash on other errors
-                        error_text = await response.text()
-                        print(f"❌ Brave Search error {response.status}: {error_text}")
-                        break
+                else:
+                    # Log but don't crash on other errors
+                    print(f"❌ Brave Search error {response.status}: {response.text}")
+                    break
 
             except asyncio.TimeoutError:
                 print(f"⏰ Brave Search timeout, attempt {attempt + 1}")
@@ -316,15 +328,6 @@ class BraveSearchAPI:
         """
         Main search method with usage tracking and optimization
         """
-        # Check usage limits
-        allowed, remaining, status = await self.usage_tracker.track_search()
-
-        if not allowed:
-            raise BraveSearchError(f"Usage limit exceeded: {status}")
-
-        if "Warning" in status:
-            print(f"⚠️ Brave Search: {status}")
-
         # Optimize query for Brave's strengths
         optimized_query = self.optimize_query_for_brave(query)
 
@@ -6,9 +6,11 @@ Provides reliable web search with multiple providers and fallback strategies.
 """
 
 import asyncio
-import aiohttp
+import bisect
 import json
 import hashlib
+import threading
+import time
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
@@ -29,39 +31,236 @@ class SearchResult:
             self.timestamp = datetime.now()
 
 
+class ProviderLatencyStats:
+    """Per-provider latency histograms used to order and hedge providers"""
+
+    # Upper bucket bounds in seconds; the last bucket catches everything slower
+    BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 15.0, float("inf"))
+    OUTCOMES = {"success": "successes", "empty": "empty", "error": "errors"}
+
+    def __init__(self, min_samples: int = 5):
+        """
+        Args:
+            min_samples: Observations needed before a provider's histogram is trusted
+        """
+        self.min_samples = min_samples
+        self._providers: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, provider: str) -> Dict[str, Any]:
+        if provider not in self._providers:
+            self._providers[provider] = {
+                "histogram": [0] * len(self.BUCKETS),
+                "count": 0,
+                "total_seconds": 0.0,
+                "successes": 0,
+                "empty": 0,
+                "errors": 0,
+                "cancelled": 0
+            }
+        return self._providers[provider]
+
+    def record(self, provider: str, seconds: float, outcome: str):
+        """
+        Record one completed provider call.
+
+        Args:
+            provider: Provider name
+            seconds: Wall time of the call
+            outcome: "success", "empty" or "error"
+        """
+        with self._lock:
+            entry = self._entry(provider)
+            entry["histogram"][bisect.bisect_left(self.BUCKETS, seconds)] += 1
+            entry["count"] += 1
+            entry["total_seconds"] += seconds
+            entry[self.OUTCOMES[outcome]] += 1
+
+    def record_cancelled(self, provider: str):
+        """Count a call abandoned because another provider answered first"""
+        with self._lock:
+            self._entry(provider)["cancelled"] += 1
+
+    def percentile(self, provider: str, fraction: float) -> Optional[float]:
+        """
+        Estimate a latency percentile from the histogram.
+
+        Args:
+            provider: Provider name
+            fraction: Percentile as a fraction (0.5 = median)
+
+        Returns:
+            Upper bound of the bucket holding the percentile, or None until
+            min_samples observations exist
+        """
+        with self._lock:
+            entry = self._providers.get(provider)
+            if not entry or entry["count"] < self.min_samples:
+                return None
+            target = fraction * entry["count"]
+            seen = 0
+            for bound, count in zip(self.BUCKETS, entry["histogram"]):
+                seen += count
+                if seen >= target:
+                    return bound
+            return self.BUCKETS[-1]
+
+    def failure_rate(self, provider: str) -> float:
+        """Fraction of calls that errored or returned nothing"""
+        with self._lock:
+            entry = self._providers.get(provider)
+            if not entry or not entry["count"]:
+                return 0.0
+            return (entry["empty"] + entry["errors"]) / entry["count"]
+
+    def order(self, providers: List[str], penalty: float) -> List[str]:
+        """
+        Order providers by expected cost: median latency plus a penalty
+        proportional to how often they fail. Only providers with enough samples
+        are reordered, among the slots they occupy; the rest keep their
+        configured position, so an untried provider neither jumps ahead of a
+        proven fast one nor falls behind a slow one it was configured before.
+
+        Args:
+            providers: Providers in configured order
+            penalty: Seconds charged for a guaranteed failure
+
+        Returns:
+            Providers with the sampled ones sorted by expected cost (stable for ties)
+        """
+        costs: Dict[str, float] = {}
+        for provider in providers:
+            median = self.percentile(provider, 0.5)
+            if median is not None:
+                costs[provider] = min(median, penalty) + self.failure_rate(provider) * penalty
+
+        ranked = iter(sorted((p for p in providers if p in costs), key=costs.get))
+        return [next(ranked) if p in costs else p for p in providers]
+
+    def reset(self):
+        with self._lock:
+            self._providers.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            providers = {name: dict(entry, histogram=list(entry["histogram"]))
+                         for name, entry in self._providers.items()}
+        for name, entry in providers.items():
+            entry["mean_seconds"] = entry["total_seconds"] / entry["count"] if entry["count"] else 0.0
+            entry["p50_seconds"] = self.percentile(name, 0.5)
+            entry["p90_seconds"] = self.percentile(name, 0.9)
+        return {"buckets": list(self.BUCKETS), "providers": providers}
+
+
+# Shared across EnhancedWebSearch instances (tools open a new one per call)
+_latency_stats = None
+_latency_stats_lock = threading.Lock()
+
+
+def get_provider_latency_stats() -> ProviderLatencyStats:
+    """
+    Get the process-wide provider latency stats.
+
+    Returns:
+        ProviderLatencyStats instance
+    """
+    global _latency_stats
+    with _latency_stats_lock:
+        if _latency_stats is None:
+            _latency_stats = ProviderLatencyStats()
+    return _latency_stats
+
+
 class EnhancedWebSearch:
     """Enhanced web search with multiple providers and reliability features"""
 
-    def __init__(self):
+    def __init__(self, hedged: bool = True, hedge_delay: float = 1.0,
+                 min_sufficient_results: int = 3, adaptive_order: bool = True,
+                 latency_stats: Optional[ProviderLatencyStats] = None, http_pool=None):
+        """
+        Args:
+            hedged: Overlap providers instead of trying them strictly in sequence
+            hedge_delay: Longest wait on an in-flight provider before firing
+                the next one (shortened to the provider's p90 once known)
+            min_sufficient_results: Unique results that end the search early
+                (capped at max_results)
+            adaptive_order: Reorder providers by observed latency and failure rate
+            latency_stats: Latency histograms (defaults to the shared instance)
+            http_pool: Pooled HTTP client (defaults to the shared SearchHTTPPool)
+        """
         self.session = None
+        self.http_pool = http_pool
         self.providers = ["duckduckgo", "brave", "serp"]
+        self.duckduckgo_url = "https://api.duckduckgo.com/"
         self.max_results_per_provider = 5
         self.timeout = 15
+        self.hedged = hedged
+        self.hedge_delay = hedge_delay
+        self.min_sufficient_results = min_sufficient_results
+        self.adaptive_order = adaptive_order
+        self.latency_stats = latency_stats or get_provider_latency_stats()
 
     async def __aenter__(self):
         """Async context manager entry"""
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=self.timeout)
-        )
+        if self.http_pool is None:
+            # Imported here: src.tools imports this module via tool_registry
+            from src.tools.http_pool import get_search_http_pool
+            self.http_pool = get_search_http_pool()
+        self.session = await self.http_pool.session()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit"""
-        if self.session:
-            await self.session.close()
+        """Async context manager exit (the pooled session stays open)"""
+        self.session = None
 
     async def search(self, query: str, max_results: int = 10) -> List[SearchResult]:
         """Search with multiple providers and fallback"""
         if not self.session:
             raise RuntimeError("EnhancedWebSearch must be used as async context manager")
 
+        providers = self._ordered_providers()
+        if self.hedged:
+            all_results = await self._hedged_search(providers, query, max_results)
+        else:
+            all_results = await self._sequential_search(providers, query, max_results)
+
+        # Deduplicate and sort by confidence
+        unique_results = self._deduplicate_results(all_results)
+        return sorted(unique_results, key=lambda r: r.confidence, reverse=True)[:max_results]
+
+    def _ordered_providers(self) -> List[str]:
+        if not self.adaptive_order:
+            return list(self.providers)
+        return self.latency_stats.order(self.providers, penalty=self.timeout)
+
+    def _hedge_delay_for(self, provider: str) -> float:
+        p90 = self.latency_stats.percentile(provider, 0.9)
+        return self.hedge_delay if p90 is None else min(self.hedge_delay, p90)
+
+    async def _timed_search(self, provider: str, query: str) -> List[SearchResult]:
+        """Run one provider and record its latency and outcome"""
+        start = time.perf_counter()
+        try:
+            results = await self._search_provider(provider, query)
+        except asyncio.CancelledError:
+            self.latency_stats.record_cancelled(provider)
+            raise
+        except Exception:
+            self.latency_stats.record(provider, time.perf_counter() - start, "error")
+            raise
+        self.latency_stats.record(provider, time.perf_counter() - start,
+                                  "success" if results else "empty")
+        return results
+
+    async def _sequential_search(self, providers: List[str], query: str,
+                                 max_results: int) -> List[SearchResult]:
         all_results = []
 
         # Try each provider in order
-        for provider in self.providers:
+        for provider in providers:
             try:
                 print(f"🔍 Trying {provider} search for: '{query}'")
-                results = await self._search_provider(provider, query)
+                results = await self._timed_search(provider, query)
 
                 if results:
                     print(f"✅ {provider} returned {len(results)} results")
@@ -76,9 +275,68 @@ class EnhancedWebSearch:
                 print(f"❌ {provider} search failed: {e}")
                 continue
 
-        # Deduplicate and sort by confidence
-        unique_results = self._deduplicate_results(all_results)
-        return sorted(unique_results, key=lambda r: r.confidence, reverse=True)[:max_results]
+        return all_results
+
+    async def _hedged_search(self, providers: List[str], query: str,
+                             max_results: int) -> List[SearchResult]:
+        """
+        Start the first provider and fire the next one whenever a call
+        finishes without enough results or the newest call outlives its hedge
+        delay. Stop as soon as the collected results are sufficient; providers
+        still running at that point are cancelled.
+        """
+        sufficient = min(max_results, self.min_sufficient_results)
+        waiting = list(providers)
+        in_flight: Dict[asyncio.Task, str] = {}
+        all_results: List[SearchResult] = []
+
+        def launch():
+            provider = waiting.pop(0)
+            print(f"🔍 Trying {provider} search for: '{query}'")
+            task = asyncio.ensure_future(self._timed_search(provider, query))
+            in_flight[task] = provider
+            return provider
+
+        try:
+            newest = launch() if waiting else None
+            while in_flight:
+                timeout = self._hedge_delay_for(newest) if waiting else None
+                done, _ = await asyncio.wait(list(in_flight), timeout=timeout,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # Newest provider is slow - hedge with the next one
+                    newest = launch()
+                    continue
+
+                for task in done:
+                    provider = in_flight.pop(task)
+                    try:
+                        results = task.result()
+                    except Exception as e:
+                        print(f"❌ {provider} search failed: {e}")
+                        continue
+                    if results:
+                        print(f"✅ {provider} returned {len(results)} results")
+                        all_results.extend(results)
+                    else:
+                        print(f"⚠️ {provider} returned no results")
+
+                if len(self._deduplicate_results(all_results)) >= sufficient:
+                    break
+                if waiting:
+                    # A provider finished without enough results - move on now
+                    newest = launch()
+        finally:
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+
+        return all_results
+
+    def get_latency_stats(self) -> Dict[str, Any]:
+        """Latency histograms and outcome counts per provider"""
+        return self.latency_stats.get_stats()
 
     async def _search_provider(self, provider: str, query: str) -> List[SearchResult]:
         """Search using specific provider"""
@@ -96,7 +354,7 @@ class EnhancedWebSearch:
         results = []
 
         try:
-            url = "https://api.duckduckgo.com/"
+            url = self.duckduckgo_url
             params = {
                 "q": query,
                 "format": "json",
@@ -104,37 +362,38 @@ class EnhancedWebSearch:
                 "skip_disambig": "1"
             }
 
-            async with self.session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-
-                    # Process abstract
-                    if data.get("Abstract") and data.get("AbstractURL"):
+            response = await self.http_pool.get("duckduckgo", url, query=query, params=params,
+                                                timeout=self.timeout)
+            if response.status == 200:
+                data = response.json()
+
+                # Process abstract
+                if data.get("Abstract") and data.get("AbstractURL"):
+                    results.append(SearchResult(
+                        title=data.get("Heading", "DuckDuckGo Abstract"),
+                        url=data["AbstractURL"],
+                        snippet=data["Abstract"],
+                        provider="duckduckgo",
+                        confidence=0.9  # High confidence for instant answers
+                    ))
+
+                # Process related topics
+                for topic in data.get("RelatedTopics", [])[:3]:
+                    if isinstance(topic, dict) and topic.get("FirstURL") and topic.get("Text"):
                         results.append(SearchResult(
-                            title=data.get("Heading", "DuckDuckGo Abstract"),
-                            url=data["AbstractURL"],
-                            snippet=data["Abstract"],
+                            title=topic.get("Text", "").split(" - ")[0],
+                            url=topic["FirstURL"],
+                            snippet=topic["Text"],
                             provider="duckduckgo",
-                            confidence=0.9  # High confidence for instant answers
+                            confidence=0.8
                         ))
 
-                    # Process related topics
-                    for topic in data.get("RelatedTopics", [])[:3]:
-                        if isinstance(topic, dict) and topic.get("FirstURL") and topic.get("Text"):
-                            results.append(SearchResult(
-                                title=topic.get("Text", "").split(" - ")[0],
-                                url=topic["FirstURL"],
-                                snippet=topic["Text"],
-                                provider="duckduckgo",
-                                confidence=0.8
-                            ))
-
-                elif response.status == 202:
-                    # DuckDuckGo is processing - wait a moment and try a simpler query
-                    await asyncio.sleep(1)
-                    simple_query = query.split()[:3]  # Use first 3 words
-                    if len(simple_query) < len(query.split()):
-                        return await self._search_duckduckgo(" ".join(simple_query))
+            elif response.status == 202:
+                # DuckDuckGo is processing - wait a moment and try a simpler query
+                await asyncio.sleep(1)
+                simple_query = query.split()[:3]  # Use first 3 words
+                if len(simple_query) < len(query.split()):
+                    return await self._search_duckduckgo(" ".join(simple_query))
 
         except Exception as e:
             print(f"DuckDuckGo search error: {e}")
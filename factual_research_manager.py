@@ -7,12 +7,11 @@ and orchestrating research execution and synthesis.
 
 from __future__ import annotations
 
-import asyncio
+import logging
 import re
-import threading
 import time
 import uuid
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
@@ -20,12 +19,16 @@ from autonomous_research_tool_server import (
     create_autonomous_research_server,
     KnowledgeGapType,
 )
+from src.core.loop_runtime import get_loop_runtime
+from src.memory.research_cache import ResearchResultCache, get_research_cache
 
 try:
     from src.core.query_classifier import needs_research as shared_needs_research
 except ImportError:  # pragma: no cover - fallback for isolated tooling
     shared_needs_research = None
 
+logger = logging.getLogger(__name__)
+
 
 class FactualQueryClassifier:
     """Heuristic classifier to decide when research or disclaimers are needed."""
@@ -355,36 +358,35 @@ class ResearchResult:
     confidence: float
     execution_time: float
     error: Optional[str] = None
-
-
-class _AsyncResearchRunner:
-    """Background event loop runner so research can be called synchronously."""
-
-    def __init__(self) -> None:
-        self._loop = asyncio.new_event_loop()
-        self._thread = threading.Thread(target=self._run_loop, daemon=True)
-        self._thread.start()
-
-    def _run_loop(self) -> None:  # pragma: no cover
-        asyncio.set_event_loop(self._loop)
-        self._loop.run_forever()
-
-    def run(self, coro: asyncio.Future) -> Any:
-        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
-        return future.result()
-
-    def shutdown(self) -> None:
-        self._loop.call_soon_threadsafe(self._loop.stop)
-        self._thread.join(timeout=1.0)
+    cached: bool = False
 
 
 class ResearchManager:
     """Coordinates autonomous research for factual requests."""
 
-    def __init__(self, classifier: Optional[FactualQueryClassifier] = None) -> None:
+    # Time-sensitive wording that gets the short "news" cache TTL
+    NEWS_MARKERS = (
+        'latest', 'today', 'tonight', 'yesterday', 'this week', 'right now', 'breaking',
+        'news', 'current', 'currently', 'recent', 'recently', 'announced', 'update', 'score',
+    )
+
+    # Follow-ups whose meaning comes from earlier turns ("how old is he?",
+    # "what about Tesla?"); their research depends on the conversation history
+    FOLLOW_UP_REFERENCE = re.compile(
+        r"\b(it|its|they|them|their|theirs|he|him|his|she|her|hers|those|these|there"
+        r"|(this|that)(?!\s+(morning|afternoon|evening|week|weekend|month|year|season)\b))\b"
+    )
+    FOLLOW_UP_OPENERS = ('what about', 'how about', 'and ', 'also ', 'same for', 'what else')
+    FOLLOW_UP_MAX_WORDS = 2
+
+    def __init__(self,
+                 classifier: Optional[FactualQueryClassifier] = None,
+                 cache: Optional[ResearchResultCache] = None,
+                 use_cache: bool = True) -> None:
         self.classifier = classifier or FactualQueryClassifier()
-        self._runner = _AsyncResearchRunner()
+        self._runtime = get_loop_runtime()
         self._server = None
+        self.cache = (cache or get_research_cache()) if use_cache else None
 
     def requires_research(self, text: str) -> bool:
         return self.classifier.requires_research(text)
@@ -395,10 +397,73 @@ class ResearchManager:
     def extract_entities(self, text: str) -> List[str]:
         return self.classifier.extract_entities(text)
 
+    def topic_for(self, query: str) -> str:
+        """Cache topic for a query: finance, news or general."""
+        if self.is_financial_topic(query):
+            return 'finance'
+        lowered = query.lower()
+        if any(re.search(r'\b' + re.escape(marker) + r'\b', lowered) for marker in self.NEWS_MARKERS):
+            return 'news'
+        return 'general'
+
+    def is_context_dependent(self, query: str,
+                             conversation_history: Optional[List[Dict[str, str]]]) -> bool:
+        """True if the query only makes sense given earlier turns (never cached)."""
+        if not conversation_history:
+            return False
+        lowered = query.lower().strip()
+        return (lowered.startswith(self.FOLLOW_UP_OPENERS)
+                or len(lowered.split()) <= self.FOLLOW_UP_MAX_WORDS
+                or self.FOLLOW_UP_REFERENCE.search(lowered) is not None)
+
     def run_research(self,
                      query: str,
                      conversation_history: Optional[List[Dict[str, str]]] = None) -> ResearchResult:
-        return self._runner.run(self._run_research_async(query, conversation_history or []))
+        # The cache is keyed by query text alone, so it only holds answers that
+        # don't depend on the conversation; refreshes can then re-run them without it
+        if self.cache is None or self.is_context_dependent(query, conversation_history):
+            return self._runtime.run_sync(self._run_research_async(query, conversation_history or []))
+
+        start_time = time.time()
+        topic = self.topic_for(query)
+        hit = self.cache.lookup(query, topic)
+        if hit is not None:
+            logger.info(f"Research cache {hit.match} hit ({hit.similarity:.2f}, {hit.age:.0f}s old)")
+            if hit.refresh_due:
+                self._schedule_refresh(hit.query, topic, hit.key)
+            cached = hit.result
+            return replace(
+                cached,
+                query=query,
+                key_insights=list(cached.key_insights or []),
+                recommendations=list(cached.recommendations or []),
+                findings=list(cached.findings or []),
+                execution_time=time.time() - start_time,
+                cached=True,
+            )
+
+        result = self._runtime.run_sync(self._run_research_async(query, conversation_history or []))
+        if result.success:
+            self.cache.put(query, topic, result)
+        return result
+
+    def _schedule_refresh(self, query: str, topic: str, key: str) -> None:
+        """Re-run research for a hot cache entry on the loop runtime without waiting.
+
+        Cached queries are context-free (see run_research), so the refresh
+        needs no conversation history.
+        """
+        async def _refresh():
+            result = await self._run_research_async(query, [])
+            if result.success:
+                self.cache.put(query, topic, result)
+            else:
+                self.cache.refresh_failed(key)
+
+        self._runtime.submit(_refresh())
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        return self.cache.get_stats() if self.cache is not None else {}
 
     async def _run_research_async(self,
                                   query: str,
@@ -493,7 +558,9 @@ class ResearchManager:
         return "\n".join(parts)
 
     def shutdown(self) -> None:
-        self._runner.shutdown()
+        # Research runs on the process-wide loop runtime, which outlives this
+        # manager (see src.core.loop_runtime); there is no private loop to stop.
+        pass
 
 
 __all__ = [
@@ -13,6 +13,8 @@ from datetime import datetime, date
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, asdict
 
+from src.tools.http_pool import get_search_http_pool
+
 
 @dataclass
 class SearchResult:
@@ -49,19 +51,29 @@ class GoogleCSESearch:
 
         self.base_url = "https://www.googleapis.com/customsearch/v1"
         self.usage_file = "google_cse_usage.json"
+        self.http_pool = get_search_http_pool()
         self.session = None
+        self.timeout = 30
 
     async def __aenter__(self):
-        """Async context manager entry"""
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=30)
-        )
+        """Async context manager entry (uses the shared search HTTP pool)"""
+        self.session = await self.http_pool.session()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit"""
-        if self.session:
-            await self.session.close()
+        """Async context manager exit (the pooled session stays open)"""
+        self.session = None
+
+    def _reserve_search(self) -> None:
+        """Count one API call against the daily limit (cache hits are free)"""
+        allowed, remaining, status = self._check_rate_limit()
+        if not allowed:
+            raise GoogleCSESearchError(f"Rate limit exceeded: {status}")
+
+        if "Warning" in status:
+            print(f"⚠️ Google CSE: {status}")
+
+        self._increment_usage()
 
     def _load_usage_data(self) -> Dict[str, Any]:
         """Load daily usage tracking data"""
@@ -132,14 +144,6 @@ class GoogleCSESearch:
         if not self.session:
             raise GoogleCSESearchError("GoogleCSESearch must be used as async context manager")
 
-        # Check rate limits
-        allowed, remaining, status = self._check_rate_limit()
-        if not allowed:
-            raise GoogleCSESearchError(f"Rate limit exceeded: {status}")
-
-        if "Warning" in status:
-            print(f"⚠️ Google CSE: {status}")
-
         # Prepare API request
         params = {
             "key": self.api_key,
@@ -152,30 +156,26 @@ class GoogleCSESearch:
         try:
             print(f"🔍 Google CSE search: '{query}' (limit: {num_results})")
 
-            async with self.session.get(self.base_url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    results = self._parse_search_results(data)
-
-                    # Only increment usage on successful search
-                    self._increment_usage()
-
-                    print(f"✅ Found {len(results)} results")
-                    return results
-
-                elif response.status == 429:
-                    raise GoogleCSESearchError("API rate limit exceeded (too many requests)")
-
-                elif response.status == 403:
-                    error_text = await response.text()
-                    if "quota" in error_text.lower():
-                        raise GoogleCSESearchError("Daily quota exceeded")
-                    else:
-                        raise GoogleCSESearchError(f"API access forbidden: {error_text}")
-
+            response = await self.http_pool.get(
+                "google_cse", self.base_url, query=query, params=params,
+                timeout=self.timeout, before_fetch=self._reserve_search
+            )
+            if response.status == 200:
+                results = self._parse_search_results(response.json())
+                print(f"✅ Found {len(results)} results{' (cached)' if response.from_cache else ''}")
+                return results
+
+            elif response.status == 429:
+                raise GoogleCSESearchError("API rate limit exceeded (too many requests)")
+
+            elif response.status == 403:
+                if "quota" in response.text.lower():
+                    raise GoogleCSESearchError("Daily quota exceeded")
                 else:
-                    error_text = await response.text()
-                    raise GoogleCSESearchError(f"API error {response.status}: {error_text}")
+                    raise GoogleCSESearchError(f"API access forbidden: {response.text}")
+
+            else:
+                raise GoogleCSESearchError(f"API error {response.status}: {response.text}")
 
         except asyncio.TimeoutError:
             raise GoogleCSESearchError("Search request timed out")
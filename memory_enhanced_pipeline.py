@@ -126,6 +126,32 @@ class MemoryEnhancedPipeline(PipelineLoop):
         self.state = State.SPEAKING
         return reply
     
+    def _streaming_prompt(self, user_text: str) -> str:
+        """Streamed replies get the same memory context as think()."""
+        memory_context = self.memory.get_enhanced_context_for_llm()
+        if memory_context:
+            return f"{memory_context}\n\nUser: {user_text}"
+        return user_text or "Hello"
+
+    def _after_streamed_reply(self, user_text: str, reply: str, tone: str):
+        """Store the spoken reply; the personality rewrite in think() can't apply to audio already played."""
+        response_time_ms = self.last_stream_stats.get("first_audio_ms") or 0.0
+        try:
+            turn = self.memory.base_memory.add_conversation_turn(
+                user_input=user_text,
+                assistant_response=reply,
+                context={
+                    "tone": tone,
+                    "response_time_ms": response_time_ms,
+                    "timestamp": time.time(),
+                    "streamed": True
+                },
+                response_time_ms=response_time_ms
+            )
+            self.memory.process_conversation_turn(user_text, reply, turn.turn_id)
+        except Exception as e:
+            print(f"Warning: Failed to save to memory: {e}")
+
     def get_memory_stats(self) -> Dict[str, Any]:
         """Get comprehensive memory statistics including emotional data."""
         base_stats = self.memory.base_memory.get_memory_stats()
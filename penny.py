@@ -1,13 +1,23 @@
 import threading
 import sounddevice as sd
 import time
-from stt_engine import transcribe_audio
+from stt_engine import transcribe_audio, warm_up as warm_up_stt
 from core.llm_router import get_llm
-from src.audio.tts_engine import speak_text
+from src.audio.tts_engine import speak_text, speak_text_blocking
+from src.adapters.tts.sentence_dispatcher import SentenceDispatcher
 from src.core.intent_router import is_agent_mode_trigger
-from voice_entry import respond as voice_respond
+from personality.filter import sanitize_output
+from voice_entry import SYSTEM_PROMPT, respond as voice_respond
 from pynput import keyboard  # ✅ REPLACED `keyboard` WITH `pynput`
 
+class _SayTTS:
+    """Sentence speaker for SentenceDispatcher: persona filter, then blocking `say`"""
+
+    def speak(self, sentence: str):
+        sentence = sanitize_output(sentence)
+        if sentence:
+            speak_text_blocking(sentence)
+
 def capture_and_handle():
     print("🎤 Listening...")
     audio_data = sd.rec(int(5 * 16000), samplerate=16000, channels=1)
@@ -23,6 +33,15 @@ def capture_and_handle():
     agent_mode = is_agent_mode_trigger(text)
     llm = get_llm()
 
+    if hasattr(llm, "stream"):
+        # Speak each sentence as soon as it is generated instead of after the whole reply
+        prompt = f"[AGENT_MODE REQUEST]\nUser: {text}" if agent_mode else f"User: {text}"
+        dispatcher = SentenceDispatcher(_SayTTS())
+        dispatcher.run(llm.stream(prompt, system_prompt=SYSTEM_PROMPT, cancel_event=dispatcher.cancel_event,
+                                  on_open=dispatcher.attach_stream))
+        dispatcher.wait()
+        return
+
     def llm_generator(system_prompt: str, user_text: str) -> str:
         prompt = f"{system_prompt}\n\nUser: {user_text}".strip()
         if agent_mode:
@@ -48,6 +67,7 @@ def hotkey_listener():
 
 if __name__ == '__main__':
     print("💬 Starting PennyGPT voice assistant...")
+    warm_up_stt()  # load Whisper now, not on the first utterance
 
     listener_thread = threading.Thread(target=hotkey_listener, daemon=True)
     listener_thread.start()
@@ -5,9 +5,12 @@ Transforms learned personality preferences into dynamic LLM system prompts
 """
 
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 
+from src.core.loop_runtime import get_loop_runtime, run_sync
+
 
 @dataclass
 class PersonalityProfile:
@@ -300,30 +303,14 @@ Confidence: 65% (learned from recent conversations)"""
 def get_personality_prompt(base_prompt: Optional[str] = None, context: Optional[Dict[str, Any]] = None) -> str:
     """Synchronous wrapper - returns personality-aware prompt"""
     builder = PersonalityPromptBuilder()
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # If loop is already running, create a task
-            import threading
-            result = [None]
-            def run():
-                new_loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(new_loop)
-                result[0] = new_loop.run_until_complete(
-                    builder.build_personality_prompt(base_prompt, context)
-                )
-                new_loop.close()
-            thread = threading.Thread(target=run)
-            thread.start()
-            thread.join()
-            return result[0]
-        else:
-            return loop.run_until_complete(
-                builder.build_personality_prompt(base_prompt, context)
-            )
-    except RuntimeError:
-        # No event loop, create new one
-        return asyncio.run(builder.build_personality_prompt(base_prompt, context))
+    prompt = builder.build_personality_prompt(base_prompt, context)
+    if get_loop_runtime().in_loop_thread():
+        # Blocking on the shared loop from its own thread would deadlock;
+        # build on a private loop in a helper thread instead
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(asyncio.run, prompt).result()
+    # Shared runtime loop: no per-call loop, safe to call from inside another running loop
+    return run_sync(prompt)
 
 
 if __name__ == "__main__":
@@ -13,6 +13,8 @@ from dataclasses import dataclass
 from pathlib import Path
 import sys
 
+from src.core.loop_runtime import run_sync
+
 # Add src/personality to path for cache import
 sys.path.insert(0, str(Path(__file__).parent / "src" / "personality"))
 try:
@@ -579,21 +581,17 @@ class PersonalityTracker:
         Used by Week 8 snapshot system which runs in sync context.
         Returns JSON-serializable dict format for snapshots.
         """
-        loop = asyncio.new_event_loop()
-        try:
-            state = loop.run_until_complete(self.get_current_personality_state())
+        state = run_sync(self.get_current_personality_state())
 
-            # Convert PersonalityDimension objects to dicts for JSON serialization
-            serializable_state = {}
-            for key, dim in state.items():
-                if hasattr(dim, 'to_dict'):
-                    serializable_state[key] = dim.to_dict()
-                else:
-                    serializable_state[key] = dim
+        # Convert PersonalityDimension objects to dicts for JSON serialization
+        serializable_state = {}
+        for key, dim in state.items():
+            if hasattr(dim, 'to_dict'):
+                serializable_state[key] = dim.to_dict()
+            else:
+                serializable_state[key] = dim
 
-            return serializable_state
-        finally:
-            loop.close()
+        return serializable_state
 
     async def update_personality_dimension(self, dimension: str, new_value: Union[float, str],
                                          confidence_change: float, context: str) -> bool:
@@ -8,7 +8,6 @@ import asyncio
 import sounddevice as sd
 import numpy as np
 import threading
-import queue
 import time
 import sys
 import os
@@ -23,8 +22,10 @@ from memory_enhanced_pipeline import MemoryEnhancedPipeline
 from src.core.pipeline import State
 from src.core.telemetry import Telemetry
 from src.core.wake_word import detect_wake_word, extract_command
-from stt_engine import transcribe_audio
+from src.core.query_classifier import needs_research
+from stt_engine import transcribe_audio, create_streaming_transcriber, warm_up as warm_up_stt
 from performance_logger import PerformanceLogger, ConversationMetrics
+from src.audio.capture import AudioCapture, MicrophoneSource, VADEndpointer
 
 
 class RealTimeVoiceAssistant:
@@ -34,6 +35,9 @@ class RealTimeVoiceAssistant:
         print("🤖 Initializing PennyGPT Real-Time Voice Assistant...")
         
         # Core components
+        self.stt_service = warm_up_stt()  # Whisper loads in the background while we set up
+        # Transcribes while the user is still speaking; only the tail is decoded after the endpoint
+        self.streaming_stt = create_streaming_transcriber(on_partial=self.on_partial_transcript)
         self.pipeline = MemoryEnhancedPipeline()
         self.telemetry = Telemetry()
         self.performance_logger = PerformanceLogger()
@@ -41,43 +45,54 @@ class RealTimeVoiceAssistant:
         # Audio configuration
         self.sample_rate = 16000  # 16kHz for Whisper
         self.channels = 1  # Mono
-        self.chunk_size = 1024  # Small chunks for responsiveness
-        self.audio_queue = queue.Queue()
+        self.chunk_size = 320  # 20ms callback blocks for responsiveness
         
-        # Voice Activity Detection
-        self.vad_threshold = 0.01  # Energy threshold for voice detection
+        # Voice Activity Detection (WebRTC VAD frames with pre-roll and hangover)
+        self.vad_threshold = 0.01  # Peak-level floor under the VAD
         self.silence_duration = 2.0  # Seconds of silence before processing
         self.min_speech_duration = 0.5  # Minimum speech length to process
+        self.endpointer = VADEndpointer(
+            sample_rate=self.sample_rate,
+            hangover_ms=int(self.silence_duration * 1000),
+            min_speech_ms=int(self.min_speech_duration * 1000),
+            energy_floor=self.vad_threshold
+        )
         
         # State management
         self.running = False
         self.listening_active = False
-        self.audio_stream = None
+        self.audio_stream: Optional[AudioCapture] = None
         
         # Wake word detection
         self.wake_words = ["hey penny", "penny", "ok penny", "okay penny", "hello penny"]
         
         print("✅ PennyGPT initialized successfully!")
         
-    def audio_callback(self, indata, frames, time_info, status):
-        """Callback for audio input stream."""
-        if status:
-            print(f"⚠️ Audio status: {status}")
-        
-        # Convert to numpy array and add to queue
-        audio_chunk = indata[:, 0]  # Use first channel only
-        if not self.audio_queue.full():
-            self.audio_queue.put(audio_chunk.copy())
-    
     def detect_voice_activity(self, audio_chunk: np.ndarray) -> bool:
-        """Enhanced voice activity detection."""
-        # Calculate RMS energy
-        rms = np.sqrt(np.mean(audio_chunk**2))
-        
-        # Simple threshold-based detection
-        return rms > self.vad_threshold
+        """WebRTC VAD decision for one 30ms frame of 16kHz float32 audio."""
+        return self.endpointer.is_voiced(audio_chunk)
     
-    def process_audio_buffer(self, audio_buffer: list) -> Optional[str]:
+    def on_partial_transcript(self, transcript):
+        """Log partial hypotheses with early classification (STT worker thread).
+
+        Telemetry only: nothing in the turn consumes these signals, and the
+        final command is classified again from scratch. They record how early
+        the wake word, command and research need are recognisable.
+        """
+        signals = {"wake_word": detect_wake_word(transcript.text)}
+        if signals["wake_word"]:
+            command = extract_command(transcript.text)
+            signals["command"] = command
+            signals["needs_research"] = bool(command) and needs_research(command)
+        self.telemetry.log_event("stt_partial", {
+            "stable_text": transcript.stable_text,
+            "unstable_text": transcript.unstable_text,
+            "audio_seconds": transcript.audio_seconds,
+            "decode_ms": transcript.decode_ms,
+            **signals
+        })
+
+    def process_audio_buffer(self, audio_buffer: list, transcript=None) -> Optional[str]:
         """Process collected audio buffer through STT pipeline."""
         if not audio_buffer:
             return None
@@ -89,8 +104,18 @@ class RealTimeVoiceAssistant:
             print("🎙️ Processing speech through STT...")
             start_time = time.time()
             
-            # FIX: Use the direct transcribe function with numpy array
-            text = transcribe_audio(full_audio)
+            text = None
+            if transcript is not None:
+                # Streaming STT already committed most of the utterance; wait for the tail
+                try:
+                    final = transcript.result(timeout=30)
+                    text = final.text
+                    print(f"📝 Tail decode: {final.tail_seconds:.1f}s of "
+                          f"{final.audio_seconds:.1f}s audio in {final.post_utterance_ms:.0f}ms")
+                except Exception as e:
+                    print(f"⚠️ Streaming STT failed ({e}), transcribing whole utterance")
+            if text is None:
+                text = transcribe_audio(full_audio)
             confidence = 1.0  # Default confidence
             
             stt_time = (time.time() - start_time) * 1000
@@ -101,7 +126,9 @@ class RealTimeVoiceAssistant:
                 self.telemetry.log_event("stt_success", {
                     "text": text,
                     "confidence": confidence,
-                    "response_time_ms": stt_time
+                    "response_time_ms": stt_time,
+                    "inference_ms": self.stt_service.stats["last_inference_ms"],
+                    "model_load_ms": self.stt_service.stats["model_load_ms"]
                 })
                 return text.strip()
             else:
@@ -116,65 +143,36 @@ class RealTimeVoiceAssistant:
     
     async def process_audio_stream(self):
         """Main audio processing loop."""
-        audio_buffer = []
-        silence_start = None
-        speech_start = None
-        
         print("🎧 Audio processing started - listening for wake words...")
         
         while self.running:
             try:
-                # Get audio chunk with timeout
-                try:
-                    audio_chunk = self.audio_queue.get(timeout=0.1)
-                except queue.Empty:
-                    continue
-                
-                # Check for voice activity
-                has_voice = self.detect_voice_activity(audio_chunk)
-                current_time = time.time()
+                for utterance in self.audio_stream.poll():
+                    print(f"🔄 Processing {utterance.speech_duration:.1f}s of speech "
+                          f"(endpointed in {utterance.endpoint_latency_ms:.0f}ms)...")
+                    self.telemetry.log_event("voice_activity_end", {
+                        "speech_duration_s": utterance.speech_duration,
+                        "endpoint_latency_ms": utterance.endpoint_latency_ms,
+                        "processing_lag_ms": utterance.processing_lag_ms
+                    })
+                    await self.handle_voice_input([utterance.audio], utterance.transcript)
+                    # Don't treat audio captured while we were responding as new speech
+                    self.audio_stream.discard_pending()
                 
-                if has_voice:
-                    # Voice detected
-                    if not self.listening_active:
-                        # Start listening
-                        self.listening_active = True
-                        speech_start = current_time
-                        audio_buffer = [audio_chunk]
-                        silence_start = None
-                        print("🎙️ Voice detected - recording...")
-                        self.telemetry.log_event("voice_activity_start")
-                    else:
-                        # Continue recording
-                        audio_buffer.append(audio_chunk)
-                        silence_start = None
+                # Utterances shorter than min_speech_duration are dropped by the endpointer
+                was_listening = self.listening_active
+                self.listening_active = self.endpointer.triggered
+                if self.listening_active and not was_listening:
+                    print("🎙️ Voice detected - recording...")
+                    self.telemetry.log_event("voice_activity_start")
                 
-                else:
-                    # Silence detected
-                    if self.listening_active:
-                        if silence_start is None:
-                            silence_start = current_time
-                        elif current_time - silence_start > self.silence_duration:
-                            # End of speech - process if long enough
-                            speech_duration = current_time - (speech_start or current_time)
-                            
-                            if speech_duration >= self.min_speech_duration:
-                                print(f"🔄 Processing {speech_duration:.1f}s of speech...")
-                                await self.handle_voice_input(audio_buffer)
-                            else:
-                                print(f"⏭️ Ignoring {speech_duration:.1f}s speech (too short)")
-                            
-                            # Reset
-                            audio_buffer = []
-                            self.listening_active = False
-                            silence_start = None
-                            speech_start = None
+                await asyncio.sleep(self.endpointer.frame_ms / 1000)
                 
             except Exception as e:
                 print(f"❌ Audio processing error: {e}")
                 self.telemetry.log_event("audio_processing_error", {"error": str(e)})
     
-    async def handle_voice_input(self, audio_buffer: list):
+    async def handle_voice_input(self, audio_buffer: list, transcript=None):
         """Handle voice input through the complete pipeline."""
         conversation_start = time.time()
         metrics = {
@@ -192,7 +190,7 @@ class RealTimeVoiceAssistant:
         try:
             # Step 1: Speech-to-Text
             stt_start = time.time()
-            user_text = self.process_audio_buffer(audio_buffer)
+            user_text = self.process_audio_buffer(audio_buffer, transcript)
             metrics['stt_time_ms'] = (time.time() - stt_start) * 1000
             
             if not user_text:
@@ -227,39 +225,29 @@ class RealTimeVoiceAssistant:
             memory_context = self.pipeline.memory.get_context_for_llm()
             metrics['memory_context_length'] = len(memory_context) if memory_context else 0
             
-            # Set pipeline state
+            # Set pipeline state; the reply is spoken sentence by sentence as it
+            # streams, and barge-in can cancel it before the first sentence too
             self.pipeline.state = State.THINKING
-            response = self.pipeline.think(command)
-            
-            metrics['llm_time_ms'] = (time.time() - llm_start) * 1000
-            print(f"💭 Generated response in {metrics['llm_time_ms']:.1f}ms")
-            
+            print("🔊 Speaking response as it streams...")
+            response = self.pipeline.think_and_speak_streaming(command)
+
+            # Time to first audio is the LLM's share of the turn; the rest is speech
+            total_ms = (time.time() - llm_start) * 1000
+            first_audio_ms = self.pipeline.last_stream_stats.get('first_audio_ms')
+            metrics['llm_time_ms'] = first_audio_ms if first_audio_ms is not None else total_ms
+            metrics['tts_time_ms'] = total_ms - metrics['llm_time_ms']
+            print(f"💭 First audio after {metrics['llm_time_ms']:.1f}ms")
+
             if response:
                 metrics['response_length'] = len(response)
                 print(f"🤖 PennyGPT: '{response}'")
-                
-                # Step 5: Text-to-Speech
-                print("🔊 Speaking response...")
-                tts_start = time.time()
-                self.pipeline.state = State.SPEAKING
-                
-                # Check if TTS has cache hit info (StreamingTTS adapter)
-                tts_success = self.pipeline.speak(response)
-                metrics['tts_time_ms'] = (time.time() - tts_start) * 1000
-                
-                # Try to detect cache hit (rough heuristic: very fast TTS = likely cached)
-                metrics['tts_cache_hit'] = metrics['tts_time_ms'] < 100  # Less than 100ms = likely cached
-                
-                if tts_success:
-                    print("✅ Response spoken successfully")
-                    self.telemetry.log_event("conversation_complete", {
-                        "command_length": len(command),
-                        "response_length": len(response),
-                        "think_time_ms": metrics['llm_time_ms']
-                    })
-                else:
-                    print("❌ TTS failed")
-                    self.telemetry.log_event("tts_failed")
+                print("✅ Response spoken")
+                self.telemetry.log_event("conversation_complete", {
+                    "command_length": len(command),
+                    "response_length": len(response),
+                    "think_time_ms": metrics['llm_time_ms'],
+                    "cancelled": self.pipeline.last_stream_stats.get('cancelled', False)
+                })
             else:
                 print("❌ No response generated")
                 self.telemetry.log_event("no_response_generated")
@@ -297,12 +285,10 @@ class RealTimeVoiceAssistant:
         try:
             print(f"🎧 Starting audio stream (sample rate: {self.sample_rate}Hz)...")
             
-            self.audio_stream = sd.InputStream(
-                samplerate=self.sample_rate,
-                channels=self.channels,
-                dtype=np.float32,
-                blocksize=self.chunk_size,
-                callback=self.audio_callback
+            self.audio_stream = AudioCapture(
+                MicrophoneSource(self.sample_rate, block_size=self.chunk_size),
+                self.endpointer,
+                speech_listener=self.streaming_stt
             )
             self.audio_stream.start()
             print("✅ Audio stream started successfully")
@@ -317,7 +303,6 @@ class RealTimeVoiceAssistant:
         if self.audio_stream:
             try:
                 self.audio_stream.stop()
-                self.audio_stream.close()
                 print("🎧 Audio stream stopped")
             except Exception as e:
                 print(f"⚠️ Error stopping audio stream: {e}")
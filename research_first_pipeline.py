@@ -9,7 +9,9 @@ import os
 import time
 import logging
 import json
+import threading
 from typing import Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from dataclasses import dataclass
 
@@ -19,6 +21,10 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 from chat_entry import respond as chat_respond
 from personality.filter import sanitize_output
 from src.core.pipeline import PipelineLoop, State
+from src.core.stage_graph import Stage, StageGraph
+from src.core.write_behind import WriteBehindWorker
+from src.core.loop_runtime import run_sync
+from src.llm.prompt_assembly import PromptAssembler, PromptSection, SESSION, STATIC
 from memory_system import MemoryManager
 from emotional_memory_system import create_enhanced_memory_system
 from personality_integration import create_personality_integration
@@ -28,14 +34,13 @@ from factual_research_manager import ResearchManager
 from src.personality.dynamic_personality_prompt_builder import DynamicPersonalityPromptBuilder
 from src.personality.personality_response_post_processor import PersonalityResponsePostProcessor
 from personality_tracker import PersonalityTracker
-import asyncio
 
 # Phase 3A Week 2: Milestone & Achievement System
 from src.personality.personality_milestone_tracker import PersonalityMilestoneTracker
 from src.personality.adaptation_ab_test import get_ab_test, ABTestMetrics
 
 # Phase 3B Week 3: Tool Calling Infrastructure
-from src.tools.tool_orchestrator import ToolOrchestrator
+from src.tools.tool_orchestrator import ToolOrchestrator, render_tool_exchange
 from src.tools.tool_registry import get_tool_registry
 
 # Week 6: Context Manager, Emotion Detector, Semantic Memory Integration
@@ -89,6 +94,21 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+# Static closing instructions; kept byte-identical across turns so it stays in
+# the server's cached prompt prefix.
+RESPONSE_REQUIREMENTS = (
+    "RESPONSE REQUIREMENTS:\n"
+    "- You may use tools if needed by outputting: <|channel|>commentary<|message|>{\"tool\": \"tool_name\", \"args\": {...}}\n"
+    "- OR respond directly with natural conversational text\n"
+    "- Do NOT mix tool calls with natural text\n"
+    "- If using a tool, output ONLY the tool call syntax\n"
+    "- If answering directly, use ONLY natural English\n"
+    "- Stay dry, concise, and direct.\n"
+    "- Lead with the actionable answer before elaborating.\n"
+    "- If recommending verification or research, make it explicit."
+)
+
+
 def _apply_financial_disclaimer(response: str, financial_topic: bool) -> str:
     """Append Penny's financial disclaimer when responding on a financial topic.
 
@@ -146,6 +166,19 @@ class ResearchFirstPipeline(PipelineLoop):
         self.db_path = db_path
         self.data_dir = data_dir
 
+        # Shared executor for the per-turn stage graph (see _run_turn_stages).
+        # Timeouts apply to stages with a safe fallback; None = wait as before.
+        self._stage_executor = ThreadPoolExecutor(max_workers=6, thread_name_prefix="turn-stage")
+        self.stage_timeouts: Dict[str, Optional[float]] = {
+            'financial': 2.0,
+            'semantic': 5.0,
+        }
+        self.last_stage_timings: Dict[str, float] = {}
+
+        # Prompt sections ordered static -> volatile for server-side prefix caching
+        self.prompt_assembler = PromptAssembler()
+        self.last_prompt_stats: Dict[str, Any] = {}
+
         # LLM selection is config-driven (penny_config.json -> "llm"). Adding a
         # model is a config change; standardized on OpenAI-compatible serving.
         # See src/llm/registry.py. Nemotron/Ollama remains a graceful fallback.
@@ -213,6 +246,9 @@ class ResearchFirstPipeline(PipelineLoop):
             intensity_threshold=self.consent_manager.get_intensity_threshold(),
             enabled=self.consent_manager.is_tracking_enabled()
         )
+        # The emotion stage appends threads while the write-behind learning task
+        # marks follow-ups, snapshots and decays them; both go through this lock
+        self._emotional_threads_lock = threading.Lock()
         self.personality_snapshots = PersonalitySnapshotManager(
             storage_path=os.path.join(self.data_dir, "personality_snapshots"),
             snapshot_interval=50
@@ -333,6 +369,22 @@ class ResearchFirstPipeline(PipelineLoop):
             else:
                 logger.info("Hebbian Learning disabled (set hebbian_enabled=True to enable)")
 
+        # Post-turn persistence runs write-behind (see _persist_turn). Created last:
+        # a journal left by an unclean shutdown is replayed immediately, and the
+        # handlers need every subsystem above.
+        self.write_behind_enabled = True
+        self._pending_memory_write = None
+        self.persist_worker = WriteBehindWorker(
+            handlers={
+                'turn_memory': lambda payload, ctx: self._persist_turn_memory(payload, ctx),
+                'turn_learning': lambda payload, ctx: self._persist_turn_learning(payload, ctx),
+            },
+            max_pending=64,
+            journal_path=os.path.join(self.data_dir, "post_turn_journal.jsonl"),
+            encryption=self.semantic_memory.encryption,
+            name="post-turn-persist"
+        )
+
         print("🔬 Research-First Pipeline initialized (Week 7.5 Architecture)")
         print("   • Factual queries trigger autonomous research")
         print("   • Financial topics require research validation")
@@ -531,7 +583,7 @@ class ResearchFirstPipeline(PipelineLoop):
         personality_enhancement = ""
         if not is_control:
             try:
-                personality_enhancement = asyncio.run(
+                personality_enhancement = run_sync(
                     self.personality_prompt_builder.build_personality_prompt(
                         user_id="default",
                         context={'topic': 'general', 'query': user_input}
@@ -543,15 +595,21 @@ class ResearchFirstPipeline(PipelineLoop):
         else:
             logger.debug("🧪 A/B Test: Skipping personality enhancement (control group)")
 
-        prompt_sections = [system_prompt if system_prompt else "", _build_research_instructions()]
+        # Sections are ordered static -> session -> turn by the assembler so the
+        # server can reuse the KV cache of the unchanged prefix (see
+        # src/llm/prompt_assembly.py); within a tier, order is as listed here.
+        prompt_sections = [
+            PromptSection("system", system_prompt if system_prompt else "", STATIC),
+            # Phase 3B Week 3: Add tool manifest
+            PromptSection("tools", self.prompt_assembler.static_block(
+                "tool_manifest", self.tool_registry.get_tool_manifest), STATIC),
+            PromptSection("requirements", RESPONSE_REQUIREMENTS, STATIC),
+            PromptSection("research_mode", _build_research_instructions(), SESSION),
+        ]
 
         # Add personality enhancement early (before research context) - only for treatment
         if personality_enhancement and not is_control:
-            prompt_sections.append(personality_enhancement)
-
-        # Week 6: Add conversation context from context manager
-        if conversation_context:
-            prompt_sections.append(f"\n{conversation_context}")
+            prompt_sections.append(PromptSection("personality", personality_enhancement, SESSION))
 
         # Week 13: Inject user-model beliefs (what Penny knows about the user).
         # build_context_snippet() already filters to relevant, confident beliefs
@@ -567,23 +625,30 @@ class ResearchFirstPipeline(PipelineLoop):
                     context_keywords=keywords, min_confidence=0.6
                 )
                 if belief_snippet:
-                    prompt_sections.append(
+                    prompt_sections.append(PromptSection(
+                        "beliefs",
                         "What I know about you (use naturally, don't recite):\n"
-                        f"{belief_snippet}"
-                    )
+                        f"{belief_snippet}",
+                        SESSION
+                    ))
             except Exception as um_e:
                 logger.warning(f"Belief context injection failed (non-fatal): {um_e}")
 
+        # Week 6: Add conversation context from context manager
+        # (first volatile section: it mostly grows turn to turn)
+        if conversation_context:
+            prompt_sections.append(PromptSection("conversation", f"\n{conversation_context}"))
+
         # Week 6: Add semantic memory context
         if semantic_results:
             semantic_context = "\n\nRelevant past conversations:"
             for result in semantic_results:
                 semantic_context += f"\n- User: {result.get('user_input', '')[:100]}... (similarity: {result.get('similarity', 0):.2f})"
-            prompt_sections.append(semantic_context)
+            prompt_sections.append(PromptSection("semantic", semantic_context))
 
         # Week 8: Add emotional context if check-in suggested
         if emotional_context:
-            prompt_sections.append(emotional_context)
+            prompt_sections.append(PromptSection("emotional_check_in", emotional_context))
 
         # Week 6: Add current topic and emotional state
         stats = self.context_manager.get_stats()
@@ -595,34 +660,26 @@ class ResearchFirstPipeline(PipelineLoop):
         if emotion_result:
             context_info.append(f"User's current emotion: {emotion_result.primary_emotion} ({emotion_result.sentiment})")
         if context_info:
-            prompt_sections.append("\n\n" + "\n".join(context_info))
+            prompt_sections.append(PromptSection("context_info", "\n\n" + "\n".join(context_info)))
 
         # WEEK 7: Removed legacy memory_context (using semantic memory instead)
         # if memory_context:
         #     prompt_sections.append(f"Legacy conversation context: {memory_context}")
 
         if research_context:
-            prompt_sections.append(research_context)
-
-        # Phase 3B Week 3: Add tool manifest
-        tool_manifest = self.tool_registry.get_tool_manifest()
-        prompt_sections.append(tool_manifest)
-
-        prompt_sections.append(
-            "RESPONSE REQUIREMENTS:\n"
-            "- You may use tools if needed by outputting: <|channel|>commentary<|message|>{\"tool\": \"tool_name\", \"args\": {...}}\n"
-            "- OR respond directly with natural conversational text\n"
-            "- Do NOT mix tool calls with natural text\n"
-            "- If using a tool, output ONLY the tool call syntax\n"
-            "- If answering directly, use ONLY natural English\n"
-            "- Stay dry, concise, and direct.\n"
-            "- Lead with the actionable answer before elaborating.\n"
-            "- If recommending verification or research, make it explicit."
-        )
-
-        prompt_sections.append(f"User query: {user_input}")
-
-        final_prompt = "\n\n".join(filter(None, prompt_sections))
+            prompt_sections.append(PromptSection("research", research_context))
+
+        prompt_sections.append(PromptSection("user_query", f"User query: {user_input}"))
+
+        assembled = self.prompt_assembler.assemble(prompt_sections)
+        final_prompt = assembled.text
+        # Prefix reuse is reported by the LLM adapter, measured over the whole
+        # message list it sends (system + user); the user message alone would
+        # overstate it
+        self.last_prompt_stats = {
+            "chars": len(final_prompt),
+            "static_chars": assembled.static_chars,
+        }
 
         # Week 6+7: Debug logging for prompt length
         logger.debug(f"✨ Final prompt built: {len(final_prompt)} chars (Week 7 architecture)")
@@ -639,15 +696,29 @@ class ResearchFirstPipeline(PipelineLoop):
         logger.debug("🔧 Checking for tool calls...")
 
         # Create LLM generator wrapper for orchestrator
-        def orchestrator_llm_gen(context):
-            # Simple: just call LLM with the final prompt
+        def orchestrator_llm_gen(messages):
+            # First call: the assembled prompt. Later calls append the tool
+            # calls/results accumulated in messages, so the prompt prefix stays
+            # identical and the follow-up isn't a repeat of the first call.
+            prompt = final_prompt
+            exchange = render_tool_exchange(messages)
+            if exchange:
+                prompt = f"{final_prompt}\n\n{exchange}"
             if hasattr(self.llm, 'complete'):
-                return self.llm.complete(final_prompt, tone=tone)
+                reply = self.llm.complete(prompt, tone=tone)
             else:
-                return self.llm.generate(final_prompt)
+                reply = self.llm.generate(prompt)
+            sent = getattr(self.llm, 'last_prompt_stats', None)
+            if not exchange and isinstance(sent, dict) and sent:
+                # The turn's first request; tool follow-ups extend it and
+                # would report near-total reuse
+                self.last_prompt_stats.update(sent)
+                logger.debug(f"♻️ Prompt prefix reuse: {sent.get('prefix_hit_ratio', 0.0):.0%} "
+                             f"({sent.get('prefix_hit_chars')}/{sent.get('sent_chars')} chars sent)")
+            return reply
 
         # Run orchestrator (sync wrapper for async)
-        orchestrated_response = asyncio.run(
+        orchestrated_response = run_sync(
             self.tool_orchestrator.orchestrate(
                 initial_prompt=user_input,
                 llm_generator=orchestrator_llm_gen,
@@ -655,6 +726,11 @@ class ResearchFirstPipeline(PipelineLoop):
             )
         )
 
+        # Server-reported prefix reuse, when the backend exposes it
+        usage = getattr(self.llm, 'last_usage', None)
+        if isinstance(usage, dict) and usage:
+            self.last_prompt_stats.update(usage)
+
         return orchestrated_response
 
 
@@ -676,6 +752,7 @@ class ResearchFirstPipeline(PipelineLoop):
         # Track research for web interface
         self.last_research_triggered = research_required
         self.last_research_success = False
+        self.last_research_cached = False
 
         # Step 3: Conduct research if needed
         research_context = ""
@@ -696,6 +773,7 @@ class ResearchFirstPipeline(PipelineLoop):
             if research_result.success and research_result.summary:
                 # Track successful research
                 self.last_research_success = True
+                self.last_research_cached = research_result.cached
 
                 # Format research for personality integration, not replacement
                 key_facts = research_result.key_insights[:3] if research_result.key_insights else []
@@ -824,7 +902,8 @@ class ResearchFirstPipeline(PipelineLoop):
     def _process_emotion(self, actual_command: str):
         """Emotion detection + Week 8 emotional-continuity check-in.
 
-        Runs after the judgment gate. Returns (emotion_result, emotional_context,
+        Runs as the 'emotion' stage once the judgment gate has passed (see
+        _run_turn_stages). Returns (emotion_result, emotional_context,
         check_in_thread); check_in_thread is threaded back so think()'s post-turn
         block can mark the follow-up.
         """
@@ -839,27 +918,28 @@ class ResearchFirstPipeline(PipelineLoop):
         emotional_context = ""
 
         if self.consent_manager.is_tracking_enabled():
-            # Track emotion if significant
-            emotional_thread = self.emotional_continuity.track_emotion(
-                user_input=actual_command,
-                turn_id=turn_id
-            )
-
-            if emotional_thread:
-                logger.info(
-                    f"📌 Tracked emotion: {emotional_thread.emotion} "
-                    f"(intensity={emotional_thread.intensity:.2f})"
+            with self._emotional_threads_lock:
+                # Track emotion if significant
+                emotional_thread = self.emotional_continuity.track_emotion(
+                    user_input=actual_command,
+                    turn_id=turn_id
                 )
 
-            # Check if we should reference previous emotional context
-            if self.consent_manager.is_checkins_enabled():
-                check_in_thread = self.emotional_continuity.should_check_in()
-
-                if check_in_thread:
-                    emotional_context = self.emotional_continuity.generate_check_in_prompt(
-                        check_in_thread
+                if emotional_thread:
+                    logger.info(
+                        f"📌 Tracked emotion: {emotional_thread.emotion} "
+                        f"(intensity={emotional_thread.intensity:.2f})"
                     )
-                    logger.info(f"💭 Suggesting emotional check-in: {check_in_thread.emotion}")
+
+                # Check if we should reference previous emotional context
+                if self.consent_manager.is_checkins_enabled():
+                    check_in_thread = self.emotional_continuity.should_check_in()
+
+                    if check_in_thread:
+                        emotional_context = self.emotional_continuity.generate_check_in_prompt(
+                            check_in_thread
+                        )
+                        logger.info(f"💭 Suggesting emotional check-in: {check_in_thread.emotion}")
 
         return emotion_result, emotional_context, check_in_thread
 
@@ -868,11 +948,12 @@ class ResearchFirstPipeline(PipelineLoop):
                       check_in_thread) -> None:
         """Step 8 dual-save: persist the turn + run all post-save subsystems.
 
-        Touches context_manager, semantic_memory, personality_tracker (via
-        _update_personality_from_conversation, which also drives milestone_tracker),
-        hebbian, emotional_continuity, personality_snapshots, and
-        forgetting_mechanism. Returns nothing; every effect lands on self.*
-        subsystems. Keeps its own non-fatal try/except intact.
+        The context_manager cache is updated inline (the next turn's prompt
+        reads it). Everything else -- the semantic_memory save and the learning
+        subsystems in _persist_turn_learning -- is handed to the write-behind
+        worker so the reply isn't held up by embedding, disk and SQLite work.
+        With write_behind_enabled=False both tasks run inline, as before.
+        Keeps its own non-fatal try/except intact.
         """
         # Step 8: Store in memory (WEEK 7: Dual-save architecture)
         try:
@@ -908,78 +989,129 @@ class ResearchFirstPipeline(PipelineLoop):
             )
             logger.debug(f"💬 Context Manager: Cached turn (in-memory only)")
 
-            # SAVE 2: Semantic Memory (ONLY persistent store)
-            self.semantic_memory.add_conversation_turn(
-                user_input=actual_command,
-                assistant_response=final_response,
-                turn_id=turn_id,
-                context=enhanced_metadata  # Includes encrypted emotions/sentiment
-            )
-            logger.debug(f"🧠 Semantic Memory: Turn {turn_id[:8]}... saved with encryption")
+            payload = {
+                "turn_id": turn_id,
+                "user_input": actual_command,
+                "assistant_response": final_response,
+                "metadata": enhanced_metadata
+            }
+            if self.write_behind_enabled:
+                # SAVE 2 + learning: queued; the next turn's semantic stage waits on
+                # _pending_memory_write so it still sees this turn
+                self._pending_memory_write = self.persist_worker.submit('turn_memory', payload)
+                self.persist_worker.submit('turn_learning', payload, context=check_in_thread)
+            else:
+                self._persist_turn_memory(payload)
+                self._persist_turn_learning(payload, check_in_thread)
+
+        except Exception as e:
+            import traceback
+            logger.warning(f"⚠️ Memory storage failed: {e}")
+            logger.warning(f"⚠️ Traceback: {traceback.format_exc()}")
 
-            # Update personality tracking from this conversation
-            self._update_personality_from_conversation(actual_command, final_response, turn_id)
-            logger.debug("✅ Conversation saved (Week 7 dual-save: Context cache + Semantic persistent)")
+    def _persist_turn_memory(self, payload: Dict[str, Any], context: Any = None) -> None:
+        """Write-behind task: SAVE 2, the semantic_memory turn (idempotent on turn_id
+        so a journal replay after a crash doesn't store the turn twice)."""
+        turn_id = payload["turn_id"]
+        if turn_id in self.semantic_memory.turn_id_to_vector_id:
+            return
+
+        # SAVE 2: Semantic Memory (ONLY persistent store)
+        self.semantic_memory.add_conversation_turn(
+            user_input=payload["user_input"],
+            assistant_response=payload["assistant_response"],
+            turn_id=turn_id,
+            context=payload["metadata"]  # Includes encrypted emotions/sentiment
+        )
+        logger.debug(f"🧠 Semantic Memory: Turn {turn_id[:8]}... saved with encryption")
 
-            # Week 10: Hebbian Learning (with safety checks)
-            if self.hebbian and self._is_safe_to_learn(actual_command, enhanced_metadata):
-                try:
-                    hebbian_result = self.hebbian.process_conversation_turn(
-                        user_message=actual_command,
-                        assistant_response=final_response,
-                        context={
-                            'formality': enhanced_metadata.get('formality', 0.5),
-                            'technical_depth': enhanced_metadata.get('technical_depth', 0.5),
-                            'emotion': enhanced_metadata.get('emotion'),
-                            'sentiment': enhanced_metadata.get('sentiment')
-                        },
-                        active_dimensions=self._get_personality_state_for_learning(),
-                        session_id=turn_id
-                    )
-                    logger.debug(f"Hebbian learning: staging={hebbian_result['staging_count']}, "
-                               f"permanent={hebbian_result['permanent_count']}, "
-                               f"latency={hebbian_result['latency_ms']:.1f}ms")
-                    logger.debug(f"🧠 Hebbian Learning: {hebbian_result['staging_count']} staging, "
-                          f"{hebbian_result['permanent_count']} permanent patterns")
-                except Exception as heb_e:
-                    # Don't break response if Hebbian learning fails
-                    logger.error(f"Hebbian learning error (non-fatal): {heb_e}")
-            elif self.hebbian:
-                logger.debug("Hebbian learning skipped: safety check failed")
-
-            # Week 8: Mark emotional follow-up if we referenced past emotion
-            if check_in_thread and self._response_references_emotion(final_response, check_in_thread):
+    def _persist_turn_learning(self, payload: Dict[str, Any], check_in_thread: Any = None) -> None:
+        """Write-behind task: post-save learning subsystems.
+
+        Touches personality_tracker (via _update_personality_from_conversation,
+        which also drives milestone_tracker), hebbian, emotional_continuity,
+        personality_snapshots, and forgetting_mechanism. check_in_thread is the
+        live EmotionalThread from this turn (None when replayed from the journal).
+        """
+        actual_command = payload["user_input"]
+        final_response = payload["assistant_response"]
+        turn_id = payload["turn_id"]
+        enhanced_metadata = payload["metadata"]
+
+        # Update personality tracking from this conversation
+        self._update_personality_from_conversation(actual_command, final_response, turn_id)
+        logger.debug("✅ Conversation saved (Week 7 dual-save: Context cache + Semantic persistent)")
+
+        # Week 10: Hebbian Learning (with safety checks)
+        if self.hebbian and self._is_safe_to_learn(actual_command, enhanced_metadata):
+            try:
+                hebbian_result = self.hebbian.process_conversation_turn(
+                    user_message=actual_command,
+                    assistant_response=final_response,
+                    context={
+                        'formality': enhanced_metadata.get('formality', 0.5),
+                        'technical_depth': enhanced_metadata.get('technical_depth', 0.5),
+                        'emotion': enhanced_metadata.get('emotion'),
+                        'sentiment': enhanced_metadata.get('sentiment')
+                    },
+                    active_dimensions=self._get_personality_state_for_learning(),
+                    session_id=turn_id
+                )
+                logger.debug(f"Hebbian learning: staging={hebbian_result['staging_count']}, "
+                           f"permanent={hebbian_result['permanent_count']}, "
+                           f"latency={hebbian_result['latency_ms']:.1f}ms")
+                logger.debug(f"🧠 Hebbian Learning: {hebbian_result['staging_count']} staging, "
+                      f"{hebbian_result['permanent_count']} permanent patterns")
+            except Exception as heb_e:
+                # Don't break response if Hebbian learning fails
+                logger.error(f"Hebbian learning error (non-fatal): {heb_e}")
+        elif self.hebbian:
+            logger.debug("Hebbian learning skipped: safety check failed")
+
+        # Week 8: Mark emotional follow-up if we referenced past emotion
+        if check_in_thread and self._response_references_emotion(final_response, check_in_thread):
+            with self._emotional_threads_lock:
                 self.emotional_continuity.mark_followed_up(check_in_thread, turn_id)
-                logger.info(f"✅ Marked emotional follow-up for {check_in_thread.turn_id}")
+            logger.info(f"✅ Marked emotional follow-up for {check_in_thread.turn_id}")
 
-            # Week 8: Check if snapshot needed
-            stats = self.semantic_memory.get_stats()
-            conversation_count = stats.get('total_conversations', 0)
-            if self.personality_snapshots.should_snapshot(conversation_count):
-                try:
-                    personality_state = self.personality_tracker.get_personality_state()
+        # Week 8: Check if snapshot needed
+        stats = self.semantic_memory.get_stats()
+        conversation_count = stats.get('total_conversations', 0)
+        if self.personality_snapshots.should_snapshot(conversation_count):
+            try:
+                personality_state = self.personality_tracker.get_personality_state()
+                with self._emotional_threads_lock:
                     emotional_threads = [t.to_dict() for t in self.emotional_continuity.threads]
 
-                    snapshot = self.personality_snapshots.create_snapshot(
-                        personality_state=personality_state,
-                        emotional_threads=emotional_threads,
-                        conversation_count=conversation_count
-                    )
-                    logger.info(f"📸 Created personality snapshot v{snapshot.version}")
-                except Exception as snap_e:
-                    logger.warning(f"Snapshot creation failed: {snap_e}")
+                snapshot = self.personality_snapshots.create_snapshot(
+                    personality_state=personality_state,
+                    emotional_threads=emotional_threads,
+                    conversation_count=conversation_count
+                )
+                logger.info(f"📸 Created personality snapshot v{snapshot.version}")
+            except Exception as snap_e:
+                logger.warning(f"Snapshot creation failed: {snap_e}")
 
-            # Week 8: Apply forgetting mechanism (every 10 conversations)
-            if conversation_count % 10 == 0:
+        # Week 8: Apply forgetting mechanism (every 10 conversations)
+        if conversation_count % 10 == 0:
+            with self._emotional_threads_lock:
                 self.emotional_continuity.threads = self.forgetting_mechanism.apply_decay(
                     self.emotional_continuity.threads
                 )
-                logger.info(f"🧹 Applied forgetting mechanism ({conversation_count} conversations)")
+            logger.info(f"🧹 Applied forgetting mechanism ({conversation_count} conversations)")
 
-        except Exception as e:
-            import traceback
-            logger.warning(f"⚠️ Memory storage failed: {e}")
-            logger.warning(f"⚠️ Traceback: {traceback.format_exc()}")
+    def flush_persistence(self, timeout: Optional[float] = None) -> bool:
+        """Block until every queued post-turn task has run.
+
+        Returns:
+            True if the write-behind queue drained within timeout
+        """
+        return self.persist_worker.flush(timeout)
+
+    def shutdown(self, timeout: Optional[float] = 30.0) -> None:
+        """Drain post-turn persistence and release the stage executor."""
+        self.persist_worker.close(timeout)
+        self._stage_executor.shutdown(wait=False)
 
     def _record_ab_metrics(self, conversation_id, user_id, is_control,
                            actual_command, start_time, group) -> None:
@@ -1048,6 +1180,53 @@ class ResearchFirstPipeline(PipelineLoop):
             except Exception as tag_e:
                 logger.warning(f"Response tagging error (non-fatal): {tag_e}")
 
+    def _run_turn_stages(self, actual_command: str):
+        """Run the independent per-turn stages as a dependency graph.
+
+        Stages (all need only the normalized command):
+          judgment      -- Step 1.3 clarify gate; a non-None result short-circuits
+          emotion       -- Step 1.5/1.6 emotion detection + continuity check-in
+                           (after judgment: it records emotional threads)
+          financial     -- Step 2 financial-topic classification (feeds the disclaimer)
+          research      -- Step 2/3 classification + research (sets self.last_research_*)
+                           (after judgment: network I/O, writes pipeline state)
+          conversation  -- Step 4.5 in-memory conversation context
+          semantic      -- Step 4.5 semantic memory lookup (falls back to [])
+
+        Emotion and research have side effects, so they only start once the
+        gate has passed; a clarification skips them as it did before the graph.
+        The read-only stages overlap with the gate; if it fires, they finish in
+        the background and their results are dropped.
+        """
+        def _semantic():
+            # Read-your-writes: the previous turn's save may still be queued
+            pending = self._pending_memory_write
+            if pending is not None:
+                try:
+                    pending.result(self.stage_timeouts.get('semantic'))
+                except Exception:
+                    pass  # failure already logged by the worker; search what's there
+            return self.semantic_memory.semantic_search(query=actual_command, k=3)
+
+        graph = StageGraph([
+            Stage('judgment', lambda: self._judgment_gate(actual_command), gate=True),
+            Stage('emotion', lambda judgment: self._process_emotion(actual_command),
+                  deps=('judgment',)),
+            Stage('financial', lambda: self.research_manager.is_financial_topic(actual_command),
+                  timeout=self.stage_timeouts.get('financial'), default=False),
+            Stage('research', lambda judgment: self._classify_and_research(actual_command),
+                  deps=('judgment',), timeout=self.stage_timeouts.get('research')),
+            Stage('conversation', lambda: self.context_manager.get_context_for_prompt(
+                max_turns=5, include_metadata=True)),
+            Stage('semantic', _semantic, timeout=self.stage_timeouts.get('semantic'), default=[]),
+        ])
+        stages = graph.run(self._stage_executor)
+        logger.debug(
+            "⏱️ Turn stages: " + ", ".join(f"{k}={v:.0f}ms" for k, v in stages.stage_ms.items())
+            + f" (wall {stages.total_ms:.0f}ms)"
+        )
+        return stages
+
     def think(self, user_text: str) -> str:
         """Research-first think method with comprehensive error handling."""
         if self.state.name != "THINKING":
@@ -1069,24 +1248,24 @@ class ResearchFirstPipeline(PipelineLoop):
             # Step 1: normalize input + Week 11/12/13 learning pre-hooks
             actual_command = self._input_prehooks(user_text, conversation_id)
 
-            # Step 1.3: Week 8.5 - Judgment check (should we clarify first?)
-            clarification = self._judgment_gate(actual_command)
+            # Steps 1.3-4.5 run as one stage graph: the judgment gate, emotion,
+            # classification/research and memory lookups are independent, so
+            # they overlap; a clarification cancels whatever hasn't started.
+            stages = self._run_turn_stages(actual_command)
+            self.last_stage_timings = dict(stages.stage_ms, total=stages.total_ms)
+
+            clarification = stages['judgment']
             if clarification is not None:
                 # Return clarifying question instead of processing
                 logger.info(f"✋ Judgment system returned clarification - not proceeding with tools")
                 self.state = State.SPEAKING
                 return clarification
 
-            # Step 1.5/1.6: emotion detection + emotional-continuity check-in
-            emotion_result, emotional_context, check_in_thread = self._process_emotion(actual_command)
-
-            # Step 2: classification. financial_topic feeds the disclaimer (Step 6),
-            # not research, so it stays here; research classification+execution moves
-            # to _classify_and_research() (which still sets self.last_research_*).
-            financial_topic = self.research_manager.is_financial_topic(actual_command)
+            emotion_result, emotional_context, check_in_thread = stages['emotion']
+            financial_topic = stages['financial']
             logger.debug(f"   Financial topic: {financial_topic}")
 
-            research_outcome = self._classify_and_research(actual_command)
+            research_outcome = stages['research']
             research_required = research_outcome.research_required
             research_context = research_outcome.research_context
             research_result = research_outcome.research_result
@@ -1096,17 +1275,10 @@ class ResearchFirstPipeline(PipelineLoop):
             tone = self._route_tone(actual_command)
             render_debug: Dict[str, str] = {}
 
-            # Step 4.5: Week 6 - Get conversation context and semantic memories
-            conversation_context = self.context_manager.get_context_for_prompt(max_turns=5, include_metadata=True)
+            conversation_context = stages['conversation']
             logger.debug(f"💬 Conversation context: {len(conversation_context)} chars")
-
-            # Get semantic memories (similar past conversations)
-            semantic_results = []
-            try:
-                semantic_results = self.semantic_memory.semantic_search(query=actual_command, k=3)
-                logger.debug(f"🧠 Semantic memory: Found {len(semantic_results)} relevant memories")
-            except Exception as e:
-                logger.warning(f"Semantic search failed: {e}")
+            semantic_results = stages['semantic']
+            logger.debug(f"🧠 Semantic memory: Found {len(semantic_results)} relevant memories")
 
             prompt_ctx = PromptContext(
                 is_control=is_control,
@@ -1141,7 +1313,7 @@ class ResearchFirstPipeline(PipelineLoop):
             personality_adjustments = []
             if not is_control:
                 try:
-                    result = asyncio.run(
+                    result = run_sync(
                         self.personality_post_processor.process_response(
                             final_response,
                             context={'topic': 'general', 'query': actual_command}
@@ -1189,14 +1361,14 @@ class ResearchFirstPipeline(PipelineLoop):
             context = {}  # TODO: Could add more context like is_follow_up, previous_humor_style, etc.
 
             logger.debug("🧠 Analyzing conversation for personality signals...")
-            analysis = asyncio.run(self.personality_tracker.analyze_user_communication(user_input, context))
+            analysis = run_sync(self.personality_tracker.analyze_user_communication(user_input, context))
 
             updates_made = 0
 
             # Update communication formality if detected with confidence
             formality = analysis.get('formality_level', {})
             if formality.get('confidence', 0) > 0.5:
-                asyncio.run(self._update_dimension_if_changed(
+                run_sync(self._update_dimension_if_changed(
                     'communication_formality',
                     formality['value'],
                     formality['confidence'] * 0.05,  # Small confidence boost per conversation
@@ -1207,7 +1379,7 @@ class ResearchFirstPipeline(PipelineLoop):
             # Update technical depth preference
             tech_depth = analysis.get('technical_depth_request', {})
             if tech_depth.get('confidence', 0) > 0.5:
-                asyncio.run(self._update_dimension_if_changed(
+                run_sync(self._update_dimension_if_changed(
                     'technical_depth_preference',
                     tech_depth['value'],
                     tech_depth['confidence'] * 0.05,
@@ -1218,7 +1390,7 @@ class ResearchFirstPipeline(PipelineLoop):
             # Update humor style preference
             humor = analysis.get('humor_response_cues', {})
             if humor.get('confidence', 0) > 0.5:
-                asyncio.run(self._update_dimension_if_changed(
+                run_sync(self._update_dimension_if_changed(
                     'humor_style_preference',
                     humor['value'],
                     humor['confidence'] * 0.05,
@@ -1229,7 +1401,7 @@ class ResearchFirstPipeline(PipelineLoop):
             # Update response length preference
             length = analysis.get('length_preference_signals', {})
             if length.get('confidence', 0) > 0.5:
-                asyncio.run(self._update_dimension_if_changed(
+                run_sync(self._update_dimension_if_changed(
                     'response_length_preference',
                     length['value'],
                     length['confidence'] * 0.05,
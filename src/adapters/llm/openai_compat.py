@@ -1,7 +1,37 @@
 import json
-from typing import Any, Dict
+import socket
+import threading
+from typing import Any, Callable, Dict, Iterator, Optional
 import requests
 
+try:
+    from src.llm.prompt_assembly import PromptAssembler, render_messages
+except ImportError:
+    from llm.prompt_assembly import PromptAssembler, render_messages
+
+
+class StreamHandle:
+    """Handle on an open streaming response that can be aborted from any thread"""
+
+    def __init__(self, response: requests.Response):
+        self.response = response
+
+    def close(self):
+        # response.close() alone doesn't wake a reader blocked in recv();
+        # shutting the socket down does
+        raw = getattr(self.response, "raw", None)
+        connection = getattr(raw, "_connection", None)  # urllib3 2.x
+        sock = getattr(connection, "sock", None)
+        if sock is None:  # urllib3 1.x
+            fp = getattr(getattr(raw, "_fp", None), "fp", None)
+            sock = getattr(getattr(fp, "raw", None), "_sock", None)
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self.response.close()
+
 class OpenAICompatLLM:
     def __init__(self, config: dict):
         self.cfg = config or {}
@@ -15,6 +45,15 @@ class OpenAICompatLLM:
         self.frequency_penalty = float(llm.get("frequency_penalty", 0.3))
         self.max_tokens = int(llm.get("max_tokens", 512))
         self.timeout = float(llm.get("timeout", 60))
+        # llama.cpp-style hint to keep and reuse the KV cache of the shared prompt
+        # prefix; servers that don't know the field ignore it
+        self.cache_prompt = bool(llm.get("cache_prompt", True))
+        self.last_usage: Dict[str, Any] = {}
+        # Persona is memoised so the system message (the head of the server-side
+        # prefix) stays byte-identical across turns; reuse is measured over the
+        # full message list actually sent
+        self.prompt_assembler = PromptAssembler()
+        self.last_prompt_stats: Dict[str, Any] = {}
         self._session = requests.Session()
 
     def _chat_url(self) -> str:
@@ -22,6 +61,77 @@ class OpenAICompatLLM:
             return f"{self.base_url}/chat/completions"
         return f"{self.base_url}/v1/chat/completions"
 
+    def _build_persona(self) -> str:
+        """Personality-aware persona, or the basic fallback. Tone-independent."""
+        try:
+            from personality_prompt_builder import get_personality_prompt
+        except ImportError:
+            return "You are Penny, a sassy and helpful AI assistant."
+
+        try:
+            final_system_prompt = get_personality_prompt("You are Penny, an AI assistant", context=None)
+            print(f"🎭 Personality-enhanced prompt applied (length: {len(final_system_prompt)} chars)")
+            return final_system_prompt
+        except Exception as e:
+            print(f"⚠️ Personality prompt failed: {e}, using fallback")
+            return "You are Penny, a sassy and helpful AI assistant."
+
+    def refresh_persona(self):
+        """Rebuild the persona on next use, e.g. after the learned personality changed"""
+        self.prompt_assembler.invalidate("persona")
+
+    def _system_prompt(self, system_prompt: str = None) -> str:
+        """Resolve the system prompt: explicit, or the memoised persona"""
+        if system_prompt:
+            return system_prompt
+        return self.prompt_assembler.static_block("persona", self._build_persona)
+
+    def _chat_body(self, prompt: str, tone: str = "", system_prompt: str = None) -> Dict[str, Any]:
+        # Tone changes per turn, so it trails the user message instead of
+        # living in the (cached) system message
+        user = f"{prompt}\n\nTone: {tone}" if tone else prompt
+        body = {
+            "model": self.model,
+            "temperature": self.temperature,
+            "presence_penalty": self.presence_penalty,
+            "frequency_penalty": self.frequency_penalty,
+            "max_tokens": self.max_tokens,
+            "messages": [
+                {"role": "system", "content": self._system_prompt(system_prompt)},
+                {"role": "user", "content": user},
+            ],
+        }
+        if self.cache_prompt:
+            body["cache_prompt"] = True
+        return body
+
+    def _record_prefix(self, body: Dict[str, Any]):
+        """Prefix reuse of the message list about to be sent vs the previous request"""
+        text = render_messages(body["messages"])
+        hit, ratio = self.prompt_assembler.measure(text)
+        self.last_prompt_stats = {
+            "sent_chars": len(text),
+            "prefix_hit_chars": hit,
+            "prefix_hit_ratio": ratio,
+        }
+
+    @staticmethod
+    def _usage(data: Dict[str, Any]) -> Dict[str, Any]:
+        """Prompt/cached token counts from OpenAI-style usage or llama.cpp timings"""
+        usage = data.get("usage") or {}
+        timings = data.get("timings") or {}
+        details = usage.get("prompt_tokens_details") or {}
+        if "prompt_tokens" in usage:
+            return {
+                "prompt_tokens": usage["prompt_tokens"],
+                "cached_prompt_tokens": details.get("cached_tokens"),
+            }
+        if "prompt_n" in timings:
+            # llama.cpp: prompt_n tokens were prefilled, cache_n came from the cache
+            cached = timings.get("cache_n", 0)
+            return {"prompt_tokens": timings["prompt_n"] + cached, "cached_prompt_tokens": cached}
+        return {}
+
     def complete(self, prompt: str, tone: str = "", system_prompt: str = None) -> str:
         """
         Generate completion with optional personality-aware system prompt
@@ -32,49 +142,14 @@ class OpenAICompatLLM:
             system_prompt: Custom system prompt (if None, uses default)
         """
         try:
-            # Try to import personality prompt builder
-            try:
-                from personality_prompt_builder import get_personality_prompt
-                has_personality = True
-            except ImportError:
-                has_personality = False
-
             url = self._chat_url()
             headers = {"Authorization": f"Bearer {self.api_key}"}
-
-            # Build system prompt with personality if available
-            if system_prompt:
-                # Use provided system prompt
-                final_system_prompt = system_prompt
-            elif has_personality:
-                # Use personality-aware prompt
-                try:
-                    base = "You are Penny, an AI assistant"
-                    if tone:
-                        base += f" with {tone} tone"
-                    final_system_prompt = get_personality_prompt(base, context=None)
-                    print(f"🎭 Personality-enhanced prompt applied (length: {len(final_system_prompt)} chars)")
-                except Exception as e:
-                    print(f"⚠️ Personality prompt failed: {e}, using fallback")
-                    final_system_prompt = f"You are Penny, a sassy and helpful AI assistant. Tone: {tone}".strip()
-            else:
-                # Fallback to basic prompt
-                final_system_prompt = f"You are Penny, a sassy and helpful AI assistant. Tone: {tone}".strip()
-
-            body: Dict[str, Any] = {
-                "model": self.model,
-                "temperature": self.temperature,
-                "presence_penalty": self.presence_penalty,
-                "frequency_penalty": self.frequency_penalty,
-                "max_tokens": self.max_tokens,
-                "messages": [
-                    {"role": "system", "content": final_system_prompt},
-                    {"role": "user", "content": prompt},
-                ],
-            }
+            body = self._chat_body(prompt, tone, system_prompt)
+            self._record_prefix(body)
             r = self._session.post(url, headers=headers, json=body, timeout=self.timeout)
             r.raise_for_status()
             data = r.json() if r.content else {}
+            self.last_usage = self._usage(data)
             choices = data.get("choices") or []
             if not choices:
                 return ""
@@ -85,6 +160,69 @@ class OpenAICompatLLM:
         except Exception as e:
             return f"[llm error] {e}\n{prompt}"
 
+    def stream(
+        self,
+        prompt: str,
+        tone: str = "",
+        system_prompt: str = None,
+        cancel_event: Optional[threading.Event] = None,
+        on_open: Optional[Callable[[StreamHandle], None]] = None
+    ) -> Iterator[str]:
+        """
+        Stream completion text deltas as they arrive (SSE ``stream: true``)
+
+        Args:
+            prompt: User message or full conversation prompt
+            tone: Optional tone hint (legacy)
+            system_prompt: Custom system prompt (if None, uses default)
+            cancel_event: Barge-in signal; once set, the HTTP stream is closed
+                and iteration stops at the next received chunk
+            on_open: Called with a StreamHandle once the response is open, so
+                a canceller (SentenceDispatcher.attach_stream) can close it
+                without waiting for the next chunk
+
+        Yields:
+            Text fragments in generation order
+        """
+        url = self._chat_url()
+        headers = {"Authorization": f"Bearer {self.api_key}", "Accept": "text/event-stream"}
+        body = self._chat_body(prompt, tone, system_prompt)
+        body["stream"] = True
+        self._record_prefix(body)
+
+        yielded = False
+        r = None
+        try:
+            r = self._session.post(url, headers=headers, json=body, timeout=self.timeout, stream=True)
+            if on_open is not None:
+                on_open(StreamHandle(r))
+            r.raise_for_status()
+            # chunk_size=None: hand over each transfer chunk as it arrives
+            # instead of blocking until a fixed-size buffer fills
+            for line in r.iter_lines(chunk_size=None, decode_unicode=True):
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+                if not line or not line.startswith("data:"):
+                    continue  # blank separators and SSE comments / keep-alives
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                choices = (json.loads(data).get("choices") or [{}])
+                delta = choices[0].get("delta") or {}
+                text = delta.get("content") or choices[0].get("text") or ""
+                if text:
+                    yielded = True
+                    yield text
+        except Exception as e:
+            # Closing the response from another thread on barge-in lands here too
+            cancelled = cancel_event is not None and cancel_event.is_set()
+            if not yielded and not cancelled:
+                yield f"[llm error] {e}"
+        finally:
+            # Also runs when the consumer stops iterating early (generator close)
+            if r is not None:
+                r.close()
+
     def health(self) -> bool:
         try:
             models_url = f"{self.base_url}/models" if self.base_url.endswith("/v1") else f"{self.base_url}/v1/models"
@@ -22,6 +22,7 @@ class WhisperSTT:
         self.config = config or {}
         self.model_name = (self.config.get("stt") or {}).get("model", "base")
         self._model = None
+        self._service = None
         if whisper:
             try:
                 self._model = whisper.load_model(self.model_name)
@@ -67,3 +68,33 @@ class WhisperSTT:
                     pass  # Ignore cleanup errors
         except Exception:
             return empty
+
+    def start_stream(self, on_partial=None, **session_options):
+        """
+        Start incremental transcription of one utterance.
+
+        Feed 16 kHz float32 audio with session.feed() while the user is still
+        speaking; session.finish() then decodes only the uncommitted tail.
+
+        Args:
+            on_partial: Called with each partial Transcript
+            **session_options: TranscriptionSession settings (step_s, ...)
+
+        Returns:
+            TranscriptionSession, or None if no model is loaded
+        """
+        if not self._model:
+            return None
+        try:
+            from src.audio.streaming_stt import TranscriptionSession
+            from src.audio.whisper_service import WhisperSTTService
+        except ImportError:
+            from audio.streaming_stt import TranscriptionSession
+            from audio.whisper_service import WhisperSTTService
+        if self._service is None:
+            # Serve the model this adapter already loaded; no second copy
+            model = self._model
+            self._service = WhisperSTTService(
+                self.model_name, warmup=False, model_loader=lambda name: model, fp16=False
+            ).start()
+        return TranscriptionSession(self._service, on_partial=on_partial, **session_options)
@@ -0,0 +1,403 @@
+"""
+Unified TTS Audio Store
+One content-addressed cache of synthesized speech shared by every TTS adapter
+
+Audio is keyed by (normalised text, backend, voice, voice settings), so the
+same phrase spoken by the same engine/voice/settings is synthesized once no
+matter which adapter asked for it. Layout:
+
+    <root>/objects/<k[:2]>/<key>.<ext>   audio files
+    <root>/index.db                       SQLite index (one row per object)
+
+The total size is kept in a ledger updated on every insert/delete (no
+directory scans), and eviction pops from a heap ordered by last access (LRU)
+or by (hits, last access) (LFU) until the store is back under its byte budget.
+"""
+
+import hashlib
+import heapq
+import itertools
+import json
+import logging
+import os
+import re
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_DIR = Path(tempfile.gettempdir()) / 'penny_audio_store'
+
+
+def normalize_tts_text(text: str) -> str:
+    """Trim and collapse whitespace (case and punctuation change the audio, so they are kept)"""
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def audio_key(text: str, backend: str, voice: str = "default",
+              settings: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Content address for one synthesis request.
+
+    Args:
+        text: Text to speak
+        backend: TTS engine name ("google", "elevenlabs", "say", ...)
+        voice: Voice identifier
+        settings: Voice settings / personality parameters that change the audio
+
+    Returns:
+        Hex digest identifying the audio
+    """
+    descriptor = json.dumps(
+        [normalize_tts_text(text), backend, voice or "default", settings or {}],
+        sort_keys=True, separators=(',', ':'), default=str
+    )
+    return hashlib.sha256(descriptor.encode('utf-8')).hexdigest()
+
+
+class AudioStore:
+    """Thread-safe content-addressed audio cache with a byte budget"""
+
+    POLICIES = ('lru', 'lfu')
+
+    def __init__(self, root: Optional[str] = None, max_bytes: int = 200 * 1024 * 1024,
+                 policy: str = 'lru'):
+        """
+        Open (or create) the store.
+
+        Args:
+            root: Directory holding objects/ and index.db
+            max_bytes: Byte budget; least valuable objects are evicted beyond it
+            policy: "lru" (evict least recently used) or "lfu" (fewest hits,
+                then least recently used)
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown eviction policy '{policy}' (expected one of {self.POLICIES})")
+
+        self.root = Path(root) if root else DEFAULT_STORE_DIR
+        self.objects_dir = self.root / 'objects'
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_bytes)
+        self.policy = policy
+        self._lock = threading.RLock()
+
+        self._conn = sqlite3.connect(str(self.root / 'index.db'), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS audio ("
+            " key TEXT PRIMARY KEY, path TEXT NOT NULL, size INTEGER NOT NULL,"
+            " backend TEXT NOT NULL, voice TEXT NOT NULL, text TEXT NOT NULL,"
+            " duration REAL, created_at REAL NOT NULL, last_access REAL NOT NULL,"
+            " hits INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS audio_backend ON audio(backend)")
+        self._conn.commit()
+
+        # In-memory view of the index: key -> [size, hits, last_access, path, backend]
+        self._entries: Dict[str, List[Any]] = {}
+        self._heap: List[Tuple[Any, int, str]] = []
+        self._versions: Dict[str, int] = {}
+        self._counter = itertools.count()
+        self.total_bytes = 0
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'rejected': 0}
+
+        for key, size, hits, last_access, path, backend in self._conn.execute(
+                "SELECT key, size, hits, last_access, path, backend FROM audio"):
+            self._entries[key] = [size, hits, last_access, path, backend]
+            self.total_bytes += size
+            self._push(key)
+        self._evict()
+
+    # ------------------------------------------------------------------
+    # Eviction heap (lazy deletion: stale versions are skipped on pop)
+    # ------------------------------------------------------------------
+
+    def _priority(self, key: str) -> Any:
+        size, hits, last_access, _, _ = self._entries[key]
+        return (hits, last_access) if self.policy == 'lfu' else last_access
+
+    def _push(self, key: str):
+        version = next(self._counter)
+        self._versions[key] = version
+        heapq.heappush(self._heap, (self._priority(key), version, key))
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [(self._priority(k), self._versions[k], k) for k in self._entries]
+            heapq.heapify(self._heap)
+
+    def _evict(self, protect: Optional[str] = None):
+        """
+        Drop the least valuable objects until within budget (caller holds the lock).
+
+        Args:
+            protect: Key that must survive this pass -- the object just inserted,
+                which under LFU would otherwise always be the first victim
+        """
+        spared = None
+        while self.total_bytes > self.max_bytes and self._heap:
+            item = heapq.heappop(self._heap)
+            _, version, key = item
+            if self._versions.get(key) != version:
+                continue
+            if key == protect:
+                spared = item
+                continue
+            self._delete(key)
+            self.stats['evictions'] += 1
+        if spared is not None:
+            heapq.heappush(self._heap, spared)
+
+    def _delete(self, key: str):
+        """Remove one object from disk, index and ledger (caller holds the lock)"""
+        entry = self._entries.pop(key, None)
+        self._versions.pop(key, None)
+        if entry is None:
+            return
+        self.total_bytes -= entry[0]
+        self._conn.execute("DELETE FROM audio WHERE key = ?", (key,))
+        self._conn.commit()
+        try:
+            os.unlink(entry[3])
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not delete cached audio {entry[3]}: {e}")
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def get(self, text: str, backend: str, voice: str = "default",
+            settings: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """
+        Path of the cached audio for this request, or None on a miss.
+
+        Args:
+            text: Text to speak
+            backend: TTS engine name
+            voice: Voice identifier
+            settings: Voice settings that affect the audio
+        """
+        key = audio_key(text, backend, voice, settings)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not os.path.exists(entry[3]):
+                # File removed behind our back
+                self._delete(key)
+                entry = None
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+
+            entry[1] += 1
+            entry[2] = time.time()
+            self._conn.execute("UPDATE audio SET hits = ?, last_access = ? WHERE key = ?",
+                               (entry[1], entry[2], key))
+            self._conn.commit()
+            self._push(key)
+            self.stats['hits'] += 1
+            return entry[3]
+
+    def get_bytes(self, text: str, backend: str, voice: str = "default",
+                  settings: Optional[Dict[str, Any]] = None) -> Optional[bytes]:
+        """Cached audio contents for this request, or None on a miss"""
+        path = self.get(text, backend, voice, settings)
+        if path is None:
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def contains(self, text: str, backend: str, voice: str = "default",
+                 settings: Optional[Dict[str, Any]] = None) -> bool:
+        """True if the audio is cached (does not count as a hit)"""
+        with self._lock:
+            return audio_key(text, backend, voice, settings) in self._entries
+
+    # ------------------------------------------------------------------
+    # Insert
+    # ------------------------------------------------------------------
+
+    def put_file(self, text: str, backend: str, source_path: str, voice: str = "default",
+                 settings: Optional[Dict[str, Any]] = None, duration: Optional[float] = None,
+                 move: bool = False) -> Optional[str]:
+        """
+        Store an audio file.
+
+        Args:
+            text: Text the audio speaks
+            backend: TTS engine name
+            source_path: Audio file to store (its extension is kept)
+            voice: Voice identifier
+            settings: Voice settings that affect the audio
+            duration: Audio length in seconds, if known
+            move: Move the file into the store instead of copying it
+
+        Returns:
+            Path of the stored object, or None if it could not be stored
+        """
+        try:
+            size = os.path.getsize(source_path)
+        except OSError as e:
+            logger.warning(f"Cannot store audio {source_path}: {e}")
+            return None
+        ext = Path(source_path).suffix or '.audio'
+
+        def _write(target: Path):
+            if move:
+                shutil.move(source_path, target)
+            else:
+                shutil.copyfile(source_path, target)
+
+        return self._insert(text, backend, voice, settings, duration, size, ext, _write)
+
+    def put_bytes(self, text: str, backend: str, data: bytes, ext: str = '.mp3',
+                  voice: str = "default", settings: Optional[Dict[str, Any]] = None,
+                  duration: Optional[float] = None) -> Optional[str]:
+        """Store audio held in memory; returns the stored path (see put_file)"""
+        def _write(target: Path):
+            target.write_bytes(data)
+
+        return self._insert(text, backend, voice, settings, duration, len(data), ext, _write)
+
+    def _insert(self, text: str, backend: str, voice: str, settings: Optional[Dict[str, Any]],
+                duration: Optional[float], size: int, ext: str, write) -> Optional[str]:
+        if size > self.max_bytes:
+            self.stats['rejected'] += 1
+            return None
+
+        key = audio_key(text, backend, voice, settings)
+        target_dir = self.objects_dir / key[:2]
+        target_dir.mkdir(exist_ok=True)
+        target = target_dir / f"{key}{ext if ext.startswith('.') else '.' + ext}"
+
+        # Write outside the lock under a temporary name, then rename into place
+        partial = target.with_name(f".{target.name}.{threading.get_ident()}.partial")
+        try:
+            write(partial)
+            os.replace(partial, target)
+        except OSError as e:
+            logger.warning(f"Failed to store audio for '{text[:40]}': {e}")
+            try:
+                os.unlink(partial)
+            except OSError:
+                pass
+            return None
+
+        now = time.time()
+        with self._lock:
+            previous = self._entries.get(key)
+            if previous is not None:
+                self.total_bytes -= previous[0]
+                if previous[3] != str(target):
+                    try:
+                        os.unlink(previous[3])
+                    except OSError:
+                        pass
+            hits = previous[1] if previous else 0
+            self._entries[key] = [size, hits, now, str(target), backend]
+            self.total_bytes += size
+            self._conn.execute(
+                "INSERT OR REPLACE INTO audio"
+                " (key, path, size, backend, voice, text, duration, created_at, last_access, hits)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, str(target), size, backend, voice or "default", normalize_tts_text(text),
+                 duration, now, now, hits)
+            )
+            self._conn.commit()
+            self._push(key)
+            self.stats['stores'] += 1
+            self._evict(protect=key)
+            return str(target)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def remove(self, text: str, backend: str, voice: str = "default",
+               settings: Optional[Dict[str, Any]] = None):
+        with self._lock:
+            self._delete(audio_key(text, backend, voice, settings))
+
+    def clear(self, backend: Optional[str] = None):
+        """Remove every object (or only those of one backend)"""
+        with self._lock:
+            keys = [k for k, e in self._entries.items() if backend is None or e[4] == backend]
+            for key in keys:
+                self._delete(key)
+            if backend is None:
+                self._heap.clear()
+
+    def count(self, backend: Optional[str] = None) -> int:
+        with self._lock:
+            if backend is None:
+                return len(self._entries)
+            return sum(1 for e in self._entries.values() if e[4] == backend)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            by_backend: Dict[str, int] = {}
+            for entry in self._entries.values():
+                by_backend[entry[4]] = by_backend.get(entry[4], 0) + 1
+            return dict(
+                self.stats,
+                entries=len(self._entries),
+                entries_by_backend=by_backend,
+                total_bytes=self.total_bytes,
+                max_bytes=self.max_bytes,
+                policy=self.policy,
+                hit_rate=self.stats['hits'] / lookups if lookups else 0.0
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# Singleton instance shared by all TTS adapters
+_audio_store: Optional[AudioStore] = None
+_audio_store_lock = threading.Lock()
+
+
+def get_audio_store(root: Optional[str] = None, max_bytes: Optional[int] = None,
+                    policy: Optional[str] = None) -> AudioStore:
+    """
+    Get the shared audio store. Arguments only apply to the first call, which
+    creates it.
+
+    Args:
+        root: Store directory (default: <tmp>/penny_audio_store)
+        max_bytes: Byte budget (default: 200 MB)
+        policy: Eviction policy, "lru" or "lfu" (default: "lru")
+
+    Returns:
+        AudioStore instance
+    """
+    global _audio_store
+    with _audio_store_lock:
+        if _audio_store is None:
+            kwargs: Dict[str, Any] = {'root': root}
+            if max_bytes is not None:
+                kwargs['max_bytes'] = max_bytes
+            if policy is not None:
+                kwargs['policy'] = policy
+            _audio_store = AudioStore(**kwargs)
+    return _audio_store
+
+
+def get_audio_store_for_config(tts_config: Dict[str, Any]) -> AudioStore:
+    """Shared store sized from a TTS config section (audio_store_dir / _max_mb / _policy)"""
+    max_mb = tts_config.get('audio_store_max_mb')
+    return get_audio_store(
+        root=tts_config.get('audio_store_dir'),
+        max_bytes=int(max_mb * 1024 * 1024) if max_mb else None,
+        policy=tts_config.get('audio_store_policy')
+    )
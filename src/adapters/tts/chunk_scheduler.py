@@ -0,0 +1,231 @@
+"""
+Adaptive chunk planning and synthesize-ahead scheduling for streaming TTS
+
+plan_chunks() makes the first chunk deliberately short, so its synthesis
+round trip (and therefore time-to-first-audio) is small, and grows each
+following chunk geometrically. Later chunks have the whole playback time of
+their predecessors to synthesize in.
+
+ChunkScheduler runs synthesis as a producer over a bounded window (at most
+`window` chunks synthesized or in flight ahead of playback) and hands results
+to a separate consumer thread strictly in text order, so collecting results
+never waits on playback and playback never waits on collection.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .sentence_dispatcher import SentenceChunker
+
+logger = logging.getLogger(__name__)
+
+# Clause boundaries preferred for splitting an over-long sentence
+_CLAUSE_MARKS = (", ", "; ", ": ", " - ", "— ")
+
+
+def _split_sentences(text: str) -> List[str]:
+    chunker = SentenceChunker(min_chars=1, max_chars=len(text) + 1)
+    sentences = chunker.feed(text + " ")
+    rest = chunker.flush()
+    return sentences + ([rest] if rest else [])
+
+
+def _cut(text: str, limit: int) -> Tuple[str, str]:
+    """Split text at the last clause boundary (else word boundary) within limit"""
+    if len(text) <= limit:
+        return text, ""
+    window = text[:limit + 1]
+    cut = max(window.rfind(mark) + len(mark.rstrip()) for mark in _CLAUSE_MARKS)
+    if cut < limit * 0.4:
+        # No clause boundary, or one so early the chunk would be tiny
+        cut = window.rfind(" ")
+    if cut <= 0:
+        cut = limit
+    return text[:cut].strip(), text[cut:].strip()
+
+
+def plan_chunks(text: str, first_chars: int = 80, growth: float = 1.8,
+                max_chars: int = 300) -> List[str]:
+    """
+    Split text into TTS chunks of growing size.
+
+    Whole sentences are packed into each chunk up to its target length;
+    a sentence longer than the target is split at a clause, else word,
+    boundary.
+
+    Args:
+        text: Text to speak
+        first_chars: Target length of the first chunk
+        growth: Each following chunk's target is the previous one times this
+        max_chars: Upper bound on any chunk's target
+
+    Returns:
+        Chunks in speaking order
+    """
+    units = deque(_split_sentences(text.strip()))
+    chunks: List[str] = []
+    target = first_chars
+    current = ""
+
+    while units:
+        unit = units.popleft()
+        candidate = f"{current} {unit}" if current else unit
+        if len(candidate) <= target:
+            current = candidate
+            continue
+        if current:
+            chunks.append(current)
+            current = ""
+            units.appendleft(unit)
+        else:
+            head, rest = _cut(unit, target)
+            chunks.append(head)
+            if rest:
+                units.appendleft(rest)
+        target = min(max_chars, int(target * growth))
+
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class ChunkScheduler:
+    """Bounded synthesize-ahead producer with an in-order playback consumer"""
+
+    def __init__(self, synthesize: Callable[[str, int], Any],
+                 consume: Callable[[int, Any], Optional[bool]],
+                 window: int = 3):
+        """
+        Args:
+            synthesize: synthesize(text, index) -> audio (None if it failed);
+                called on worker threads
+            consume: consume(index, audio) plays or queues one chunk, in
+                order, on the consumer thread; returning False (or raising,
+                which is logged) stops the run
+            window: Chunks synthesized or in flight ahead of the one being
+                consumed (also the number of concurrent requests)
+        """
+        self.synthesize = synthesize
+        self.consume = consume
+        self.window = max(1, window)
+        self.cancel_event = threading.Event()
+        self.stats: Dict[str, Any] = {}
+
+    def cancel(self):
+        """Barge-in: stop submitting and consuming; in-flight requests are abandoned"""
+        self.cancel_event.set()
+
+    def run(self, chunks: List[str]) -> Dict[str, Any]:
+        """
+        Synthesize and consume every chunk (blocks until done or cancelled).
+
+        Returns:
+            Timing stats: first_audio_ms, per-chunk synth_ms, and stalls /
+            stall_ms -- how often and how long the consumer waited for a
+            chunk that was not ready yet (audible with blocking playback;
+            with the PCM engine its underrun stats measure audible gaps).
+            'error' holds the message if consume() raised.
+        """
+        started = time.perf_counter()
+        self.stats = {
+            'chunks': len(chunks), 'consumed': 0, 'failed': 0,
+            'first_audio_ms': None, 'synth_ms': [None] * len(chunks),
+            'stalls': 0, 'stall_ms': 0.0, 'error': None
+        }
+        if not chunks:
+            return self.stats
+
+        slots = threading.Semaphore(self.window)
+        ordered: deque = deque()
+        ready = threading.Condition()
+        executor = ThreadPoolExecutor(max_workers=self.window, thread_name_prefix="tts-synth")
+
+        def timed(text: str, index: int) -> Any:
+            t0 = time.perf_counter()
+            try:
+                return self.synthesize(text, index)
+            finally:
+                self.stats['synth_ms'][index] = (time.perf_counter() - t0) * 1000
+
+        consumer = threading.Thread(target=self._consume_loop, args=(ordered, ready, slots, started),
+                                    name="tts-playback", daemon=True)
+        consumer.start()
+        try:
+            for index, text in enumerate(chunks):
+                while not slots.acquire(timeout=0.05):
+                    if self.cancel_event.is_set():
+                        break
+                if self.cancel_event.is_set():
+                    break
+                future = executor.submit(timed, text, index)
+                with ready:
+                    ordered.append((index, future))
+                    ready.notify()
+        finally:
+            with ready:
+                ordered.append(None)
+                ready.notify()
+            consumer.join()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        self.stats['total_ms'] = (time.perf_counter() - started) * 1000
+        return self.stats
+
+    def _consume_loop(self, ordered: deque, ready: threading.Condition,
+                      slots: threading.Semaphore, started: float):
+        try:
+            self._consume_items(ordered, ready, slots, started)
+        except Exception as e:
+            logger.error(f"TTS chunk consumer failed: {e}", exc_info=True)
+            self.stats['error'] = str(e)
+        finally:
+            # However the consumer exits, the producer must stop waiting for slots
+            self.cancel_event.set()
+
+    def _consume_items(self, ordered: deque, ready: threading.Condition,
+                       slots: threading.Semaphore, started: float):
+        while True:
+            with ready:
+                while not ordered:
+                    ready.wait()
+                item = ordered.popleft()
+            if item is None or self.cancel_event.is_set():
+                return
+            index, future = item
+
+            audio = self._await(future, index)
+            if self.cancel_event.is_set():
+                return
+            slots.release()  # room to synthesize one more ahead
+            if audio is None:
+                self.stats['failed'] += 1
+                continue
+
+            if self.stats['first_audio_ms'] is None:
+                self.stats['first_audio_ms'] = (time.perf_counter() - started) * 1000
+            if self.consume(index, audio) is False:
+                self.cancel_event.set()
+                return
+            self.stats['consumed'] += 1
+
+    def _await(self, future: Future, index: int) -> Any:
+        """Wait for a chunk; time spent waiting after the first chunk is a stall"""
+        t0 = time.perf_counter()
+        done = threading.Event()
+        future.add_done_callback(lambda _: done.set())
+        while not done.wait(0.02):
+            if self.cancel_event.is_set():
+                return None
+        if index > 0 and self.stats['consumed'] > 0:
+            waited = (time.perf_counter() - t0) * 1000
+            if waited > 1.0:
+                self.stats['stalls'] += 1
+                self.stats['stall_ms'] += waited
+        try:
+            return future.result()
+        except Exception:
+            return None
@@ -9,16 +9,28 @@ import tempfile
 import subprocess
 import threading
 import time
-import hashlib
 import requests
 import re
-from pathlib import Path
 from typing import Optional, Dict, Any
 
+
+def elevenlabs_cache_settings(voice_settings: Dict[str, Any], model_id: str,
+                              output_format: Optional[str] = None) -> Dict[str, Any]:
+    """Audio-store settings for an ElevenLabs request: everything besides text
+    and voice that changes the audio. Shared by ElevenLabsTTS and
+    StreamingElevenLabsTTS so identical requests share cache entries."""
+    settings = dict(voice_settings, model_id=model_id)
+    if output_format:
+        settings['output_format'] = output_format
+    return settings
+
+
 class ElevenLabsTTS:
     """ElevenLabs TTS adapter with Penny personality integration"""
     
-    def __init__(self, config: Dict[str, Any]):
+    BACKEND = "elevenlabs"
+
+    def __init__(self, config: Dict[str, Any], store=None):
         self.config = config or {}
         self.tts_config = self.config.get('tts', {})
         self._last_file = None
@@ -32,15 +44,14 @@ class ElevenLabsTTS:
         # Rachel voice ID (our winner)
         self.voice_id = "21m00Tcm4TlvDq8ikWAM"
         self.base_url = "https://api.elevenlabs.io/v1"
+        self.model_id = "eleven_monolingual_v1"
         
-        # Initialize cache system (same as Google TTS)
+        # Synthesized audio goes to the shared audio store (same as Google TTS)
         self.cache_enabled = self.tts_config.get('cache_enabled', True)
-        self.cache_dir = Path(tempfile.gettempdir()) / 'pennygpt_elevenlabs_cache'
-        if self.cache_enabled:
-            self.cache_dir.mkdir(exist_ok=True)
-        
-        self.memory_cache: Dict[str, str] = {}
-        self.max_cache_phrase_length = 60
+        self.store = store
+        if self.cache_enabled and self.store is None:
+            from .audio_store import get_audio_store_for_config
+            self.store = get_audio_store_for_config(self.tts_config)
         
         # Background playback thread
         self._playback_thread = None
@@ -115,49 +126,26 @@ class ElevenLabsTTS:
         
         return text
     
-    def _get_cache_key(self, text: str, personality: str) -> str:
-        """Generate cache key including personality mode"""
-        combined = f"{text}|{personality}"
-        return hashlib.md5(combined.encode('utf-8')).hexdigest()
+    def _cache_settings(self) -> Dict[str, Any]:
+        """Everything besides text and voice that changes the synthesized audio"""
+        return elevenlabs_cache_settings(self.voice_settings, self.model_id)
     
-    def _get_cached_file(self, text: str, personality: str) -> Optional[str]:
+    def _get_cached_file(self, text: str) -> Optional[str]:
         """Get cached audio file if exists"""
         if not self.cache_enabled:
             return None
-        
-        cache_key = self._get_cache_key(text, personality)
-        
-        # Check memory cache for short phrases
-        if len(text) <= self.max_cache_phrase_length:
-            return self.memory_cache.get(cache_key)
-        
-        # Check disk cache
-        cache_file = self.cache_dir / f"{cache_key}.mp3"
-        if cache_file.exists():
-            return str(cache_file)
-        
-        return None
+        return self.store.get(text, self.BACKEND, self.voice_id, self._cache_settings())
     
-    def _cache_file(self, text: str, personality: str, file_path: str):
-        """Cache the audio file with personality"""
+    def _cache_file(self, text: str, file_path: str) -> Optional[str]:
+        """Move synthesized audio into the store; returns its stored path"""
         if not self.cache_enabled:
-            return
-        
-        cache_key = self._get_cache_key(text, personality)
-        
-        # Cache short phrases in memory
-        if len(text) <= self.max_cache_phrase_length:
-            self.memory_cache[cache_key] = file_path
-        
-        # Cache to disk
-        try:
-            cache_file = self.cache_dir / f"{cache_key}.mp3"
-            if not cache_file.exists():
-                import shutil
-                shutil.copy2(file_path, cache_file)
-        except Exception as e:
-            if not self._error_logged:
-                print(f"[ElevenLabs] Cache write failed: {e}")
+            return None
+        settings = self._cache_settings()
+        stored = self.store.put_file(text, self.BACKEND, file_path, voice=self.voice_id,
+                                     settings=settings, move=True)
+        if not stored and not self._error_logged:
+            print("[ElevenLabs] Cache write failed")
+        return stored
     
     def _synthesize_audio(self, text: str, personality: str = 'default') -> Optional[str]:
         """Synthesize text using ElevenLabs API with consistent quality settings"""
@@ -165,9 +153,8 @@ class ElevenLabsTTS:
         
         try:
             # Check cache first
-            cache_key = hashlib.md5(text.encode('utf-8')).hexdigest()
-            cached_file = self._get_cached_file(text, 'default')  # Use single cache key
-            if cached_file and os.path.exists(cached_file):
+            cached_file = self._get_cached_file(text)
+            if cached_file:
                 # Increment cache hit counter
                 if hasattr(self, '_cache_hits'):
                     self._cache_hits += 1
@@ -185,7 +172,7 @@ class ElevenLabsTTS:
             
             data = {
                 "text": text,
-                "model_id": "eleven_monolingual_v1",
+                "model_id": self.model_id,
                 "voice_settings": self.voice_settings  # Use single optimized settings
             }
             
@@ -206,12 +193,11 @@ class ElevenLabsTTS:
                 # Save to temporary file
                 with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as f:
                     f.write(response.content)
-                    self._last_file = f.name
-                    
-                    # Cache the result
-                    self._cache_file(text, 'default', f.name)
-                    
-                    return f.name
+
+                # Cache the result (the store takes ownership of the file)
+                audio_file = self._cache_file(text, f.name) or f.name
+                self._last_file = audio_file
+                return audio_file
             else:
                 if not self._error_logged:
                     print(f"[ElevenLabs] API error: {response.status_code}")
@@ -402,16 +388,13 @@ class ElevenLabsTTS:
     
     def clear_cache(self):
         """Clear TTS cache"""
-        self.memory_cache.clear()
-        
-        if self.cache_enabled and self.cache_dir.exists():
-            try:
-                import shutil
-                shutil.rmtree(self.cache_dir)
-                self.cache_dir.mkdir(exist_ok=True)
-                print("[ElevenLabs] Cache cleared")
-            except Exception as e:
-                print(f"[ElevenLabs] Cache clear failed: {e}")
+        if not self.cache_enabled:
+            return
+        try:
+            self.store.clear(backend=self.BACKEND)
+            print("[ElevenLabs] Cache cleared")
+        except Exception as e:
+            print(f"[ElevenLabs] Cache clear failed: {e}")
     
     def __del__(self):
         """Cleanup"""
@@ -1,7 +1,5 @@
-import os, tempfile, subprocess, threading, time
-import hashlib
-from pathlib import Path
-from typing import Optional, Dict
+import os, io, tempfile, subprocess, threading, time
+from typing import Optional
 
 try:
     from gtts import gTTS  # type: ignore
@@ -11,68 +9,57 @@ except Exception:
     GTTS_AVAILABLE = False
 
 class GoogleTTS:
-    def __init__(self, config):
+    BACKEND = "google"
+
+    def __init__(self, config, store=None, engine=None):
         self.config = config or {}
         self.tts_config = self.config.get('tts', {})
         self._last_file = None
         self._error_logged = False
         
-        # Initialize cache
+        # Synthesized audio goes to the shared audio store
         self.cache_enabled = self.tts_config.get('cache_enabled', True)
-        self.cache_dir = Path(tempfile.gettempdir()) / 'pennygpt_tts_cache'
-        if self.cache_enabled:
-            self.cache_dir.mkdir(exist_ok=True)
+        self.store = store
+        if self.cache_enabled and self.store is None:
+            from .audio_store import get_audio_store_for_config
+            self.store = get_audio_store_for_config(self.tts_config)
         
-        # Cache for phrases under 60 characters
-        self.memory_cache: Dict[str, str] = {}
-        self.max_cache_phrase_length = 60
+        # In-memory playback engine (resolved on first speak); afplay is the fallback
+        self.engine = engine
+        self._engine_checked = engine is not None
         
         # Background playback thread
         self._playback_thread = None
         self._stop_playback = threading.Event()
 
-    def _get_cache_key(self, text: str) -> str:
-        """Generate cache key for text."""
-        return hashlib.md5(text.encode('utf-8')).hexdigest()
+    def _get_engine(self):
+        """Shared PCM playback engine, or None to play files with afplay."""
+        if not self._engine_checked:
+            self._engine_checked = True
+            try:
+                try:
+                    from src.audio.playback_engine import get_playback_engine
+                except ImportError:
+                    from audio.playback_engine import get_playback_engine
+                self.engine = get_playback_engine(self.tts_config)
+            except ImportError:
+                self.engine = None
+        return self.engine
 
     def _get_cached_file(self, text: str) -> Optional[str]:
         """Get cached audio file path if exists."""
         if not self.cache_enabled:
             return None
-            
-        cache_key = self._get_cache_key(text)
-        
-        # Check memory cache for short phrases
-        if len(text) <= self.max_cache_phrase_length:
-            return self.memory_cache.get(cache_key)
-        
-        # Check disk cache
-        cache_file = self.cache_dir / f"{cache_key}.mp3"
-        if cache_file.exists():
-            return str(cache_file)
-        
-        return None
+        return self.store.get(text, self.BACKEND)
 
-    def _cache_file(self, text: str, file_path: str):
-        """Cache the audio file."""
+    def _cache_file(self, text: str, file_path: str) -> Optional[str]:
+        """Move freshly synthesized audio into the store; returns its stored path."""
         if not self.cache_enabled:
-            return
-            
-        cache_key = self._get_cache_key(text)
-        
-        # Cache short phrases in memory
-        if len(text) <= self.max_cache_phrase_length:
-            self.memory_cache[cache_key] = file_path
-        
-        # Also cache to disk for persistence
-        try:
-            cache_file = self.cache_dir / f"{cache_key}.mp3"
-            if not cache_file.exists():
-                import shutil
-                shutil.copy2(file_path, cache_file)
-        except Exception as e:
-            if not self._error_logged:
-                print(f"[TTS] Cache write failed: {e}")
+            return None
+        stored = self.store.put_file(text, self.BACKEND, file_path, move=True)
+        if not stored and not self._error_logged:
+            print("[TTS] Cache write failed")
+        return stored
 
     def _synthesize_audio(self, text: str) -> Optional[str]:
         """Synthesize text to audio file."""
@@ -85,18 +72,45 @@ class GoogleTTS:
         try:
             # Check cache first
             cached_file = self._get_cached_file(text)
-            if cached_file and os.path.exists(cached_file):
+            if cached_file:
                 return cached_file
             
             # Synthesize new audio
             with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as f:
-                gTTS(text=text, lang="en").save(f.name)
-                self._last_file = f.name
-                
-                # Cache the result
-                self._cache_file(text, f.name)
+                temp_path = f.name
+            gTTS(text=text, lang="en").save(temp_path)
+
+            # Cache the result (the store takes ownership of the file)
+            audio_file = self._cache_file(text, temp_path) or temp_path
+            self._last_file = audio_file
+            return audio_file
                 
-                return f.name
+        except Exception as e:
+            if not self._error_logged:
+                print(f"[TTS] Synthesis failed: {e}")
+                self._error_logged = True
+            return None
+
+    def _synthesize_bytes(self, text: str) -> Optional[bytes]:
+        """Synthesize text to MP3 bytes in memory (no temp file)."""
+        if not GTTS_AVAILABLE:
+            if not self._error_logged:
+                print("[TTS] gTTS not installed; skipping audio synthesis.")
+                self._error_logged = True
+            return None
+
+        try:
+            if self.cache_enabled:
+                cached = self.store.get_bytes(text, self.BACKEND)
+                if cached:
+                    return cached
+
+            buffer = io.BytesIO()
+            gTTS(text=text, lang="en").write_to_fp(buffer)
+            data = buffer.getvalue()
+            if self.cache_enabled:
+                self.store.put_bytes(text, self.BACKEND, data, ext=".mp3")
+            return data
                 
         except Exception as e:
             if not self._error_logged:
@@ -104,6 +118,22 @@ class GoogleTTS:
                 self._error_logged = True
             return None
 
+    def _speak_in_memory(self, engine, text: str) -> Optional[bool]:
+        """Decode and queue audio on the playback engine; None if it can't be decoded."""
+        data = self._synthesize_bytes(text)
+        if not data:
+            return False
+        try:
+            utterance = engine.begin_utterance()
+            engine.enqueue_audio(data, utterance=utterance)
+            engine.finish(utterance)
+            return True
+        except ValueError as e:
+            # e.g. libsndfile without MP3 support: use file playback from now on
+            print(f"[TTS] In-memory playback unavailable ({e}); using afplay")
+            self.engine = None
+            return None
+
     def _play_audio_file(self, file_path: str) -> bool:
         """Play audio file using system player."""
         try:
@@ -157,6 +187,12 @@ class GoogleTTS:
         # Stop any current playback
         self.stop()
         
+        engine = self._get_engine()
+        if engine is not None:
+            result = self._speak_in_memory(engine, text)
+            if result is not None:
+                return result
+
         # Synthesize audio
         audio_file = self._synthesize_audio(text)
         if not audio_file:
@@ -174,6 +210,11 @@ class GoogleTTS:
 
     def stop(self):
         """Stop current audio playback."""
+        if self.engine is not None:
+            # Barge-in: the engine goes silent within one audio block
+            self.engine.stop()
+            return
+
         # Signal stop to background thread
         self._stop_playback.set()
         
@@ -195,22 +236,21 @@ class GoogleTTS:
 
     def is_speaking(self) -> bool:
         """Check if currently speaking."""
+        if self.engine is not None:
+            return self.engine.is_playing()
         return (self._playback_thread and 
                 self._playback_thread.is_alive() and 
                 not self._stop_playback.is_set())
 
     def clear_cache(self):
         """Clear TTS cache."""
-        self.memory_cache.clear()
-        
-        if self.cache_enabled and self.cache_dir.exists():
-            try:
-                import shutil
-                shutil.rmtree(self.cache_dir)
-                self.cache_dir.mkdir(exist_ok=True)
-                print("[TTS] Cache cleared successfully")
-            except Exception as e:
-                print(f"[TTS] Failed to clear cache: {e}")
+        if not self.cache_enabled:
+            return
+        try:
+            self.store.clear(backend=self.BACKEND)
+            print("[TTS] Cache cleared successfully")
+        except Exception as e:
+            print(f"[TTS] Failed to clear cache: {e}")
 
     def preload_common_phrases(self):
         """Preload common phrases to reduce latency."""
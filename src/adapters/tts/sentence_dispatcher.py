@@ -0,0 +1,202 @@
+"""
+Sentence dispatch from a streaming LLM into TTS
+
+SentenceChunker turns a stream of text deltas into complete sentences;
+SentenceDispatcher speaks each sentence as soon as it closes while the LLM
+keeps generating, so time-to-first-audio is bounded by the first sentence
+rather than the whole reply. cancel() is the barge-in hook: it stops the
+speaker, stops TTS, and closes the LLM's HTTP stream (attach_stream) so
+a stalled stream is cut off at once instead of at its next chunk.
+"""
+
+import queue
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# Words ending in '.' that don't end a sentence
+ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "st", "vs", "etc", "e.g", "i.e", "jr", "sr", "no", "approx"}
+
+# Sentence-final punctuation (plus closing quotes/brackets) followed by whitespace
+_BOUNDARY = re.compile(r'[.!?…]+["\')\]]*(?=\s)|\n+')
+
+
+class SentenceChunker:
+    """Incremental sentence splitter for token streams"""
+
+    def __init__(self, min_chars: int = 20, max_chars: int = 180):
+        """
+        Args:
+            min_chars: Shorter sentences are held and merged with the next one
+                       (avoids a TTS round trip for "Sure." on its own)
+            max_chars: Force a split at the last comma/space past this length
+        """
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self._buffer = ""
+
+    def feed(self, text: str) -> List[str]:
+        """Add a text delta; returns sentences completed by it"""
+        self._buffer += text
+        sentences = []
+        search_from = 0
+        while True:
+            match = _BOUNDARY.search(self._buffer, search_from)
+            if match is None:
+                break
+            end = match.end()
+            candidate = self._buffer[:end].strip()
+            if self._is_abbreviation(self._buffer[:match.start()]) or len(candidate) < self.min_chars:
+                search_from = end
+                continue
+            sentences.append(candidate)
+            self._buffer = self._buffer[end:].lstrip()
+            search_from = 0
+
+        while len(self._buffer) > self.max_chars:
+            cut = self._buffer.rfind(", ", 0, self.max_chars)
+            if cut <= 0:
+                cut = self._buffer.rfind(" ", 0, self.max_chars)
+            if cut <= 0:
+                break
+            sentences.append(self._buffer[:cut + 1].strip())
+            self._buffer = self._buffer[cut + 1:].lstrip()
+        return sentences
+
+    def flush(self) -> Optional[str]:
+        """Return whatever is left once the stream ends"""
+        rest, self._buffer = self._buffer.strip(), ""
+        return rest or None
+
+    @staticmethod
+    def _is_abbreviation(before: str) -> bool:
+        words = before.rsplit(None, 1)
+        return bool(words) and words[-1].lower().rstrip('.') in ABBREVIATIONS
+
+
+class SentenceDispatcher:
+    """
+    Speak sentences from a token stream as they complete.
+
+    Works with any TTS exposing speak(text) and optionally stop()
+    (StreamingTTS, StreamingElevenLabsTTS, GoogleTTS, ...). Sentences are spoken
+    in order on a dedicated thread so a blocking speak() never stalls token
+    consumption.
+    """
+
+    def __init__(self, tts: Any, chunker: Optional[SentenceChunker] = None,
+                 on_sentence: Optional[Callable[[str], None]] = None):
+        """
+        Args:
+            tts: TTS adapter with speak(text)
+            chunker: Sentence splitter (default: SentenceChunker())
+            on_sentence: Optional callback invoked before each sentence is spoken
+        """
+        self.tts = tts
+        self.chunker = chunker or SentenceChunker()
+        self.on_sentence = on_sentence
+        self.cancel_event = threading.Event()
+        self._sentences: "queue.Queue" = queue.Queue()
+        self._speaker: Optional[threading.Thread] = None
+        self._stream: Any = None
+        self._stream_lock = threading.Lock()
+        self.stats: Dict[str, Any] = {
+            "sentences": 0,
+            "first_sentence_ms": None,
+            "first_audio_ms": None
+        }
+        self._started_at = 0.0
+
+    def run(self, tokens: Iterable[str]) -> str:
+        """
+        Consume a token stream, speaking each sentence as it completes.
+
+        Args:
+            tokens: Text deltas, e.g. OpenAICompatLLM.stream(..., cancel_event=dispatcher.cancel_event,
+                on_open=dispatcher.attach_stream)
+
+        Returns:
+            The full text received (truncated at the point of cancellation)
+        """
+        self._started_at = time.perf_counter()
+        self._speaker = threading.Thread(target=self._speak_worker, name="sentence-tts", daemon=True)
+        self._speaker.start()
+
+        received = []
+        try:
+            for token in tokens:
+                if self.cancel_event.is_set():
+                    break
+                received.append(token)
+                for sentence in self.chunker.feed(token):
+                    self._enqueue(sentence)
+            if not self.cancel_event.is_set():
+                rest = self.chunker.flush()
+                if rest:
+                    self._enqueue(rest)
+        finally:
+            # Stop the LLM stream if we exited early (close() runs its cleanup)
+            close = getattr(tokens, "close", None)
+            if close is not None:
+                close()
+            self._sentences.put(None)
+        return "".join(received)
+
+    def attach_stream(self, handle: Any):
+        """Keep the LLM stream's handle (anything with close()) so cancel() can close it"""
+        with self._stream_lock:
+            self._stream = handle
+            cancelled = self.cancel_event.is_set()
+        if cancelled:
+            self._close_stream()
+
+    def _close_stream(self):
+        with self._stream_lock:
+            handle, self._stream = self._stream, None
+        if handle is not None:
+            try:
+                handle.close()
+            except Exception:
+                pass
+
+    def wait(self, timeout: Optional[float] = None):
+        """Block until every queued sentence has been handed to TTS"""
+        if self._speaker is not None:
+            self._speaker.join(timeout)
+
+    def cancel(self):
+        """Barge-in: drop queued sentences, stop TTS, close the LLM stream"""
+        self.cancel_event.set()
+        self._close_stream()
+        while True:
+            try:
+                self._sentences.get_nowait()
+            except queue.Empty:
+                break
+        self._sentences.put(None)
+        if hasattr(self.tts, 'stop'):
+            try:
+                self.tts.stop()
+            except Exception:
+                pass
+
+    def _enqueue(self, sentence: str):
+        if self.stats["first_sentence_ms"] is None:
+            self.stats["first_sentence_ms"] = (time.perf_counter() - self._started_at) * 1000
+        self._sentences.put(sentence)
+
+    def _speak_worker(self):
+        while True:
+            sentence = self._sentences.get()
+            if sentence is None or self.cancel_event.is_set():
+                break
+            if self.on_sentence:
+                self.on_sentence(sentence)
+            if self.stats["first_audio_ms"] is None:
+                self.stats["first_audio_ms"] = (time.perf_counter() - self._started_at) * 1000
+            self.stats["sentences"] += 1
+            try:
+                self.tts.speak(sentence)
+            except Exception as e:
+                print(f"[TTS] Sentence playback failed: {e}")
@@ -1,6 +1,11 @@
 #!/usr/bin/env python3
 """
-Streaming ElevenLabs TTS - Generates and plays chunks in parallel for faster speech
+Streaming ElevenLabs TTS - Synthesizes ahead while playing for faster speech
+
+The first chunk is kept short for fast time-to-first-audio and later chunks
+grow (see chunk_scheduler.plan_chunks). ChunkScheduler synthesizes a bounded
+window ahead over one keep-alive HTTP session while a separate consumer plays
+chunks in order.
 """
 
 import os
@@ -8,18 +13,21 @@ import tempfile
 import subprocess
 import threading
 import time
-import hashlib
 import requests
 import re
 import queue
-from pathlib import Path
 from typing import Optional, Dict, Any, List
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+
+from .chunk_scheduler import ChunkScheduler, plan_chunks
+from .elevenlabs_tts_adapter import elevenlabs_cache_settings
 
 class StreamingElevenLabsTTS:
     """Streaming ElevenLabs TTS adapter - generates chunks in parallel"""
     
-    def __init__(self, config: Dict[str, Any]):
+    BACKEND = "elevenlabs"
+
+    def __init__(self, config: Dict[str, Any], store=None, engine=None):
         self.config = config or {}
         self.tts_config = self.config.get('tts', {})
         self._error_logged = False
@@ -31,16 +39,36 @@ class StreamingElevenLabsTTS:
         
         # Rachel voice ID
         self.voice_id = "21m00Tcm4TlvDq8ikWAM"
-        self.base_url = "https://api.elevenlabs.io/v1"
+        self.base_url = self.tts_config.get('elevenlabs_base_url', "https://api.elevenlabs.io/v1")
+        self.model_id = "eleven_monolingual_v1"
         
-        # Cache system
-        self.cache_enabled = self.tts_config.get('cache_enabled', True)
-        self.cache_dir = Path(tempfile.gettempdir()) / 'pennygpt_elevenlabs_cache'
-        if self.cache_enabled:
-            self.cache_dir.mkdir(exist_ok=True)
+        # Chunk sizing and synthesize-ahead window
+        self.first_chunk_chars = self.tts_config.get('first_chunk_chars', 80)
+        self.chunk_growth = self.tts_config.get('chunk_growth', 1.8)
+        self.max_chunk_chars = self.tts_config.get('max_chunk_chars', 300)
+        self.synthesis_window = self.tts_config.get('synthesis_window', 3)
+        self._scheduler: Optional[ChunkScheduler] = None
+        self.last_schedule_stats: Dict[str, Any] = {}
         
-        self.memory_cache: Dict[str, str] = {}
-        self.max_cache_phrase_length = 60
+        # Keep-alive session: one pooled connection per in-flight chunk, no
+        # TCP/TLS handshake per request
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=self.synthesis_window))
+        self.session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=self.synthesis_window))
+        self.session.headers.update({"xi-api-key": self.api_key, "Content-Type": "application/json"})
+
+        # Raw 16-bit PCM for the in-memory playback engine (no decode, no temp file)
+        self.pcm_output_format = "pcm_22050"
+        self.pcm_sample_rate = 22050
+        self.engine = engine
+        self._engine_checked = engine is not None
+
+        # Chunks are cached in the shared audio store, keyed by voice settings
+        self.cache_enabled = self.tts_config.get('cache_enabled', True)
+        self.store = store
+        if self.cache_enabled and self.store is None:
+            from .audio_store import get_audio_store_for_config
+            self.store = get_audio_store_for_config(self.tts_config)
         
         # Streaming controls
         self._stop_speaking = threading.Event()
@@ -83,60 +111,96 @@ class StreamingElevenLabsTTS:
         return text
     
     def _split_into_chunks(self, text: str) -> List[str]:
-        """Split text into optimal chunks for streaming"""
+        """Split text into chunks: a short first chunk, then growing ones"""
         text = self._clean_text_for_speech(text)
-        
-        # Very short chunks for streaming (150-200 chars)
-        max_length = 180
-        
-        if len(text) <= max_length:
-            return [text]
-        
-        # Split at sentence boundaries
-        sentences = text.replace('. ', '.\n').replace('? ', '?\n').replace('! ', '!\n').split('\n')
-        chunks = []
-        current_chunk = ""
-        
-        for sentence in sentences:
-            if len(current_chunk + sentence) < max_length:
-                current_chunk += sentence + " "
-            else:
-                if current_chunk.strip():
-                    chunks.append(current_chunk.strip())
-                current_chunk = sentence + " "
-        
-        if current_chunk.strip():
-            chunks.append(current_chunk.strip())
-        
-        return chunks
+        return plan_chunks(text, self.first_chunk_chars, self.chunk_growth, self.max_chunk_chars)
     
     def _synthesize_chunk(self, text: str, chunk_index: int) -> tuple:
         """Synthesize a single chunk - returns (index, audio_file_path)"""
         try:
             personality = self._detect_personality_mode(text)
             voice_settings = self.personality_settings.get(personality, self.personality_settings['default'])
+            cache_settings = elevenlabs_cache_settings(voice_settings, self.model_id)
+
+            if self.cache_enabled:
+                cached_file = self.store.get(text, self.BACKEND, self.voice_id, cache_settings)
+                if cached_file:
+                    return (chunk_index, cached_file)
             
             # API request
             url = f"{self.base_url}/text-to-speech/{self.voice_id}"
-            headers = {
-                "Accept": "audio/mpeg",
-                "Content-Type": "application/json",
-                "xi-api-key": self.api_key
-            }
-            
             data = {
                 "text": text,
-                "model_id": "eleven_monolingual_v1",
+                "model_id": self.model_id,
                 "voice_settings": voice_settings
             }
             
-            response = requests.post(url, json=data, headers=headers, timeout=10)
+            response = self.session.post(url, json=data, headers={"Accept": "audio/mpeg"}, timeout=10)
             
             if response.status_code == 200:
                 # Save to temporary file
                 with tempfile.NamedTemporaryFile(suffix=f"_chunk_{chunk_index}.mp3", delete=False) as f:
                     f.write(response.content)
-                    return (chunk_index, f.name)
+                if self.cache_enabled:
+                    stored = self.store.put_file(text, self.BACKEND, f.name, voice=self.voice_id,
+                                                 settings=cache_settings, move=True)
+                    if stored:
+                        return (chunk_index, stored)
+                return (chunk_index, f.name)
+            else:
+                print(f"[ElevenLabs] Chunk {chunk_index} API error: {response.status_code}")
+                return (chunk_index, None)
+                
+        except Exception as e:
+            print(f"[ElevenLabs] Chunk {chunk_index} synthesis failed: {e}")
+            return (chunk_index, None)
+    
+    def _get_engine(self):
+        """Shared PCM playback engine, or None to play chunk files with afplay"""
+        if not self._engine_checked:
+            self._engine_checked = True
+            try:
+                try:
+                    from src.audio.playback_engine import get_playback_engine
+                except ImportError:
+                    from audio.playback_engine import get_playback_engine
+                self.engine = get_playback_engine(self.tts_config)
+            except ImportError:
+                self.engine = None
+        return self.engine
+
+    def _synthesize_chunk_pcm(self, text: str, chunk_index: int) -> tuple:
+        """Synthesize a single chunk to PCM in memory - returns (index, float32 samples)"""
+        try:
+            from src.audio.playback_engine import pcm16_to_float
+        except ImportError:
+            from audio.playback_engine import pcm16_to_float
+
+        try:
+            personality = self._detect_personality_mode(text)
+            voice_settings = self.personality_settings.get(personality, self.personality_settings['default'])
+            cache_settings = elevenlabs_cache_settings(voice_settings, self.model_id, self.pcm_output_format)
+
+            if self.cache_enabled:
+                cached = self.store.get_bytes(text, self.BACKEND, self.voice_id, cache_settings)
+                if cached:
+                    return (chunk_index, pcm16_to_float(cached))
+
+            url = f"{self.base_url}/text-to-speech/{self.voice_id}"
+            data = {
+                "text": text,
+                "model_id": self.model_id,
+                "voice_settings": voice_settings
+            }
+
+            response = self.session.post(url, json=data, params={"output_format": self.pcm_output_format},
+                                         timeout=10)
+
+            if response.status_code == 200:
+                if self.cache_enabled:
+                    self.store.put_bytes(text, self.BACKEND, response.content, ext=".pcm",
+                                         voice=self.voice_id, settings=cache_settings)
+                return (chunk_index, pcm16_to_float(response.content))
             else:
                 print(f"[ElevenLabs] Chunk {chunk_index} API error: {response.status_code}")
                 return (chunk_index, None)
@@ -145,6 +209,30 @@ class StreamingElevenLabsTTS:
             print(f"[ElevenLabs] Chunk {chunk_index} synthesis failed: {e}")
             return (chunk_index, None)
     
+    def _run_scheduler(self, synthesize, consume, chunks: List[str]) -> Dict[str, Any]:
+        """Synthesize ahead and consume chunks in order; stop() cancels the run"""
+        scheduler = ChunkScheduler(synthesize, consume, window=self.synthesis_window)
+        self._scheduler = scheduler
+        try:
+            self.last_schedule_stats = scheduler.run(chunks)
+        finally:
+            if self._scheduler is scheduler:
+                self._scheduler = None
+        return self.last_schedule_stats
+
+    def _speak_in_memory(self, engine, chunks: List[str]) -> bool:
+        """Queue chunks, in order, on the playback engine as they are synthesized"""
+        utterance = engine.begin_utterance()
+
+        def consume(index, samples):
+            # False once stop() has cut this utterance off
+            return engine.enqueue_pcm(samples, self.pcm_sample_rate, utterance=utterance)
+
+        self._run_scheduler(lambda text, i: self._synthesize_chunk_pcm(text, i)[1], consume, chunks)
+        engine.finish(utterance)
+        engine.wait()
+        return True
+
     def _play_audio_file(self, file_path: str) -> bool:
         """Play audio file"""
         if not file_path:
@@ -174,72 +262,38 @@ class StreamingElevenLabsTTS:
         # Split into chunks
         chunks = self._split_into_chunks(text)
         
-        if len(chunks) == 1:
-            # Single chunk - just synthesize and play
-            print(f"[ElevenLabs] Single chunk")
-            chunk_index, audio_file = self._synthesize_chunk(chunks[0], 0)
-            return self._play_audio_file(audio_file)
-        
-        print(f"[ElevenLabs] Streaming {len(chunks)} chunks")
+        # Speaking until the last chunk has played (engine.wait() for in-memory playback)
         self._is_speaking = True
-        
-        # Start parallel synthesis of all chunks
-        with ThreadPoolExecutor(max_workers=3) as executor:
-            # Submit all synthesis tasks
-            future_to_chunk = {
-                executor.submit(self._synthesize_chunk, chunk, i): i 
-                for i, chunk in enumerate(chunks)
-            }
-            
-            # Collect results as they complete
-            audio_files = {}
-            
-            for future in as_completed(future_to_chunk):
-                if self._stop_speaking.is_set():
-                    break
-                    
-                chunk_index, audio_file = future.result()
-                if audio_file:
-                    audio_files[chunk_index] = audio_file
-                    
-                    # If this is the next chunk to play, start playing
-                    if chunk_index == 0 or (chunk_index > 0 and (chunk_index - 1) in audio_files):
-                        self._play_queued_chunks(audio_files, chunks)
-        
-        self._is_speaking = False
-        return True
-    
-    def _play_queued_chunks(self, audio_files: dict, chunks: list):
-        """Play chunks in order as they become available"""
-        for i in range(len(chunks)):
-            if self._stop_speaking.is_set():
-                break
-                
-            if i in audio_files:
-                print(f"[ElevenLabs] Playing chunk {i+1}/{len(chunks)}")
-                self._play_audio_file(audio_files[i])
-                # Small pause between chunks
-                time.sleep(0.1)
-            else:
-                # Wait for chunk to be ready
-                max_wait = 5  # seconds
-                waited = 0
-                while i not in audio_files and waited < max_wait and not self._stop_speaking.is_set():
-                    time.sleep(0.1)
-                    waited += 0.1
-                
-                if i in audio_files:
-                    print(f"[ElevenLabs] Playing chunk {i+1}/{len(chunks)}")
-                    self._play_audio_file(audio_files[i])
-                else:
-                    print(f"[ElevenLabs] Chunk {i+1} timeout")
-                    break
+        try:
+            engine = self._get_engine()
+            if engine is not None:
+                return self._speak_in_memory(engine, chunks)
+
+            print(f"[ElevenLabs] Streaming {len(chunks)} chunk(s)")
+
+            def consume(index, audio_file):
+                print(f"[ElevenLabs] Playing chunk {index+1}/{len(chunks)}")
+                self._play_audio_file(audio_file)
+
+            self._run_scheduler(lambda text, i: self._synthesize_chunk(text, i)[1], consume, chunks)
+            return True
+        finally:
+            self._is_speaking = False
     
     def stop(self):
         """Stop current speech"""
         self._stop_speaking.set()
         self._is_speaking = False
         
+        if self._scheduler is not None:
+            self._scheduler.cancel()
+
+        if self.engine is not None:
+            # Barge-in: the engine goes silent within one audio block
+            self.engine.stop()
+            self._stop_speaking.clear()
+            return
+
         # Kill any afplay processes
         try:
             subprocess.run(
@@ -261,5 +315,6 @@ class StreamingElevenLabsTTS:
     
     def clear_cache(self):
         """Clear TTS cache"""
-        self.memory_cache.clear()
+        if self.cache_enabled:
+            self.store.clear(backend=self.BACKEND)
         print("[ElevenLabs] Cache cleared")
@@ -7,9 +7,6 @@ import tempfile
 import subprocess
 import threading
 import time
-import hashlib
-import json
-from pathlib import Path
 from queue import Queue, Empty
 from typing import Optional, Dict, Any, Callable
 import asyncio
@@ -26,14 +23,17 @@ try:
 except ImportError:
     PYTTSX3_AVAILABLE = False
 
+from .audio_store import get_audio_store_for_config
+
 
 class StreamingTTS:
     """Low-latency TTS with streaming, caching, and multiple backends"""
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], store=None):
         self.config = config
-        self.cache_dir = Path(tempfile.gettempdir()) / "penny_tts_cache"
-        self.cache_dir.mkdir(exist_ok=True)
+
+        # Generated audio files live in the shared audio store
+        self.store = store or get_audio_store_for_config(self.config.get('tts', self.config))
         
         # Audio playback queue for streaming
         self.audio_queue = Queue()
@@ -44,9 +44,6 @@ class StreamingTTS:
         # TTS backends in order of preference (fastest first)
         self.backends = self._initialize_backends()
         
-        # Common phrases cache
-        self.phrase_cache = self._load_phrase_cache()
-        
         # Background preprocessing
         self.preprocess_queue = Queue()
         self.preprocess_thread = None
@@ -84,29 +81,27 @@ class StreamingTTS:
             
         return backends
     
-    def _load_phrase_cache(self) -> Dict[str, str]:
-        """Load cached audio files for common phrases"""
-        cache_file = self.cache_dir / "phrase_cache.json"
-        if cache_file.exists():
-            try:
-                with open(cache_file, 'r') as f:
-                    return json.load(f)
-            except Exception:
-                pass
-        return {}
+    def _cache_settings(self, backend_name: str) -> Optional[Dict[str, Any]]:
+        """Backend parameters that change the generated audio"""
+        if backend_name == 'say':
+            return {'rate': int(self.config.get('speaking_rate', 1.0) * 200)}
+        return None
     
-    def _save_phrase_cache(self):
-        """Save phrase cache to disk"""
-        cache_file = self.cache_dir / "phrase_cache.json"
-        try:
-            with open(cache_file, 'w') as f:
-                json.dump(self.phrase_cache, f)
-        except Exception as e:
-            print(f"[TTS] Cache save failed: {e}")
+    def _get_cached_audio(self, text: str) -> Optional[str]:
+        """Cached audio file for text from any file-producing backend"""
+        for backend_name, _ in self.backends:
+            if backend_name == 'system':
+                continue  # pyttsx3 speaks directly, nothing to cache
+            cached_file = self.store.get(text, backend_name, settings=self._cache_settings(backend_name))
+            if cached_file:
+                return cached_file
+        return None
     
-    def _get_cache_key(self, text: str, backend: str) -> str:
-        """Generate cache key for text and backend"""
-        return hashlib.md5(f"{backend}:{text}".encode()).hexdigest()
+    def _store_audio(self, text: str, backend_name: str, audio_file: str) -> str:
+        """Move generated audio into the store; returns the path to play"""
+        stored = self.store.put_file(text, backend_name, audio_file,
+                                     settings=self._cache_settings(backend_name), move=True)
+        return stored or audio_file
     
     def _start_background_processor(self):
         """Start background thread for preprocessing common phrases"""
@@ -136,8 +131,11 @@ class StreamingTTS:
         for phrase in common_phrases:
             try:
                 # Only preprocess if not already cached
-                cache_key = self._get_cache_key(phrase, 'google')
-                if cache_key not in self.phrase_cache:
+                cached = any(
+                    self.store.contains(phrase, name, settings=self._cache_settings(name))
+                    for name, _ in self.backends if name != 'system'
+                )
+                if not cached:
                     self._preprocess_phrase(phrase)
                     time.sleep(0.1)  # Don't overwhelm the system
             except Exception as e:
@@ -146,20 +144,17 @@ class StreamingTTS:
     def _preprocess_phrase(self, text: str):
         """Preprocess a phrase and cache the audio"""
         for backend_name, backend in self.backends:
-            cache_key = self._get_cache_key(text, backend_name)
-            if cache_key in self.phrase_cache:
+            if backend_name == 'system':
                 continue
                 
             try:
                 audio_file = self._generate_audio(text, backend_name, backend)
                 if audio_file and os.path.exists(audio_file):
-                    self.phrase_cache[cache_key] = audio_file
+                    self._store_audio(text, backend_name, audio_file)
                     break  # Use first successful backend
             except Exception as e:
                 print(f"[TTS] Preprocessing failed for backend {backend_name}: {e}")
                 continue
-        
-        self._save_phrase_cache()
     
     def _generate_audio(self, text: str, backend_name: str, backend: Any) -> Optional[str]:
         """Generate audio file for given text using specified backend"""
@@ -171,10 +166,11 @@ class StreamingTTS:
         elif backend_name == 'google':
             # Use Google TTS
             try:
-                audio_file = self.cache_dir / f"tts_{int(time.time() * 1000)}.mp3"
+                with tempfile.NamedTemporaryFile(prefix="tts_", suffix=".mp3", delete=False) as f:
+                    audio_file = f.name
                 tts = gTTS(text=text, lang="en", slow=False)
-                tts.save(str(audio_file))
-                return str(audio_file)
+                tts.save(audio_file)
+                return audio_file
             except Exception as e:
                 print(f"[TTS] Google TTS failed: {e}")
                 return None
@@ -182,15 +178,16 @@ class StreamingTTS:
         elif backend_name == 'say':
             # Use macOS say command
             try:
-                audio_file = self.cache_dir / f"say_{int(time.time() * 1000)}.aiff"
+                with tempfile.NamedTemporaryFile(prefix="say_", suffix=".aiff", delete=False) as f:
+                    audio_file = f.name
                 cmd = [
                     'say', 
-                    '-o', str(audio_file),
+                    '-o', audio_file,
                     '-r', str(int(self.config.get('speaking_rate', 1.0) * 200)),
                     text
                 ]
                 subprocess.run(cmd, check=True, capture_output=True)
-                return str(audio_file)
+                return audio_file
             except Exception as e:
                 print(f"[TTS] Say command failed: {e}")
                 return None
@@ -257,20 +254,13 @@ class StreamingTTS:
         text = text.strip()
         
         # Check cache first for instant playback
-        for backend_name, _ in self.backends:
-            cache_key = self._get_cache_key(text, backend_name)
-            if cache_key in self.phrase_cache:
-                cached_file = self.phrase_cache[cache_key]
-                
-                if cached_file == 'SYSTEM_IMMEDIATE':
-                    # Use system TTS for immediate playback
-                    return self._speak_system_immediate(text)
-                elif os.path.exists(cached_file):
-                    # Queue cached audio file
-                    self._start_playback_thread()
-                    self.audio_queue.put(cached_file)
-                    self.is_playing = True
-                    return True
+        cached_file = self._get_cached_audio(text)
+        if cached_file:
+            # Queue cached audio file
+            self._start_playback_thread()
+            self.audio_queue.put(cached_file)
+            self.is_playing = True
+            return True
         
         # No cache hit - generate audio with fastest available backend
         for backend_name, backend in self.backends:
@@ -281,13 +271,12 @@ class StreamingTTS:
                     # Generate and play audio file
                     audio_file = self._generate_audio(text, backend_name, backend)
                     if audio_file:
-                        # Cache for future use
-                        cache_key = self._get_cache_key(text, backend_name)
-                        self.phrase_cache[cache_key] = audio_file
-                        
                         if audio_file == 'SYSTEM_IMMEDIATE':
                             return True
                         else:
+                            # Cache for future use
+                            audio_file = self._store_audio(text, backend_name, audio_file)
+
                             # Queue for playback
                             self._start_playback_thread()
                             self.audio_queue.put(audio_file)
@@ -11,15 +11,39 @@ if sys.version_info >= (3, 13):
         stacklevel=2
     )
 
+# WebRTC VAD only accepts 16-bit mono PCM at these rates, in 10/20/30 ms frames
+SUPPORTED_SAMPLE_RATES = (8000, 16000, 32000, 48000)
+SUPPORTED_FRAME_MS = (10, 20, 30)
+
+
 class WebRTCVAD:
     def __init__(self, cfg: dict = None):
         self.cfg = cfg or {}
         level = {"low": 0, "medium": 2, "high": 3}.get(self.cfg.get("sensitivity", "medium"), 2)
         self.vad = webrtcvad.Vad(level)
 
-    def is_speech(self, audio_bytes: bytes) -> bool:
-        if not audio_bytes or len(audio_bytes) == 0:
+    def is_speech_frame(self, frame, sample_rate: int = 16000) -> bool:
+        """
+        Classify one 10, 20 or 30 ms frame.
+
+        Args:
+            frame: 16-bit little-endian PCM bytes, or a float32 array in [-1, 1]
+            sample_rate: 8000, 16000, 32000 or 48000
+
+        Returns:
+            True if WebRTC VAD classifies the frame as speech
+        """
+        if not isinstance(frame, (bytes, bytearray)):
+            import numpy as np
+            frame = (np.clip(frame, -1.0, 1.0) * 32767).astype('<i2').tobytes()
+        return self.vad.is_speech(bytes(frame), sample_rate)
+
+    def is_speech(self, audio_bytes: bytes, sample_rate: int = 16000) -> bool:
+        """True if any 10 ms frame of 16-bit PCM audio is classified as speech"""
+        if not isinstance(audio_bytes, (bytes, bytearray)) or sample_rate not in SUPPORTED_SAMPLE_RATES:
             return False
-        # WebRTC VAD requires specific sample rates and frame sizes
-        # For now, use simple heuristic - non-empty audio likely contains speech
-        return len(audio_bytes) > 160  # Minimum frame size for 16kHz, 10ms
+        frame_bytes = sample_rate // 100 * 2
+        return any(
+            self.vad.is_speech(bytes(audio_bytes[i:i + frame_bytes]), sample_rate)
+            for i in range(0, len(audio_bytes) - frame_bytes + 1, frame_bytes)
+        )
@@ -0,0 +1,601 @@
+"""
+Audio Capture
+One continuous input stream, a lock-free ring buffer, and VAD endpointing
+
+The old capture paths restarted a recording for every 100 ms chunk (dropping
+whatever arrived between sd.rec() calls) and endpointed on a raw peak or RMS
+threshold. Here a single source -- the microphone callback stream, or a file
+replayed at (or faster than) real time -- writes continuously into a
+single-producer / single-consumer ring buffer. The consumer slices it into
+fixed 10/20/30 ms frames, classifies each with WebRTC VAD, and an endpointer
+turns the frame decisions into utterances:
+
+    idle      keep the last `pre_roll_ms` of audio so the first syllable,
+              which VAD only recognises after it has started, is not clipped
+    trigger   `start_ms` of consecutive voiced frames starts an utterance
+    hangover  the utterance ends once `hangover_ms` of consecutive unvoiced
+              frames follow the last voiced one (or at `max_utterance_s`)
+
+Endpoint latency is reported in audio time (hangover plus frame granularity)
+and as processing lag (wall-clock time from the moment the deciding frame was
+captured to the decision), so it can be benchmarked offline:
+
+    python -m src.audio.capture recording.wav --hangover-ms 500
+
+Usage:
+    with AudioCapture(MicrophoneSource()) as capture:
+        utterance = capture.listen()
+        text = transcribe_audio(utterance.audio)
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+FRAME_MS = 30
+
+
+class SampleRingBuffer:
+    """
+    Lock-free single-producer / single-consumer float32 ring buffer.
+
+    The producer (audio callback) only ever advances `_written` and the
+    consumer only ever advances `_consumed`; both are monotonically increasing
+    sample counts, so each side reads the other's counter without a lock.
+    Samples that do not fit are dropped and counted rather than blocking the
+    audio callback.
+    """
+
+    def __init__(self, capacity: int):
+        self._data = np.zeros(capacity, dtype=np.float32)
+        self.capacity = capacity
+        self._written = 0
+        self._consumed = 0
+        self.dropped = 0
+
+    @property
+    def available(self) -> int:
+        return self._written - self._consumed
+
+    @property
+    def position(self) -> int:
+        """Stream position (in samples) of the next sample to be read"""
+        return self._consumed
+
+    @property
+    def written(self) -> int:
+        """Samples written since the stream started (position of the newest sample)"""
+        return self._written
+
+    def write(self, samples: np.ndarray) -> int:
+        """Producer side: append samples; returns how many fit"""
+        count = min(len(samples), self.capacity - (self._written - self._consumed))
+        if count < len(samples):
+            self.dropped += len(samples) - count
+        start = self._written % self.capacity
+        first = min(count, self.capacity - start)
+        self._data[start:start + first] = samples[:first]
+        self._data[:count - first] = samples[first:count]
+        self._written += count  # publish only after the data is in place
+        return count
+
+    def read(self, count: int) -> Optional[np.ndarray]:
+        """Consumer side: take exactly count samples, or None if not yet available"""
+        if self._written - self._consumed < count:
+            return None
+        start = self._consumed % self.capacity
+        first = min(count, self.capacity - start)
+        out = np.empty(count, dtype=np.float32)
+        out[:first] = self._data[start:start + first]
+        out[first:] = self._data[:count - first]
+        self._consumed += count
+        return out
+
+    def discard(self) -> int:
+        """Consumer side: skip everything buffered so far; returns samples skipped"""
+        skipped = self._written - self._consumed
+        self._consumed += skipped
+        return skipped
+
+
+class MicrophoneSource:
+    """Continuous sounddevice input stream writing into the ring from its callback"""
+
+    realtime = True
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, block_size: int = 0,
+                 device: Any = None, latency: Any = 'low'):
+        """
+        Args:
+            sample_rate: Capture rate (WebRTC VAD needs 8/16/32/48 kHz)
+            block_size: Frames per callback (0 lets PortAudio choose)
+            device: sounddevice input device
+            latency: sounddevice latency setting
+        """
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.device = device
+        self.latency = latency
+        self.stream = None
+        self.status_errors = 0
+
+    @property
+    def finished(self) -> bool:
+        return False
+
+    def start(self, ring: SampleRingBuffer):
+        import sounddevice as sd
+
+        def callback(indata, frames, time_info, status):
+            if status:
+                self.status_errors += 1
+            ring.write(indata[:, 0])
+
+        self.stream = sd.InputStream(
+            samplerate=self.sample_rate, channels=1, dtype='float32',
+            blocksize=self.block_size, device=self.device,
+            latency=self.latency, callback=callback
+        )
+        self.stream.start()
+
+    def stop(self):
+        if self.stream is not None:
+            try:
+                self.stream.stop()
+                self.stream.close()
+            except Exception as e:
+                logger.warning(f"Error closing input stream: {e}")
+            self.stream = None
+
+
+class FileReplaySource:
+    """Replays a recording into the ring, paced like a microphone or as fast as possible"""
+
+    def __init__(self, source: Union[str, bytes, np.ndarray], sample_rate: int = SAMPLE_RATE,
+                 block_size: int = 320, realtime: bool = True, source_rate: Optional[int] = None):
+        """
+        Args:
+            source: Path or encoded bytes of an audio file, or float32 samples
+            sample_rate: Rate to deliver at (the file is resampled to it)
+            block_size: Samples per simulated callback
+            realtime: Pace blocks at the sample rate; otherwise deliver as
+                fast as the consumer drains the ring (never dropping)
+            source_rate: Sample rate of `source` when it is a sample array
+        """
+        try:
+            from src.audio.playback_engine import decode_audio, resample
+        except ImportError:
+            from audio.playback_engine import decode_audio, resample
+
+        if isinstance(source, np.ndarray):
+            samples, rate = source.astype(np.float32), source_rate or sample_rate
+        else:
+            if isinstance(source, str):
+                with open(source, 'rb') as f:
+                    source = f.read()
+            samples, rate = decode_audio(source)
+        self.samples = resample(samples, rate, sample_rate)
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.realtime = realtime
+        self._finished = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def finished(self) -> bool:
+        return self._finished.is_set()
+
+    def start(self, ring: SampleRingBuffer):
+        self._thread = threading.Thread(target=self._run, args=(ring,),
+                                        name="capture-replay", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+    def _run(self, ring: SampleRingBuffer):
+        started = time.perf_counter()
+        for offset in range(0, len(self.samples), self.block_size):
+            if self._stop.is_set():
+                break
+            block = self.samples[offset:offset + self.block_size]
+            if self.realtime:
+                due = started + (offset + len(block)) / self.sample_rate
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            else:
+                while ring.capacity - ring.available < len(block) and not self._stop.is_set():
+                    time.sleep(0.001)
+            ring.write(block)
+        self._finished.set()
+
+
+@dataclass
+class Utterance:
+    """One endpointed stretch of speech; positions are sample offsets in the stream"""
+    audio: np.ndarray
+    sample_rate: int
+    start_sample: int      # first sample of `audio` (includes pre-roll)
+    speech_start: int      # first voiced frame of the trigger run
+    speech_end: int        # end of the last voiced frame
+    end_sample: int        # end of the frame on which the endpoint was decided
+    reason: str            # 'silence', 'max_duration' or 'eof'
+    processing_lag_ms: Optional[float] = None
+    transcript: Any = None  # set by a streaming speech listener (e.g. a Future of the text)
+
+    @property
+    def duration(self) -> float:
+        return len(self.audio) / self.sample_rate
+
+    @property
+    def speech_duration(self) -> float:
+        return (self.speech_end - self.speech_start) / self.sample_rate
+
+    @property
+    def endpoint_latency_ms(self) -> float:
+        """Audio time between the end of speech and the endpoint decision"""
+        return (self.end_sample - self.speech_end) * 1000 / self.sample_rate
+
+
+class VADEndpointer:
+    """Frame-level VAD state machine with pre-roll, start trigger and hangover"""
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, frame_ms: int = FRAME_MS,
+                 pre_roll_ms: int = 300, start_ms: int = 150, hangover_ms: int = 600,
+                 min_speech_ms: int = 250, max_utterance_s: float = 30.0,
+                 energy_floor: float = 0.0,
+                 classifier: Optional[Callable[[np.ndarray], bool]] = None,
+                 vad_config: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            sample_rate: Stream sample rate
+            frame_ms: Classification frame length (10, 20 or 30)
+            pre_roll_ms: Audio kept from before the trigger run
+            start_ms: Consecutive voiced audio needed to start an utterance
+            hangover_ms: Consecutive unvoiced audio that ends an utterance
+            min_speech_ms: Shorter utterances (clicks, coughs) are discarded
+            max_utterance_s: Force an endpoint after this long
+            energy_floor: Frames whose peak is below this are never voiced
+            classifier: classifier(frame) -> voiced; defaults to WebRTC VAD
+            vad_config: WebRTCVAD config ({'sensitivity': 'low'|'medium'|'high'})
+        """
+        if classifier is None:
+            try:
+                from src.adapters.vad.webrtc_vad_adapter import SUPPORTED_FRAME_MS, WebRTCVAD
+            except ImportError:
+                from adapters.vad.webrtc_vad_adapter import SUPPORTED_FRAME_MS, WebRTCVAD
+            if frame_ms not in SUPPORTED_FRAME_MS:
+                raise ValueError(f"WebRTC VAD frames must be 10, 20 or 30 ms, not {frame_ms}")
+            vad = WebRTCVAD(vad_config)
+            classifier = lambda frame: vad.is_speech_frame(frame, sample_rate)
+
+        self.classifier = classifier
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+        self.frame_size = sample_rate * frame_ms // 1000
+        self.energy_floor = energy_floor
+        self.start_frames = max(1, -(-start_ms // frame_ms))
+        self.hangover_frames = max(1, -(-hangover_ms // frame_ms))
+        self.pre_roll_frames = -(-pre_roll_ms // frame_ms) + self.start_frames
+        self.min_speech_samples = sample_rate * min_speech_ms // 1000
+        self.max_samples = int(sample_rate * max_utterance_s)
+        self.reset()
+
+    def reset(self):
+        """Drop any partial utterance and go back to idle"""
+        self.triggered = False
+        self._pre_roll: Deque[np.ndarray] = deque(maxlen=self.pre_roll_frames)
+        self._frames: List[np.ndarray] = []
+        self._voiced_run = 0
+        self._unvoiced_run = 0
+        self._start_sample = 0
+        self._speech_start = 0
+        self._speech_end = 0
+        self.last_voiced = False
+        self.discarded = 0
+
+    def pending_audio(self) -> np.ndarray:
+        """Audio of the utterance in progress so far (pre-roll included)"""
+        if not self._frames:
+            return np.zeros(0, dtype=np.float32)
+        return np.concatenate(self._frames)
+
+    def is_voiced(self, frame: np.ndarray) -> bool:
+        if self.energy_floor and float(np.max(np.abs(frame))) < self.energy_floor:
+            return False
+        return bool(self.classifier(frame))
+
+    def process(self, frame: np.ndarray, position: int) -> Optional[Utterance]:
+        """
+        Feed one frame.
+
+        Args:
+            frame: frame_size float32 samples
+            position: Stream offset of the frame's first sample
+
+        Returns:
+            The completed utterance if this frame endpointed one
+        """
+        voiced = self.last_voiced = self.is_voiced(frame)
+        frame_end = position + len(frame)
+
+        if not self.triggered:
+            self._pre_roll.append(frame)
+            self._voiced_run = self._voiced_run + 1 if voiced else 0
+            if self._voiced_run >= self.start_frames:
+                self.triggered = True
+                self._frames = list(self._pre_roll)
+                self._pre_roll.clear()
+                self._start_sample = frame_end - len(self._frames) * self.frame_size
+                self._speech_start = frame_end - self._voiced_run * self.frame_size
+                self._speech_end = frame_end
+                self._unvoiced_run = 0
+            return None
+
+        self._frames.append(frame)
+        if voiced:
+            self._unvoiced_run = 0
+            self._speech_end = frame_end
+        else:
+            self._unvoiced_run += 1
+
+        if self._unvoiced_run >= self.hangover_frames:
+            return self._finish(frame_end, 'silence')
+        if frame_end - self._start_sample >= self.max_samples:
+            return self._finish(frame_end, 'max_duration')
+        return None
+
+    def flush(self, position: int) -> Optional[Utterance]:
+        """End of stream: close out a triggered utterance"""
+        if not self.triggered:
+            return None
+        return self._finish(position, 'eof')
+
+    def _finish(self, end_sample: int, reason: str) -> Optional[Utterance]:
+        utterance = Utterance(
+            audio=np.concatenate(self._frames), sample_rate=self.sample_rate,
+            start_sample=self._start_sample, speech_start=self._speech_start,
+            speech_end=self._speech_end, end_sample=end_sample, reason=reason
+        )
+        discarded = self.discarded
+        self.reset()
+        if utterance.speech_end - utterance.speech_start < self.min_speech_samples:
+            self.discarded = discarded + 1
+            return None
+        self.discarded = discarded
+        return utterance
+
+
+class AudioCapture:
+    """Source -> ring buffer -> VAD endpointer, consumed on the caller's thread"""
+
+    def __init__(self, source: Any, endpointer: Optional[VADEndpointer] = None,
+                 buffer_seconds: float = 10.0, speech_listener: Any = None):
+        """
+        Args:
+            source: MicrophoneSource, FileReplaySource, or anything with
+                start(ring), stop(), `finished`, `realtime` and `sample_rate`
+            endpointer: Defaults to VADEndpointer at the source's rate
+            buffer_seconds: Ring capacity; the consumer may fall this far behind
+            speech_listener: Optional object told about speech as it is
+                captured, on the consumer thread: speech_started(audio) with
+                the pre-roll and trigger frames, speech_audio(frame) for each
+                later frame, and speech_ended(utterance) -- None when the
+                utterance was discarded as too short or dropped
+        """
+        self.source = source
+        self.speech_listener = speech_listener
+        self.sample_rate = source.sample_rate
+        self.endpointer = endpointer or VADEndpointer(sample_rate=self.sample_rate)
+        self.ring = SampleRingBuffer(int(self.sample_rate * buffer_seconds))
+        self.running = False
+        self.stats: Dict[str, Any] = {
+            'frames': 0, 'voiced_frames': 0, 'utterances': 0, 'discarded': 0,
+            'last_endpoint_latency_ms': None, 'last_processing_lag_ms': None,
+            'endpoint_latency_ms': [], 'processing_lag_ms': []
+        }
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self):
+        if self.running:
+            return
+        self.source.start(self.ring)
+        self.running = True
+
+    def stop(self):
+        if self.running:
+            self.source.stop()
+            self.running = False
+
+    def discard_pending(self):
+        """Forget buffered audio and any partial utterance (e.g. after the assistant spoke)"""
+        self.ring.discard()
+        if self.endpointer.triggered:
+            self._notify('speech_ended', None)
+        self.endpointer.reset()
+
+    def _next_frame(self):
+        position = self.ring.position
+        return self.ring.read(self.endpointer.frame_size), position
+
+    def _process(self, frame: np.ndarray, position: int) -> Optional[Utterance]:
+        self.stats['frames'] += 1
+        discarded = self.endpointer.discarded
+        was_triggered = self.endpointer.triggered
+        utterance = self.endpointer.process(frame, position)
+        self.stats['voiced_frames'] += self.endpointer.last_voiced
+        self.stats['discarded'] += self.endpointer.discarded - discarded
+        if utterance is not None:
+            self._record(utterance)
+
+        if self.speech_listener is not None:
+            if not was_triggered and self.endpointer.triggered:
+                self._notify('speech_started', self.endpointer.pending_audio())
+            elif was_triggered:
+                self._notify('speech_audio', frame)
+                if not self.endpointer.triggered:
+                    self._notify('speech_ended', utterance)
+        return utterance
+
+    def _flush(self) -> Optional[Utterance]:
+        """End of a finite source: close out the utterance in progress"""
+        was_triggered = self.endpointer.triggered
+        discarded = self.endpointer.discarded
+        utterance = self.endpointer.flush(self.ring.position)
+        self.stats['discarded'] += self.endpointer.discarded - discarded
+        if utterance is not None:
+            self._record(utterance)
+        if was_triggered:
+            self._notify('speech_ended', utterance)
+        return utterance
+
+    def _notify(self, event: str, payload: Any):
+        if self.speech_listener is None:
+            return
+        try:
+            getattr(self.speech_listener, event)(payload)
+        except Exception as e:
+            logger.warning(f"Speech listener {event} failed: {e}")
+
+    def _record(self, utterance: Utterance):
+        if self.source.realtime and utterance.reason != 'eof':
+            # With a live-paced source the newest sample in the ring was just
+            # captured, so audio already buffered past the deciding frame is
+            # how long the decision trailed the capture
+            behind = self.ring.written - utterance.end_sample
+            utterance.processing_lag_ms = behind * 1000 / self.sample_rate
+            self.stats['last_processing_lag_ms'] = utterance.processing_lag_ms
+            self.stats['processing_lag_ms'].append(utterance.processing_lag_ms)
+        self.stats['utterances'] += 1
+        self.stats['last_endpoint_latency_ms'] = utterance.endpoint_latency_ms
+        self.stats['endpoint_latency_ms'].append(utterance.endpoint_latency_ms)
+
+    def poll(self) -> List[Utterance]:
+        """Process every complete frame buffered so far without blocking"""
+        utterances = []
+        while True:
+            frame, position = self._next_frame()
+            if frame is None:
+                break
+            utterance = self._process(frame, position)
+            if utterance is not None:
+                utterances.append(utterance)
+        if self.source.finished and self.ring.available < self.endpointer.frame_size:
+            utterance = self._flush()
+            if utterance is not None:
+                utterances.append(utterance)
+        return utterances
+
+    def listen(self, timeout: Optional[float] = None) -> Optional[Utterance]:
+        """
+        Block until the next utterance is endpointed.
+
+        Args:
+            timeout: Give up if no speech has started after this many seconds.
+                An utterance already in progress at the deadline is still
+                endpointed (by silence, or by the endpointer's max_utterance_s)
+
+        Returns:
+            The utterance, or None on timeout or when a file source runs out
+        """
+        self.start()
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        frame_seconds = self.endpointer.frame_ms / 1000
+        while True:
+            frame, position = self._next_frame()
+            if frame is not None:
+                utterance = self._process(frame, position)
+                if utterance is not None:
+                    return utterance
+                continue
+            if self.source.finished and self.ring.available < self.endpointer.frame_size:
+                return self._flush()
+            if deadline is not None and not self.endpointer.triggered and time.perf_counter() >= deadline:
+                return None
+            time.sleep(frame_seconds / 3)
+
+    def get_stats(self) -> Dict[str, Any]:
+        latencies = self.stats['endpoint_latency_ms']
+        lags = self.stats['processing_lag_ms']
+        return {
+            **{k: v for k, v in self.stats.items() if not isinstance(v, list)},
+            'dropped_samples': self.ring.dropped,
+            'mean_endpoint_latency_ms': sum(latencies) / len(latencies) if latencies else None,
+            'mean_processing_lag_ms': sum(lags) / len(lags) if lags else None,
+            'max_processing_lag_ms': max(lags) if lags else None,
+        }
+
+
+def benchmark_endpointing(source: Union[str, bytes, np.ndarray], realtime: bool = False,
+                          source_rate: Optional[int] = None,
+                          **endpointer_kwargs) -> Dict[str, Any]:
+    """
+    Replay a recording through the capture pipeline and report endpointing.
+
+    Args:
+        source: Audio file path or bytes, or float32 samples
+        realtime: Replay at microphone pace (measures processing lag under
+            real timing) instead of as fast as possible
+        source_rate: Sample rate of `source` when it is a sample array
+        **endpointer_kwargs: VADEndpointer settings
+
+    Returns:
+        Capture stats plus one (speech_start_s, speech_end_s, endpoint_s,
+        reason) entry per utterance under 'segments'
+    """
+    sample_rate = endpointer_kwargs.get('sample_rate', SAMPLE_RATE)
+    replay = FileReplaySource(source, sample_rate=sample_rate, realtime=realtime,
+                              source_rate=source_rate)
+    capture = AudioCapture(replay, VADEndpointer(**endpointer_kwargs))
+    found = []
+    with capture:
+        while True:
+            utterance = capture.listen()
+            if utterance is None:
+                break
+            found.append((utterance.speech_start / sample_rate, utterance.speech_end / sample_rate,
+                          utterance.end_sample / sample_rate, utterance.reason))
+    stats = capture.get_stats()
+    stats['segments'] = found
+    return stats
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark VAD endpointing on a recording")
+    parser.add_argument("path")
+    parser.add_argument("--hangover-ms", type=int, default=600)
+    parser.add_argument("--pre-roll-ms", type=int, default=300)
+    parser.add_argument("--start-ms", type=int, default=150)
+    parser.add_argument("--sensitivity", default="medium", choices=["low", "medium", "high"])
+    parser.add_argument("--realtime", action="store_true")
+    args = parser.parse_args()
+
+    result = benchmark_endpointing(
+        args.path, realtime=args.realtime, hangover_ms=args.hangover_ms,
+        pre_roll_ms=args.pre_roll_ms, start_ms=args.start_ms,
+        vad_config={"sensitivity": args.sensitivity}
+    )
+    for start, end, endpoint, reason in result.pop('segments'):
+        print(f"speech {start:7.2f}s - {end:7.2f}s  endpoint {endpoint:7.2f}s  "
+              f"(+{(endpoint - end) * 1000:.0f} ms, {reason})")
+    print(result)
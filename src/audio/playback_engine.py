@@ -0,0 +1,487 @@
+"""
+PCM Playback Engine
+One long-lived output stream fed from an in-memory ring buffer
+
+TTS adapters used to write every synthesized chunk to a temp file and spawn
+an external player for it, with fixed sleeps between chunks. Here chunks are
+decoded to float32 PCM in memory and appended to a ring buffer; a single sink
+(the sound card, or a null sink for headless use) pulls fixed-size blocks from
+it. Consecutive chunks therefore play back to back with no gap, and stop()
+empties the buffer so playback goes silent within one block.
+
+Usage:
+    engine = get_playback_engine()
+    utterance = engine.begin_utterance()
+    for pcm in chunks:
+        engine.enqueue_pcm(pcm, sample_rate=22050, utterance=utterance)
+    engine.finish(utterance)
+    engine.wait()
+
+    engine.stop()   # barge-in
+"""
+
+import io
+import logging
+import threading
+import time
+import wave
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SAMPLE_RATE = 22050
+DEFAULT_BLOCK_SIZE = 512
+
+
+def pcm16_to_float(data: bytes) -> np.ndarray:
+    """Raw little-endian 16-bit mono PCM to float32 in [-1, 1]"""
+    usable = len(data) - (len(data) % 2)
+    return np.frombuffer(data[:usable], dtype='<i2').astype(np.float32) / 32768.0
+
+
+def resample(samples: np.ndarray, source_rate: int, target_rate: int) -> np.ndarray:
+    """Linear-interpolation resample (speech only needs to sound right, not be bit-exact)"""
+    if source_rate == target_rate or len(samples) == 0:
+        return samples
+    target_len = max(1, int(round(len(samples) * target_rate / source_rate)))
+    positions = np.linspace(0, len(samples) - 1, target_len)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+
+def decode_audio(data: bytes) -> Tuple[np.ndarray, int]:
+    """
+    Decode an encoded audio file held in memory to mono float32 PCM.
+
+    Uses soundfile (WAV, AIFF, FLAC, OGG and -- with libsndfile >= 1.1 -- MP3)
+    when installed, otherwise the standard library for WAV.
+
+    Args:
+        data: Encoded audio bytes
+
+    Returns:
+        (samples, sample_rate)
+
+    Raises:
+        ValueError: If the data cannot be decoded
+    """
+    try:
+        import soundfile as sf
+        samples, rate = sf.read(io.BytesIO(data), dtype='float32', always_2d=True)
+        return samples.mean(axis=1).astype(np.float32), int(rate)
+    except ImportError:
+        pass
+    except Exception as e:
+        if not data.startswith(b'RIFF'):
+            raise ValueError(f"Cannot decode audio: {e}")
+
+    try:
+        with wave.open(io.BytesIO(data), 'rb') as wav:
+            rate = wav.getframerate()
+            channels = wav.getnchannels()
+            width = wav.getsampwidth()
+            frames = wav.readframes(wav.getnframes())
+    except (wave.Error, EOFError) as e:
+        raise ValueError(f"Cannot decode audio: {e}")
+    if width != 2:
+        raise ValueError(f"Unsupported WAV sample width: {width * 8} bits")
+    samples = pcm16_to_float(frames)
+    if channels > 1:
+        samples = samples[:len(samples) - len(samples) % channels].reshape(-1, channels).mean(axis=1)
+    return samples.astype(np.float32), rate
+
+
+class PCMRingBuffer:
+    """Fixed-capacity float32 ring buffer (not thread-safe; the engine locks around it)"""
+
+    def __init__(self, capacity: int):
+        self._data = np.zeros(capacity, dtype=np.float32)
+        self.capacity = capacity
+        self._read = 0
+        self.available = 0
+
+    @property
+    def free(self) -> int:
+        return self.capacity - self.available
+
+    def write(self, samples: np.ndarray) -> int:
+        """Append as many samples as fit; returns how many were written"""
+        count = min(len(samples), self.free)
+        start = (self._read + self.available) % self.capacity
+        first = min(count, self.capacity - start)
+        self._data[start:start + first] = samples[:first]
+        self._data[:count - first] = samples[first:count]
+        self.available += count
+        return count
+
+    def read_into(self, out: np.ndarray) -> int:
+        """Fill out from the buffer; returns how many samples were copied"""
+        count = min(len(out), self.available)
+        first = min(count, self.capacity - self._read)
+        out[:first] = self._data[self._read:self._read + first]
+        out[first:count] = self._data[:count - first]
+        self._read = (self._read + count) % self.capacity
+        self.available -= count
+        return count
+
+    def clear(self):
+        self._read = 0
+        self.available = 0
+
+
+class PlaybackEngine:
+    """Gapless chunk playback through a single sink with block-level barge-in"""
+
+    def __init__(self, sink: Any = None, sample_rate: int = DEFAULT_SAMPLE_RATE,
+                 block_size: int = DEFAULT_BLOCK_SIZE, buffer_seconds: float = 30.0):
+        """
+        Args:
+            sink: Output that pulls blocks via render() -- SoundDeviceSink,
+                NullSink, ... (default: SoundDeviceSink)
+            sample_rate: Output sample rate; chunks are resampled to it
+            block_size: Frames per block the sink pulls (stop latency bound)
+            buffer_seconds: Ring buffer capacity; enqueue blocks when full
+        """
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.sink = sink if sink is not None else SoundDeviceSink()
+        self._buffer = PCMRingBuffer(int(buffer_seconds * sample_rate))
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._started = False
+
+        # Utterance state: enqueue/finish calls for an older utterance are ignored
+        self._utterance = 0
+        self._finished = True
+        self._utterance_started_at = 0.0
+        self._utterance_played = 0
+
+        # Absolute sample positions: where each queued chunk begins
+        self._written = 0
+        self._played = 0
+        self._chunk_starts: deque = deque()
+        self._stop_requested_at: Optional[float] = None
+
+        self.stats: Dict[str, Any] = {
+            'utterances': 0, 'chunks_enqueued': 0, 'chunks_started': 0,
+            'underruns': 0, 'gap_frames': 0, 'stops': 0,
+            'first_audio_ms': None, 'last_stop_latency_ms': None, 'max_stop_latency_ms': 0.0
+        }
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Open the sink's output stream (idempotent)"""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        try:
+            self.sink.start(self)
+        except Exception:
+            with self._lock:
+                self._started = False
+            raise
+
+    def close(self):
+        self.stop()
+        with self._lock:
+            if not self._started:
+                return
+            self._started = False
+        self.sink.stop()
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def begin_utterance(self) -> int:
+        """
+        Start a new utterance, cutting off anything still playing.
+
+        Returns:
+            Utterance id to pass to enqueue_pcm()/finish()
+        """
+        self.start()
+        with self._lock:
+            self._reset_locked()
+            self._utterance += 1
+            self._finished = False
+            self._utterance_started_at = time.perf_counter()
+            self._utterance_played = 0
+            self.stats['utterances'] += 1
+            return self._utterance
+
+    def enqueue_pcm(self, samples: np.ndarray, sample_rate: Optional[int] = None,
+                    utterance: Optional[int] = None, timeout: Optional[float] = None) -> bool:
+        """
+        Append one chunk of mono PCM to the current utterance.
+
+        Blocks while the ring buffer is full (the sink drains it in real time).
+
+        Args:
+            samples: Float32 samples in [-1, 1] (int16 arrays are converted)
+            sample_rate: Rate of samples (default: engine rate)
+            utterance: Id from begin_utterance(); stale ids are dropped
+            timeout: Maximum seconds to wait for buffer space
+
+        Returns:
+            True if the whole chunk was queued, False if dropped or cut off
+        """
+        samples = np.asarray(samples)
+        if samples.dtype == np.int16:
+            samples = samples.astype(np.float32) / 32768.0
+        samples = resample(samples.astype(np.float32, copy=False).reshape(-1),
+                           sample_rate or self.sample_rate, self.sample_rate)
+        if len(samples) == 0:
+            return True
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        offset = 0
+        with self._lock:
+            if utterance is None:
+                utterance = self._utterance
+            if utterance != self._utterance or self._finished:
+                return False
+            self._chunk_starts.append(self._written)
+            self.stats['chunks_enqueued'] += 1
+            while offset < len(samples):
+                written = self._buffer.write(samples[offset:])
+                offset += written
+                self._written += written
+                if offset == len(samples):
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._changed.wait(remaining if remaining is not None else 0.5)
+                if utterance != self._utterance:
+                    return False
+        return True
+
+    def enqueue_audio(self, data: bytes, utterance: Optional[int] = None) -> bool:
+        """Decode an encoded chunk (WAV/MP3/...) in memory and enqueue it"""
+        samples, rate = decode_audio(data)
+        return self.enqueue_pcm(samples, rate, utterance=utterance)
+
+    def finish(self, utterance: Optional[int] = None):
+        """No more chunks for this utterance; wait() returns once it has played out"""
+        with self._lock:
+            if utterance is None or utterance == self._utterance:
+                self._finished = True
+                self._changed.notify_all()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the current utterance is finished and fully played (or stopped).
+
+        Returns:
+            True if playback completed, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            while not (self._finished and self._buffer.available == 0):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._changed.wait(remaining if remaining is not None else 0.5)
+        return True
+
+    def stop(self):
+        """Barge-in: drop everything queued; the sink outputs silence from its next block"""
+        with self._lock:
+            if self._buffer.available or not self._finished:
+                self.stats['stops'] += 1
+                self._stop_requested_at = time.perf_counter()
+            self._utterance += 1
+            self._reset_locked()
+            self._finished = True
+            self._changed.notify_all()
+
+    def _reset_locked(self):
+        self._buffer.clear()
+        self._played = self._written
+        self._chunk_starts.clear()
+
+    def is_playing(self) -> bool:
+        with self._lock:
+            return self._buffer.available > 0 or not self._finished
+
+    # ------------------------------------------------------------------
+    # Consumer side (called by the sink, typically from an audio thread)
+    # ------------------------------------------------------------------
+
+    def render(self, frames: int) -> np.ndarray:
+        """
+        Produce the next block of output.
+
+        Args:
+            frames: Block length in samples
+
+        Returns:
+            Float32 array of length frames (silence where nothing is queued)
+        """
+        out = np.zeros(frames, dtype=np.float32)
+        now = time.perf_counter()
+        with self._lock:
+            if self._stop_requested_at is not None:
+                latency = (now - self._stop_requested_at) * 1000
+                self.stats['last_stop_latency_ms'] = latency
+                self.stats['max_stop_latency_ms'] = max(self.stats['max_stop_latency_ms'], latency)
+                self._stop_requested_at = None
+
+            got = self._buffer.read_into(out)
+            end = self._played + got
+            while self._chunk_starts and self._chunk_starts[0] < end:
+                self._chunk_starts.popleft()
+                self.stats['chunks_started'] += 1
+            if got and self._utterance_played == 0:
+                self.stats['first_audio_ms'] = (now - self._utterance_started_at) * 1000
+            self._played = end
+            self._utterance_played += got
+
+            # Ran dry mid-utterance: the next chunk was late -> audible gap
+            if got < frames and self._utterance_played > 0 and not self._finished:
+                self.stats['underruns'] += 1
+                self.stats['gap_frames'] += frames - got
+
+            self._changed.notify_all()
+        return out
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(
+                self.stats,
+                sample_rate=self.sample_rate,
+                block_ms=self.block_size / self.sample_rate * 1000,
+                buffered_ms=self._buffer.available / self.sample_rate * 1000,
+                gap_ms=self.stats['gap_frames'] / self.sample_rate * 1000
+            )
+
+
+class NullSink:
+    """
+    Headless sink: pulls blocks on a timer and optionally records them.
+
+    With realtime=True blocks are pulled at the audio rate, so latency, gap and
+    stop timings match a real device; with realtime=False as fast as data is
+    available.
+    """
+
+    def __init__(self, realtime: bool = True, record: bool = True):
+        self.realtime = realtime
+        self.record = record
+        self.blocks: List[np.ndarray] = []
+        self.block_times: List[float] = []
+        self._engine: Optional[PlaybackEngine] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self, engine: PlaybackEngine):
+        self._engine = engine
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="null-audio-sink", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+    def _run(self):
+        engine = self._engine
+        period = engine.block_size / engine.sample_rate
+        next_tick = time.perf_counter()
+        while not self._stop.is_set():
+            if not self.realtime and not engine.is_playing():
+                time.sleep(0.001)
+                continue
+            block = engine.render(engine.block_size)
+            if self.record:
+                self.blocks.append(block)
+                self.block_times.append(time.perf_counter())
+            if self.realtime:
+                next_tick += period
+                delay = next_tick - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_tick = time.perf_counter()
+
+    @property
+    def recorded(self) -> np.ndarray:
+        """Everything rendered so far as one array"""
+        blocks = list(self.blocks)
+        return np.concatenate(blocks) if blocks else np.zeros(0, dtype=np.float32)
+
+
+class SoundDeviceSink:
+    """Sound-card output through one sounddevice OutputStream with a pull callback"""
+
+    def __init__(self, device: Any = None, latency: Any = 'low', channels: int = 1):
+        self.device = device
+        self.latency = latency
+        self.channels = channels
+        self._stream = None
+
+    def start(self, engine: PlaybackEngine):
+        import sounddevice as sd
+
+        def callback(outdata, frames, time_info, status):
+            block = engine.render(frames)
+            for channel in range(outdata.shape[1]):
+                outdata[:, channel] = block
+
+        self._stream = sd.OutputStream(
+            samplerate=engine.sample_rate, blocksize=engine.block_size,
+            channels=self.channels, dtype='float32', device=self.device,
+            latency=self.latency, callback=callback
+        )
+        self._stream.start()
+
+    def stop(self):
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+
+
+# Singleton instance shared by all TTS adapters
+_playback_engine: Optional[PlaybackEngine] = None
+_playback_engine_failed = False
+_playback_engine_lock = threading.Lock()
+
+
+def get_playback_engine(tts_config: Optional[Dict[str, Any]] = None) -> Optional[PlaybackEngine]:
+    """
+    Get the shared playback engine, opening the output device on first use.
+
+    Args:
+        tts_config: TTS config section (playback_engine, output_device,
+            playback_block_size); only the first call's values apply
+
+    Returns:
+        PlaybackEngine, or None if disabled or no output device could be opened
+        (callers fall back to their file-based playback)
+    """
+    global _playback_engine, _playback_engine_failed
+    tts_config = tts_config or {}
+    if not tts_config.get('playback_engine', True):
+        return None
+    with _playback_engine_lock:
+        if _playback_engine is None and not _playback_engine_failed:
+            engine = PlaybackEngine(
+                SoundDeviceSink(device=tts_config.get('output_device')),
+                block_size=tts_config.get('playback_block_size', DEFAULT_BLOCK_SIZE)
+            )
+            try:
+                engine.start()
+                _playback_engine = engine
+            except Exception as e:
+                logger.warning(f"In-memory playback unavailable, using file playback: {e}")
+                _playback_engine_failed = True
+    return _playback_engine
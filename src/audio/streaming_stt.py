@@ -0,0 +1,339 @@
+"""
+Streaming STT
+Sliding-window Whisper transcription while the user is still speaking
+
+Batch transcription starts only once the endpointer has decided the user is
+done, so end-of-speech to text always costs a full Whisper pass over the whole
+utterance. Here a TranscriptionSession re-decodes the uncommitted part of the
+utterance every `step_s` of new audio while capture is still running:
+
+    audio     |---------- committed ----------|------ window ------|
+    decode n                                   [seg a][seg b][seg c?]
+    decode n+1                                 [seg a][seg b][seg c][d?]
+                                               ^^^^^^^^^^^^^^ agreed -> commit
+
+A segment is committed once two consecutive decodes agree on it (same text,
+same position) and it ends clear of the still-growing edge of the window; the
+window then starts after it, with the committed text passed as Whisper's
+initial_prompt. After the endpoint only the uncommitted tail is decoded, so
+post-utterance latency is the tail decode rather than a full pass.
+
+Every decode emits a Transcript event (stable text + tentative tail) for
+callers that want to look at the hypothesis before the endpoint.
+
+Usage:
+    transcriber = StreamingTranscriber(get_stt_service(), on_partial=print)
+    capture = AudioCapture(MicrophoneSource(), speech_listener=transcriber)
+    utterance = capture.listen()
+    final = utterance.transcript.result(timeout=30)
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+
+
+@dataclass
+class Transcript:
+    """A partial (final=False) or final hypothesis for one utterance"""
+    text: str
+    stable_text: str       # committed; will not change
+    unstable_text: str     # tentative tail of the latest decode
+    final: bool
+    audio_seconds: float   # audio heard so far
+    decode_ms: float       # inference time of the decode that produced this
+    tail_seconds: float = 0.0                 # final only: audio decoded after the endpoint
+    post_utterance_ms: Optional[float] = None  # final only: finish() to final text
+
+
+def _join(*parts: str) -> str:
+    return " ".join(p for p in parts if p).strip()
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+class TranscriptionSession:
+    """Incremental transcription of one utterance"""
+
+    def __init__(self, service: Any, sample_rate: int = SAMPLE_RATE,
+                 on_partial: Optional[Callable[[Transcript], None]] = None,
+                 step_s: float = 1.0, min_window_s: float = 1.0, max_window_s: float = 20.0,
+                 edge_guard_s: float = 0.5, align_tolerance_s: float = 0.4):
+        """
+        Args:
+            service: WhisperSTTService (anything with submit(audio, detailed=True, **options))
+            sample_rate: Rate of the fed audio (Whisper expects 16 kHz)
+            on_partial: Called with each partial Transcript (on the STT worker thread)
+            step_s: New audio between window decodes
+            min_window_s: Don't decode windows shorter than this
+            max_window_s: Commit everything but the last segment once the
+                uncommitted window is this long (Whisper's context is 30 s)
+            edge_guard_s: Segments ending this close to the window edge stay tentative
+            align_tolerance_s: How far the same segment may move between decodes
+        """
+        self.service = service
+        self.sample_rate = sample_rate
+        self.on_partial = on_partial
+        self.step = int(step_s * sample_rate)
+        self.min_window = int(min_window_s * sample_rate)
+        self.max_window = int(max_window_s * sample_rate)
+        self.edge_guard = edge_guard_s
+        self.tolerance = align_tolerance_s
+
+        self._lock = threading.Lock()
+        self._chunks: List[np.ndarray] = []
+        self._length = 0
+        self._audio: Optional[np.ndarray] = None  # cache of the concatenated chunks
+        self._committed: List[str] = []
+        self._committed_at = 0
+        self._previous: List[Tuple[float, float, str, str]] = []  # absolute (start, end, norm, text)
+        self._decoded_at = 0
+        self._in_flight = False
+        self._finish_started: Optional[float] = None
+        self._cancelled = False
+        self._result: Future = Future()
+        self.partials: List[Transcript] = []
+        self.stats = {'decodes': 0, 'decode_ms': 0.0, 'committed_segments': 0, 'forced_commits': 0}
+
+    # ------------------------------------------------------------------
+    # Capture side
+    # ------------------------------------------------------------------
+
+    def feed(self, samples: np.ndarray):
+        """Append captured audio; may start a window decode"""
+        with self._lock:
+            if self._finish_started is not None or self._cancelled:
+                return
+            self._chunks.append(np.asarray(samples, dtype=np.float32))
+            self._length += len(samples)
+            self._audio = None
+            request = self._next_window_locked()
+        self._submit(request)
+
+    def finish(self) -> Future:
+        """
+        End of speech: decode only the uncommitted tail.
+
+        Returns:
+            Future resolving to the final Transcript
+        """
+        with self._lock:
+            if self._finish_started is None and not self._cancelled:
+                self._finish_started = time.perf_counter()
+                # An in-flight window decode runs ahead of the tail on the same
+                # model anyway; let it commit what it can first
+                request = None if self._in_flight else self._tail_locked()
+            else:
+                request = None
+        self._submit(request)
+        return self._result
+
+    def cancel(self):
+        """Utterance discarded: drop pending work"""
+        with self._lock:
+            self._cancelled = True
+        if not self._result.done():
+            self._result.cancel()
+
+    @property
+    def stable_text(self) -> str:
+        with self._lock:
+            return _join(*self._committed)
+
+    # ------------------------------------------------------------------
+    # Decoding
+    # ------------------------------------------------------------------
+
+    def _audio_locked(self) -> np.ndarray:
+        if self._audio is None:
+            self._audio = np.concatenate(self._chunks) if self._chunks else np.zeros(0, np.float32)
+            self._chunks = [self._audio]
+        return self._audio
+
+    def _next_window_locked(self):
+        if self._in_flight:
+            return None
+        if self._length - self._decoded_at < self.step or self._length - self._committed_at < self.min_window:
+            return None
+        self._in_flight = True
+        self._decoded_at = self._length
+        return ('window', self._committed_at, self._audio_locked()[self._committed_at:self._length])
+
+    def _tail_locked(self):
+        self._in_flight = True
+        return ('tail', self._committed_at, self._audio_locked()[self._committed_at:self._length])
+
+    def _submit(self, request):
+        if request is None:
+            return
+        kind, offset, audio = request
+        if len(audio) == 0:
+            self._on_decoded(kind, offset, len(audio), None, 0.0)
+            return
+        prompt = self.stable_text
+        options = {'initial_prompt': prompt} if prompt else {}
+        started = time.perf_counter()
+        try:
+            future = self.service.submit(audio, detailed=True, **options)
+        except Exception as e:
+            logger.warning(f"Streaming STT submit failed: {e}")
+            self._on_decoded(kind, offset, len(audio), e, 0.0)
+            return
+        future.add_done_callback(
+            lambda f: self._on_decoded(kind, offset, len(audio), f, (time.perf_counter() - started) * 1000))
+
+    def _on_decoded(self, kind: str, offset: int, length: int, outcome: Any, elapsed_ms: float):
+        error = outcome if isinstance(outcome, Exception) else None
+        result = None
+        if isinstance(outcome, Future):
+            try:
+                result = outcome.result()
+            except Exception as e:
+                error = e
+        if error is not None:
+            logger.warning(f"Streaming STT {kind} decode failed: {error}")
+
+        if kind == 'tail':
+            self._complete(offset, length, result, error, elapsed_ms)
+            return
+
+        event = None
+        with self._lock:
+            self._in_flight = False
+            if self._cancelled:
+                return
+            if result is not None:
+                event = self._commit_locked(offset, length, result['segments'], elapsed_ms)
+            if self._finish_started is not None:
+                request = self._tail_locked()
+            else:
+                request = self._next_window_locked()
+        if event is not None:
+            self.partials.append(event)
+            if self.on_partial is not None:
+                try:
+                    self.on_partial(event)
+                except Exception as e:
+                    logger.warning(f"Partial transcript handler failed: {e}")
+        self._submit(request)
+
+    def _commit_locked(self, offset: int, length: int, segments, elapsed_ms: float) -> Transcript:
+        """Commit the prefix of segments this decode and the previous one agree on"""
+        self.stats['decodes'] += 1
+        self.stats['decode_ms'] += elapsed_ms
+        base = offset / self.sample_rate
+        window_end = (offset + length) / self.sample_rate
+        current = [(base + start, base + end, _normalize(text), text)
+                   for start, end, text in segments if text]
+
+        stable = 0
+        for i, (start, end, norm, _) in enumerate(current[:-1]):
+            if end > window_end - self.edge_guard or i >= len(self._previous):
+                break
+            p_start, p_end, p_norm, _ = self._previous[i]
+            if norm != p_norm or abs(start - p_start) > self.tolerance or abs(end - p_end) > self.tolerance:
+                break
+            stable = i + 1
+
+        if stable == 0 and length >= self.max_window and len(current) > 1:
+            # Never agreed and the window is getting too long for Whisper
+            stable = len(current) - 1
+            self.stats['forced_commits'] += 1
+
+        if stable:
+            self._committed.extend(text for *_, text in current[:stable])
+            self._committed_at = max(self._committed_at, int(current[stable - 1][1] * self.sample_rate))
+            self.stats['committed_segments'] += stable
+        self._previous = current[stable:]
+
+        stable_text = _join(*self._committed)
+        unstable_text = _join(*(text for *_, text in self._previous))
+        return Transcript(
+            text=_join(stable_text, unstable_text), stable_text=stable_text,
+            unstable_text=unstable_text, final=False,
+            audio_seconds=self._length / self.sample_rate, decode_ms=elapsed_ms
+        )
+
+    def _complete(self, offset: int, length: int, result, error, elapsed_ms: float):
+        with self._lock:
+            self._in_flight = False
+            if self._cancelled or self._result.done():
+                return
+            stable_text = _join(*self._committed)
+            tail_text = result['text'].strip() if result else ""
+            if error is not None and not stable_text:
+                self._result.set_exception(RuntimeError(f"Streaming STT failed: {error}"))
+                return
+            transcript = Transcript(
+                text=_join(stable_text, tail_text), stable_text=stable_text,
+                unstable_text=tail_text, final=True,
+                audio_seconds=self._length / self.sample_rate, decode_ms=elapsed_ms,
+                tail_seconds=length / self.sample_rate,
+                post_utterance_ms=(time.perf_counter() - self._finish_started) * 1000
+            )
+        self._result.set_result(transcript)
+
+
+class StreamingTranscriber:
+    """
+    AudioCapture speech listener running one TranscriptionSession per utterance.
+
+    The final transcript's Future is attached to the endpointed utterance as
+    utterance.transcript.
+    """
+
+    def __init__(self, service: Any = None, on_partial: Optional[Callable[[Transcript], None]] = None,
+                 sample_rate: int = SAMPLE_RATE, **session_options):
+        """
+        Args:
+            service: WhisperSTTService; defaults to the shared one
+            on_partial: Called with each partial Transcript
+            sample_rate: Capture rate
+            **session_options: TranscriptionSession settings (step_s, ...)
+        """
+        if service is None:
+            try:
+                from src.audio.whisper_service import get_stt_service
+            except ImportError:
+                from audio.whisper_service import get_stt_service
+            service = get_stt_service()
+        self.service = service
+        self.on_partial = on_partial
+        self.sample_rate = sample_rate
+        self.session_options = session_options
+        self.session: Optional[TranscriptionSession] = None
+
+    def start_session(self) -> TranscriptionSession:
+        """Begin a new utterance (an unfinished previous one is cancelled)"""
+        if self.session is not None:
+            self.session.cancel()
+        self.session = TranscriptionSession(self.service, self.sample_rate,
+                                            self.on_partial, **self.session_options)
+        return self.session
+
+    def speech_started(self, audio: np.ndarray):
+        self.start_session().feed(audio)
+
+    def speech_audio(self, frame: np.ndarray):
+        if self.session is not None:
+            self.session.feed(frame)
+
+    def speech_ended(self, utterance: Any):
+        session, self.session = self.session, None
+        if session is None:
+            return
+        if utterance is None:
+            session.cancel()
+        else:
+            utterance.transcript = session.finish()
@@ -0,0 +1,384 @@
+"""
+Whisper STT Service
+Long-lived, warm Whisper model behind a request queue
+
+The model is loaded once (in a worker thread, or optionally a dedicated worker
+process so inference doesn't contend with the voice loop for the GIL), warmed
+up with a short silent clip, and then serves transcription requests for the
+life of the process. Audio is passed as in-memory float32 numpy buffers at
+16 kHz, which whisper accepts directly, so there is no temp-file round trip.
+
+Model-load, warm-up and per-request inference latency are reported separately
+via get_stats().
+"""
+
+import itertools
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+WARMUP_SECONDS = 1.0
+
+_STOP = None  # queue sentinel
+
+
+def load_whisper_model(model_name: str) -> Any:
+    """Default model loader (imports whisper lazily so the module stays importable)"""
+    import whisper
+    return whisper.load_model(model_name)
+
+
+def to_whisper_audio(audio_data: np.ndarray) -> np.ndarray:
+    """Flatten capture buffers ([N] or [N, channels]) to contiguous mono float32"""
+    audio = np.asarray(audio_data, dtype=np.float32)
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1) if audio.shape[1] > 1 else audio[:, 0]
+    return np.ascontiguousarray(audio)
+
+
+def _load_and_warm(model_name: str, model_loader: Callable, warmup: bool, options: Dict[str, Any]):
+    """Load the model and run one silent inference; returns (model, load_ms, warmup_ms)"""
+    start = time.perf_counter()
+    model = model_loader(model_name)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    warmup_ms = 0.0
+    if warmup:
+        start = time.perf_counter()
+        model.transcribe(np.zeros(int(SAMPLE_RATE * WARMUP_SECONDS), dtype=np.float32), **options)
+        warmup_ms = (time.perf_counter() - start) * 1000
+    return model, load_ms, warmup_ms
+
+
+def _transcribe(model: Any, audio: np.ndarray, options: Dict[str, Any], detailed: bool = False):
+    """
+    Run one inference; returns (result, inference_ms).
+
+    result is the text, or with detailed=True a dict with the text and
+    'segments' as (start_s, end_s, text) tuples (plain data, so it pickles
+    back from the worker process).
+    """
+    start = time.perf_counter()
+    result = model.transcribe(audio, **options)
+    inference_ms = (time.perf_counter() - start) * 1000
+    text = result.get('text', '').strip()
+    if not detailed:
+        return text, inference_ms
+    segments = [(float(seg['start']), float(seg['end']), seg.get('text', '').strip())
+                for seg in result.get('segments') or []]
+    return {'text': text, 'segments': segments}, inference_ms
+
+
+def _process_worker(model_name, model_loader, warmup, options, requests, responses):
+    """Entry point of the dedicated worker process"""
+    try:
+        model, load_ms, warmup_ms = _load_and_warm(model_name, model_loader, warmup, options)
+    except Exception as e:
+        responses.put(('ready', None, None, f"{type(e).__name__}: {e}"))
+        return
+    responses.put(('ready', None, (load_ms, warmup_ms), None))
+
+    while True:
+        item = requests.get()
+        if item is _STOP:
+            break
+        request_id, audio, request_options, detailed = item
+        try:
+            result = _transcribe(model, audio, {**options, **request_options}, detailed)
+            responses.put(('result', request_id, result, None))
+        except Exception as e:
+            responses.put(('result', request_id, None, f"{type(e).__name__}: {e}"))
+
+
+class WhisperSTTService:
+    """
+    Warm Whisper model serving a queue of transcription requests.
+
+    Usage:
+        service = WhisperSTTService("base")
+        service.start()                      # loads + warms up in the background
+        text = service.transcribe(audio)     # float32 numpy, 16 kHz
+        future = service.submit(audio)       # or non-blocking
+    """
+
+    def __init__(
+        self,
+        model_name: str = "base",
+        use_process: bool = False,
+        warmup: bool = True,
+        model_loader: Callable[[str], Any] = load_whisper_model,
+        mp_context: str = "spawn",
+        **transcribe_options
+    ):
+        """
+        Initialize service (nothing is loaded until start()).
+
+        Args:
+            model_name: Whisper model size (tiny/base/small/...)
+            use_process: Run the model in a dedicated worker process
+            warmup: Run one silent inference after loading
+            model_loader: Callable model_name -> model with a transcribe() method
+                          (must be picklable when use_process=True)
+            mp_context: multiprocessing start method for the worker process
+            **transcribe_options: Passed to model.transcribe (e.g. language='en', fp16=False)
+        """
+        self.model_name = model_name
+        self.use_process = use_process
+        self.warmup = warmup
+        self.model_loader = model_loader
+        self.mp_context = mp_context
+        self.transcribe_options = transcribe_options
+
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._load_error: Optional[str] = None
+        self._pending: Dict[int, Future] = {}
+        self._ids = itertools.count()
+        self._threads = []
+        self._process = None
+        self._requests = None
+        self.stats = {
+            "model_load_ms": None,
+            "warmup_ms": None,
+            "requests": 0,
+            "inference_ms_total": 0.0,
+            "last_inference_ms": None
+        }
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self, wait: bool = False, timeout: Optional[float] = None) -> "WhisperSTTService":
+        """
+        Start loading and warming the model in the background.
+
+        Args:
+            wait: Block until the model is ready
+            timeout: Maximum seconds to wait when wait=True
+
+        Returns:
+            self
+        """
+        with self._lock:
+            if not self._threads:
+                if self.use_process:
+                    self._start_process()
+                else:
+                    self._start_thread()
+        if wait:
+            self.wait_ready(timeout)
+        return self
+
+    def _start_thread(self):
+        self._requests = queue.Queue()
+        thread = threading.Thread(target=self._thread_worker, name="whisper-stt", daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _start_process(self):
+        ctx = multiprocessing.get_context(self.mp_context)
+        self._requests = ctx.Queue()
+        self._responses = ctx.Queue()
+        self._process = ctx.Process(
+            target=_process_worker,
+            args=(self.model_name, self.model_loader, self.warmup, self.transcribe_options,
+                  self._requests, self._responses),
+            name="whisper-stt",
+            daemon=True
+        )
+        self._process.start()
+        thread = threading.Thread(target=self._collect_responses, name="whisper-stt-results", daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the model is loaded and warm.
+
+        Raises:
+            RuntimeError: If loading failed
+        """
+        ready = self._ready.wait(timeout)
+        if self._load_error:
+            raise RuntimeError(f"Whisper model failed to load: {self._load_error}")
+        return ready
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set() and self._load_error is None
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the worker and fail any outstanding requests"""
+        with self._lock:
+            threads, self._threads = self._threads, []
+            process, self._process = self._process, None
+        if not threads:
+            return
+
+        # Workers take the lock to resolve futures, so join outside it
+        self._requests.put(_STOP)
+        if process is not None:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+            self._responses.put(('stop', None, None, None))
+        for thread in threads:
+            thread.join(timeout)
+
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(RuntimeError("Whisper service stopped"))
+
+    # ------------------------------------------------------------------
+    # Request API
+    # ------------------------------------------------------------------
+
+    def submit(self, audio_data: np.ndarray, detailed: bool = False, **options) -> Future:
+        """
+        Queue audio for transcription (starts the service if needed).
+
+        Args:
+            audio_data: float32 samples at 16 kHz, shape [N] or [N, channels]
+            detailed: Resolve to {'text', 'segments': [(start_s, end_s, text)]}
+                instead of the text alone
+            **options: Per-request model.transcribe options (e.g. initial_prompt),
+                layered over the service's own
+
+        Returns:
+            Future resolving to the transcribed text (or detailed dict)
+        """
+        if not self._threads:
+            self.start()
+        future: Future = Future()
+        request_id = next(self._ids)
+        with self._lock:
+            if self._load_error:
+                raise RuntimeError(f"Whisper model failed to load: {self._load_error}")
+            self._pending[request_id] = future
+        self._requests.put((request_id, to_whisper_audio(audio_data), options, detailed))
+        return future
+
+    def transcribe(self, audio_data: np.ndarray, timeout: Optional[float] = None) -> str:
+        """Blocking transcription of one buffer"""
+        return self.submit(audio_data).result(timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            requests = self.stats["requests"]
+            return {
+                **self.stats,
+                "ready": self.ready,
+                "mode": "process" if self.use_process else "thread",
+                "avg_inference_ms": self.stats["inference_ms_total"] / requests if requests else 0.0
+            }
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    def _mark_loaded(self, load_ms: float, warmup_ms: float):
+        with self._lock:
+            self.stats["model_load_ms"] = load_ms
+            self.stats["warmup_ms"] = warmup_ms
+        logger.info(f"Whisper '{self.model_name}' ready (load {load_ms:.0f}ms, warm-up {warmup_ms:.0f}ms)")
+        self._ready.set()
+
+    def _mark_failed(self, error: str):
+        logger.error(f"Whisper model failed to load: {error}")
+        with self._lock:
+            self._load_error = error
+        self._ready.set()
+
+    def _resolve(self, request_id: int, result, error: Optional[str]):
+        with self._lock:
+            future = self._pending.pop(request_id, None)
+            if result is not None:
+                text, inference_ms = result
+                self.stats["requests"] += 1
+                self.stats["inference_ms_total"] += inference_ms
+                self.stats["last_inference_ms"] = inference_ms
+        if future is None:
+            return
+        if error is not None:
+            future.set_exception(RuntimeError(error))
+        else:
+            future.set_result(result[0])
+
+    def _fail_pending(self, error: str):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.set_exception(RuntimeError(error))
+
+    def _thread_worker(self):
+        try:
+            model, load_ms, warmup_ms = _load_and_warm(
+                self.model_name, self.model_loader, self.warmup, self.transcribe_options
+            )
+        except Exception as e:
+            self._mark_failed(f"{type(e).__name__}: {e}")
+            self._fail_pending(self._load_error)
+            return
+        self._mark_loaded(load_ms, warmup_ms)
+
+        while True:
+            item = self._requests.get()
+            if item is _STOP:
+                break
+            request_id, audio, options, detailed = item
+            try:
+                result = _transcribe(model, audio, {**self.transcribe_options, **options}, detailed)
+                self._resolve(request_id, result, None)
+            except Exception as e:
+                self._resolve(request_id, None, f"{type(e).__name__}: {e}")
+
+    def _collect_responses(self):
+        while True:
+            kind, request_id, payload, error = self._responses.get()
+            if kind == 'stop':
+                break
+            if kind == 'ready':
+                if error:
+                    self._mark_failed(error)
+                    self._fail_pending(error)
+                    break
+                self._mark_loaded(*payload)
+            else:
+                self._resolve(request_id, payload, error)
+
+
+# Singleton instance for module-level access
+_stt_service = None
+_stt_service_lock = threading.Lock()
+
+
+def get_stt_service(model_name: str = "base", **kwargs) -> WhisperSTTService:
+    """
+    Get (and start) the shared STT service.
+
+    Args:
+        model_name: Whisper model size
+        **kwargs: Passed to WhisperSTTService on first creation
+
+    Returns:
+        WhisperSTTService instance
+    """
+    global _stt_service
+    with _stt_service_lock:
+        if _stt_service is None or _stt_service.model_name != model_name:
+            if _stt_service is not None:
+                _stt_service.stop()
+            _stt_service = WhisperSTTService(model_name, **kwargs).start()
+    return _stt_service
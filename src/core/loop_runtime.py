@@ -0,0 +1,189 @@
+"""
+Process-wide asyncio runtime for synchronous callers.
+
+The voice pipeline is synchronous, but personality, tool orchestration and
+research are async. Calling asyncio.run() at each boundary builds and tears
+down an event loop per call, so nothing loop-bound (aiohttp sessions,
+connection pools, async caches) survives from one call to the next.
+
+LoopRuntime owns one event loop on a dedicated daemon thread for the life of
+the process. run_sync(coro) schedules a coroutine on it and blocks the calling
+thread for the result, so loop-bound resources persist across turns.
+
+Usage:
+    from src.core.loop_runtime import run_sync
+    state = run_sync(tracker.get_current_personality_state())
+"""
+
+import asyncio
+import atexit
+import logging
+import threading
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Awaitable, Callable, Coroutine, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LoopRuntime:
+    """One long-lived event loop on a background thread with a sync bridge"""
+
+    def __init__(self, name: str = "penny-event-loop"):
+        """
+        Args:
+            name: Name of the loop thread
+        """
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._shutdown_callbacks: List[Callable[[], Awaitable[Any]]] = []
+        self.stats = {"calls": 0, "timeouts": 0}
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> "LoopRuntime":
+        """Start the loop thread (idempotent)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return self
+            loop = asyncio.new_event_loop()
+            started = threading.Event()
+            self._thread = threading.Thread(
+                target=self._run_loop, args=(loop, started), name=self.name, daemon=True
+            )
+            self._thread.start()
+            started.wait()
+            self._loop = loop
+        return self
+
+    def _run_loop(self, loop: asyncio.AbstractEventLoop, started: threading.Event):
+        asyncio.set_event_loop(loop)
+        loop.call_soon(started.set)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The runtime's event loop (started on first access)"""
+        if self._loop is None or not self.running:
+            self.start()
+        return self._loop
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def in_loop_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def add_shutdown_callback(self, callback: Callable[[], Awaitable[Any]]):
+        """
+        Register an async cleanup (e.g. closing an aiohttp session) to run on
+        the loop before it stops.
+
+        Args:
+            callback: Zero-argument coroutine function
+        """
+        self._shutdown_callbacks.append(callback)
+
+    def shutdown(self, timeout: float = 5.0):
+        """Run shutdown callbacks, cancel outstanding tasks and stop the loop"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop, self._thread = None, None
+        if loop is None or thread is None or not thread.is_alive():
+            return
+
+        async def _drain():
+            for callback in reversed(self._shutdown_callbacks):
+                try:
+                    await callback()
+                except Exception as e:
+                    logger.warning(f"Event loop shutdown callback failed: {e}")
+            current = asyncio.current_task()
+            tasks = [t for t in asyncio.all_tasks() if t is not current]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await loop.shutdown_asyncgens()
+
+        try:
+            asyncio.run_coroutine_threadsafe(_drain(), loop).result(timeout)
+        except Exception as e:
+            logger.warning(f"Event loop did not drain cleanly: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        self._shutdown_callbacks.clear()
+
+    # ------------------------------------------------------------------
+    # Sync bridge
+    # ------------------------------------------------------------------
+
+    def submit(self, coro: Coroutine) -> Future:
+        """
+        Schedule a coroutine on the runtime loop without waiting.
+
+        Returns:
+            concurrent.futures.Future for the coroutine's result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run_sync(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the runtime loop and block for its result.
+
+        Args:
+            coro: Coroutine to run
+            timeout: Seconds to wait; on expiry the coroutine is cancelled
+
+        Returns:
+            The coroutine's result
+
+        Raises:
+            RuntimeError: Called from the runtime's own loop thread (would deadlock)
+            TimeoutError: timeout expired
+            Exception: Whatever the coroutine raised
+        """
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("run_sync() called from the event loop thread; await the coroutine instead")
+
+        future = self.submit(coro)
+        self.stats["calls"] += 1
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            self.stats["timeouts"] += 1
+            raise TimeoutError(f"Coroutine did not finish within {timeout}s")
+
+
+# Singleton instance for module-level access
+_runtime: Optional[LoopRuntime] = None
+_runtime_lock = threading.Lock()
+
+
+def get_loop_runtime() -> LoopRuntime:
+    """
+    Get (and start) the shared loop runtime.
+
+    Returns:
+        LoopRuntime instance
+    """
+    global _runtime
+    with _runtime_lock:
+        if _runtime is None:
+            _runtime = LoopRuntime().start()
+            atexit.register(_runtime.shutdown)
+    return _runtime
+
+
+def run_sync(coro: Coroutine, timeout: Optional[float] = None) -> Any:
+    """Run a coroutine on the shared loop runtime and return its result"""
+    return get_loop_runtime().run_sync(coro, timeout)
@@ -15,6 +15,7 @@ if sys.version_info >= (3, 13):
 from core.stt.factory import STTFactory
 from core.tts.factory import TTSFactory
 from adapters.llm.factory import LLMFactory
+from adapters.tts.sentence_dispatcher import SentenceDispatcher
 from core.vad.webrtc_vad import SimpleVAD
 from core.telemetry import Telemetry
 from core.llm_router import load_config
@@ -37,6 +38,8 @@ class PipelineLoop:
         self.state = State.IDLE
         self.audio_buffer = io.BytesIO()
         self.barge_in_enabled = True
+        self._dispatcher: Optional[SentenceDispatcher] = None
+        self.last_stream_stats: dict = {}
 
     def _route_tone(self, text: str) -> str:
         """Simple tone routing based on text content."""
@@ -181,12 +184,63 @@ class PipelineLoop:
         
         return True
 
+    def think_and_speak_streaming(self, user_text: str) -> str:
+        """
+        Stream the LLM reply into TTS sentence by sentence.
+
+        Speech starts as soon as the first sentence is generated instead of
+        after the whole completion. Falls back to think() + speak() for LLMs
+        without stream().
+        """
+        if self.state != State.THINKING:
+            return ""
+        self.last_stream_stats = {}
+        if not hasattr(self.llm, 'stream'):
+            reply = self.think(user_text)
+            self.speak(reply)
+            return reply
+
+        tone = self._route_tone(user_text)
+        self.telemetry.log_event("thinking_start", {"tone": tone, "streaming": True})
+
+        def _on_sentence(sentence: str):
+            if self.state == State.THINKING:
+                self.state = State.SPEAKING
+                self.telemetry.log_event("speaking_start")
+
+        dispatcher = SentenceDispatcher(self.tts, on_sentence=_on_sentence)
+        self._dispatcher = dispatcher
+        try:
+            reply = dispatcher.run(
+                self.llm.stream(self._streaming_prompt(user_text), tone=tone,
+                                cancel_event=dispatcher.cancel_event, on_open=dispatcher.attach_stream)
+            )
+            dispatcher.wait()
+        finally:
+            self._dispatcher = None
+        self.last_stream_stats = dict(dispatcher.stats, cancelled=dispatcher.cancel_event.is_set())
+        self.telemetry.log_event("thinking_complete", {"reply": reply, **self.last_stream_stats})
+        self._after_streamed_reply(user_text, reply, tone)
+        self.state = State.IDLE
+        return reply
+
+    def _streaming_prompt(self, user_text: str) -> str:
+        """Prompt sent by think_and_speak_streaming(); subclasses add context"""
+        return user_text or "Hello"
+
+    def _after_streamed_reply(self, user_text: str, reply: str, tone: str):
+        """Called with the spoken (possibly barge-in truncated) streamed reply"""
+
     def handle_barge_in(self):
-        """Handle barge-in behavior during speaking."""
-        if self.state == State.SPEAKING and self.barge_in_enabled:
-            # Stop current TTS
+        """Handle barge-in while speaking, or while a streamed reply is still generating."""
+        dispatcher = self._dispatcher
+        streaming = self.state == State.THINKING and dispatcher is not None
+        if (self.state == State.SPEAKING or streaming) and self.barge_in_enabled:
+            # Stop a streaming reply (closes the LLM stream) or the current TTS
             try:
-                if hasattr(self.tts, 'stop'):
+                if dispatcher is not None:
+                    dispatcher.cancel()
+                elif hasattr(self.tts, 'stop'):
                     self.tts.stop()
             except Exception:
                 pass
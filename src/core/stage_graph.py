@@ -0,0 +1,200 @@
+"""
+Stage graph: run a turn's stages as a dependency DAG on a shared executor.
+
+Each Stage declares the stages it depends on; a stage is submitted as soon as
+all of its dependencies have resolved, so independent stages (emotion
+inference, research I/O, semantic search) overlap and a turn's wall-clock
+approaches its slowest path instead of the sum of every stage.
+
+- Per-stage timeouts: a stage that overruns resolves to its default and the
+  graph moves on (the worker thread is abandoned, not killed).
+- Gates: a stage marked gate=True short-circuits the graph when it returns a
+  non-None value; stages that haven't started are cancelled and running ones
+  are abandoned.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+_NO_DEFAULT = object()
+
+
+@dataclass
+class Stage:
+    """One unit of work in a turn.
+
+    fn is called with the results of its deps as keyword arguments (by stage
+    name). A stage without a default is critical: its exception (or timeout)
+    fails the whole graph. With a default, errors and timeouts are logged and
+    the default is used instead.
+    """
+    name: str
+    fn: Callable[..., Any]
+    deps: Sequence[str] = ()
+    timeout: Optional[float] = None
+    default: Any = _NO_DEFAULT
+    gate: bool = False
+
+    @property
+    def critical(self) -> bool:
+        return self.default is _NO_DEFAULT
+
+
+@dataclass
+class StageResults:
+    """Outcome of StageGraph.run()"""
+    values: Dict[str, Any] = field(default_factory=dict)
+    short_circuit: Optional[str] = None  # name of the gate that fired
+    cancelled: bool = False
+    timed_out: Tuple[str, ...] = ()
+    stage_ms: Dict[str, float] = field(default_factory=dict)
+    total_ms: float = 0.0
+
+    def __getitem__(self, name: str) -> Any:
+        return self.values[name]
+
+
+class StageTimeout(TimeoutError):
+    """A critical stage exceeded its timeout"""
+
+
+class StageGraph:
+    """Dependency-ordered, concurrent execution of Stages"""
+
+    def __init__(self, stages: Sequence[Stage]):
+        """
+        Args:
+            stages: Stages in any order; deps must name other stages
+
+        Raises:
+            ValueError: Unknown dependency, duplicate name, or a cycle
+        """
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage {stage.name!r}")
+            self.stages[stage.name] = stage
+        for stage in stages:
+            for dep in stage.deps:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage {stage.name!r} depends on unknown stage {dep!r}")
+        self._check_acyclic()
+
+    def _check_acyclic(self):
+        state: Dict[str, int] = {}  # 1 = visiting, 2 = done
+
+        def visit(name: str):
+            if state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise ValueError(f"Stage graph has a cycle through {name!r}")
+            state[name] = 1
+            for dep in self.stages[name].deps:
+                visit(dep)
+            state[name] = 2
+
+        for name in self.stages:
+            visit(name)
+
+    def run(self, executor: Executor, cancel_event: Optional[threading.Event] = None) -> StageResults:
+        """
+        Execute the graph.
+
+        Args:
+            executor: Shared executor the stages run on
+            cancel_event: Optional external cancellation (e.g. barge-in); when
+                          set, pending stages are cancelled and run() returns
+                          with whatever has resolved
+
+        Returns:
+            StageResults
+
+        Raises:
+            StageTimeout: A critical stage timed out
+            Exception: Whatever a critical stage raised
+        """
+        results = StageResults()
+        started = time.perf_counter()
+        remaining = dict(self.stages)
+        running: Dict[Future, Tuple[Stage, float]] = {}
+
+        def _submit_ready():
+            for name, stage in list(remaining.items()):
+                if all(dep in results.values for dep in stage.deps):
+                    kwargs = {dep: results.values[dep] for dep in stage.deps}
+                    running[executor.submit(self._call, stage, kwargs)] = (stage, time.perf_counter())
+                    del remaining[name]
+
+        def _abandon():
+            for future in running:
+                future.cancel()
+
+        def _resolve(stage: Stage, value: Any, submitted: float):
+            results.values[stage.name] = value
+            results.stage_ms[stage.name] = (time.perf_counter() - submitted) * 1000
+
+        _submit_ready()
+        while running:
+            if cancel_event is not None and cancel_event.is_set():
+                _abandon()
+                results.cancelled = True
+                break
+
+            now = time.perf_counter()
+            deadlines = [
+                submitted + stage.timeout - now
+                for stage, submitted in running.values() if stage.timeout is not None
+            ]
+            wait_for = max(0.0, min(deadlines)) if deadlines else None
+            if cancel_event is not None:
+                wait_for = 0.05 if wait_for is None else min(wait_for, 0.05)
+            done, _ = wait(list(running), timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                stage, submitted = running.pop(future)
+                try:
+                    value = future.result()
+                except Exception as e:
+                    if stage.critical:
+                        _abandon()
+                        raise
+                    logger.warning(f"Stage '{stage.name}' failed (using default): {e}")
+                    value = stage.default
+                _resolve(stage, value, submitted)
+
+                if stage.gate and value is not None:
+                    logger.debug(f"Stage '{stage.name}' short-circuited the turn")
+                    results.short_circuit = stage.name
+                    _abandon()
+                    running.clear()
+                    break
+
+            if results.short_circuit:
+                break
+
+            now = time.perf_counter()
+            for future, (stage, submitted) in list(running.items()):
+                if stage.timeout is not None and now - submitted >= stage.timeout:
+                    running.pop(future)
+                    future.cancel()
+                    if stage.critical:
+                        _abandon()
+                        raise StageTimeout(f"Stage '{stage.name}' timed out after {stage.timeout}s")
+                    logger.warning(f"Stage '{stage.name}' timed out after {stage.timeout}s (using default)")
+                    results.timed_out += (stage.name,)
+                    _resolve(stage, stage.default, submitted)
+
+            _submit_ready()
+
+        results.total_ms = (time.perf_counter() - started) * 1000
+        return results
+
+    @staticmethod
+    def _call(stage: Stage, kwargs: Dict[str, Any]) -> Any:
+        return stage.fn(**kwargs)
@@ -0,0 +1,287 @@
+"""
+Write-behind worker for post-turn side effects.
+
+Persistence and learning (semantic-memory save, personality/Hebbian updates,
+snapshots, forgetting decay) don't affect the reply the user is waiting for,
+so the pipeline hands them to this worker and returns. Tasks run one at a
+time in submission order on a single background thread.
+
+- Bounded: at most max_pending tasks are queued; a full queue blocks the
+  producer (backpressure) until the worker makes room. Tasks never skip the
+  queue, so a slow worker can't reorder writes.
+- Durable (optional): each task's payload is appended to a JSON-lines journal
+  before it is queued and acknowledged after it runs. Unacknowledged entries
+  are replayed, in order, the next time a worker opens the same journal.
+  Payloads can be encrypted with DataEncryption (they hold user text).
+- Read-your-writes: submit() returns a Future; callers that must observe a
+  write (e.g. the next turn's semantic search) wait on it.
+- Flush-on-shutdown: close() drains the queue; it is also registered atexit.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+# handler(payload, context) -> Any; context is None for journal replays
+Handler = Callable[[Dict[str, Any], Any], Any]
+
+
+class WriteBehindWorker:
+    """Ordered, bounded, optionally journaled background task queue"""
+
+    def __init__(
+        self,
+        handlers: Dict[str, Handler],
+        max_pending: int = 64,
+        block_timeout: float = 5.0,
+        journal_path: Optional[str] = None,
+        encryption: Any = None,
+        name: str = "write-behind"
+    ):
+        """
+        Start the worker (and replay any unfinished journal entries).
+
+        Args:
+            handlers: Task kind -> handler(payload, context)
+            max_pending: Queue capacity before submit() applies backpressure
+            block_timeout: Seconds between "queue still full" warnings while
+                           submit() waits on a full queue
+            journal_path: JSON-lines journal for durability (None = in-memory only)
+            encryption: Optional DataEncryption used for journaled payloads
+            name: Thread name
+        """
+        self.handlers = dict(handlers)
+        self.block_timeout = block_timeout
+        self.encryption = encryption
+        self.journal_path = Path(journal_path) if journal_path else None
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self._journal_lock = threading.Lock()
+        self._seq = 0
+        self._outstanding = set()  # journaled seqs not yet acknowledged
+        self._closed = False
+        self.stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "replayed": 0,
+            "backpressure_waits": 0,
+            "backpressure_stalls": 0,
+            "max_depth": 0
+        }
+
+        replay = self._load_journal() if self.journal_path else []
+
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+        for seq, kind, payload in replay:
+            self._queue.put((seq, kind, payload, None, Future()))
+            self.stats["replayed"] += 1
+        if replay:
+            logger.info(f"Replaying {len(replay)} unfinished post-turn task(s) from {self.journal_path}")
+
+    # ------------------------------------------------------------------
+    # Producer API
+    # ------------------------------------------------------------------
+
+    def submit(self, kind: str, payload: Dict[str, Any], context: Any = None) -> Future:
+        """
+        Enqueue a task.
+
+        Args:
+            kind: Handler name
+            payload: JSON-serializable task data (journaled)
+            context: Live, non-durable extras passed to the handler (not journaled)
+
+        Returns:
+            Future resolving to the handler's return value
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"No handler for task kind {kind!r}")
+
+        future: Future = Future()
+        if self._closed:
+            self._execute(kind, payload, context, future)
+            return future
+
+        try:
+            seq = self._journal_append(kind, payload)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Post-turn task '{kind}' not journaled (payload not serializable): {e}")
+            seq = None
+        self.stats["submitted"] += 1
+        item = (seq, kind, payload, context, future)
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.stats["backpressure_waits"] += 1
+            waited = 0.0
+            while True:
+                try:
+                    self._queue.put(item, timeout=self.block_timeout)
+                    break
+                except queue.Full:
+                    waited += self.block_timeout
+                    self.stats["backpressure_stalls"] += 1
+                    logger.warning(f"Post-turn queue still full after {waited:.1f}s; "
+                                   f"'{kind}' waiting for the worker")
+        self.stats["max_depth"] = max(self.stats["max_depth"], self._queue.qsize())
+        return future
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued task has run.
+
+        Returns:
+            True if the queue drained within timeout
+        """
+        if not self._thread.is_alive():
+            return self._queue.unfinished_tasks == 0
+        marker: Future = Future()
+        try:
+            self._queue.put((None, None, None, None, marker), timeout=timeout)
+        except queue.Full:
+            return False
+        try:
+            marker.result(timeout)
+            return True
+        except Exception:
+            return False
+
+    def close(self, timeout: Optional[float] = 30.0):
+        """Drain the queue and stop the worker thread"""
+        if self._closed:
+            return
+        self._closed = True
+        self.flush(timeout)
+        self._queue.put((None, _STOP, None, None, Future()))
+        self._thread.join(timeout)
+        try:
+            atexit.unregister(self.close)
+        except Exception:
+            pass
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        while True:
+            seq, kind, payload, context, future = self._queue.get()
+            try:
+                if kind is _STOP:
+                    return
+                if kind is None:  # flush marker
+                    future.set_result(True)
+                    continue
+                self._execute(kind, payload, context, future)
+                self._journal_ack(seq)
+            finally:
+                self._queue.task_done()
+
+    def _execute(self, kind: str, payload: Dict[str, Any], context: Any, future: Future):
+        start = time.perf_counter()
+        try:
+            result = self.handlers[kind](payload, context)
+        except Exception as e:
+            self.stats["failed"] += 1
+            logger.error(f"Post-turn task '{kind}' failed (non-fatal): {e}", exc_info=True)
+            future.set_exception(e)
+            return
+        self.stats["completed"] += 1
+        logger.debug(f"Post-turn task '{kind}' done in {(time.perf_counter() - start) * 1000:.0f}ms")
+        future.set_result(result)
+
+    # ------------------------------------------------------------------
+    # Journal
+    # ------------------------------------------------------------------
+
+    def _journal_append(self, kind: str, payload: Dict[str, Any]) -> Optional[int]:
+        if self.journal_path is None:
+            return None
+        with self._journal_lock:
+            seq = self._seq + 1
+            record = {"seq": seq, "kind": kind}
+            if self.encryption is not None:
+                record["enc"] = self.encryption.encrypt_dict(payload)
+            else:
+                record["payload"] = payload
+            self._write_line(record)
+            self._seq = seq
+            self._outstanding.add(seq)
+            return seq
+
+    def _journal_ack(self, seq: Optional[int]):
+        if seq is None or self.journal_path is None:
+            return
+        with self._journal_lock:
+            self._outstanding.discard(seq)
+            # Once nothing is outstanding the journal carries no information; reset it
+            if not self._outstanding:
+                self.journal_path.write_text("")
+            else:
+                self._write_line({"ack": seq})
+
+    def _write_line(self, record: Dict[str, Any]):
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _load_journal(self) -> List[tuple]:
+        """Unacknowledged (seq, kind, payload) entries, oldest first"""
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.journal_path.exists():
+            return []
+
+        entries: Dict[int, tuple] = {}
+        acked = set()
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning("Skipping torn post-turn journal line")
+                    continue
+                if "ack" in record:
+                    acked.add(record["ack"])
+                    continue
+                try:
+                    payload = (self.encryption.decrypt_dict(record["enc"]) if "enc" in record
+                               else record["payload"])
+                except Exception as e:
+                    logger.warning(f"Skipping unreadable post-turn journal entry: {e}")
+                    continue
+                if record["kind"] in self.handlers:
+                    entries[record["seq"]] = (record["seq"], record["kind"], payload)
+
+        replay = [entries[seq] for seq in sorted(entries) if seq not in acked]
+        self._seq = max(entries, default=0)
+
+        # Rewrite the journal with just the outstanding entries
+        self.journal_path.write_text("")
+        for seq, kind, payload in replay:
+            record = {"seq": seq, "kind": kind}
+            if self.encryption is not None:
+                record["enc"] = self.encryption.encrypt_dict(payload)
+            else:
+                record["payload"] = payload
+            self._write_line(record)
+            self._outstanding.add(seq)
+        return replay
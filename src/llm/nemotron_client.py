@@ -1,13 +1,22 @@
 """
 Nemotron-3 Nano LLM Client
 Local inference using Ollama with intelligent reasoning mode detection
+
+Talks to the Ollama HTTP API (/api/chat) over a pooled keep-alive session
+rather than spawning ``ollama run`` per completion, and pins the model in
+memory with ``keep_alive`` so fallback latency approaches raw model latency.
 """
 
 import logging
-from typing import Dict, Any, Optional, List
-import subprocess
+import os
+import re
+import threading
+from typing import Callable, Dict, Any, Iterator, Optional, List
 import json
 
+import requests
+from requests.adapters import HTTPAdapter
+
 logger = logging.getLogger(__name__)
 
 # Import reasoning detector
@@ -19,6 +28,143 @@ except ImportError:
     logger.warning("Reasoning detector not available, using static mode")
 
 
+def _partial_tag(text: str, tag: str) -> int:
+    """Length of the longest suffix of text that is a proper prefix of tag"""
+    for size in range(min(len(tag) - 1, len(text)), 0, -1):
+        if text.endswith(tag[:size]):
+            return size
+    return 0
+
+
+class _ReasoningTraceFilter:
+    """
+    Streaming counterpart of NemotronClient._clean_reasoning_traces.
+
+    Text is released as soon as the batch cleanup could no longer remove it.
+    It is held back only while it might still be one of the following:
+    - a <think>/</think> tag split across chunks;
+    - the start of a line that may be a reasoning prefix ("We need to ...");
+    - a leading "Thinking..." preamble that runs until "done thinking.".
+    Lines come out stripped, with blank lines dropped, as in the batch cleanup.
+    """
+
+    OPEN, CLOSE = "<think>", "</think>"
+    LINE_PREFIXES = ("Let me think", "I need to", "We need to")
+    PREAMBLE = "Thinking"
+    PREAMBLE_END = re.compile(r"done thinking\.\s*")
+
+    def __init__(self, cleanup: Callable[[str], str]):
+        """
+        Args:
+            cleanup: Batch cleanup, applied to a "Thinking" preamble that never ends
+        """
+        self._cleanup = cleanup
+        self._raw = ""           # tag-level text not yet classified
+        self._in_think = False
+        self._mode = "start"     # start | released | skip | preamble
+        self._line = ""          # undecided (or skipped) start of the current line
+        self._held_space = ""    # trailing whitespace of the released line
+        self._preamble = ""
+        self._emitted = False
+
+    def feed(self, text: str) -> str:
+        """Add a chunk; returns the text that is now safe to emit"""
+        self._raw += text
+        out = []
+        while self._raw:
+            if self._in_think:
+                end = self._raw.find(self.CLOSE)
+                if end == -1:
+                    self._raw = self._raw[len(self._raw) - _partial_tag(self._raw, self.CLOSE):]
+                    break
+                self._raw = self._raw[end + len(self.CLOSE):]
+                self._in_think = False
+                continue
+            start = self._raw.find(self.OPEN)
+            if start == -1:
+                ready = len(self._raw) - _partial_tag(self._raw, self.OPEN)
+                out.append(self._lines(self._raw[:ready]))
+                self._raw = self._raw[ready:]
+                break
+            out.append(self._lines(self._raw[:start]))
+            self._raw = self._raw[start + len(self.OPEN):]
+            self._in_think = True
+        return "".join(out)
+
+    def flush(self) -> str:
+        """End of stream: release whatever is still held back"""
+        out = "" if self._in_think else self._lines(self._raw)  # an unclosed <think> is dropped
+        self._raw = ""
+        if self._mode == "preamble":
+            rest = self._cleanup(self._preamble)
+            out += self._release(rest) if rest else ""
+        elif self._mode in ("start", "skip") and self._line.strip():
+            # Like the batch regexes, a reasoning prefix only drops a finished line
+            out += self._release(self._line.rstrip())
+        self._mode, self._line, self._preamble = "start", "", ""
+        return out
+
+    def _release(self, line: str) -> str:
+        text = ("\n" if self._emitted else "") + line
+        self._emitted = True
+        return text
+
+    def _lines(self, text: str) -> str:
+        out = []
+        while text:
+            if self._mode == "preamble":
+                self._preamble += text
+                text = ""
+                match = self.PREAMBLE_END.search(self._preamble)
+                if match:
+                    text, self._preamble, self._mode = self._preamble[match.end():], "", "start"
+                continue
+
+            newline = text.find("\n")
+            segment, rest = (text, "") if newline == -1 else (text[:newline], text[newline + 1:])
+
+            if self._mode == "released":
+                body = segment.rstrip()
+                if body:
+                    out.append(self._held_space + body)
+                    self._held_space = segment[len(body):]
+                else:
+                    self._held_space += segment
+                if newline != -1:
+                    self._mode, self._held_space = "start", ""
+                text = rest
+                continue
+
+            self._line = (self._line + segment).lstrip()
+            if self._mode == "skip":
+                if newline != -1:
+                    self._mode, self._line = "start", ""
+                text = rest
+                continue
+
+            # Start of a line: is it reasoning?
+            candidates = self.LINE_PREFIXES + (() if self._emitted else (self.PREAMBLE,))
+            if not self._emitted and self._line.startswith(self.PREAMBLE):
+                self._mode, text, self._line = "preamble", self._line + ("\n" + rest if newline != -1 else ""), ""
+                continue
+            if any(self._line.startswith(p) for p in self.LINE_PREFIXES):
+                self._mode = "skip"
+                if newline != -1:
+                    self._mode, self._line = "start", ""
+                text = rest
+                continue
+            if newline == -1 and any(p.startswith(self._line) for p in candidates):
+                break  # could still become a reasoning line; wait for more text
+            if self._line.strip():
+                body = self._line.rstrip()
+                out.append(self._release(body))
+                self._held_space = self._line[len(body):]
+                self._mode = "released" if newline == -1 else "start"
+            self._line = ""
+            text = rest
+        return "".join(out)
+
+
 class NemotronClient:
     """Client for NVIDIA Nemotron-3 Nano via Ollama"""
 
@@ -27,7 +173,11 @@ class NemotronClient:
         model_name: str = "nemotron-3-nano:latest",
         reasoning_mode: bool = "auto",
         temperature: float = 0.7,
-        max_tokens: int = 2048
+        max_tokens: int = 2048,
+        base_url: Optional[str] = None,
+        keep_alive: str = "30m",
+        timeout: float = 180,
+        pool_size: int = 4
     ):
         """
         Initialize Nemotron client.
@@ -37,11 +187,31 @@ class NemotronClient:
             reasoning_mode: Enable reasoning traces - True/False or "auto" for intelligent detection (default: "auto")
             temperature: Sampling temperature (default: 0.7)
             max_tokens: Max tokens to generate (default: 2048)
+            base_url: Ollama server URL (default: $OLLAMA_HOST or http://localhost:11434)
+            keep_alive: How long Ollama keeps the model loaded after each request (default: "30m")
+            timeout: Read timeout in seconds for a generation (default: 180)
+            pool_size: Max pooled keep-alive connections (default: 4)
         """
         self.model_name = model_name
         self.reasoning_mode = reasoning_mode  # Can be True, False, or "auto"
         self.temperature = temperature
         self.max_tokens = max_tokens
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+
+        base_url = base_url or os.getenv("OLLAMA_HOST") or "http://localhost:11434"
+        if not base_url.startswith(("http://", "https://")):
+            base_url = f"http://{base_url}"
+        base_url = base_url.rstrip("/")
+        if base_url.endswith("/v1"):
+            base_url = base_url[:-len("/v1")]  # accept the OpenAI-compatible URL too
+        self.base_url = base_url
+
+        # One pooled session for the client's lifetime: TCP + HTTP keep-alive
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
 
         # Verify model is available
         self._verify_model()
@@ -52,28 +222,40 @@ class NemotronClient:
     def _verify_model(self):
         """Verify Nemotron model is available"""
         try:
-            result = subprocess.run(
-                ["ollama", "list"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
+            r = self._session.get(f"{self.base_url}/api/tags", timeout=5)
+            r.raise_for_status()
+            names = [m.get("name", "") for m in r.json().get("models", [])]
 
-            if self.model_name not in result.stdout and "nemotron-3-nano" not in result.stdout:
+            if self.model_name not in names and not any("nemotron-3-nano" in n for n in names):
                 raise RuntimeError(
                     f"Model {self.model_name} not found. "
                     f"Run: ollama pull nemotron-3-nano:latest"
                 )
 
             logger.info(f"Model {self.model_name} is available")
-        except FileNotFoundError:
+        except requests.ConnectionError:
             raise RuntimeError(
-                "Ollama not found. Install: curl -fsSL https://ollama.com/install.sh | sh"
+                f"Ollama not reachable at {self.base_url}. Start it with `ollama serve` "
+                "(install: curl -fsSL https://ollama.com/install.sh | sh)"
             )
         except Exception as e:
             logger.error(f"Failed to verify model: {e}")
             raise
 
+    def warm_up(self):
+        """Load the model into memory and pin it for keep_alive (empty generate request)"""
+        r = self._session.post(
+            f"{self.base_url}/api/generate",
+            json={"model": self.model_name, "keep_alive": self.keep_alive},
+            timeout=self.timeout
+        )
+        r.raise_for_status()
+        logger.info(f"Model {self.model_name} loaded (keep_alive={self.keep_alive})")
+
+    def close(self):
+        """Close pooled connections"""
+        self._session.close()
+
     def complete(
         self,
         prompt: str,
@@ -112,57 +294,147 @@ class NemotronClient:
         Returns:
             Generated response text
         """
-        # Handle both string prompts and message lists
-        if isinstance(prompt_or_messages, str):
-            prompt = prompt_or_messages
-            user_query = prompt_or_messages  # For reasoning detection
-        else:
-            # Build prompt from messages
-            prompt = self._build_prompt(prompt_or_messages, system_prompt)
-            # Extract user query for reasoning detection
-            user_query = next((msg.get("content", "") for msg in reversed(prompt_or_messages) if msg.get("role") == "user"), "")
+        messages, user_query = self._to_messages(prompt_or_messages, system_prompt)
 
         # Determine if we should use reasoning for this specific query
         use_reasoning = self._should_use_reasoning_for_query(user_query)
 
-        # Use provided values or defaults
-        temp = temperature if temperature is not None else self.temperature
-
-        # Call Ollama via subprocess
+        # Call Ollama over the pooled HTTP session
         try:
-            # Build command with options
-            cmd = ["ollama", "run", self.model_name]
-
-            # Run with timeout (increased for long prompts)
-            result = subprocess.run(
-                cmd,
-                input=prompt,
-                capture_output=True,
-                text=True,
-                timeout=180  # 3 minute timeout for long complex prompts
+            r = self._session.post(
+                f"{self.base_url}/api/chat",
+                json=self._chat_body(messages, temperature, max_tokens, stream=False),
+                timeout=(5, self.timeout)
             )
+            if r.status_code != 200:
+                error_msg = self._error_message(r)
+                logger.error(f"Ollama error: {error_msg}")
+                raise RuntimeError(f"Generation failed: {error_msg}")
 
-            if result.returncode == 0:
-                response = result.stdout.strip()
+            response = (r.json().get("message") or {}).get("content", "").strip()
 
-                # ALWAYS strip reasoning traces for clean output
-                # Nemotron outputs thinking in various formats - remove all of them
-                response = self._clean_reasoning_traces(response)
+            # ALWAYS strip reasoning traces for clean output
+            # Nemotron outputs thinking in various formats - remove all of them
+            response = self._clean_reasoning_traces(response)
 
-                logger.debug(f"Generated {len(response)} chars (reasoning={use_reasoning})")
-                return response
-            else:
-                error_msg = result.stderr.strip()
-                logger.error(f"Ollama error: {error_msg}")
-                raise RuntimeError(f"Generation failed: {error_msg}")
+            logger.debug(f"Generated {len(response)} chars (reasoning={use_reasoning})")
+            return response
 
-        except subprocess.TimeoutExpired:
-            logger.error("Generation timed out (>180s)")
-            raise RuntimeError("Generation timed out after 180 seconds")
+        except requests.Timeout:
+            logger.error(f"Generation timed out (>{self.timeout:.0f}s)")
+            raise RuntimeError(f"Generation timed out after {self.timeout:.0f} seconds")
         except Exception as e:
             logger.error(f"Generation failed: {e}")
             raise
-    
+
+    def stream(
+        self,
+        prompt_or_messages,
+        system_prompt: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Iterator[str]:
+        """
+        Stream response text as Ollama generates it.
+
+        Reasoning traces are dropped on the fly with the same rules as
+        _clean_reasoning_traces, including <think> tags split across
+        chunks (see _ReasoningTraceFilter). Setting cancel_event
+        (or closing the generator) closes the HTTP response, which makes
+        Ollama stop generating.
+
+        Args:
+            prompt_or_messages: Either a string prompt or list of message dicts
+            system_prompt: Optional system prompt
+            temperature: Override default temperature
+            max_tokens: Override default max tokens
+            cancel_event: Barge-in signal checked between chunks
+
+        Yields:
+            Text fragments in generation order
+        """
+        messages, _ = self._to_messages(prompt_or_messages, system_prompt)
+        r = self._session.post(
+            f"{self.base_url}/api/chat",
+            json=self._chat_body(messages, temperature, max_tokens, stream=True),
+            timeout=(5, self.timeout),
+            stream=True
+        )
+        try:
+            if r.status_code != 200:
+                raise RuntimeError(f"Generation failed: {self._error_message(r)}")
+
+            traces = _ReasoningTraceFilter(self._clean_reasoning_traces)
+            cancelled = False
+            for line in r.iter_lines(chunk_size=None):
+                if cancel_event is not None and cancel_event.is_set():
+                    logger.debug("Stream cancelled")
+                    cancelled = True
+                    break
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if chunk.get("error"):
+                    raise RuntimeError(f"Generation failed: {chunk['error']}")
+
+                text = traces.feed((chunk.get("message") or {}).get("content", ""))
+                if text:
+                    yield text
+
+                if chunk.get("done"):
+                    break
+            if not cancelled:
+                text = traces.flush()
+                if text:
+                    yield text
+        finally:
+            r.close()
+
+    def _to_messages(self, prompt_or_messages, system_prompt: Optional[str] = None):
+        """Normalize a prompt or message list; returns (messages, user_query)"""
+        # Handle both string prompts and message lists
+        if isinstance(prompt_or_messages, str):
+            messages = [{"role": "user", "content": prompt_or_messages}]
+            user_query = prompt_or_messages  # For reasoning detection
+        else:
+            messages = [
+                {"role": msg.get("role", "user"), "content": msg.get("content", "")}
+                for msg in prompt_or_messages
+            ]
+            # Extract user query for reasoning detection
+            user_query = next((msg.get("content", "") for msg in reversed(prompt_or_messages) if msg.get("role") == "user"), "")
+
+        if system_prompt:
+            messages.insert(0, {"role": "system", "content": system_prompt})
+        return messages, user_query
+
+    def _chat_body(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        stream: bool
+    ) -> Dict[str, Any]:
+        # Use provided values or defaults
+        return {
+            "model": self.model_name,
+            "messages": messages,
+            "stream": stream,
+            "keep_alive": self.keep_alive,
+            "options": {
+                "temperature": temperature if temperature is not None else self.temperature,
+                "num_predict": max_tokens if max_tokens is not None else self.max_tokens,
+            },
+        }
+
+    @staticmethod
+    def _error_message(response: requests.Response) -> str:
+        try:
+            return response.json().get("error") or response.text
+        except ValueError:
+            return response.text.strip() or f"HTTP {response.status_code}"
+
     def _clean_reasoning_traces(self, response: str) -> str:
         """
         Remove reasoning traces from Nemotron output.
@@ -239,35 +511,6 @@ class NemotronClient:
             # Fall back to no reasoning if detector not available
             return False
 
-    def _build_prompt(
-        self,
-        messages: List[Dict[str, str]],
-        system_prompt: Optional[str] = None
-    ) -> str:
-        """Build prompt from messages"""
-        prompt_parts = []
-
-        # Add system prompt if provided
-        if system_prompt:
-            prompt_parts.append(f"System: {system_prompt}\n")
-
-        # Add messages
-        for msg in messages:
-            role = msg.get("role", "user")
-            content = msg.get("content", "")
-
-            if role == "system":
-                prompt_parts.append(f"System: {content}\n")
-            elif role == "user":
-                prompt_parts.append(f"User: {content}\n")
-            elif role == "assistant":
-                prompt_parts.append(f"Assistant: {content}\n")
-
-        # Add final assistant prompt
-        prompt_parts.append("Assistant:")
-
-        return "\n".join(prompt_parts)
-
     def chat_completion(
         self,
         messages: List[Dict[str, str]],
@@ -308,11 +551,14 @@ class NemotronClient:
 # Factory function
 def create_nemotron_client(
     reasoning_mode: bool = True,
-    temperature: float = 0.7
+    temperature: float = 0.7,
+    model_name: str = "nemotron-3-nano:latest",
+    **kwargs
 ) -> NemotronClient:
-    """Create and return a NemotronClient instance"""
+    """Create and return a NemotronClient instance (kwargs: base_url, keep_alive, timeout, ...)"""
     return NemotronClient(
-        model_name="nemotron-3-nano:latest",
+        model_name=model_name,
         reasoning_mode=reasoning_mode,
-        temperature=temperature
+        temperature=temperature,
+        **kwargs
     )
@@ -0,0 +1,175 @@
+"""
+Prefix-stable prompt assembly
+
+Local inference servers (llama.cpp, LM Studio, Ollama) keep the KV cache of the
+previous request and only re-prefill from the first token that differs. A
+prompt that interleaves per-turn content (conversation context, semantic hits,
+emotion) with static blocks (tool manifest, response requirements) therefore
+invalidates almost the whole cache every turn.
+
+PromptAssembler orders sections from most static to most volatile, memoises
+static blocks, and measures how much of each prompt is a shared prefix with the
+previous one (prefix_hit_ratio), which approximates the share of prefill the
+server can skip. Chat adapters should measure the whole message list they send
+(render_messages + measure), since the system message is part of the prefix.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Section tiers, most static first
+STATIC = 0    # identical across turns and sessions (persona, tool manifest, requirements)
+SESSION = 1   # changes occasionally (learned personality, research mode, user beliefs)
+TURN = 2      # changes every turn (history, memory hits, emotion, research, query)
+
+SECTION_SEPARATOR = "\n\n"
+
+
+@dataclass
+class PromptSection:
+    """One block of the prompt"""
+    name: str
+    text: str
+    tier: int = TURN
+
+
+@dataclass
+class AssembledPrompt:
+    """Result of PromptAssembler.assemble()"""
+    text: str
+    sections: List[str] = field(default_factory=list)   # section names, in prompt order
+    static_chars: int = 0          # length of the STATIC-tier prefix
+    prefix_hit_chars: int = 0      # chars shared with the previous prompt's start
+    prefix_hit_ratio: float = 0.0  # prefix_hit_chars / len(text)
+
+
+def common_prefix_length(a: str, b: str) -> int:
+    """Length of the longest common prefix of two strings"""
+    limit = min(len(a), len(b))
+    if a[:limit] == b[:limit]:
+        return limit
+    lo, hi = 0, limit
+    while lo < hi:  # binary search on slice equality (C-speed compares)
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def render_messages(messages: List[Dict[str, str]]) -> str:
+    """Flatten a chat message list in send order, for prefix measurement"""
+    return SECTION_SEPARATOR.join(
+        f"{m.get('role', '')}: {m.get('content') or ''}" for m in messages
+    )
+
+
+class PromptAssembler:
+    """
+    Orders prompt sections by volatility and tracks prefix reuse between turns.
+
+    Usage:
+        assembler = PromptAssembler()
+        manifest = assembler.static_block("tool_manifest", registry.get_tool_manifest)
+        prompt = assembler.assemble([
+            PromptSection("user_query", f"User query: {text}", TURN),
+            PromptSection("tools", manifest, STATIC),
+        ])
+        prompt.prefix_hit_ratio
+    """
+
+    def __init__(self, separator: str = SECTION_SEPARATOR):
+        """
+        Args:
+            separator: Joined between non-empty sections
+        """
+        self.separator = separator
+        self._static_blocks: Dict[str, str] = {}
+        self._last_text = ""
+        self._lock = threading.Lock()
+        self.stats = {
+            "prompts": 0,
+            "prompt_chars": 0,
+            "prefix_hit_chars": 0
+        }
+
+    def static_block(self, name: str, factory: Callable[[], str]) -> str:
+        """
+        Build a static block once and reuse the exact same text afterwards.
+
+        Args:
+            name: Cache key
+            factory: Zero-argument callable producing the block
+
+        Returns:
+            The memoised block text
+        """
+        block = self._static_blocks.get(name)
+        if block is None:
+            block = factory() or ""
+            self._static_blocks[name] = block
+        return block
+
+    def invalidate(self, name: Optional[str] = None):
+        """Drop one memoised static block (or all of them), e.g. after tools change"""
+        if name is None:
+            self._static_blocks.clear()
+        else:
+            self._static_blocks.pop(name, None)
+
+    def assemble(self, sections: List[PromptSection]) -> AssembledPrompt:
+        """
+        Join sections, most static tier first (order within a tier is preserved).
+
+        Args:
+            sections: Sections in any order; empty ones are skipped
+
+        Returns:
+            AssembledPrompt with prefix-reuse figures against the previous call
+        """
+        ordered = sorted((s for s in sections if s.text), key=lambda s: s.tier)
+        text = self.separator.join(s.text for s in ordered)
+
+        static = [s.text for s in ordered if s.tier == STATIC]
+        static_chars = len(self.separator.join(static)) if static else 0
+
+        hit, ratio = self.measure(text)
+        return AssembledPrompt(
+            text=text,
+            sections=[s.name for s in ordered],
+            static_chars=static_chars,
+            prefix_hit_chars=hit,
+            prefix_hit_ratio=ratio
+        )
+
+    def measure(self, text: str) -> Tuple[int, float]:
+        """
+        Record prefix reuse of a fully rendered prompt against the previous one.
+
+        Args:
+            text: Exactly what is sent, e.g. render_messages(body["messages"])
+
+        Returns:
+            (prefix_hit_chars, prefix_hit_ratio)
+        """
+        with self._lock:
+            hit = common_prefix_length(self._last_text, text)
+            self._last_text = text
+            self.stats["prompts"] += 1
+            self.stats["prompt_chars"] += len(text)
+            self.stats["prefix_hit_chars"] += hit
+        return hit, hit / len(text) if text else 0.0
+
+    def get_stats(self) -> Dict[str, float]:
+        with self._lock:
+            chars = self.stats["prompt_chars"]
+            return {
+                **self.stats,
+                "static_blocks": len(self._static_blocks),
+                "avg_prefix_hit_ratio": self.stats["prefix_hit_chars"] / chars if chars else 0.0
+            }
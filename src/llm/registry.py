@@ -4,7 +4,7 @@ Config-driven LLM registry.
 One seam for selecting and constructing the active language model, so adding a
 model is a config change (penny_config.json) rather than code. Standardized on
 OpenAI-compatible local serving (LM Studio / Ollama /v1 / vLLM / llama.cpp),
-with the legacy Ollama-subprocess (Nemotron) client kept as a fallback provider.
+with the native Ollama HTTP (Nemotron) client kept as a fallback provider.
 
 Config shape (penny_config.json -> "llm"):
 
@@ -99,7 +99,7 @@ def create_llm(config: Optional[Dict[str, Any]] = None, model_name: Optional[str
     Construct the active LLM client from config.
 
     Standardized on OpenAI-compatible serving; ``provider: ollama``/``nemotron``
-    falls back to the legacy subprocess client.
+    falls back to the native Ollama HTTP client.
     """
     if config is None:
         config = load_llm_config()
@@ -123,6 +123,8 @@ def create_llm(config: Optional[Dict[str, Any]] = None, model_name: Optional[str
             model_name=llm.get("model", "nemotron-3-nano:latest"),
             reasoning_mode=llm.get("reasoning_mode", "auto"),
             temperature=float(llm.get("temperature", 0.7)),
+            base_url=llm.get("base_url"),
+            keep_alive=llm.get("keep_alive", "30m"),
         )
 
     raise ValueError(f"Unknown LLM provider: {provider!r}")
@@ -0,0 +1,178 @@
+"""
+Approximate-Nearest-Neighbour Index Tier
+IVF / HNSW acceleration structures layered over VectorStore's exact index
+
+The exact IndexFlatIP stays the source of truth (it is what gets persisted);
+an AnnIndex is a derived structure that VectorStore builds in the background
+once the store grows past a size threshold, then hot-swaps in for search.
+"""
+
+import time
+import numpy as np
+import faiss
+from typing import Dict, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+ANN_KINDS = ('hnsw', 'ivf')
+
+
+class AnnIndex:
+    """IVF or HNSW index over (vector, id) pairs with tunable recall/latency"""
+
+    def __init__(
+        self,
+        embedding_dim: int,
+        kind: str = "hnsw",
+        nprobe: int = 16,
+        ef_search: int = 64,
+        hnsw_m: int = 32,
+        nlist: Optional[int] = None
+    ):
+        """
+        Initialize an (empty, unbuilt) ANN index.
+
+        Args:
+            embedding_dim: Dimension of embedding vectors
+            kind: 'hnsw' (graph, no training) or 'ivf' (inverted lists, trained)
+            nprobe: IVF lists probed per query (higher = better recall, slower)
+            ef_search: HNSW candidate-list size per query (higher = better recall, slower)
+            hnsw_m: HNSW graph degree
+            nlist: IVF list count (default: 4 * sqrt(n) at build time)
+        """
+        if kind not in ANN_KINDS:
+            raise ValueError(f"Unknown ANN index kind {kind!r} (expected one of {ANN_KINDS})")
+
+        self.embedding_dim = int(embedding_dim)
+        self.kind = kind
+        self.nprobe = int(nprobe)
+        self.ef_search = int(ef_search)
+        self.hnsw_m = int(hnsw_m)
+        self.nlist = nlist
+        self._inner = None
+        self.index = None
+
+    def build(self, vectors: np.ndarray, ids: np.ndarray):
+        """
+        Build the index from a snapshot of normalized vectors.
+
+        Args:
+            vectors: float32 array of shape [n, embedding_dim]
+            ids: int64 array of shape [n] with the store IDs of each vector
+        """
+        vectors = np.ascontiguousarray(vectors, dtype='float32')
+        ids = np.ascontiguousarray(ids, dtype='int64')
+        n = vectors.shape[0]
+
+        if self.kind == 'hnsw':
+            inner = faiss.IndexHNSWFlat(self.embedding_dim, self.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+        else:
+            nlist = self.nlist or max(1, int(4 * np.sqrt(n)))
+            nlist = min(nlist, n)
+            quantizer = faiss.IndexFlatIP(self.embedding_dim)
+            inner = faiss.IndexIVFFlat(quantizer, self.embedding_dim, nlist, faiss.METRIC_INNER_PRODUCT)
+            inner.train(vectors)
+
+        index = faiss.IndexIDMap2(inner)
+        index.add_with_ids(vectors, ids)
+
+        self._inner = inner
+        self.index = index
+        self.set_search_params()
+        logger.info(f"Built {self.kind.upper()} index over {n} vectors")
+
+    def set_search_params(self, nprobe: Optional[int] = None, ef_search: Optional[int] = None):
+        """Update the recall/latency knobs (takes effect on the next search)"""
+        if nprobe is not None:
+            self.nprobe = int(nprobe)
+        if ef_search is not None:
+            self.ef_search = int(ef_search)
+
+        if self._inner is None:
+            return
+        if self.kind == 'hnsw':
+            self._inner.hnsw.efSearch = self.ef_search
+        else:
+            self._inner.nprobe = self.nprobe
+
+    def add(self, vectors: np.ndarray, ids: np.ndarray):
+        """Add vectors that arrived after the build snapshot"""
+        self.index.add_with_ids(
+            np.ascontiguousarray(vectors, dtype='float32'),
+            np.ascontiguousarray(ids, dtype='int64')
+        )
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Search; returns (similarities, ids) like faiss.Index.search"""
+        return self.index.search(np.ascontiguousarray(queries, dtype='float32'), k)
+
+    @property
+    def ntotal(self) -> int:
+        return 0 if self.index is None else self.index.ntotal
+
+    def widen(self) -> bool:
+        """
+        Double the active search knob for better recall.
+
+        Returns:
+            False when the knob is already at its useful maximum
+        """
+        if self.kind == 'hnsw':
+            if self.ef_search >= 1024:
+                return False
+            self.set_search_params(ef_search=self.ef_search * 2)
+        else:
+            if self.nprobe >= self._inner.nlist:
+                return False
+            self.set_search_params(nprobe=min(self.nprobe * 2, self._inner.nlist))
+        return True
+
+
+def measure_recall(
+    ann: AnnIndex,
+    vectors: np.ndarray,
+    ids: np.ndarray,
+    queries: np.ndarray,
+    k: int = 10
+) -> Dict[str, float]:
+    """
+    Compare ANN results against brute-force search on a sample of queries.
+
+    Args:
+        ann: Built AnnIndex
+        vectors: The exact vectors the ANN index was built from
+        ids: Store IDs for each row of vectors
+        queries: float32 array of shape [q, embedding_dim]
+        k: Neighbours per query
+
+    Returns:
+        Dict with recall@k and p95 search latency (ms) for both tiers
+    """
+    k = min(k, len(vectors))
+    if k == 0 or len(queries) == 0:
+        return {'recall': 1.0, 'ann_p95_ms': 0.0, 'exact_p95_ms': 0.0, 'queries': 0}
+
+    hits = 0
+    ann_ms = []
+    exact_ms = []
+    for query in queries:
+        query = np.ascontiguousarray(query.reshape(1, -1), dtype='float32')
+
+        start = time.perf_counter()
+        _, exact_rows = faiss.knn(query, vectors, k, metric=faiss.METRIC_INNER_PRODUCT)
+        exact_ms.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        _, ann_ids = ann.search(query, k)
+        ann_ms.append((time.perf_counter() - start) * 1000)
+
+        truth = set(int(ids[row]) for row in exact_rows[0] if row != -1)
+        hits += len(truth.intersection(int(i) for i in ann_ids[0] if i != -1))
+
+    return {
+        'recall': hits / float(k * len(queries)),
+        'ann_p95_ms': float(np.percentile(ann_ms, 95)),
+        'exact_p95_ms': float(np.percentile(exact_ms, 95)),
+        'queries': len(queries)
+    }
@@ -0,0 +1,176 @@
+"""
+Embedding Cache
+Content-hash keyed cache for sentence embeddings
+
+Two tiers:
+- EmbeddingCache: in-memory LRU (always on)
+- DiskEmbeddingCache: optional mmap-backed tier that survives restarts. Vectors
+  live in a fixed-capacity float32 memmap used as a ring buffer; a small SQLite
+  table maps content hash -> slot.
+"""
+
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def embedding_key(model_name: str, text: str, normalize: bool) -> str:
+    """Content hash identifying one (model, text, normalization) embedding"""
+    digest = hashlib.sha1()
+    digest.update(model_name.encode('utf-8'))
+    digest.update(b'\x00n' if normalize else b'\x00r')
+    digest.update(text.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class DiskEmbeddingCache:
+    """mmap-backed on-disk embedding tier with ring-buffer eviction"""
+
+    def __init__(self, cache_dir: str, embedding_dim: int, capacity: int = 100000):
+        """
+        Open (or create) the on-disk tier.
+
+        Args:
+            cache_dir: Directory holding vectors.f32 and index.db
+            embedding_dim: Dimension of stored embeddings
+            capacity: Maximum number of embeddings kept on disk
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.embedding_dim = int(embedding_dim)
+        self.capacity = int(capacity)
+        self._lock = threading.Lock()
+
+        vectors_path = self.cache_dir / "vectors.f32"
+        mode = 'r+' if vectors_path.exists() else 'w+'
+        self._vectors = np.memmap(
+            vectors_path, dtype='float32', mode=mode,
+            shape=(self.capacity, self.embedding_dim)
+        )
+
+        self._conn = sqlite3.connect(str(self.cache_dir / "index.db"), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, slot INTEGER UNIQUE)"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER)")
+        row = self._conn.execute("SELECT value FROM meta WHERE name = 'next_slot'").fetchone()
+        self._next_slot = row[0] if row else 0
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            row = self._conn.execute("SELECT slot FROM embeddings WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            return np.array(self._vectors[row[0]])
+
+    def put_many(self, items: Dict[str, np.ndarray]):
+        """Write several embeddings in one transaction, overwriting the oldest slots"""
+        if not items:
+            return
+        with self._lock:
+            for key, vector in items.items():
+                if self._conn.execute("SELECT 1 FROM embeddings WHERE key = ?", (key,)).fetchone():
+                    continue
+                slot = self._next_slot % self.capacity
+                self._next_slot = slot + 1
+                self._conn.execute("DELETE FROM embeddings WHERE slot = ?", (slot,))
+                self._conn.execute("INSERT INTO embeddings (key, slot) VALUES (?, ?)", (key, slot))
+                self._vectors[slot] = vector
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES ('next_slot', ?)", (self._next_slot,)
+            )
+            self._vectors.flush()
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._vectors.flush()
+            self._conn.close()
+
+
+class EmbeddingCache:
+    """
+    In-memory LRU of embeddings, optionally backed by a DiskEmbeddingCache.
+
+    Disk hits are promoted into the LRU so repeated lookups stay in memory.
+    """
+
+    def __init__(self, max_entries: int = 4096, disk: Optional[DiskEmbeddingCache] = None):
+        """
+        Initialize cache.
+
+        Args:
+            max_entries: LRU capacity (number of embeddings)
+            disk: Optional on-disk tier consulted on memory misses
+        """
+        self.max_entries = int(max_entries)
+        self.disk = disk
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {
+            "hits": 0,
+            "disk_hits": 0,
+            "misses": 0
+        }
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return vector
+
+        if self.disk is not None:
+            vector = self.disk.get(key)
+            if vector is not None:
+                with self._lock:
+                    self.stats["disk_hits"] += 1
+                    self._insert(key, vector)
+                return vector
+
+        with self._lock:
+            self.stats["misses"] += 1
+        return None
+
+    def put_many(self, items: Dict[str, np.ndarray]):
+        with self._lock:
+            for key, vector in items.items():
+                self._insert(key, vector)
+        if self.disk is not None:
+            self.disk.put_many(items)
+
+    def _insert(self, key: str, vector: np.ndarray):
+        """Insert into the LRU (caller holds the lock)"""
+        vector = np.array(vector, dtype='float32')
+        vector.setflags(write=False)  # shared between callers; keep it immutable
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["disk_hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "entries": len(self._entries),
+                "hit_rate": (self.stats["hits"] + self.stats["disk_hits"]) / lookups if lookups else 0.0
+            }
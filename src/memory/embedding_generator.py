@@ -1,42 +1,174 @@
 """
 Embedding Generator for Semantic Search
 Generates 384-dimensional embeddings using sentence-transformers
+
+Every text is looked up in a content-hash keyed EmbeddingCache first, so a turn
+that encodes the same text twice (search query, then the stored turn, then
+find_similar_conversations) pays for one forward pass. Cache misses go through
+an EncodeBatcher that coalesces concurrent callers (web server, research,
+memory) into a single batched model.encode call.
 """
 
 import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
 import numpy as np
 from sentence_transformers import SentenceTransformer
-from typing import List, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 import logging
 
+from src.memory.embedding_cache import DiskEmbeddingCache, EmbeddingCache, embedding_key
+
 # Set HuggingFace cache to local project directory
 os.environ['HF_HOME'] = os.path.join(os.path.dirname(__file__), '..', '..', '.cache', 'huggingface')
 
 logger = logging.getLogger(__name__)
 
 
+class EncodeBatcher:
+    """
+    Micro-batching queue in front of a batch encode function.
+
+    The first queued request opens a window of max_wait_ms; everything queued
+    before it closes (up to max_batch_size texts) is encoded in one call.
+    """
+
+    def __init__(
+        self,
+        encode_fn: Callable[[List[str], bool], np.ndarray],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0
+    ):
+        """
+        Args:
+            encode_fn: Function (texts, normalize) -> array of shape [len(texts), dim]
+            max_batch_size: Maximum texts per forward pass
+            max_wait_ms: How long the first request waits for company
+        """
+        self.encode_fn = encode_fn
+        self.max_batch_size = int(max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "batches": 0,
+            "largest_batch": 0
+        }
+
+    def submit(self, texts: List[str], normalize: bool) -> List[Future]:
+        """Queue texts for encoding; each Future resolves to one embedding"""
+        self._ensure_started()
+        futures = []
+        for text in texts:
+            future: Future = Future()
+            self._queue.put((text, normalize, future))
+            futures.append(future)
+        return futures
+
+    def _ensure_started(self):
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="EncodeBatcher", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._encode(batch)
+
+    def _encode(self, batch: List[tuple]):
+        self.stats["requests"] += len(batch)
+        self.stats["batches"] += 1
+        self.stats["largest_batch"] = max(self.stats["largest_batch"], len(batch))
+
+        for normalize in (True, False):
+            group = [(text, future) for text, norm, future in batch if norm == normalize]
+            if not group:
+                continue
+            # Identical texts in one window share a row
+            unique = list(dict.fromkeys(text for text, _ in group))
+            try:
+                embeddings = self.encode_fn(unique, normalize)
+                rows = {text: embeddings[i] for i, text in enumerate(unique)}
+                for text, future in group:
+                    future.set_result(rows[text])
+            except Exception as e:
+                for _, future in group:
+                    future.set_exception(e)
+
+
 class EmbeddingGenerator:
     """Generate embeddings for text using sentence-transformers"""
 
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        cache_size: int = 4096,
+        cache_dir: Optional[str] = None,
+        batching: bool = True,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0
+    ):
         """
         Initialize embedding generator.
 
         Args:
             model_name: Name of the sentence-transformers model to use
                        Default: all-MiniLM-L6-v2 (384 dimensions, fast)
+            cache_size: In-memory LRU capacity (0 disables caching)
+            cache_dir: Optional directory for the mmap-backed on-disk cache tier
+            batching: Coalesce concurrent encode calls into batched forward passes
+            max_batch_size: Maximum texts per batched forward pass
+            max_wait_ms: Coalescing window for the batcher
         """
         self.model_name = model_name
         self.model = None
         self.embedding_dim = 384  # Dimension for all-MiniLM-L6-v2
+        self._model_lock = threading.Lock()
+
+        self.cache: Optional[EmbeddingCache] = None
+        if cache_size > 0:
+            disk = DiskEmbeddingCache(cache_dir, self.embedding_dim) if cache_dir else None
+            self.cache = EmbeddingCache(max_entries=cache_size, disk=disk)
+
+        self.batcher: Optional[EncodeBatcher] = None
+        if batching:
+            self.batcher = EncodeBatcher(
+                self._encode_batch,
+                max_batch_size=max_batch_size,
+                max_wait_ms=max_wait_ms
+            )
         logger.info(f"Initializing EmbeddingGenerator with model: {model_name}")
 
     def _load_model(self):
         """Lazy-load the model on first use"""
-        if self.model is None:
-            logger.info(f"Loading sentence-transformer model: {self.model_name}")
-            self.model = SentenceTransformer(self.model_name)
-            logger.info("Model loaded successfully")
+        with self._model_lock:
+            if self.model is None:
+                logger.info(f"Loading sentence-transformer model: {self.model_name}")
+                self.model = SentenceTransformer(self.model_name)
+                logger.info("Model loaded successfully")
+
+    def _encode_batch(self, texts: List[str], normalize: bool) -> np.ndarray:
+        """One forward pass over texts (no caching)"""
+        self._load_model()
+        return self.model.encode(
+            texts,
+            normalize_embeddings=normalize,
+            show_progress_bar=False
+        )
 
     def encode(self, text: Union[str, List[str]], normalize: bool = True) -> np.ndarray:
         """
@@ -50,19 +182,33 @@ class EmbeddingGenerator:
             numpy array of shape (embedding_dim,) for single text
             or (n, embedding_dim) for list of texts
         """
-        self._load_model()
-
         # Convert single string to list for consistent processing
         is_single = isinstance(text, str)
-        if is_single:
-            text = [text]
+        texts = [text] if is_single else list(text)
+        if not texts:
+            return np.zeros((0, self.embedding_dim), dtype='float32')
 
-        # Generate embeddings
-        embeddings = self.model.encode(
-            text,
-            normalize_embeddings=normalize,
-            show_progress_bar=False
-        )
+        # Serve what we can from the cache; encode each distinct miss once
+        keys = [embedding_key(self.model_name, t, normalize) for t in texts]
+        found: Dict[str, np.ndarray] = {}
+        missing: Dict[str, str] = {}
+        for key, t in zip(keys, texts):
+            if key in found or key in missing:
+                continue
+            cached = self.cache.get(key) if self.cache is not None else None
+            if cached is not None:
+                found[key] = cached
+            else:
+                missing[key] = t
+
+        if missing:
+            computed = self._encode_uncached(list(missing.values()), normalize)
+            fresh = dict(zip(missing.keys(), computed))
+            if self.cache is not None:
+                self.cache.put_many(fresh)
+            found.update(fresh)
+
+        embeddings = np.stack([found[key] for key in keys]).astype('float32', copy=False)
 
         # Return single embedding if input was single string
         if is_single:
@@ -70,6 +216,20 @@ class EmbeddingGenerator:
 
         return embeddings
 
+    def _encode_uncached(self, texts: List[str], normalize: bool) -> List[np.ndarray]:
+        """Encode cache misses, through the batcher when enabled"""
+        if self.batcher is not None:
+            futures = self.batcher.submit(texts, normalize)
+            return [future.result() for future in futures]
+        return list(self._encode_batch(texts, normalize))
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Cache hit/miss and batching statistics"""
+        return {
+            'cache': self.cache.get_stats() if self.cache is not None else {},
+            'batcher': dict(self.batcher.stats) if self.batcher is not None else {}
+        }
+
     def cosine_similarity(self, embedding1: np.ndarray, embedding2: np.ndarray) -> float:
         """
         Calculate cosine similarity between two embeddings.
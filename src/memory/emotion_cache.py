@@ -0,0 +1,96 @@
+"""
+Emotion Analysis Cache
+Content-hash keyed results shared by the emotion detectors
+
+One user message is looked at by several components per turn (the keyword
+detector in the pipeline, EmotionalContinuity.track_emotion, intensity
+scoring). Each detector stores its analysis here under (detector, text) so
+repeat lookups of the same text -- within a turn or across a backfill -- reuse
+the first result instead of re-running the classifier.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def analysis_key(detector: str, text: str) -> str:
+    """Content hash identifying one detector's analysis of one text"""
+    digest = hashlib.sha1()
+    digest.update(detector.encode('utf-8'))
+    digest.update(b'\x00')
+    digest.update(text.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class EmotionAnalysisCache:
+    """Thread-safe LRU of emotion analyses"""
+
+    def __init__(self, max_size: int = 512):
+        """
+        Args:
+            max_size: Maximum number of analyses kept
+        """
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, detector: str, text: str) -> Optional[Any]:
+        key = analysis_key(detector, text)
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, detector: str, text: str, value: Any):
+        key = analysis_key(detector, text)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+
+# Singleton instance for module-level access
+_analysis_cache = None
+_analysis_cache_lock = threading.Lock()
+
+
+def get_emotion_analysis_cache() -> EmotionAnalysisCache:
+    """
+    Get the shared emotion analysis cache.
+
+    Returns:
+        EmotionAnalysisCache instance
+    """
+    global _analysis_cache
+    with _analysis_cache_lock:
+        if _analysis_cache is None:
+            _analysis_cache = EmotionAnalysisCache()
+    return _analysis_cache
@@ -3,11 +3,13 @@ Emotion Detector for Text Analysis
 Detects emotional state and sentiment from text using keyword/pattern matching
 """
 
-from dataclasses import dataclass
-from typing import Tuple, List, Dict, Any
+from dataclasses import dataclass, replace
+from typing import Tuple, List, Dict, Any, Optional
 import re
 import logging
 
+from src.memory.emotion_cache import EmotionAnalysisCache, get_emotion_analysis_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -94,8 +96,15 @@ class EmotionDetector:
         'quite': 1.3
     }
 
-    def __init__(self):
-        """Initialize emotion detector"""
+    def __init__(self, cache: Optional[EmotionAnalysisCache] = None):
+        """
+        Initialize emotion detector
+
+        Args:
+            cache: Analysis cache shared with the other detectors
+                   (default: process-wide get_emotion_analysis_cache())
+        """
+        self.cache = cache if cache is not None else get_emotion_analysis_cache()
         logger.info("Initialized EmotionDetector with keyword-based matching")
 
     def detect_emotion(self, text: str) -> EmotionResult:
@@ -116,6 +125,16 @@ class EmotionDetector:
                 sentiment_score=0.0
             )
 
+        cached = self.cache.get("v1", text)
+        if cached is not None:
+            return replace(cached)
+
+        result = self._analyze(text)
+        self.cache.put("v1", text, result)
+        return replace(result)
+
+    def _analyze(self, text: str) -> EmotionResult:
+        """Keyword scoring behind detect_emotion() (uncached)"""
         text_lower = text.lower()
 
         # Count emotion keyword matches
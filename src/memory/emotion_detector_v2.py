@@ -9,7 +9,9 @@ Week 8 Implementation
 
 from transformers import pipeline
 import logging
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
+
+from src.memory.emotion_cache import EmotionAnalysisCache, get_emotion_analysis_cache
 
 logger = logging.getLogger(__name__)
 
@@ -40,31 +42,81 @@ class EmotionDetectorV2:
         # }
     """
     
-    def __init__(self, model_name: str = "j-hartmann/emotion-english-distilroberta-base"):
+    BACKENDS = ("torch", "int8", "onnx")
+
+    def __init__(
+        self,
+        model_name: str = "j-hartmann/emotion-english-distilroberta-base",
+        backend: str = "torch",
+        cache: Optional[EmotionAnalysisCache] = None,
+        classifier: Optional[Callable] = None
+    ):
         """
         Initialize transformer-based emotion detector.
         
         Args:
             model_name: HuggingFace model to use for emotion detection
+            backend: CPU inference backend:
+                     "torch" - stock fp32 model
+                     "int8"  - torch dynamic int8 quantization of the Linear layers
+                     "onnx"  - ONNX Runtime via optimum (falls back to torch if
+                               optimum/onnxruntime aren't installed)
+            cache: Analysis cache shared with the other detectors
+                   (default: process-wide get_emotion_analysis_cache())
+            classifier: Pre-built text-classification callable (skips model loading)
         """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend {backend!r}; expected one of {self.BACKENDS}")
         self.model_name = model_name
-        self.classifier = None
+        self.backend = backend
+        self.cache = cache if cache is not None else get_emotion_analysis_cache()
+        self.classifier = classifier
         self._fallback_mode = False
-        
+
+        if classifier is not None:
+            return
+
         try:
             # Load emotion classification model
             # This downloads ~250MB on first run, then caches locally
-            self.classifier = pipeline(
-                "text-classification",
-                model=model_name,
-                return_all_scores=True,
-                device=-1  # CPU (use device=0 for GPU)
-            )
-            logger.info(f"✅ EmotionDetectorV2 initialized (transformer-based: {model_name})")
+            self.classifier = self._load_classifier(model_name, backend)
+            logger.info(f"✅ EmotionDetectorV2 initialized (transformer-based: {model_name}, backend={self.backend})")
             
         except Exception as e:
             logger.error(f"❌ Failed to load emotion model: {e}")
             self._init_fallback()
+
+    def _load_classifier(self, model_name: str, backend: str):
+        """Build the text-classification pipeline for the requested backend"""
+        if backend == "onnx":
+            try:
+                from optimum.onnxruntime import ORTModelForSequenceClassification
+                from transformers import AutoTokenizer
+
+                model = ORTModelForSequenceClassification.from_pretrained(model_name, export=True)
+                tokenizer = AutoTokenizer.from_pretrained(model_name)
+                return pipeline(
+                    "text-classification",
+                    model=model,
+                    tokenizer=tokenizer,
+                    return_all_scores=True
+                )
+            except ImportError:
+                logger.warning("⚠️ optimum[onnxruntime] not installed; using torch backend for emotion model")
+                self.backend = backend = "torch"
+
+        classifier = pipeline(
+            "text-classification",
+            model=model_name,
+            return_all_scores=True,
+            device=-1  # CPU (use device=0 for GPU)
+        )
+        if backend == "int8":
+            import torch
+            classifier.model = torch.quantization.quantize_dynamic(
+                classifier.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        return classifier
     
     def _init_fallback(self):
         """Initialize fallback to keyword-based detection if model fails"""
@@ -114,9 +166,13 @@ class EmotionDetectorV2:
                 'all_scores': {'neutral': 1.0}
             }
         
+        cached = self.cache.get(self._cache_name, text)
+        if cached is not None:
+            return self._copy(cached)
+
         # If fallback mode, use v1 detector
         if self._fallback_mode and self.classifier:
-            return self._detect_with_fallback(text)
+            return self._remember(text, self._detect_with_fallback(text))
         
         # If no classifier at all, return neutral
         if not self.classifier:
@@ -130,18 +186,7 @@ class EmotionDetectorV2:
         try:
             # Get predictions from transformer
             results = self.classifier(text)[0]
-            
-            # Convert to our format
-            scores = {r['label']: r['score'] for r in results}
-            
-            # Find dominant emotion
-            dominant = max(scores.items(), key=lambda x: x[1])
-            
-            return {
-                'dominant_emotion': dominant[0],
-                'confidence': dominant[1],
-                'all_scores': scores
-            }
+            return self._remember(text, self._to_result(results))
         
         except Exception as e:
             logger.error(f"❌ Emotion detection failed: {e}")
@@ -150,6 +195,68 @@ class EmotionDetectorV2:
                 'confidence': 0.5,
                 'all_scores': {'neutral': 0.5}
             }
+
+    def detect_batch(self, texts: List[str], batch_size: int = 32) -> List[Dict[str, Any]]:
+        """
+        Detect emotions for many texts with batched transformer inference.
+
+        Meant for backfills and analytics: duplicates and cached texts are
+        classified once, the rest go through the model batch_size at a time.
+
+        Args:
+            texts: Texts to analyze
+            batch_size: Texts per forward pass
+
+        Returns:
+            One detect_emotion()-style dict per input text, in input order
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        pending: List[str] = []
+        for text in dict.fromkeys(texts):
+            cached = self.cache.get(self._cache_name, text) if text else None
+            if cached is not None:
+                results[text] = cached
+            elif not self.classifier or self._fallback_mode or not text or len(text.strip()) < 3:
+                results[text] = self.detect_emotion(text)
+            else:
+                pending.append(text)
+
+        if pending:
+            try:
+                outputs = self.classifier(pending, batch_size=batch_size)
+                for text, output in zip(pending, outputs):
+                    results[text] = self._remember(text, self._to_result(output))
+            except Exception as e:
+                logger.error(f"❌ Batched emotion detection failed, classifying one at a time: {e}")
+                for text in pending:
+                    results[text] = self.detect_emotion(text)
+
+        return [self._copy(results[text]) for text in texts]
+
+    @property
+    def _cache_name(self) -> str:
+        mode = "fallback" if self._fallback_mode else self.backend
+        return f"v2:{self.model_name}:{mode}"
+
+    def _remember(self, text: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        self.cache.put(self._cache_name, text, result)
+        return self._copy(result)
+
+    @staticmethod
+    def _copy(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Callers get their own dicts so the cached analysis can't be mutated"""
+        return {**result, 'all_scores': dict(result['all_scores'])}
+
+    @staticmethod
+    def _to_result(scores_list: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Convert pipeline [{'label', 'score'}, ...] output to our format"""
+        scores = {r['label']: r['score'] for r in scores_list}
+        dominant = max(scores.items(), key=lambda x: x[1])
+        return {
+            'dominant_emotion': dominant[0],
+            'confidence': dominant[1],
+            'all_scores': scores
+        }
     
     def _detect_with_fallback(self, text: str) -> Dict[str, any]:
         """Use v1 keyword-based detector as fallback"""
@@ -195,8 +302,19 @@ class EmotionDetectorV2:
             >>> detector.detect_intensity("That's interesting.")
             0.15  # Low intensity
         """
-        result = self.detect_emotion(text)
-        
+        return self.intensity_from_result(self.detect_emotion(text))
+
+    @staticmethod
+    def intensity_from_result(result: Dict[str, Any]) -> float:
+        """
+        Intensity of an existing detect_emotion() result (no extra inference).
+
+        Args:
+            result: Output of detect_emotion()
+
+        Returns:
+            Float between 0.0 and 1.0 (see detect_intensity)
+        """
         # Calculate intensity based on confidence and neutrality
         neutral_score = result['all_scores'].get('neutral', 0.0)
         intensity = result['confidence'] * (1.0 - neutral_score)
@@ -233,6 +351,7 @@ class EmotionDetectorV2:
         """Get information about loaded model"""
         return {
             'model_name': self.model_name,
+            'backend': self.backend,
             'fallback_mode': self._fallback_mode,
             'classifier_loaded': self.classifier is not None,
             'supported_emotions': [
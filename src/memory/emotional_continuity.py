@@ -181,9 +181,9 @@ class EmotionalContinuity:
         if timestamp is None:
             timestamp = datetime.now()
         
-        # Detect emotion and intensity
+        # Detect emotion once and derive intensity from the same result
         emotion_result = self.emotion_detector.detect_emotion(user_input)
-        intensity = self.emotion_detector.detect_intensity(user_input)
+        intensity = self.emotion_detector.intensity_from_result(emotion_result)
         
         # Only track if intensity exceeds threshold
         if intensity < self.intensity_threshold:
@@ -0,0 +1,204 @@
+"""
+Metadata Store for VectorStore
+SQLite-backed, dict-like table of per-vector metadata with indexed filter columns
+
+Replaces the in-memory ``id_to_metadata`` dict that used to be pickled next to
+the FAISS index. Each row keeps the full metadata dict as a pickled payload
+plus a handful of typed, indexed columns pulled out of it (timestamp, emotion,
+flags), so time-windowed and flag-scoped queries can select candidate IDs in
+SQL before any vector is scored.
+"""
+
+import pickle
+import sqlite3
+import threading
+from collections.abc import MutableMapping
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _context(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    return metadata.get('context') or {}
+
+
+def _flag(value: Any) -> Optional[int]:
+    return None if value is None else int(bool(value))
+
+
+# column name -> (SQL type, extractor from the metadata dict)
+INDEXED_COLUMNS: Dict[str, Tuple[str, Callable[[Dict[str, Any]], Any]]] = {
+    'turn_id': ('TEXT', lambda m: m.get('turn_id')),
+    'timestamp': ('TEXT', lambda m: m.get('timestamp')),
+    # Equality key for emotion; SemanticMemory stores a blind index here when
+    # the emotion itself is encrypted
+    'emotion': ('TEXT', lambda m: m.get('emotion_key')),
+    'research_used': ('INTEGER', lambda m: _flag(_context(m).get('research_used'))),
+    'financial_topic': ('INTEGER', lambda m: _flag(_context(m).get('financial_topic'))),
+    'ab_test_group': ('TEXT', lambda m: _context(m).get('ab_test_group')),
+}
+
+# Filter keys accepted by filter_ids() besides exact column matches
+RANGE_FILTERS = ('since', 'until')
+
+
+class MetadataStore(MutableMapping):
+    """Dict-like {vector_id: metadata} mapping persisted in SQLite"""
+
+    def __init__(self, db_path: str):
+        """
+        Open (or create) the metadata table.
+
+        Args:
+            db_path: SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+
+        columns = ", ".join(f"{name} {sql_type}" for name, (sql_type, _) in INDEXED_COLUMNS.items())
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS metadata (id INTEGER PRIMARY KEY, {columns}, payload BLOB NOT NULL)"
+        )
+        for name in INDEXED_COLUMNS:
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_metadata_{name} ON metadata ({name})")
+        self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # Mapping interface
+    # ------------------------------------------------------------------
+
+    def __getitem__(self, id: int) -> Dict[str, Any]:
+        with self._lock:
+            row = self._conn.execute("SELECT payload FROM metadata WHERE id = ?", (int(id),)).fetchone()
+        if row is None:
+            raise KeyError(id)
+        return pickle.loads(row[0])
+
+    def __setitem__(self, id: int, metadata: Dict[str, Any]):
+        self.put_many({id: metadata})
+
+    def __delitem__(self, id: int):
+        with self._lock:
+            if int(id) not in self:
+                raise KeyError(id)
+            self.delete_many([id])
+
+    def __contains__(self, id: object) -> bool:
+        try:
+            id = int(id)
+        except (TypeError, ValueError):
+            return False
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM metadata WHERE id = ?", (id,)).fetchone() is not None
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.ids().tolist())
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM metadata").fetchone()[0]
+
+    def items(self) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        with self._lock:
+            rows = self._conn.execute("SELECT id, payload FROM metadata ORDER BY id").fetchall()
+        for id, payload in rows:
+            yield id, pickle.loads(payload)
+
+    # ------------------------------------------------------------------
+    # Bulk operations
+    # ------------------------------------------------------------------
+
+    def put_many(self, items: Dict[int, Dict[str, Any]]):
+        """Upsert several rows in one transaction"""
+        if not items:
+            return
+        names = list(INDEXED_COLUMNS)
+        placeholders = ", ".join("?" for _ in range(len(names) + 2))
+        rows = [
+            (int(id), *(INDEXED_COLUMNS[name][1](meta) for name in names),
+             pickle.dumps(meta, protocol=pickle.HIGHEST_PROTOCOL))
+            for id, meta in items.items()
+        ]
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO metadata (id, {', '.join(names)}, payload) VALUES ({placeholders})",
+                rows
+            )
+            self._conn.commit()
+
+    def delete_many(self, ids: Iterable[int]):
+        """Delete several rows in one transaction (missing IDs are ignored)"""
+        rows = [(int(id),) for id in ids]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany("DELETE FROM metadata WHERE id = ?", rows)
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM metadata")
+            self._conn.commit()
+
+    def ids(self) -> np.ndarray:
+        """All stored IDs as an int64 array"""
+        with self._lock:
+            rows = self._conn.execute("SELECT id FROM metadata ORDER BY id").fetchall()
+        return np.array([r[0] for r in rows], dtype='int64')
+
+    def column(self, name: str) -> List[Tuple[int, Any]]:
+        """(id, value) pairs for one indexed column, without unpickling payloads"""
+        if name not in INDEXED_COLUMNS:
+            raise ValueError(f"Unknown metadata column {name!r}")
+        with self._lock:
+            return self._conn.execute(f"SELECT id, {name} FROM metadata ORDER BY id").fetchall()
+
+    def filter_ids(self, filters: Dict[str, Any]) -> np.ndarray:
+        """
+        Select IDs matching all filters.
+
+        Args:
+            filters: Exact matches on indexed columns (turn_id, emotion,
+                     research_used, financial_topic, ab_test_group), plus
+                     'since' / 'until' bounds on timestamp (datetime or ISO string)
+
+        Returns:
+            int64 array of matching IDs
+        """
+        clauses = []
+        params: List[Any] = []
+        for key, value in filters.items():
+            if key in RANGE_FILTERS:
+                if isinstance(value, datetime):
+                    value = value.isoformat()
+                clauses.append("timestamp >= ?" if key == 'since' else "timestamp <= ?")
+                params.append(value)
+            elif key in INDEXED_COLUMNS:
+                if value is None:
+                    clauses.append(f"{key} IS NULL")
+                    continue
+                if INDEXED_COLUMNS[key][0] == 'INTEGER':
+                    value = _flag(value)
+                clauses.append(f"{key} = ?")
+                params.append(value)
+            else:
+                raise ValueError(f"Unsupported metadata filter {key!r}")
+
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(f"SELECT id FROM metadata{where} ORDER BY id", params).fetchall()
+        return np.array([r[0] for r in rows], dtype='int64')
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
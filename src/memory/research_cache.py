@@ -0,0 +1,270 @@
+"""
+Research Result Cache
+Reuses recent research for repeated and paraphrased factual questions
+
+ResearchManager.run_research runs gap identification, planning, execution and
+synthesis for every factual turn -- the slowest stage of the turn -- even when
+the same question (or a paraphrase of it) was researched minutes earlier.
+Successful results are stored here under the normalised query and its
+embedding:
+
+- exact lookup on the normalised query
+- semantic lookup: nearest stored query of the same topic above a cosine
+  threshold (numbers in the two queries must match, so "iPhone 15" never
+  answers "iPhone 16")
+- per-topic TTLs: short for finance and news, long for stable facts
+- entries hit repeatedly are flagged for background refresh shortly before
+  they expire, so hot questions stay warm
+"""
+
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Seconds a result stays valid, by topic
+DEFAULT_TOPIC_TTLS = {
+    'finance': 300.0,
+    'news': 1800.0,
+    'general': 86400.0,
+}
+
+_NUMBER = re.compile(r'\d+(?:[.,]\d+)?')
+
+
+def normalize_research_query(query: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace"""
+    lowered = re.sub(r"[^\w\s$%.]", " ", query.lower())
+    return re.sub(r"\s+", " ", lowered).strip(" .")
+
+
+@dataclass
+class _Entry:
+    query: str
+    topic: str
+    result: Any
+    embedding: Optional[np.ndarray]
+    numbers: frozenset
+    stored_at: float
+    ttl: float
+    hits: int = 0
+    refreshing: bool = False
+
+
+@dataclass
+class ResearchCacheHit:
+    """A cached research result and how it was matched"""
+    result: Any
+    key: str
+    query: str  # Query the cached result was researched for
+    match: str  # "exact" or "semantic"
+    similarity: float
+    age: float
+    refresh_due: bool = False
+
+
+class ResearchResultCache:
+    """Thread-safe TTL cache of research results with semantic lookup"""
+
+    def __init__(self,
+                 embedder: Optional[Callable[[str], np.ndarray]] = None,
+                 similarity_threshold: float = 0.92,
+                 max_entries: int = 256,
+                 topic_ttls: Optional[Dict[str, float]] = None,
+                 refresh_window: float = 0.2,
+                 hot_hits: int = 2):
+        """
+        Args:
+            embedder: Callable mapping text to a vector; defaults to the shared
+                EmbeddingGenerator, loaded on first semantic lookup. Semantic
+                lookup is disabled if it cannot be loaded.
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+            max_entries: Maximum cached results (oldest evicted first)
+            topic_ttls: Per-topic TTL overrides in seconds
+            refresh_window: Fraction of the TTL, at the end of an entry's life,
+                during which a hot entry is flagged for refresh
+            hot_hits: Hits after which an entry counts as hot
+        """
+        self._embedder = embedder
+        self._embedder_failed = False
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.topic_ttls = dict(DEFAULT_TOPIC_TTLS, **(topic_ttls or {}))
+        self.refresh_window = refresh_window
+        self.hot_hits = hot_hits
+
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            'hits': 0, 'exact_hits': 0, 'semantic_hits': 0, 'misses': 0,
+            'expired': 0, 'stores': 0, 'refreshes_scheduled': 0, 'refresh_failures': 0
+        }
+
+    # ------------------------------------------------------------------
+    # Embeddings
+    # ------------------------------------------------------------------
+
+    def _embed(self, text: str) -> Optional[np.ndarray]:
+        if self._embedder_failed:
+            return None
+        try:
+            if self._embedder is None:
+                from src.memory.embedding_generator import get_embedding_generator
+                self._embedder = get_embedding_generator().encode
+            vector = np.asarray(self._embedder(text), dtype='float32')
+        except Exception as e:
+            logger.warning(f"Research cache semantic lookup disabled: {e}")
+            self._embedder_failed = True
+            return None
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    # ------------------------------------------------------------------
+    # Lookup / store
+    # ------------------------------------------------------------------
+
+    def ttl_for(self, topic: str) -> float:
+        return self.topic_ttls.get(topic, self.topic_ttls['general'])
+
+    def lookup(self, query: str, topic: str = 'general') -> Optional[ResearchCacheHit]:
+        """
+        Find a live cached result for query.
+
+        Args:
+            query: User query
+            topic: Topic the query was classified as
+
+        Returns:
+            ResearchCacheHit, or None on a miss
+        """
+        key = normalize_research_query(query)
+        now = time.monotonic()
+        with self._lock:
+            self._drop_expired(now)
+            entry = self._entries.get(key)
+            if entry is not None and entry.topic == topic:
+                return self._hit(key, entry, 'exact', 1.0, now)
+            candidates = [(k, e) for k, e in self._entries.items()
+                          if e.topic == topic and e.embedding is not None]
+
+        if candidates:
+            vector = self._embed(key)
+            if vector is not None:
+                numbers = frozenset(_NUMBER.findall(key))
+                best_key, best_score = None, self.similarity_threshold
+                for candidate_key, candidate in candidates:
+                    if candidate.numbers != numbers:
+                        continue
+                    score = float(np.dot(vector, candidate.embedding))
+                    if score >= best_score:
+                        best_key, best_score = candidate_key, score
+                if best_key is not None:
+                    with self._lock:
+                        entry = self._entries.get(best_key)
+                        if entry is not None and now - entry.stored_at <= entry.ttl:
+                            return self._hit(best_key, entry, 'semantic', best_score, now)
+
+        with self._lock:
+            self.stats['misses'] += 1
+        return None
+
+    def _hit(self, key: str, entry: _Entry, match: str, similarity: float, now: float) -> ResearchCacheHit:
+        """Record a hit (caller holds the lock)"""
+        entry.hits += 1
+        self.stats['hits'] += 1
+        self.stats[f'{match}_hits'] += 1
+        age = now - entry.stored_at
+        refresh_due = (
+            not entry.refreshing
+            and entry.hits >= self.hot_hits
+            and age >= entry.ttl * (1.0 - self.refresh_window)
+        )
+        if refresh_due:
+            entry.refreshing = True
+            self.stats['refreshes_scheduled'] += 1
+        return ResearchCacheHit(entry.result, key, entry.query, match, similarity, age, refresh_due)
+
+    def put(self, query: str, topic: str, result: Any):
+        """
+        Store a successful research result.
+
+        Args:
+            query: User query the result answers
+            topic: Topic the query was classified as (selects the TTL)
+            result: ResearchResult to reuse
+        """
+        key = normalize_research_query(query)
+        embedding = self._embed(key)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            self._entries[key] = _Entry(
+                query=query, topic=topic, result=result, embedding=embedding,
+                numbers=frozenset(_NUMBER.findall(key)), stored_at=time.monotonic(),
+                ttl=self.ttl_for(topic), hits=previous.hits if previous else 0
+            )
+            self.stats['stores'] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.pop(next(iter(self._entries)))
+
+    def refresh_failed(self, key: str):
+        """Allow another refresh attempt after a failed background refresh"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.refreshing = False
+            self.stats['refresh_failures'] += 1
+
+    def invalidate(self, query: str):
+        with self._lock:
+            self._entries.pop(normalize_research_query(query), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _drop_expired(self, now: float):
+        """Remove expired entries (caller holds the lock)"""
+        expired = [k for k, e in self._entries.items() if now - e.stored_at > e.ttl]
+        for key in expired:
+            del self._entries[key]
+        self.stats['expired'] += len(expired)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            topics: Dict[str, int] = {}
+            for entry in self._entries.values():
+                topics[entry.topic] = topics.get(entry.topic, 0) + 1
+            return dict(
+                self.stats,
+                size=len(self._entries),
+                max_entries=self.max_entries,
+                entries_by_topic=topics,
+                semantic_enabled=not self._embedder_failed,
+                hit_rate=self.stats['hits'] / lookups if lookups else 0.0
+            )
+
+
+# Singleton instance for module-level access
+_research_cache = None
+_research_cache_lock = threading.Lock()
+
+
+def get_research_cache() -> ResearchResultCache:
+    """
+    Get the shared research result cache.
+
+    Returns:
+        ResearchResultCache instance
+    """
+    global _research_cache
+    with _research_cache_lock:
+        if _research_cache is None:
+            _research_cache = ResearchResultCache()
+    return _research_cache
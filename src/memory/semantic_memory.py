@@ -10,8 +10,9 @@ CHANGES:
 """
 
 import uuid
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+from collections.abc import Mapping
+from typing import List, Dict, Any, Iterator, Optional
+from datetime import datetime, timedelta
 import logging
 
 from src.memory.embedding_generator import get_embedding_generator
@@ -20,6 +21,67 @@ from src.security.encryption import get_encryption
 
 logger = logging.getLogger(__name__)
 
+# Context fields encrypted at rest (GDPR Article 9)
+SENSITIVE_FIELDS = ('emotion', 'sentiment', 'sentiment_score')
+
+
+class DecryptedContext(Mapping):
+    """
+    Read-only view of a stored context whose encrypted fields decrypt on first access.
+
+    Most callers of semantic_search only read user_input/similarity, so paying
+    Fernet for every sensitive field of every hit is wasted work. Use
+    SemanticMemory.decrypt_results() to decrypt many views in one batch, and
+    copy() for a plain mutable dict.
+    """
+
+    __slots__ = ('_raw', '_encryption', '_plain')
+
+    def __init__(self, raw: Dict[str, Any], encryption: Any):
+        self._raw = raw
+        self._encryption = encryption
+        self._plain: Dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._plain:
+            return self._plain[key]
+        value = self._raw[key]
+        if key not in SENSITIVE_FIELDS or not value:
+            return value
+        self._fill(key, self._encryption.decrypt_many([value])[0])
+        return self._plain[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._raw)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def __repr__(self) -> str:
+        return f"DecryptedContext({dict(self)!r})"
+
+    def copy(self) -> Dict[str, Any]:
+        return dict(self)
+
+    def _pending(self) -> List[tuple]:
+        """(field, ciphertext) pairs not yet decrypted"""
+        return [
+            (field, self._raw[field]) for field in SENSITIVE_FIELDS
+            if self._raw.get(field) and field not in self._plain
+        ]
+
+    def _fill(self, field: str, plaintext: Optional[str]):
+        if plaintext is None:
+            # Keep the ciphertext if decryption fails (matches decrypt_selective)
+            self._plain[field] = self._raw[field]
+            return
+        if field == 'sentiment_score':
+            try:
+                plaintext = float(plaintext)
+            except ValueError:
+                logger.warning("Failed to parse decrypted sentiment_score")
+        self._plain[field] = plaintext
+
 
 class SemanticMemory:
     """
@@ -57,6 +119,7 @@ class SemanticMemory:
             storage_path=storage_path  # CROSS-MODAL FIX: Pass storage path
         )
         self.turn_id_to_vector_id: Dict[str, int] = {}
+        self._rebuild_turn_index()
 
         # WEEK 7: Encryption for sensitive data (GDPR Article 9)
         self.encrypt_sensitive = encrypt_sensitive
@@ -69,6 +132,35 @@ class SemanticMemory:
 
         logger.info(f"✅ SemanticMemory initialized (SOLE persistent store) at {storage_path}")
 
+    def _rebuild_turn_index(self):
+        """Rebuild turn_id -> vector_id from the persisted metadata"""
+        self.turn_id_to_vector_id.clear()
+        for vector_id, turn_id in self.vector_store.id_to_metadata.column('turn_id'):
+            if turn_id:
+                self.turn_id_to_vector_id[turn_id] = vector_id
+
+    def _emotion_key(self, emotion: Any) -> Optional[str]:
+        """Filterable key for an emotion: blind index when encrypted, plaintext otherwise"""
+        if emotion is None:
+            return None
+        if self.encrypt_sensitive and self.encryption:
+            return self.encryption.blind_index(str(emotion))
+        return str(emotion)
+
+    def _translate_filters(self, filters: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Map semantic_search filters onto metadata-store columns.
+
+        Accepts everything MetadataStore.filter_ids does, plus 'last_days'
+        (shorthand for since=now - N days); 'emotion' is matched by key.
+        """
+        translated = dict(filters)
+        if 'last_days' in translated:
+            translated['since'] = datetime.now() - timedelta(days=translated.pop('last_days'))
+        if 'emotion' in translated:
+            translated['emotion'] = self._emotion_key(translated['emotion'])
+        return translated
+
     def add_conversation_turn(
         self,
         user_input: str,
@@ -123,6 +215,8 @@ class SemanticMemory:
             'timestamp': timestamp.isoformat(),
             'combined_text': combined_text
         }
+        if context and context.get('emotion') is not None:
+            metadata['emotion_key'] = self._emotion_key(context['emotion'])
 
         # Add context with encryption for sensitive fields
         if context:
@@ -153,28 +247,38 @@ class SemanticMemory:
         self,
         query: str,
         k: int = 5,
-        min_similarity: float = 0.0
+        min_similarity: float = 0.0,
+        filters: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
         """
         Search for semantically similar conversations.
 
-        WEEK 7: Automatically decrypts sensitive fields before returning results.
+        WEEK 7: Sensitive fields are decrypted on access (see DecryptedContext).
 
         Args:
             query: Search query
             k: Number of results to return
             min_similarity: Minimum similarity threshold (0-1)
+            filters: Optional pre-filters applied before scoring, e.g.
+                     {'research_used': True}, {'last_days': 7}, {'emotion': 'joy'},
+                     {'ab_test_group': 'treatment'}, {'since': datetime, 'until': datetime}
 
         Returns:
-            List of matching conversations with similarity scores and decrypted metadata
+            List of matching conversations with similarity scores and metadata
+            (encrypted context fields decrypt lazily)
         """
         # Generate query embedding
         query_embedding = self.embedding_generator.encode(query)
 
         # Search vector store
-        results = self.vector_store.search(query_embedding, k=k)
+        if filters:
+            results = self.vector_store.search(query_embedding, k=k, filters=self._translate_filters(filters))
+        else:
+            results = self.vector_store.search(query_embedding, k=k)
+        return self._format_results(results, min_similarity)
 
-        # Filter by minimum similarity and format results
+    def _format_results(self, results: List[Any], min_similarity: float = 0.0) -> List[Dict[str, Any]]:
+        """Filter vector-store hits by similarity into result dicts (contexts decrypt lazily)"""
         filtered_results = []
         for result in results:
             # CROSS-MODAL FIX: VectorStore now returns tuples (id, similarity, metadata)
@@ -188,39 +292,44 @@ class SemanticMemory:
 
             if similarity >= min_similarity:
 
-                # Decrypt sensitive fields if encryption is enabled
                 context = metadata.get('context', {})
                 if self.encrypt_sensitive and self.encryption and context:
-                    decrypted_context = context.copy()
-
-                    # Decrypt sensitive fields
-                    sensitive_fields = ['emotion', 'sentiment', 'sentiment_score']
-                    for field in sensitive_fields:
-                        if field in decrypted_context and decrypted_context[field]:
-                            try:
-                                decrypted_context[field] = self.encryption.decrypt(
-                                    decrypted_context[field]
-                                )
-                                # Convert back to proper type
-                                if field == 'sentiment_score':
-                                    decrypted_context[field] = float(decrypted_context[field])
-                            except Exception as e:
-                                logger.warning(f"Failed to decrypt {field}: {e}")
-
-                    context = decrypted_context
-
-                # Build result with decrypted data
+                    context = DecryptedContext(context, self.encryption)
+
+                # Build result (sensitive fields decrypt when read)
                 filtered_results.append({
                     'turn_id': metadata.get('turn_id'),
                     'user_input': metadata.get('user_input'),
                     'assistant_response': metadata.get('assistant_response'),
                     'timestamp': metadata.get('timestamp'),
                     'similarity': similarity,  # Use unpacked similarity
-                    'context': context  # Now includes decrypted sensitive fields
+                    'context': context
                 })
 
         return filtered_results
 
+    def decrypt_results(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Decrypt the sensitive fields of many results in one batched call.
+
+        For analytics passes that read emotions across thousands of rows;
+        ciphertexts are deduplicated and decrypted together instead of one
+        call per field per row.
+
+        Args:
+            results: Results from semantic_search / find_similar_conversations
+
+        Returns:
+            The same results, with every context fully decrypted
+        """
+        views = [r['context'] for r in results if isinstance(r.get('context'), DecryptedContext)]
+        pending = [(view, field, token) for view in views for field, token in view._pending()]
+        if pending:
+            plaintexts = self.encryption.decrypt_many(token for _, _, token in pending)
+            for (view, field, _), plaintext in zip(pending, plaintexts):
+                view._fill(field, plaintext)
+        return results
+
     def get_relevant_context(
         self,
         query: str,
@@ -267,6 +376,8 @@ class SemanticMemory:
         """
         Find conversations similar to a specific turn.
 
+        Uses the turn's stored vector directly (no re-embedding).
+
         Args:
             turn_id: ID of the turn to find similar conversations for
             k: Number of similar conversations to return
@@ -280,14 +391,35 @@ class SemanticMemory:
             logger.warning(f"Turn ID {turn_id} not found in semantic memory")
             return []
 
-        # Get the metadata (includes the embedding text)
-        metadata = self.vector_store.get_by_id(vector_id)
-        if not metadata:
-            return []
+        return self._format_results(self.vector_store.search_by_id(vector_id, k=k))
+
+    def neighbors_for_all(self, k: int = 5) -> Dict[str, List[tuple]]:
+        """
+        kNN graph over every stored turn, for dedup and clustering jobs.
+
+        Args:
+            k: Neighbours per turn
 
-        # Use the combined text to search
-        combined_text = metadata.get('combined_text', '')
-        return self.semantic_search(combined_text, k=k + 1)[1:]  # Exclude the query itself
+        Returns:
+            Dict of turn_id -> [(neighbour_turn_id, similarity), ...]
+        """
+        ids, neighbor_ids, similarities = self.vector_store.neighbors_for_all(k)
+        turn_ids = dict(self.vector_store.id_to_metadata.column('turn_id'))
+
+        def _turn(vector_id):
+            return turn_ids.get(int(vector_id))
+
+        graph = {}
+        for vector_id, row_ids, row_sims in zip(ids, neighbor_ids, similarities):
+            turn_id = _turn(vector_id)
+            if turn_id is None:
+                continue
+            graph[turn_id] = [
+                (_turn(nid), float(sim))
+                for nid, sim in zip(row_ids, row_sims)
+                if nid != -1 and _turn(nid) is not None
+            ]
+        return graph
 
     def get_conversation_by_id(self, turn_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -367,9 +499,5 @@ class SemanticMemory:
         """
         self.vector_store.load(filepath)
         # Rebuild turn_id mapping from metadata
-        self.turn_id_to_vector_id.clear()
-        for vector_id, metadata in self.vector_store.id_to_metadata.items():
-            turn_id = metadata.get('turn_id')
-            if turn_id:
-                self.turn_id_to_vector_id[turn_id] = vector_id
+        self._rebuild_turn_index()
         logger.info(f"Loaded semantic memory from {filepath}")
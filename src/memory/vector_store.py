@@ -1,17 +1,53 @@
 """
 Vector Store using FAISS
 Fast vector similarity search for semantic memory with persistent storage
+
+Persistence is append-only: every add/delete is written as one framed record
+to a write-ahead segment log (``<storage>.wal.<gen>``), so a turn costs O(1)
+disk I/O regardless of history size. Once a segment reaches ``compact_every``
+records it is sealed and folded into the base snapshot (``<storage>.pkl``) by a
+background thread. On load the base snapshot is read and every segment newer
+than it is replayed; a torn record at the tail of a segment (crash mid-write)
+is truncated away.
+
+Search is tiered: small stores are searched exactly. Once the store reaches
+``ann_threshold`` vectors, an IVF or HNSW index (see ann_index.py) is built
+from a snapshot on a background thread, self-checked for recall against
+brute-force search, and hot-swapped in. It is rebuilt whenever the store
+doubles in size since the last build.
+
+Deletion is real: the exact index is an IndexIDMap2 over IndexFlatIP, so
+delete() calls remove_ids and the vector is gone from memory and from the next
+snapshot. The approximate tier cannot remove in place (HNSW has no removal),
+so deleted IDs become tombstones there; search over-fetches past them, and the
+tier is rebuilt in the background once tombstones exceed ``tombstone_ratio``.
+
+Metadata lives in SQLite (``<storage>.db``, see metadata_store.py) rather than
+in the snapshot, with indexed timestamp/emotion/flag columns. search() accepts
+``filters`` that select candidate IDs in SQL and hand them to FAISS as an
+IDSelector, so only matching vectors are scored. WAL records still carry the
+metadata, so replay re-upserts any row a crash left out of the database.
 """
 
 import numpy as np
 import faiss
 from typing import List, Tuple, Dict, Any, Optional
 from pathlib import Path
+import os
 import pickle
+import struct
+import threading
+import zlib
 import logging
 
+from src.memory.ann_index import AnnIndex, measure_recall
+from src.memory.metadata_store import MetadataStore
+
 logger = logging.getLogger(__name__)
 
+# WAL record framing: payload length + crc32 of payload, then pickled payload
+_WAL_HEADER = struct.Struct('<II')
+
 
 class VectorStore:
     """FAISS-based vector store for fast similarity search with persistent storage"""
@@ -19,7 +55,15 @@ class VectorStore:
     def __init__(
         self,
         embedding_dim: int = 384,
-        storage_path: str = "data/embeddings/vector_store"
+        storage_path: str = "data/embeddings/vector_store",
+        compact_every: int = 500,
+        fsync: bool = False,
+        ann_kind: Optional[str] = "hnsw",
+        ann_threshold: int = 50000,
+        nprobe: int = 16,
+        ef_search: int = 64,
+        target_recall: float = 0.95,
+        tombstone_ratio: float = 0.2
     ):
         """
         Initialize vector store with persistent storage.
@@ -27,27 +71,92 @@ class VectorStore:
         Args:
             embedding_dim: Dimension of embedding vectors (default: 384)
             storage_path: Base path for storing index and metadata (without extension)
+            compact_every: WAL records per segment before background compaction
+            fsync: fsync each WAL append (survives OS crashes, not just process crashes)
+            ann_kind: Approximate index to promote to ('hnsw', 'ivf', or None for exact only)
+            ann_threshold: Vector count at which the approximate index is built
+            nprobe: IVF lists probed per query
+            ef_search: HNSW candidate-list size per query
+            target_recall: Recall@10 the self-check widens search params to reach
+            tombstone_ratio: Fraction of deleted IDs in the approximate tier that triggers a rebuild
         """
         self.embedding_dim = int(embedding_dim)
         self.storage_path = Path(storage_path)
         self.index_path = self.storage_path.with_suffix('.index')
         self.metadata_path = self.storage_path.with_suffix('.pkl')
+        self.metadata_db_path = self.storage_path.with_suffix('.db')
+        self.compact_every = max(1, int(compact_every))
+        self.fsync = fsync
+        self.ann_kind = ann_kind
+        self.ann_threshold = max(1, int(ann_threshold))
+        self.nprobe = int(nprobe)
+        self.ef_search = int(ef_search)
+        self.target_recall = float(target_recall)
+        self.tombstone_ratio = float(tombstone_ratio)
+
+        self._lock = threading.RLock()
+        self._wal_file = None
+        self._wal_gen = 0
+        self._wal_records = 0
+        self._compaction_thread: Optional[threading.Thread] = None
+        self._ann: Optional[AnnIndex] = None
+        self._ann_thread: Optional[threading.Thread] = None
+        self._ann_built_size = 0
+        self._tombstones: set = set()
+        self._epoch = 0
+        self.ann_stats: Dict[str, Any] = {}
 
         # Ensure directory exists
         self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+        self.id_to_metadata = MetadataStore(self.metadata_db_path)
 
-        # Try to load existing index
-        if self.index_path.exists() and self.metadata_path.exists():
+        if self.metadata_path.exists() or self._list_segments():
             logger.info(f"Loading existing vector store from {self.storage_path}")
-            self.load()
         else:
             logger.info(f"Creating new vector store at {self.storage_path}")
-            self.index = faiss.IndexFlatIP(int(embedding_dim))
-            self.id_to_metadata: Dict[int, Dict[str, Any]] = {}
-            self.next_id = 0
+        self.load()
 
         logger.info(f"VectorStore initialized: {self.index.ntotal} vectors, dim={self.embedding_dim}")
 
+    def _reset(self):
+        """Reset in-memory index state to an empty store (metadata rows are untouched)"""
+        self.index = self._new_index()
+        self.next_id = 0
+        self._ann = None
+        self._ann_built_size = 0
+        self._tombstones = set()
+        self._epoch = getattr(self, '_epoch', 0) + 1
+
+    def _new_index(self):
+        """Empty exact index: ID-mapped so vectors can be removed by store ID"""
+        return faiss.IndexIDMap2(faiss.IndexFlatIP(int(self.embedding_dim)))
+
+    def _upgrade_legacy_index(self, index) -> Any:
+        """
+        Wrap a pre-IDMap IndexFlatIP (row position == store ID).
+
+        Rows whose metadata was dropped by the old metadata-only delete() are
+        orphans; they are removed here instead of being carried forward.
+        """
+        n = index.ntotal
+        upgraded = self._new_index()
+        if n:
+            ids = np.arange(n, dtype='int64')
+            live = np.isin(ids, self.id_to_metadata.ids())
+            upgraded.add_with_ids(index.reconstruct_n(0, n)[live], ids[live])
+            if not live.all():
+                logger.info(f"Dropped {int((~live).sum())} orphaned vectors from legacy index")
+        return upgraded
+
+    def _snapshot_vectors(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Copy of all live (vectors, ids) in the exact index (caller holds the lock)"""
+        n = self.index.ntotal
+        if n == 0:
+            return np.zeros((0, self.embedding_dim), dtype='float32'), np.zeros(0, dtype='int64')
+        vectors = self.index.index.reconstruct_n(0, n)
+        ids = faiss.vector_to_array(self.index.id_map).astype('int64')
+        return vectors, ids
+
     def add(self, embeddings: np.ndarray, metadata: Optional[List[Dict[str, Any]]] = None) -> List[int]:
         """
         Add embeddings to the index with metadata.
@@ -74,30 +183,29 @@ class VectorStore:
         # Normalize embeddings for cosine similarity with IndexFlatIP
         norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
         norms[norms == 0] = 1  # Prevent division by zero
-        embeddings_normalized = embeddings / norms
-
-        # Add to FAISS index
-        self.index.add(embeddings_normalized.astype('float32'))
-
-        # Store metadata
-        ids = []
-        for i, meta in enumerate(metadata):
-            idx = self.next_id
-            self.id_to_metadata[idx] = meta
-            ids.append(idx)
-            self.next_id += 1
+        embeddings_normalized = (embeddings / norms).astype('float32')
+
+        with self._lock:
+            ids = list(range(self.next_id, self.next_id + n))
+            record = {
+                'op': 'add',
+                'ids': ids,
+                'vectors': embeddings_normalized,
+                'metadata': metadata
+            }
+            self._apply(record)
+            # Append-only persistence (replaces the old full save() per add)
+            self._append_wal(record)
+            self._maybe_promote()
 
         logger.info(f"Added {n} vectors (total: {self.index.ntotal})")
-
-        # Auto-save after adding
-        self.save()
-
         return ids
 
     def search(
         self,
         query_embedding: np.ndarray,
-        k: int = 5
+        k: int = 5,
+        filters: Optional[Dict[str, Any]] = None
     ) -> List[Tuple[int, float, Dict[str, Any]]]:
         """
         Search for similar vectors.
@@ -105,6 +213,8 @@ class VectorStore:
         Args:
             query_embedding: Query embedding (shape: [embedding_dim])
             k: Number of results to return
+            filters: Optional metadata filters (see MetadataStore.filter_ids);
+                     only matching vectors are scored
 
         Returns:
             List of (id, similarity_score, metadata) tuples
@@ -122,72 +232,548 @@ class VectorStore:
         if norm > 0:
             query_embedding = query_embedding / norm
 
-        # Search
-        k = min(k, self.index.ntotal)
-        distances, indices = self.index.search(query_embedding.astype('float32'), k)
+        query_embedding = query_embedding.astype('float32')
+
+        with self._lock:
+            k = min(k, self.index.ntotal)
+            ann = self._ann
+            if filters:
+                # Pre-filter in SQL, then score only the candidates (exact tier)
+                candidates = self.id_to_metadata.filter_ids(filters)
+                if len(candidates) == 0:
+                    return []
+                k = min(k, len(candidates))
+                params = faiss.SearchParameters(sel=faiss.IDSelectorBatch(candidates))
+                distances, indices = self.index.search(query_embedding, k, params=params)
+            elif ann is None:
+                distances, indices = self.index.search(query_embedding, k)
+            else:
+                # Approximate tier may still hold tombstoned IDs: over-fetch
+                # until k live hits are found or the whole tier was scanned
+                fetch = k + min(len(self._tombstones), k)
+                while True:
+                    fetch = min(fetch, ann.ntotal)
+                    distances, indices = ann.search(query_embedding, fetch)
+                    live = sum(1 for idx in indices[0] if idx != -1 and int(idx) not in self._tombstones)
+                    if live >= k or fetch >= ann.ntotal:
+                        break
+                    fetch *= 2
+
+            # Convert to results
+            results = []
+            for dist, idx in zip(distances[0], indices[0]):
+                if idx == -1 or int(idx) in self._tombstones:  # empty slot / deleted
+                    continue
+
+                # Convert distance to similarity (IndexFlatIP returns inner product)
+                similarity = float(dist)
+
+                # Get metadata
+                metadata = self.id_to_metadata.get(int(idx), {})
+
+                results.append((int(idx), similarity, metadata))
+                if len(results) == k:
+                    break
 
-        # Convert to results
-        results = []
-        for dist, idx in zip(distances[0], indices[0]):
-            if idx == -1:  # FAISS returns -1 for empty slots
-                continue
+        logger.debug(f"Search found {len(results)} results")
+        return results
 
-            # Convert distance to similarity (IndexFlatIP returns inner product)
-            similarity = float(dist)
+    def reconstruct(self, id: int) -> Optional[np.ndarray]:
+        """
+        Return the stored (normalized) vector for an ID.
 
-            # Get metadata
-            metadata = self.id_to_metadata.get(int(idx), {})
+        Args:
+            id: Vector ID returned by add()
 
-            results.append((int(idx), similarity, metadata))
+        Returns:
+            float32 array of shape [embedding_dim], or None if the ID is unknown
+        """
+        with self._lock:
+            if int(id) not in self.id_to_metadata:
+                return None
+            try:
+                return self.index.reconstruct(int(id))
+            except RuntimeError:
+                return None
+
+    def search_by_id(self, id: int, k: int = 5) -> List[Tuple[int, float, Dict[str, Any]]]:
+        """
+        Find the k nearest neighbours of a stored vector, excluding itself.
 
-        logger.debug(f"Search found {len(results)} results")
-        return results
+        Pure index lookup: the stored vector is reused, nothing is re-embedded.
 
-    def save(self):
-        """Save index and metadata to disk"""
+        Args:
+            id: Vector ID to use as the query
+            k: Number of neighbours to return
+
+        Returns:
+            List of (id, similarity_score, metadata) tuples
+        """
+        vector = self.reconstruct(id)
+        if vector is None:
+            return []
+        results = self.search(vector, k=k + 1)
+        return [r for r in results if r[0] != int(id)][:k]
+
+    def neighbors_for_all(self, k: int = 5) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Exact kNN graph over every stored vector in one vectorised pass.
+
+        Intended for offline dedup / clustering jobs. Each vector's own entry is
+        dropped from its neighbour list.
+
+        Args:
+            k: Neighbours per vector
+
+        Returns:
+            (ids [n], neighbor_ids [n, k], similarities [n, k]); missing
+            neighbours (k >= n) are padded with -1 / -inf
+        """
+        with self._lock:
+            vectors, ids = self._snapshot_vectors()
+        n = len(ids)
+        if n == 0:
+            return ids, np.zeros((0, k), dtype='int64'), np.zeros((0, k), dtype='float32')
+
+        fetch = min(k + 1, n)
+        sims, rows = faiss.knn(vectors, vectors, fetch, metric=faiss.METRIC_INNER_PRODUCT)
+        neighbor_ids = np.where(rows >= 0, ids[np.clip(rows, 0, None)], -1)
+
+        # Move each row's self-match to the end (stable), then keep k columns
+        is_self = neighbor_ids == ids[:, None]
+        order = np.argsort(is_self, axis=1, kind='stable')
+        neighbor_ids = np.take_along_axis(neighbor_ids, order, axis=1)
+        sims = np.take_along_axis(sims, order, axis=1)
+        is_self = np.take_along_axis(is_self, order, axis=1)
+        neighbor_ids[is_self] = -1
+        sims[is_self] = -np.inf
+
+        if fetch - 1 >= k:
+            return ids, neighbor_ids[:, :k], sims[:, :k]
+
+        pad = k - (fetch - 1)
+        neighbor_ids = np.hstack([neighbor_ids[:, :fetch - 1], np.full((n, pad), -1, dtype='int64')])
+        sims = np.hstack([sims[:, :fetch - 1], np.full((n, pad), -np.inf, dtype='float32')])
+        return ids, neighbor_ids, sims
+
+    # ------------------------------------------------------------------
+    # Write-ahead log
+    # ------------------------------------------------------------------
+
+    def _segment_path(self, gen: int) -> Path:
+        return self.storage_path.parent / f"{self.storage_path.name}.wal.{gen:06d}"
+
+    def _list_segments(self) -> List[Tuple[int, Path]]:
+        """Return (generation, path) for every WAL segment on disk, oldest first"""
+        prefix = f"{self.storage_path.name}.wal."
+        segments = []
+        for path in self.storage_path.parent.glob(f"{prefix}*"):
+            suffix = path.name[len(prefix):]
+            if suffix.isdigit():
+                segments.append((int(suffix), path))
+        return sorted(segments)
+
+    def _apply(self, record: Dict[str, Any]):
+        """Apply one WAL record to the in-memory index and metadata"""
+        op = record.get('op')
+        if op == 'add':
+            vectors = np.asarray(record['vectors'], dtype='float32')
+            ids = np.asarray(record['ids'], dtype='int64')
+            self.index.add_with_ids(vectors, ids)
+            if self._ann is not None:
+                self._ann.add(vectors, ids)
+            self.id_to_metadata.put_many(dict(zip(record['ids'], record['metadata'])))
+            if record['ids']:
+                self.next_id = max(self.next_id, record['ids'][-1] + 1)
+        elif op == 'delete':
+            ids = np.asarray(record['ids'], dtype='int64')
+            self.index.remove_ids(ids)
+            self.id_to_metadata.delete_many(record['ids'])
+            if self._ann is not None:
+                self._tombstones.update(int(idx) for idx in record['ids'])
+        else:
+            logger.warning(f"Ignoring unknown WAL record op: {op!r}")
+
+    def _append_wal(self, record: Dict[str, Any]):
+        """Append one framed record to the active segment (caller holds the lock)"""
         try:
-            # Save FAISS index
-            faiss.write_index(self.index, str(self.index_path))
-
-            # Save metadata
-            with open(self.metadata_path, 'wb') as f:
-                pickle.dump({
-                    'id_to_metadata': self.id_to_metadata,
-                    'next_id': self.next_id,
-                    'embedding_dim': self.embedding_dim
-                }, f)
-
-            logger.debug(f"Saved vector store: {self.index.ntotal} vectors")
+            if self._wal_file is None:
+                self._wal_file = open(self._segment_path(self._wal_gen), 'ab')
+
+            payload = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+            self._wal_file.write(_WAL_HEADER.pack(len(payload), zlib.crc32(payload)))
+            self._wal_file.write(payload)
+            self._wal_file.flush()
+            if self.fsync:
+                os.fsync(self._wal_file.fileno())
+            self._wal_records += 1
         except Exception as e:
-            logger.error(f"Failed to save vector store: {e}")
+            logger.error(f"Failed to append to vector store WAL: {e}")
+            return
 
-    def load(self):
-        """Load index and metadata from disk"""
+        if self._wal_records >= self.compact_every:
+            self.compact(background=True)
+
+    def _replay_segment(self, path: Path) -> int:
+        """
+        Replay a WAL segment into memory.
+
+        A torn or corrupt record ends the segment: everything from that offset
+        on is truncated so the next append starts on a clean frame boundary.
+
+        Returns:
+            Number of records applied
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        offset = 0
+        applied = 0
+        while offset + _WAL_HEADER.size <= len(data):
+            length, crc = _WAL_HEADER.unpack_from(data, offset)
+            start = offset + _WAL_HEADER.size
+            payload = data[start:start + length]
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                break
+            try:
+                record = pickle.loads(payload)
+            except Exception:
+                break
+            self._apply(record)
+            applied += 1
+            offset = start + length
+
+        if offset < len(data):
+            logger.warning(
+                f"Truncating torn WAL tail in {path.name}: "
+                f"{len(data) - offset} bytes after {applied} records"
+            )
+            with open(path, 'r+b') as f:
+                f.truncate(offset)
+
+        return applied
+
+    # ------------------------------------------------------------------
+    # Approximate index tier
+    # ------------------------------------------------------------------
+
+    def _maybe_promote(self):
+        """
+        Start a background ANN (re)build when the store crosses the threshold,
+        doubles in size, or accumulates too many tombstones.
+        """
+        if not self.ann_kind or self.index.ntotal < self.ann_threshold:
+            return
+        if self._ann is not None:
+            grown = self.index.ntotal >= 2 * self._ann_built_size
+            if not grown and self.get_tombstone_ratio() < self.tombstone_ratio:
+                return
+        self.promote_index(background=True)
+
+    def get_tombstone_ratio(self) -> float:
+        """Fraction of the approximate tier's entries that are deleted"""
+        if self._ann is None or self._ann.ntotal == 0:
+            return 0.0
+        return len(self._tombstones) / float(self._ann.ntotal)
+
+    def promote_index(self, background: bool = True):
+        """
+        Build (or rebuild) the approximate index and hot-swap it in.
+
+        Args:
+            background: Build on a daemon thread and return immediately
+        """
+        if not self.ann_kind:
+            return
+
+        thread = self._ann_thread
+        if thread is not None and thread.is_alive():
+            if not background:
+                thread.join()
+            return
+
+        if background:
+            self._ann_thread = threading.Thread(
+                target=self._build_ann,
+                name="VectorStoreAnnBuild",
+                daemon=True
+            )
+            self._ann_thread.start()
+        else:
+            self._build_ann()
+
+    def _build_ann(self):
+        """Build from a snapshot, tune against brute force, catch up, then swap"""
+        try:
+            with self._lock:
+                epoch = self._epoch
+                vectors, ids = self._snapshot_vectors()
+            n = len(ids)
+            if n == 0:
+                return
+
+            ann = AnnIndex(
+                self.embedding_dim,
+                kind=self.ann_kind,
+                nprobe=self.nprobe,
+                ef_search=self.ef_search
+            )
+            ann.build(vectors, ids)
+            stats = self._tune_ann(ann, vectors, ids)
+
+            with self._lock:
+                if epoch != self._epoch:
+                    logger.info("Discarding ANN build: store was reset during build")
+                    return
+                # Catch up on adds/deletes that landed while the build ran
+                current_vectors, current_ids = self._snapshot_vectors()
+                added = ~np.isin(current_ids, ids)
+                if added.any():
+                    ann.add(current_vectors[added], current_ids[added])
+                removed = ids[~np.isin(ids, current_ids)]
+
+                self._ann = ann
+                self._ann_built_size = n
+                self._tombstones = set(int(idx) for idx in removed)
+                self.ann_stats = stats
+
+            logger.info(
+                f"Promoted vector store to {self.ann_kind.upper()} "
+                f"({n} vectors, recall@10={stats['recall']:.3f}, "
+                f"p95 {stats['ann_p95_ms']:.2f}ms vs exact {stats['exact_p95_ms']:.2f}ms)"
+            )
+        except Exception as e:
+            logger.error(f"Failed to build ANN index: {e}")
+
+    def _tune_ann(
+        self,
+        ann: AnnIndex,
+        vectors: np.ndarray,
+        ids: np.ndarray,
+        sample_size: int = 50,
+        k: int = 10
+    ) -> Dict[str, Any]:
+        """Widen search params until sampled recall reaches target_recall"""
+        rng = np.random.default_rng(0)
+        sample = vectors[rng.choice(len(vectors), min(sample_size, len(vectors)), replace=False)]
+
+        stats = measure_recall(ann, vectors, ids, sample, k=k)
+        while stats['recall'] < self.target_recall and ann.widen():
+            stats = measure_recall(ann, vectors, ids, sample, k=k)
+
+        if stats['recall'] < self.target_recall:
+            logger.warning(
+                f"ANN recall {stats['recall']:.3f} below target {self.target_recall:.3f} "
+                f"at maximum search params"
+            )
+        stats.update(kind=ann.kind, nprobe=ann.nprobe, ef_search=ann.ef_search)
+        return stats
+
+    def set_search_params(self, nprobe: Optional[int] = None, ef_search: Optional[int] = None):
+        """Tune the recall/latency trade-off of the approximate tier"""
+        if nprobe is not None:
+            self.nprobe = int(nprobe)
+        if ef_search is not None:
+            self.ef_search = int(ef_search)
+        if self._ann is not None:
+            self._ann.set_search_params(nprobe=nprobe, ef_search=ef_search)
+
+    def check_recall(self, sample_size: int = 50, k: int = 10) -> Dict[str, Any]:
+        """
+        Self-check the approximate tier against brute-force search.
+
+        Args:
+            sample_size: Stored vectors to reuse as queries
+            k: Neighbours per query
+
+        Returns:
+            Dict with recall@k and p95 latencies, or {} while searching exactly
+        """
+        with self._lock:
+            ann = self._ann
+            if ann is None:
+                return {}
+            if self._tombstones:
+                # Recall is measured against the build contents; wait for the rebuild
+                logger.debug("Skipping recall check while tombstones are pending")
+                return dict(self.ann_stats)
+            vectors, ids = self._snapshot_vectors()
+        n = len(ids)
+
+        rng = np.random.default_rng()
+        sample = vectors[rng.choice(n, min(sample_size, n), replace=False)]
+        stats = measure_recall(ann, vectors, ids, sample, k=k)
+        stats.update(kind=ann.kind, nprobe=ann.nprobe, ef_search=ann.ef_search)
+        self.ann_stats = stats
+        return stats
+
+    # ------------------------------------------------------------------
+    # Compaction / snapshots
+    # ------------------------------------------------------------------
+
+    def compact(self, background: bool = False):
+        """
+        Fold sealed WAL segments into the base snapshot.
+
+        The active segment is sealed and a new one opened under the lock; the
+        index is serialized in memory, and the (slow) disk write happens either
+        inline or on a background thread. The snapshot is committed with an
+        atomic rename, after which the folded segments are deleted.
+
+        Args:
+            background: Write the snapshot on a daemon thread and return immediately
+        """
+        with self._lock:
+            if self._compaction_thread is not None and self._compaction_thread.is_alive():
+                if not background:
+                    self._compaction_thread.join()
+                else:
+                    # Previous compaction still writing; retry on a later append
+                    return
+
+            # Seal the active segment; new writes go to the next generation
+            if self._wal_file is not None:
+                self._wal_file.close()
+                self._wal_file = None
+            self._wal_gen += 1
+            self._wal_records = 0
+
+            snapshot = {
+                'index_bytes': faiss.serialize_index(self.index),
+                'next_id': self.next_id,
+                'embedding_dim': self.embedding_dim,
+                'wal_gen': self._wal_gen
+            }
+
+            if background:
+                self._compaction_thread = threading.Thread(
+                    target=self._write_snapshot,
+                    args=(snapshot,),
+                    name="VectorStoreCompaction",
+                    daemon=True
+                )
+                self._compaction_thread.start()
+                return
+
+        self._write_snapshot(snapshot)
+
+    def _write_snapshot(self, snapshot: Dict[str, Any]):
+        """Atomically replace the base snapshot, then drop folded segments"""
+        tmp_path = self.metadata_path.with_name(self.metadata_path.name + '.tmp')
         try:
-            # Load FAISS index
-            self.index = faiss.read_index(str(self.index_path))
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.metadata_path)
+
+            # Legacy split-format index is superseded by the snapshot
+            if self.index_path.exists():
+                self.index_path.unlink()
+
+            for gen, path in self._list_segments():
+                if gen < snapshot['wal_gen']:
+                    path.unlink(missing_ok=True)
+
+            logger.debug(
+                f"Compacted vector store: {snapshot['index_bytes'].nbytes} index bytes, "
+                f"wal_gen={snapshot['wal_gen']}"
+            )
+        except Exception as e:
+            logger.error(f"Failed to compact vector store: {e}")
 
-            # Load metadata
-            with open(self.metadata_path, 'rb') as f:
-                data = pickle.load(f)
-                self.id_to_metadata = data['id_to_metadata']
-                self.next_id = data['next_id']
-                self.embedding_dim = data.get('embedding_dim', 384)
+    def save(self):
+        """Save index and metadata to disk (synchronous compaction)"""
+        self.compact(background=False)
+        logger.debug(f"Saved vector store: {self.index.ntotal} vectors")
+
+    def load(self):
+        """Load the base snapshot and replay any newer WAL segments"""
+        with self._lock:
+            if self._wal_file is not None:
+                self._wal_file.close()
+                self._wal_file = None
+
+            self._reset()
+            base_gen = 0
+            try:
+                if self.metadata_path.exists():
+                    with open(self.metadata_path, 'rb') as f:
+                        data = pickle.load(f)
+
+                    if 'id_to_metadata' in data:
+                        # Pre-SQLite snapshot: migrate the pickled dict once
+                        self.id_to_metadata.put_many(data['id_to_metadata'])
+                        logger.info(f"Migrated {len(data['id_to_metadata'])} metadata entries to SQLite")
+                    self.next_id = data['next_id']
+                    self.embedding_dim = data.get('embedding_dim', 384)
+
+                    if 'index_bytes' in data:
+                        index = faiss.deserialize_index(data['index_bytes'])
+                    elif self.index_path.exists():
+                        # Legacy split format (.index + .pkl)
+                        index = faiss.read_index(str(self.index_path))
+                    else:
+                        index = self._new_index()
+                    if not isinstance(index, faiss.IndexIDMap2):
+                        index = self._upgrade_legacy_index(index)
+                    self.index = index
+                    base_gen = data.get('wal_gen', 0)
+            except Exception as e:
+                logger.error(f"Failed to load vector store: {e}")
+                # Fall back to empty index
+                self._reset()
+
+            # Replay segments newer than the snapshot; drop already-folded ones
+            replayed = 0
+            segments = self._list_segments()
+            for gen, path in segments:
+                if gen < base_gen:
+                    path.unlink(missing_ok=True)
+                    continue
+                try:
+                    replayed += self._replay_segment(path)
+                except Exception as e:
+                    logger.error(f"Failed to replay WAL segment {path.name}: {e}")
+
+            # Keep appending to the newest segment
+            self._wal_gen = max([base_gen] + [gen for gen, _ in segments])
+            self._wal_records = 0
+            if replayed:
+                logger.info(f"Replayed {replayed} WAL records")
+
+            self._reconcile_metadata()
+
+            self._maybe_promote()
 
             logger.info(f"Loaded vector store: {self.index.ntotal} vectors")
-        except Exception as e:
-            logger.error(f"Failed to load vector store: {e}")
-            # Fall back to empty index
-            self.index = faiss.IndexFlatIP(int(self.embedding_dim))
-            self.id_to_metadata = {}
-            self.next_id = 0
+
+    def _reconcile_metadata(self):
+        """Drop metadata rows whose vector never made it into the index (crash between writes)"""
+        if len(self.id_to_metadata) == self.index.ntotal:
+            return
+        index_ids = faiss.vector_to_array(self.index.id_map)
+        orphans = np.setdiff1d(self.id_to_metadata.ids(), index_ids)
+        if len(orphans):
+            self.id_to_metadata.delete_many(orphans.tolist())
+            logger.warning(f"Dropped {len(orphans)} metadata rows without vectors")
+
+    def close(self):
+        """Wait for background compaction/index builds and close the active WAL segment"""
+        for thread in (self._compaction_thread, self._ann_thread):
+            if thread is not None:
+                thread.join()
+        with self._lock:
+            if self._wal_file is not None:
+                self._wal_file.close()
+                self._wal_file = None
 
     def clear(self):
         """Clear all vectors and metadata"""
-        self.index = faiss.IndexFlatIP(int(self.embedding_dim))
-        self.id_to_metadata = {}
-        self.next_id = 0
-        self.save()
+        with self._lock:
+            self._reset()
+            self.id_to_metadata.clear()
+            self.save()
         logger.info("Vector store cleared")
 
     def get_stats(self) -> Dict[str, Any]:
@@ -196,7 +782,13 @@ class VectorStore:
             'total_vectors': self.index.ntotal,
             'embedding_dim': self.embedding_dim,
             'metadata_count': len(self.id_to_metadata),
-            'storage_path': str(self.storage_path)
+            'storage_path': str(self.storage_path),
+            'wal_records': self._wal_records,
+            'wal_segments': len(self._list_segments()),
+            'index_tier': self._ann.kind if self._ann is not None else 'flat',
+            'tombstones': len(self._tombstones),
+            'tombstone_ratio': self.get_tombstone_ratio(),
+            'ann': dict(self.ann_stats)
         }
 
     # Legacy compatibility methods
@@ -209,9 +801,13 @@ class VectorStore:
         return self.id_to_metadata.get(id)
 
     def delete(self, ids: List[int]):
-        """Delete entries by ID (removes metadata only)"""
-        for id in ids:
-            if id in self.id_to_metadata:
-                del self.id_to_metadata[id]
-                logger.debug(f"Deleted metadata for ID {id}")
-        self.save()
+        """Delete entries by ID (removes the vector and its metadata)"""
+        with self._lock:
+            ids = [int(id) for id in ids if id in self.id_to_metadata]
+            if not ids:
+                return
+            record = {'op': 'delete', 'ids': ids}
+            self._apply(record)
+            self._append_wal(record)
+            self._maybe_promote()
+        logger.debug(f"Deleted IDs {ids}")
@@ -14,7 +14,6 @@ Outputs:
 - Confidence-weighted learnings (only applies high-confidence data)
 """
 
-import asyncio
 import sqlite3
 from datetime import datetime, time
 from typing import Dict, List, Optional, Any, Tuple
@@ -27,6 +26,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from personality_tracker import PersonalityTracker, PersonalityDimension
 from slang_vocabulary_tracker import SlangVocabularyTracker
 from contextual_preference_engine import ContextualPreferenceEngine, TimeOfDay
+from src.core.loop_runtime import run_sync
 
 
 class DynamicPersonalityPromptBuilder:
@@ -421,4 +421,4 @@ def build_personality_enhanced_prompt_sync(
             context={'topic': 'programming'}
         )
     """
-    return asyncio.run(build_personality_enhanced_prompt(user_id, context, db_path))
+    return run_sync(build_personality_enhanced_prompt(user_id, context, db_path))
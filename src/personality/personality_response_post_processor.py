@@ -7,7 +7,6 @@ Post-processing ensures personality consistency even when LLM doesn't follow pro
 This is the "personality guard" that catches violations and applies learned preferences.
 """
 
-import asyncio
 import re
 from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
@@ -18,6 +17,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from personality_tracker import PersonalityTracker
 from slang_vocabulary_tracker import SlangVocabularyTracker
+from src.core.loop_runtime import run_sync
 
 
 class PersonalityResponsePostProcessor:
@@ -411,4 +411,4 @@ def process_response_with_personality_sync(
         )
         processed_response = result["response"]
     """
-    return asyncio.run(process_response_with_personality(response, context, db_path))
+    return run_sync(process_response_with_personality(response, context, db_path))
@@ -9,11 +9,16 @@ WEEK 7: SECURITY FOUNDATION
 - Automatic key generation on first run
 """
 
-from cryptography.fernet import Fernet
+from cryptography.fernet import Fernet, InvalidToken
+from collections import OrderedDict
 from pathlib import Path
+from typing import Iterable, List, Optional
+import hashlib
+import hmac
 import json
 import logging
 import os
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -31,12 +36,14 @@ class DataEncryption:
     Key is stored locally in data/.encryption_key with 0o600 permissions.
     """
 
-    def __init__(self, key_file: Path = None):
+    def __init__(self, key_file: Path = None, plaintext_cache_size: int = 4096):
         """
         Initialize encryption with secure key storage.
 
         Args:
             key_file: Path to encryption key file (default: data/.encryption_key)
+            plaintext_cache_size: Max ciphertext -> plaintext entries kept in memory
+                                  by decrypt_many() (0 disables the cache)
         """
         if key_file is None:
             key_file = Path(__file__).parent.parent.parent / "data" / ".encryption_key"
@@ -44,6 +51,12 @@ class DataEncryption:
         self.key_file = Path(key_file)
         self._load_or_create_key()
 
+        # Process-local only; never persisted. Keyed by ciphertext, so a key
+        # rotation (new ciphertexts) naturally misses.
+        self.plaintext_cache_size = int(plaintext_cache_size)
+        self._plaintext_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
     def _load_or_create_key(self):
         """Load existing key or create new one with secure permissions"""
         if self.key_file.exists() and self.key_file.stat().st_size > 0:
@@ -116,6 +129,73 @@ class DataEncryption:
         decrypted_bytes = self.cipher.decrypt(encrypted_data.encode('utf-8'))
         return decrypted_bytes.decode('utf-8')
 
+    def decrypt_many(self, encrypted_values: Iterable[str]) -> List[Optional[str]]:
+        """
+        Decrypt a batch of values in one call.
+
+        Duplicate ciphertexts are decrypted once and recently seen ones are
+        served from a small in-memory plaintext cache. Fernet ciphertexts are
+        randomized, so equal plaintexts (e.g. a repeated emotion label) are
+        still decrypted separately; the savings come from re-reading the same
+        rows, as repeated analytics passes over recent history do.
+
+        Args:
+            encrypted_values: Base64-encoded encrypted strings
+
+        Returns:
+            Plaintext strings in input order; None for values that fail to decrypt
+        """
+        encrypted_values = list(encrypted_values)
+        plaintexts: dict = {}
+        with self._cache_lock:
+            for token in encrypted_values:
+                if token in self._plaintext_cache:
+                    self._plaintext_cache.move_to_end(token)
+                    plaintexts[token] = self._plaintext_cache[token]
+
+        decrypted = {}
+        for token in dict.fromkeys(encrypted_values):
+            if token in plaintexts:
+                continue
+            if not token:
+                plaintexts[token] = ""
+                continue
+            try:
+                decrypted[token] = self.cipher.decrypt(token.encode('utf-8')).decode('utf-8')
+            except (InvalidToken, ValueError, AttributeError) as e:
+                logger.warning(f"Failed to decrypt value: {type(e).__name__}")
+                plaintexts[token] = None
+
+        if decrypted:
+            plaintexts.update(decrypted)
+            if self.plaintext_cache_size > 0:
+                with self._cache_lock:
+                    self._plaintext_cache.update(decrypted)
+                    while len(self._plaintext_cache) > self.plaintext_cache_size:
+                        self._plaintext_cache.popitem(last=False)
+
+        return [plaintexts[token] for token in encrypted_values]
+
+    def blind_index(self, data: str) -> str:
+        """
+        Deterministic keyed hash of a value, for equality lookups on encrypted fields.
+
+        Fernet ciphertexts are randomized, so they can't be indexed or compared.
+        The HMAC (keyed with a key derived from the encryption key) can be,
+        without revealing the plaintext to anyone who lacks the key.
+
+        Args:
+            data: Plaintext value (e.g. an emotion label)
+
+        Returns:
+            Hex digest string
+        """
+        if not data:
+            return ""
+
+        index_key = hashlib.sha256(b"blind-index:" + self.key).digest()
+        return hmac.new(index_key, data.encode('utf-8'), hashlib.sha256).hexdigest()
+
     def encrypt_dict(self, data: dict) -> str:
         """
         Encrypt dictionary as JSON.
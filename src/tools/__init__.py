@@ -10,6 +10,11 @@ from .tool_orchestrator import (
     get_orchestrator
 )
 
+from .http_pool import (
+    SearchHTTPPool,
+    get_search_http_pool
+)
+
 from .tool_registry import (
     ToolRegistry,
     ToolImplementations,
@@ -22,6 +27,8 @@ __all__ = [
     "ToolCallParser",
     "ToolOrchestrator",
     "get_orchestrator",
+    "SearchHTTPPool",
+    "get_search_http_pool",
     "ToolRegistry",
     "ToolImplementations",
     "get_tool_registry"
@@ -0,0 +1,332 @@
+"""
+Shared HTTP client for search providers.
+
+Every search tool call used to open its own aiohttp.ClientSession, paying a
+TCP connect, TLS handshake and DNS lookup before the first byte. SearchHTTPPool
+keeps one pooled session per event loop (normally the shared LoopRuntime loop)
+for all providers, and caches successful responses keyed by provider and
+normalised query:
+
+- fresh (younger than ttl): served from memory, no request
+- stale (younger than ttl + stale_ttl): served from memory immediately while
+  one background request refreshes the entry
+- expired / missing: fetched, with concurrent identical requests sharing one
+  in-flight fetch
+
+Usage:
+    pool = get_search_http_pool()
+    response = await pool.get("duckduckgo", url, query=query, params=params)
+    if response.status == 200:
+        data = response.json()
+"""
+
+import asyncio
+import hashlib
+import inspect
+import json
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# Request parameters that never take part in the cache key
+SECRET_PARAMS = {"key", "api_key", "apikey", "token", "cx"}
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase, trim and collapse whitespace so trivial variants share a key"""
+    return re.sub(r"\s+", " ", query.strip().lower())
+
+
+def cache_key(provider: str, url: str, query: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Cache key for one provider request.
+
+    Args:
+        provider: Provider name
+        url: Endpoint URL
+        query: Search query (normalised before hashing)
+        params: Request parameters; the raw query and secrets are excluded
+
+    Returns:
+        Hex digest identifying the request
+    """
+    extra = sorted(
+        (str(k), str(v)) for k, v in (params or {}).items()
+        if k not in SECRET_PARAMS and v != query
+    )
+    digest = hashlib.sha1()
+    digest.update(json.dumps([provider, url, normalize_query(query), extra]).encode("utf-8"))
+    return digest.hexdigest()
+
+
+@dataclass
+class PooledResponse:
+    """A fully read HTTP response, safe to cache and share"""
+    status: int
+    text: str
+    from_cache: bool = False
+    stale: bool = False
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+
+@dataclass
+class _CacheEntry:
+    response: PooledResponse
+    stored_at: float
+    ttl: float
+    stale_ttl: float
+
+
+class SearchHTTPPool:
+    """Process-wide pooled aiohttp sessions plus a response cache"""
+
+    def __init__(self, ttl: float = 600.0, stale_ttl: float = 3600.0, max_entries: int = 512,
+                 limit: int = 32, limit_per_host: int = 8, timeout: float = 15.0,
+                 provider_ttls: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            ttl: Seconds a cached response is served without revalidation
+            stale_ttl: Further seconds a response may be served while refreshing
+            max_entries: Maximum cached responses (least recently used evicted)
+            limit: Total connections in the pool
+            limit_per_host: Connections per host
+            timeout: Default total request timeout in seconds
+            provider_ttls: Per-provider overrides of ttl
+        """
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self.provider_ttls = provider_ttls or {}
+
+        self._sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._inflight: Dict[Tuple[int, str], asyncio.Future] = {}
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            "requests": 0, "hits": 0, "stale_hits": 0, "misses": 0,
+            "coalesced": 0, "refreshes": 0, "refresh_failures": 0, "sessions_created": 0
+        }
+
+    # ------------------------------------------------------------------
+    # Sessions
+    # ------------------------------------------------------------------
+
+    async def session(self) -> aiohttp.ClientSession:
+        """Pooled session bound to the running event loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            # Sessions of loops that have since closed can never be used again
+            for old_loop in [l for l in self._sessions if l.is_closed()]:
+                self._sessions.pop(old_loop).detach()
+            session = self._sessions.get(loop)
+            if session is None or session.closed:
+                session = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(
+                        limit=self.limit, limit_per_host=self.limit_per_host,
+                        ttl_dns_cache=300, keepalive_timeout=60
+                    ),
+                    timeout=aiohttp.ClientTimeout(total=self.timeout)
+                )
+                self._sessions[loop] = session
+                self.stats["sessions_created"] += 1
+        return session
+
+    async def aclose(self):
+        """Close the session bound to the running event loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session = self._sessions.pop(loop, None)
+        refreshes = [t for t in self._refreshing.values() if t.get_loop() is loop]
+        for task in refreshes:
+            task.cancel()
+        if refreshes:
+            await asyncio.gather(*refreshes, return_exceptions=True)
+        if session is not None and not session.closed:
+            await session.close()
+
+    # ------------------------------------------------------------------
+    # Requests
+    # ------------------------------------------------------------------
+
+    async def get(self, provider: str, url: str, query: str, params: Optional[Dict[str, Any]] = None,
+                  headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None,
+                  ttl: Optional[float] = None, use_cache: bool = True,
+                  before_fetch: Optional[Callable[[], Any]] = None) -> PooledResponse:
+        """
+        GET through the shared pool, answering from the cache when possible.
+
+        Args:
+            provider: Provider name (part of the cache key and per-provider TTL)
+            url: Endpoint URL
+            query: Search query the request is for
+            params: Query-string parameters
+            headers: Request headers (e.g. API tokens)
+            timeout: Total request timeout in seconds (defaults to the pool's)
+            ttl: Freshness override for this request
+            use_cache: False to always hit the network (response still cached)
+            before_fetch: Sync or async callable run only when a network
+                request is about to be made (quota checks); exceptions propagate
+
+        Returns:
+            PooledResponse; only status 200 responses are cached
+        """
+        key = cache_key(provider, url, query, params)
+        self.stats["requests"] += 1
+
+        if use_cache:
+            entry, state = self._lookup(key)
+            if state == "fresh":
+                self.stats["hits"] += 1
+                return PooledResponse(entry.response.status, entry.response.text, from_cache=True)
+            if state == "stale":
+                self.stats["stale_hits"] += 1
+                self._schedule_refresh(key, provider, url, params, headers, timeout, ttl, before_fetch)
+                return PooledResponse(entry.response.status, entry.response.text,
+                                      from_cache=True, stale=True)
+
+        self.stats["misses"] += 1
+        loop = asyncio.get_running_loop()
+        inflight_key = (id(loop), key)
+        shared = self._inflight.get(inflight_key)
+        if shared is not None and not shared.done():
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(shared)
+
+        future = loop.create_future()
+        self._inflight[inflight_key] = future
+        try:
+            response = await self._fetch(key, provider, url, params, headers, timeout, ttl, before_fetch)
+            future.set_result(response)
+            return response
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody else may be waiting; mark the exception retrieved
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(inflight_key, None)
+
+    async def _fetch(self, key: str, provider: str, url: str, params: Optional[Dict[str, Any]],
+                     headers: Optional[Dict[str, str]], timeout: Optional[float], ttl: Optional[float],
+                     before_fetch: Optional[Callable[[], Any]]) -> PooledResponse:
+        if before_fetch is not None:
+            result = before_fetch()
+            if inspect.isawaitable(result):
+                await result
+
+        session = await self.session()
+        request_timeout = aiohttp.ClientTimeout(total=timeout) if timeout else None
+        async with session.get(url, params=params, headers=headers, timeout=request_timeout) as response:
+            text = await response.text()
+            pooled = PooledResponse(status=response.status, text=text)
+
+        if pooled.status == 200:
+            self._store(key, pooled, self._ttl_for(provider, ttl))
+        return pooled
+
+    def _schedule_refresh(self, key: str, provider: str, url: str, params: Optional[Dict[str, Any]],
+                          headers: Optional[Dict[str, str]], timeout: Optional[float], ttl: Optional[float],
+                          before_fetch: Optional[Callable[[], Any]]):
+        running = self._refreshing.get(key)
+        if running is not None and not running.done():
+            return
+
+        async def _refresh():
+            try:
+                await self._fetch(key, provider, url, params, headers, timeout, ttl, before_fetch)
+                self.stats["refreshes"] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["refresh_failures"] += 1
+                logger.debug(f"Background refresh for {provider} failed: {e}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.ensure_future(_refresh())
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+
+    def _ttl_for(self, provider: str, ttl: Optional[float]) -> float:
+        if ttl is not None:
+            return ttl
+        return self.provider_ttls.get(provider, self.ttl)
+
+    def _lookup(self, key: str) -> Tuple[Optional[_CacheEntry], str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, "miss"
+            age = time.monotonic() - entry.stored_at
+            if age <= entry.ttl:
+                self._entries.move_to_end(key)
+                return entry, "fresh"
+            if age <= entry.ttl + entry.stale_ttl:
+                self._entries.move_to_end(key)
+                return entry, "stale"
+            del self._entries[key]
+            return None, "miss"
+
+    def _store(self, key: str, response: PooledResponse, ttl: float):
+        with self._lock:
+            self._entries[key] = _CacheEntry(response, time.monotonic(), ttl, self.stale_ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear_cache(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            cached = len(self._entries)
+            sessions = len(self._sessions)
+        served = self.stats["hits"] + self.stats["stale_hits"]
+        return dict(
+            self.stats,
+            cached_responses=cached,
+            open_sessions=sessions,
+            hit_rate=served / self.stats["requests"] if self.stats["requests"] else 0.0
+        )
+
+
+# Singleton instance for module-level access
+_search_http_pool: Optional[SearchHTTPPool] = None
+_search_http_pool_lock = threading.Lock()
+
+
+def get_search_http_pool() -> SearchHTTPPool:
+    """
+    Get the shared search HTTP pool. Its session on the shared loop runtime is
+    closed when the runtime shuts down.
+
+    Returns:
+        SearchHTTPPool instance
+    """
+    global _search_http_pool
+    with _search_http_pool_lock:
+        if _search_http_pool is None:
+            from src.core.loop_runtime import get_loop_runtime
+            _search_http_pool = SearchHTTPPool()
+            get_loop_runtime().add_shutdown_callback(_search_http_pool.aclose)
+    return _search_http_pool
@@ -54,31 +54,47 @@ class ToolCallParser:
             r'<\|channel\|>(.*?)<\|message\|>(\{.*?\})',
             re.DOTALL
         )
+        # Call header; the JSON arguments that follow are decoded with
+        # raw_decode so nested objects aren't cut at the first '}'
+        self.header_pattern = re.compile(r'<\|channel\|>(.*?)<\|message\|>\s*(?=\{)', re.DOTALL)
+        self._decoder = json.JSONDecoder()
 
     def parse(self, model_output: str) -> Union[ToolCall, FinalAnswer]:
         """
         Parse model output for tool calls.
 
         Returns:
-            ToolCall if tool syntax detected
+            ToolCall if tool syntax detected (the first one)
             FinalAnswer if normal response
         """
-        # Check for tool call syntax
-        match = self.tool_pattern.search(model_output)
+        calls = self.parse_all(model_output)
+        if calls:
+            return calls[0]
+        return self._parse_final_answer(model_output)
 
-        if match:
-            return self._parse_tool_call(match, model_output)
-        else:
-            return self._parse_final_answer(model_output)
+    def parse_all(self, model_output: str) -> List[ToolCall]:
+        """
+        Extract every tool call in the output, in order.
 
-    def _parse_tool_call(self, match, raw_output: str) -> ToolCall:
-        """Extract tool name and arguments from matched pattern."""
+        Returns:
+            List of ToolCall (empty if the output is a final answer)
+        """
+        calls = []
+        for match in self.header_pattern.finditer(model_output):
+            call = self._parse_tool_call(match, model_output)
+            if call is not None:
+                calls.append(call)
+        return calls
+
+    def _parse_tool_call(self, match, raw_output: str) -> Optional[ToolCall]:
+        """Extract tool name and arguments from a matched call header."""
         try:
             tool_descriptor = match.group(1).strip()  # e.g., "commentary to=browser.run code"
-            args_json = match.group(2)  # e.g., '{"query": "..."}'
 
-            # Parse arguments
-            arguments = json.loads(args_json)
+            # Parse arguments, e.g. '{"query": "..."}'
+            arguments, _ = self._decoder.raw_decode(raw_output, match.end())
+            if not isinstance(arguments, dict):
+                raise ValueError("tool arguments must be a JSON object")
 
             # Map tool descriptor to standard tool name
             tool_name = self._map_tool_name(tool_descriptor, arguments)
@@ -92,12 +108,12 @@ class ToolCallParser:
             )
 
         except json.JSONDecodeError as e:
+            # Skipped; an output with no valid call is treated as a final answer
             logger.error(f"Failed to parse tool arguments: {e}")
-            # Treat as final answer if parsing fails
-            return FinalAnswer(content=raw_output)
+            return None
         except Exception as e:
             logger.error(f"Error parsing tool call: {e}")
-            return FinalAnswer(content=raw_output)
+            return None
 
     def _map_tool_name(self, descriptor: str, arguments: Dict) -> str:
         """
@@ -158,19 +174,36 @@ class ToolOrchestrator:
     """
     Orchestrates tool calling workflow.
 
-    Manages the loop: LLM → Tool Call → Execute → LLM → Final Answer
+    Manages the loop: LLM → Tool Calls → Execute (concurrently) → LLM → Final Answer
+
+    The LLM is driven with a message list: each iteration appends the
+    assistant's tool calls and one "tool" message per result, so the next
+    generation sees what the tools returned instead of the same prompt again.
     """
 
-    def __init__(self, max_iterations: int = 3):
+    FOLLOW_UP_INSTRUCTION = "Now provide a natural conversational answer using these results."
+    RETRY_MESSAGE = "I had trouble finding the right information. Could you rephrase your question?"
+
+    def __init__(
+        self,
+        max_iterations: int = 3,
+        tool_timeout: Optional[float] = 20.0,
+        tool_timeouts: Optional[Dict[str, float]] = None
+    ):
         """
         Initialize orchestrator.
 
         Args:
             max_iterations: Maximum tool call iterations before forcing exit
+            tool_timeout: Default per-call timeout in seconds (None = no limit)
+            tool_timeouts: Per-tool overrides, e.g. {"math.calc": 2.0}
         """
         self.parser = ToolCallParser()
         self.max_iterations = max_iterations
+        self.tool_timeout = tool_timeout
+        self.tool_timeouts = dict(tool_timeouts or {})
         self.tool_registry = {}  # Will be populated by ToolRegistry
+        self.last_run_stats: Dict[str, Any] = {}
 
         logger.info(f"🎭 Tool Orchestrator initialized (max_iterations: {max_iterations})")
 
@@ -190,7 +223,10 @@ class ToolOrchestrator:
 
         Args:
             initial_prompt: The user's query
-            llm_generator: Function to call LLM (takes context, returns output)
+            llm_generator: Function (sync, or async) to call LLM; receives the
+                           message list (conversation_context + user query +
+                           tool exchanges so far) and returns the model output.
+                           Sync generators run in a worker thread
             conversation_context: Existing conversation history
 
         Returns:
@@ -205,55 +241,127 @@ class ToolOrchestrator:
             "content": initial_prompt
         })
 
+        stats = {"llm_calls": 0, "tool_calls": 0, "reused_results": 0, "repeated_output": False}
+        self.last_run_stats = stats
+        results_by_call: Dict[str, str] = {}  # call signature -> result, for this run
+        previous_output = None
         iteration = 0
 
         while iteration < self.max_iterations:
             iteration += 1
             logger.info(f"🔄 Orchestration iteration {iteration}/{self.max_iterations}")
 
-            # Generate LLM response
+            # Generate LLM response. A sync generator (blocking HTTP) runs in a
+            # worker thread so it never stalls the event loop this runs on
             try:
-                model_output = llm_generator(conversation_context)
+                if asyncio.iscoroutinefunction(llm_generator):
+                    model_output = await llm_generator(conversation_context)
+                else:
+                    model_output = await asyncio.to_thread(llm_generator, conversation_context)
+                stats["llm_calls"] += 1
             except Exception as e:
                 logger.error(f"LLM generation failed: {e}")
                 return "I encountered an error processing your request."
 
             # Parse output
-            parsed = self.parser.parse(model_output)
+            tool_calls = self.parser.parse_all(model_output)
 
-            if isinstance(parsed, FinalAnswer):
+            if not tool_calls:
                 # Done! Return to user
                 logger.info(f"✅ Final answer received (iteration {iteration})")
-                return parsed.content
-
-            elif isinstance(parsed, ToolCall):
-                # Execute tool
-                logger.info(f"🔧 Executing tool: {parsed.tool_name}")
-
-                tool_result = await self._execute_tool(parsed)
-
-                # Add tool call and result to context
-                conversation_context.append({
-                    "role": "assistant",
-                    "content": f"[TOOL_CALL: {parsed.tool_name}({json.dumps(parsed.arguments)})]"
-                })
-
+                return self.parser.parse(model_output).content
+
+            # The model produced exactly what it produced last time even though
+            # tool results were added: another round would cost an LLM call and
+            # change nothing, so answer with what the tools already returned
+            normalized = model_output.strip()
+            if normalized == previous_output:
+                logger.warning("⚠️ LLM repeated its tool calls after seeing the results; "
+                               "answering from the tool results")
+                stats["repeated_output"] = True
+                return self._answer_from_results(results_by_call)
+            previous_output = normalized
+
+            # Execute tools (independent calls run concurrently)
+            logger.info(f"🔧 Executing {len(tool_calls)} tool call(s): "
+                        f"{', '.join(c.tool_name for c in tool_calls)}")
+            tool_results = await self._execute_tools(tool_calls, results_by_call, stats)
+
+            # Add tool calls and results to context
+            conversation_context.append({
+                "role": "assistant",
+                "content": " ".join(
+                    f"[TOOL_CALL: {c.tool_name}({json.dumps(c.arguments)})]" for c in tool_calls
+                ),
+                "tool_calls": [c.to_dict() for c in tool_calls]
+            })
+            for call, result in zip(tool_calls, tool_results):
                 conversation_context.append({
-                    "role": "system",
-                    "content": f"TOOL_RESULT:\n{tool_result}\n\nNow provide a natural conversational answer using these results."
+                    "role": "tool",
+                    "name": call.tool_name,
+                    "content": f"TOOL_RESULT ({call.tool_name}):\n{result}"
                 })
+            conversation_context.append({
+                "role": "system",
+                "content": self.FOLLOW_UP_INSTRUCTION
+            })
 
-                # Loop continues - LLM will generate again with tool results
-                logger.info(f"✅ Tool executed, looping back to LLM")
+            # Loop continues - LLM will generate again with tool results
+            logger.info(f"✅ Tools executed, looping back to LLM")
 
         # Max iterations reached
         logger.warning(f"⚠️ Max iterations ({self.max_iterations}) reached")
-        return "I had trouble finding the right information. Could you rephrase your question?"
+        return self.RETRY_MESSAGE
+
+    def _answer_from_results(self, results_by_call: Dict[str, str]) -> str:
+        """Final answer from this run's successful tool results (distinct, in call order)."""
+        results = list(dict.fromkeys(
+            r.strip() for r in results_by_call.values()
+            if r and r.strip() and not r.startswith("ERROR:")
+        ))
+        if not results:
+            return self.RETRY_MESSAGE
+        return "Here's what I found:\n" + "\n\n".join(results)
+
+    async def _execute_tools(
+        self,
+        tool_calls: List[ToolCall],
+        results_by_call: Dict[str, str],
+        stats: Dict[str, Any]
+    ) -> List[str]:
+        """
+        Execute tool calls concurrently; identical calls (same tool and
+        arguments, in this output or an earlier iteration) run once.
+
+        Returns:
+            One result string per call, in call order
+        """
+        pending: Dict[str, ToolCall] = {}
+        for call in tool_calls:
+            signature = self._signature(call)
+            if signature in results_by_call or signature in pending:
+                stats["reused_results"] += 1
+            else:
+                pending[signature] = call
+
+        if pending:
+            stats["tool_calls"] += len(pending)
+            results = await asyncio.gather(*(self._execute_tool(call) for call in pending.values()))
+            results_by_call.update(zip(pending.keys(), results))
+
+        return [results_by_call[self._signature(call)] for call in tool_calls]
+
+    @staticmethod
+    def _signature(tool_call: ToolCall) -> str:
+        return f"{tool_call.tool_name}:{json.dumps(tool_call.arguments, sort_keys=True, default=str)}"
 
     async def _execute_tool(self, tool_call: ToolCall) -> str:
         """
         Execute a tool and return results.
 
+        Sync tools run in a worker thread so several calls can overlap; every
+        call is bounded by its timeout.
+
         Returns:
             Tool results as formatted string
         """
@@ -264,21 +372,50 @@ class ToolOrchestrator:
             logger.error(f"❌ {error_msg}")
             return f"ERROR: {error_msg}"
 
+        timeout = self.tool_timeouts.get(tool_call.tool_name, self.tool_timeout)
         try:
             # Execute tool (handle both sync and async)
             if asyncio.iscoroutinefunction(tool_func):
-                result = await tool_func(tool_call.arguments)
+                call = tool_func(tool_call.arguments)
             else:
-                result = tool_func(tool_call.arguments)
+                call = asyncio.to_thread(tool_func, tool_call.arguments)
+            result = await asyncio.wait_for(call, timeout)
 
             return str(result)
 
+        except asyncio.TimeoutError:
+            error_msg = f"Tool '{tool_call.tool_name}' timed out after {timeout}s"
+            logger.error(f"❌ {error_msg}")
+            return f"ERROR: {error_msg}"
         except Exception as e:
             error_msg = f"Tool execution failed: {e}"
             logger.error(f"❌ {error_msg}")
             return f"ERROR: {error_msg}"
 
 
+def render_tool_exchange(messages: Any) -> str:
+    """
+    Render the tool calls/results an orchestrate() run has added after the
+    user query, for text-completion LLMs.
+
+    Appending this to the turn's unchanged prompt keeps the prompt prefix (and
+    the server's KV cache) intact across iterations.
+
+    Args:
+        messages: The message list passed to llm_generator
+
+    Returns:
+        Text to append to the prompt ("" on the first iteration)
+    """
+    if not isinstance(messages, list):
+        return ""
+    user_indexes = [i for i, m in enumerate(messages) if isinstance(m, dict) and m.get("role") == "user"]
+    if not user_indexes:
+        return ""
+    exchange = messages[user_indexes[-1] + 1:]
+    return "\n\n".join(m.get("content", "") for m in exchange if m.get("content"))
+
+
 # Global orchestrator instance
 _orchestrator = None
 
@@ -1,14 +1,19 @@
-import whisper
-import tempfile
-import soundfile as sf
 import numpy as np
 
+from src.audio.whisper_service import get_stt_service
+from src.audio.streaming_stt import StreamingTranscriber
+
 SILENCE_THRESHOLD = 0.0005  # Lower = more sensitive. Was 0.002 but mic input is very quiet
+WHISPER_MODEL = "base"
 
 def is_silence(audio_data, threshold=SILENCE_THRESHOLD):
     volume = np.abs(audio_data).mean()
     return volume < threshold
 
+def warm_up(wait=False):
+    """Load the Whisper model in the background so the first utterance only pays inference."""
+    return get_stt_service(WHISPER_MODEL).start(wait=wait)
+
 def transcribe_audio(audio_data):
     # Debug: Check audio properties
     volume = np.abs(audio_data).mean()
@@ -20,10 +25,14 @@ def transcribe_audio(audio_data):
         return None  # Skip transcription if the audio is mostly silence
 
     print(f"[STT Debug] Audio accepted, transcribing...")
-    model = whisper.load_model("base")
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=True) as tmp:
-        sf.write(tmp.name, audio_data, 16000)
-        result = model.transcribe(tmp.name)
-    print(f"[STT Debug] Transcription: '{result['text']}'")
-    return result["text"].strip()
+    # Warm model, in-memory buffer: no per-call load_model and no temp WAV
+    service = get_stt_service(WHISPER_MODEL)
+    text = service.transcribe(audio_data)
+    print(f"[STT Debug] Transcription: '{text}' ({service.stats['last_inference_ms']:.0f}ms inference)")
+    return text
+
 
+def create_streaming_transcriber(on_partial=None, **session_options):
+    """Transcribe during capture: pass as AudioCapture's speech_listener, then read
+    utterance.transcript.result() -- only the uncommitted tail is decoded after the endpoint."""
+    return StreamingTranscriber(get_stt_service(WHISPER_MODEL), on_partial=on_partial, **session_options)
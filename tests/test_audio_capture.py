@@ -0,0 +1,179 @@
+"""
+Tests for the continuous capture subsystem (src/audio/capture.py): ring
+buffer, WebRTC VAD endpointing with pre-roll and hangover, and file replay.
+"""
+
+import io
+import time
+import wave
+
+import numpy as np
+import pytest
+
+from src.adapters.vad.webrtc_vad_adapter import WebRTCVAD
+from src.audio.capture import (
+    AudioCapture, FileReplaySource, SampleRingBuffer, VADEndpointer, benchmark_endpointing
+)
+
+RATE = 16000
+
+
+def _voice(seconds, f0=140):
+    """Harmonic-rich, amplitude-modulated tone that WebRTC VAD reads as speech"""
+    t = np.arange(int(RATE * seconds)) / RATE
+    tone = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in range(1, 20))
+    return (0.2 * tone * (1 + 0.3 * np.sin(2 * np.pi * 4 * t))).astype(np.float32)
+
+
+def _silence(seconds):
+    return np.zeros(int(RATE * seconds), dtype=np.float32)
+
+
+# 1.0 s of speech at 0.5 s, 0.6 s more at 2.4 s
+SPEECH = np.concatenate([_silence(0.5), _voice(1.0), _silence(0.9), _voice(0.6), _silence(1.0)])
+
+
+def _wav_bytes(samples, rate):
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes((samples * 32767).astype('<i2').tobytes())
+    return buffer.getvalue()
+
+
+def test_ring_buffer_wraps_and_counts_drops():
+    ring = SampleRingBuffer(5)
+    assert ring.write(np.arange(4, dtype=np.float32)) == 4
+    assert ring.read(3).tolist() == [0, 1, 2]
+    assert ring.read(2) is None  # only one sample buffered
+    assert ring.write(np.array([4, 5, 6, 7, 8], dtype=np.float32)) == 4
+    assert ring.dropped == 1
+    assert ring.read(5).tolist() == [3, 4, 5, 6, 7]
+    assert ring.position == 8 and ring.written == 8
+
+
+def test_webrtc_vad_classifies_frames():
+    vad = WebRTCVAD()
+    # Classify silence first: WebRTC VAD holds a speech decision for a few frames
+    assert not vad.is_speech_frame(_silence(0.03))
+    assert vad.is_speech_frame(_voice(0.03))
+    assert vad.is_speech((_voice(0.1) * 32767).astype('<i2').tobytes())
+    assert not vad.is_speech(b"too short")
+
+
+def test_endpointer_pre_roll_and_hangover():
+    endpointer = VADEndpointer(pre_roll_ms=300, start_ms=90, hangover_ms=300)
+    utterances = []
+    size = endpointer.frame_size
+    for offset in range(0, len(SPEECH) - size + 1, size):
+        utterance = endpointer.process(SPEECH[offset:offset + size], offset)
+        if utterance is not None:
+            utterances.append(utterance)
+
+    assert len(utterances) == 2
+    first = utterances[0]
+    assert first.reason == 'silence'
+    assert abs(first.speech_start / RATE - 0.5) <= 0.06
+    # Pre-roll reaches back before the detected start of speech
+    assert first.speech_start - first.start_sample >= RATE * 0.3
+    assert first.start_sample + len(first.audio) == first.end_sample
+    # Hangover: the endpoint is exactly hangover_ms after the last voiced frame
+    assert first.endpoint_latency_ms == pytest.approx(300, abs=1)
+    assert 1.5 <= first.speech_end / RATE <= 1.7
+
+
+def test_short_bursts_and_max_duration():
+    endpointer = VADEndpointer(start_ms=60, hangover_ms=150, min_speech_ms=250)
+    clicks = np.concatenate([_silence(0.2), _voice(0.12), _silence(0.5)])
+    size = endpointer.frame_size
+    assert all(endpointer.process(clicks[o:o + size], o) is None
+               for o in range(0, len(clicks) - size + 1, size))
+    assert endpointer.discarded == 1
+
+    endpointer = VADEndpointer(hangover_ms=300, max_utterance_s=1.0)
+    long_speech = np.concatenate([_silence(0.2), _voice(3.0)])
+    ends = [endpointer.process(long_speech[o:o + size], o)
+            for o in range(0, len(long_speech) - size + 1, size)]
+    forced = [u for u in ends if u is not None]
+    assert forced and forced[0].reason == 'max_duration'
+    assert forced[0].duration <= 1.0 + size / RATE
+
+
+def test_capture_replays_wav_file(tmp_path):
+    # Files at other rates are resampled to the capture rate
+    path = tmp_path / "speech.wav"
+    path.write_bytes(_wav_bytes(SPEECH[::2], 8000))
+
+    capture = AudioCapture(FileReplaySource(str(path), realtime=False),
+                           VADEndpointer(hangover_ms=300))
+    with capture:
+        first = capture.listen(timeout=5)
+        second = capture.listen(timeout=5)
+        assert capture.listen(timeout=5) is None  # replay finished
+
+    assert first.speech_start < second.speech_start
+    assert abs(second.speech_start / RATE - 2.4) <= 0.1
+    stats = capture.get_stats()
+    assert stats['utterances'] == 2 and stats['dropped_samples'] == 0
+    assert stats['mean_endpoint_latency_ms'] == pytest.approx(300, abs=1)
+
+
+def test_realtime_replay_endpoints_without_lag():
+    capture = AudioCapture(FileReplaySource(SPEECH[:int(RATE * 2.2)], realtime=True),
+                           VADEndpointer(hangover_ms=300))
+    start = time.perf_counter()
+    with capture:
+        utterance = capture.listen(timeout=5)
+    elapsed = time.perf_counter() - start
+
+    # Decided as soon as the deciding frame was captured, not after the stream ended
+    assert utterance.reason == 'silence'
+    assert elapsed == pytest.approx(utterance.end_sample / RATE, abs=0.15)
+    assert utterance.processing_lag_ms < 100
+
+
+def test_trailing_speech_is_flushed_at_end_of_file():
+    audio = np.concatenate([_silence(0.3), _voice(0.6)])
+    capture = AudioCapture(FileReplaySource(audio, realtime=False), VADEndpointer())
+    with capture:
+        utterance = capture.listen(timeout=5)
+    assert utterance.reason == 'eof'
+
+
+def test_benchmark_reports_segments():
+    result = benchmark_endpointing(SPEECH, hangover_ms=450)
+    assert [reason for *_, reason in result['segments']] == ['silence', 'silence']
+    for start, end, endpoint, _ in result['segments']:
+        assert endpoint - end == pytest.approx(0.45, abs=0.001)
+    assert result['frames'] == len(SPEECH) // (RATE * 30 // 1000)
+
+
+def test_listen_timeout_only_applies_before_speech_starts():
+    # Speech starts at 0.3 s and runs past the 0.6 s deadline
+    audio = np.concatenate([_silence(0.3), _voice(1.0), _silence(0.6)])
+    capture = AudioCapture(FileReplaySource(audio, realtime=True), VADEndpointer(hangover_ms=300))
+    with capture:
+        utterance = capture.listen(timeout=0.6)
+    assert utterance is not None and utterance.reason == 'silence'
+    assert 1.25 <= utterance.speech_end / RATE <= 1.5  # the whole run, past the deadline
+
+    capture = AudioCapture(FileReplaySource(_silence(2.0), realtime=True), VADEndpointer())
+    start = time.perf_counter()
+    with capture:
+        assert capture.listen(timeout=0.3) is None
+    assert time.perf_counter() - start < 1.0
+
+
+def test_record_until_silence_keeps_speech_spanning_the_deadline():
+    from voice_activity_detector import VoiceActivityDetector
+
+    detector = VoiceActivityDetector(silence_duration=0.3, max_recording_time=0.6)
+    audio = np.concatenate([_silence(0.3), _voice(1.0), _silence(0.6)])
+    detector.capture = AudioCapture(FileReplaySource(audio, realtime=True), VADEndpointer(hangover_ms=300))
+    recording = detector.record_until_silence()
+    detector.close()
+
+    assert len(recording) >= RATE * 1.0
+    assert detector.last_utterance.reason == 'silence'
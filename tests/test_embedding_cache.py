@@ -0,0 +1,121 @@
+"""
+Tests for the embedding cache and batched encode queue
+(src/memory/embedding_cache.py, src/memory/embedding_generator.py).
+
+A deterministic stand-in model replaces SentenceTransformer so no weights are
+downloaded; it records every forward pass.
+"""
+
+import hashlib
+import threading
+
+import numpy as np
+
+from src.memory.embedding_cache import DiskEmbeddingCache, EmbeddingCache, embedding_key
+from src.memory.embedding_generator import EmbeddingGenerator
+
+DIM = 384
+
+
+class RecordingModel:
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, normalize_embeddings=True, show_progress_bar=False):
+        self.calls.append(list(texts))
+        rows = []
+        for text in texts:
+            seed = int(hashlib.md5(text.encode()).hexdigest()[:8], 16)
+            v = np.random.default_rng(seed).standard_normal(DIM).astype("float32")
+            rows.append(v / np.linalg.norm(v) if normalize_embeddings else v)
+        return np.stack(rows)
+
+
+def _generator(**kwargs):
+    gen = EmbeddingGenerator(**kwargs)
+    gen.model = RecordingModel()
+    return gen
+
+
+def test_repeat_encode_hits_cache():
+    gen = _generator(batching=False)
+    first = gen.encode("hello there")
+    second = gen.encode("hello there")
+
+    assert np.array_equal(first, second)
+    assert len(gen.model.calls) == 1
+    assert gen.get_cache_stats()["cache"]["hits"] == 1
+
+
+def test_batch_encode_only_computes_misses():
+    gen = _generator(batching=False)
+    gen.encode("a")
+    out = gen.encode(["a", "b", "b", "c"])
+
+    assert out.shape == (4, DIM)
+    assert np.array_equal(out[1], out[2])
+    assert gen.model.calls == [["a"], ["b", "c"]]
+
+
+def test_normalize_flag_is_part_of_key():
+    assert embedding_key("m", "x", True) != embedding_key("m", "x", False)
+    gen = _generator(batching=False)
+    gen.encode("x", normalize=True)
+    gen.encode("x", normalize=False)
+    assert len(gen.model.calls) == 2
+
+
+def test_returned_arrays_are_writable_copies():
+    gen = _generator(batching=False)
+    v = gen.encode("mutable")
+    v[0] = 123.0
+    assert gen.encode("mutable")[0] != 123.0
+
+
+def test_lru_evicts_oldest():
+    cache = EmbeddingCache(max_entries=2)
+    cache.put_many({"a": np.ones(2), "b": np.ones(2)})
+    cache.get("a")
+    cache.put_many({"c": np.ones(2)})
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    gen = _generator(batching=False, cache_dir=str(tmp_path))
+    expected = gen.encode("persist me")
+    gen.cache.disk.close()
+
+    fresh = _generator(batching=False, cache_dir=str(tmp_path))
+    assert np.allclose(fresh.encode("persist me"), expected)
+    assert fresh.model.calls == []
+    assert fresh.get_cache_stats()["cache"]["disk_hits"] == 1
+
+
+def test_disk_tier_ring_buffer_overwrites_oldest(tmp_path):
+    disk = DiskEmbeddingCache(str(tmp_path), embedding_dim=2, capacity=2)
+    disk.put_many({"a": np.array([1, 1]), "b": np.array([2, 2]), "c": np.array([3, 3])})
+    assert disk.get("a") is None
+    assert disk.get("c").tolist() == [3, 3]
+    assert len(disk) == 2
+
+
+def test_batcher_coalesces_concurrent_callers():
+    gen = _generator(batching=True, max_wait_ms=50, max_batch_size=64)
+    barrier = threading.Barrier(8)
+    results = {}
+
+    def worker(i):
+        barrier.wait()
+        results[i] = gen.encode(f"text {i}")
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(results) == 8
+    assert sum(len(c) for c in gen.model.calls) == 8
+    assert len(gen.model.calls) < 8
+    assert gen.get_cache_stats()["batcher"]["largest_batch"] > 1
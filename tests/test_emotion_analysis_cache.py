@@ -0,0 +1,138 @@
+"""
+Tests for single-pass emotion analysis: the shared analysis cache
+(src/memory/emotion_cache.py), EmotionDetectorV2.detect_batch, and
+EmotionalContinuity reusing one inference for emotion + intensity.
+
+A fake classifier stands in for the transformer pipeline so no model is loaded.
+"""
+
+import pytest
+
+from src.memory.emotion_cache import EmotionAnalysisCache
+from src.memory.emotion_detector import EmotionDetector
+from src.memory.emotion_detector_v2 import EmotionDetectorV2
+from src.memory.emotional_continuity import EmotionalContinuity
+
+
+class FakeClassifier:
+    """Mimics pipeline("text-classification", return_all_scores=True)"""
+
+    def __init__(self):
+        self.calls = []
+
+    @staticmethod
+    def _scores(text):
+        if "furious" in text:
+            return [{"label": "anger", "score": 0.95}, {"label": "neutral", "score": 0.05}]
+        return [{"label": "neutral", "score": 0.9}, {"label": "joy", "score": 0.1}]
+
+    def __call__(self, inputs, batch_size=None):
+        self.calls.append((inputs, batch_size))
+        if isinstance(inputs, str):
+            return [self._scores(inputs)]
+        return [self._scores(text) for text in inputs]
+
+
+@pytest.fixture
+def fake():
+    return FakeClassifier()
+
+
+@pytest.fixture
+def detector(fake):
+    return EmotionDetectorV2(classifier=fake, cache=EmotionAnalysisCache())
+
+
+def test_repeat_detection_hits_cache(detector, fake):
+    first = detector.detect_emotion("I am furious about this")
+    second = detector.detect_emotion("I am furious about this")
+
+    assert first == second == {
+        "dominant_emotion": "anger", "confidence": 0.95,
+        "all_scores": {"anger": 0.95, "neutral": 0.05}
+    }
+    assert len(fake.calls) == 1
+    assert detector.cache.get_stats()["hits"] == 1
+
+
+def test_cached_result_cannot_be_mutated_by_callers(detector):
+    result = detector.detect_emotion("I am furious about this")
+    result["all_scores"]["anger"] = 0.0
+    result["dominant_emotion"] = "joy"
+
+    assert detector.detect_emotion("I am furious about this")["dominant_emotion"] == "anger"
+    assert detector.detect_emotion("I am furious about this")["all_scores"]["anger"] == 0.95
+
+
+def test_intensity_reuses_detection(detector, fake):
+    result = detector.detect_emotion("I am furious about this")
+    assert detector.intensity_from_result(result) == pytest.approx(0.95 * 0.95)
+    assert detector.detect_intensity("I am furious about this") == pytest.approx(0.95 * 0.95)
+    assert len(fake.calls) == 1
+
+
+def test_track_emotion_runs_one_inference(detector, fake):
+    tracker = EmotionalContinuity(semantic_memory=None, emotion_detector=detector,
+                                  intensity_threshold=0.8)
+    thread = tracker.track_emotion("I am furious about this", "turn_1")
+
+    assert thread is not None and thread.emotion == "anger"
+    assert len(fake.calls) == 1
+
+
+def test_detect_batch_batches_misses_and_keeps_order(detector, fake):
+    detector.detect_emotion("already cached text")
+    fake.calls.clear()
+
+    texts = ["I am furious", "calm day", "I am furious", "already cached text", "", "ok"]
+    results = detector.detect_batch(texts, batch_size=8)
+
+    assert [r["dominant_emotion"] for r in results] == [
+        "anger", "neutral", "anger", "neutral", "neutral", "neutral"
+    ]
+    # Only the unique, uncached, classifiable texts reach the model, in one call
+    assert fake.calls == [(["I am furious", "calm day"], 8)]
+
+    # Batched results are cached for later single lookups
+    detector.detect_emotion("calm day")
+    assert len(fake.calls) == 1
+
+
+def test_detect_batch_falls_back_to_single_calls_on_error(detector, fake):
+    def flaky(inputs, batch_size=None):
+        if not isinstance(inputs, str):
+            raise RuntimeError("batch too large")
+        return FakeClassifier()(inputs)
+
+    detector.classifier = flaky
+    results = detector.detect_batch(["I am furious", "calm day"])
+    assert [r["dominant_emotion"] for r in results] == ["anger", "neutral"]
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        EmotionDetectorV2(backend="tpu", classifier=FakeClassifier())
+
+
+def test_keyword_detector_shares_cache():
+    cache = EmotionAnalysisCache()
+    detector = EmotionDetector(cache=cache)
+
+    first = detector.detect_emotion("I'm so happy and excited today")
+    second = detector.detect_emotion("I'm so happy and excited today")
+    assert first == second
+    assert first is not second
+    assert cache.get_stats() == {"size": 1, "max_size": 512, "hits": 1, "misses": 1, "hit_rate": 0.5}
+
+
+def test_cache_evicts_least_recently_used():
+    cache = EmotionAnalysisCache(max_size=2)
+    cache.put("v1", "a", 1)
+    cache.put("v1", "b", 2)
+    cache.get("v1", "a")
+    cache.put("v1", "c", 3)
+
+    assert cache.get("v1", "b") is None
+    assert cache.get("v1", "a") == 1 and cache.get("v1", "c") == 3
+    # Keys are per detector
+    assert cache.get("v2", "a") is None
@@ -0,0 +1,154 @@
+"""
+Tests for hedged provider fan-out and latency-adaptive ordering in
+enhanced_web_search.EnhancedWebSearch. Providers are faked with sleeps so no
+network access is needed.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from enhanced_web_search import EnhancedWebSearch, ProviderLatencyStats, SearchResult
+
+
+def _results(provider, n):
+    return [SearchResult(title=f"{provider} {i}", url=f"https://{provider}.example/{i}",
+                         snippet="...", provider=provider) for i in range(n)]
+
+
+class FakeProviders(EnhancedWebSearch):
+    """Each provider sleeps for delay seconds then returns n results (or raises)"""
+
+    def __init__(self, behaviour, **kwargs):
+        kwargs.setdefault("latency_stats", ProviderLatencyStats())
+        super().__init__(**kwargs)
+        self.behaviour = behaviour
+        self.providers = list(behaviour)
+        self.session = object()
+        self.started = []
+        self.cancelled = []
+
+    async def _search_provider(self, provider, query):
+        delay, n = self.behaviour[provider]
+        self.started.append(provider)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(provider)
+            raise
+        if n is None:
+            raise ConnectionError(f"{provider} down")
+        return _results(provider, n)
+
+
+def _timed(search, max_results=3):
+    start = time.perf_counter()
+    results = asyncio.run(search.search("query", max_results=max_results))
+    return results, time.perf_counter() - start
+
+
+def test_slow_primary_is_hedged_and_cancelled():
+    search = FakeProviders({"slow": (2.0, 3), "fast": (0.05, 3)}, hedge_delay=0.1)
+    results, elapsed = _timed(search)
+
+    assert elapsed < 0.6
+    assert {r.provider for r in results} == {"fast"}
+    assert search.started == ["slow", "fast"]
+    assert search.cancelled == ["slow"]
+    assert search.latency_stats.get_stats()["providers"]["slow"]["cancelled"] == 1
+
+
+def test_fast_primary_never_fires_backups():
+    search = FakeProviders({"a": (0.01, 3), "b": (0.01, 3)}, hedge_delay=0.5)
+    results, _ = _timed(search)
+
+    assert search.started == ["a"]
+    assert len(results) == 3
+
+
+def test_failure_fires_next_immediately():
+    search = FakeProviders({"down": (0.01, None), "empty": (0.01, 0), "ok": (0.01, 3)},
+                           hedge_delay=5.0)
+    results, elapsed = _timed(search)
+
+    assert elapsed < 1.0
+    assert search.started == ["down", "empty", "ok"]
+    assert {r.provider for r in results} == {"ok"}
+
+
+def test_insufficient_results_are_combined():
+    search = FakeProviders({"a": (0.01, 1), "b": (0.01, 1), "c": (0.01, 1)}, hedge_delay=5.0)
+    results, _ = _timed(search, max_results=5)
+
+    assert sorted(r.provider for r in results) == ["a", "b", "c"]
+
+
+def test_sequential_mode_still_available():
+    search = FakeProviders({"a": (0.1, 1), "b": (0.1, 1)}, hedged=False)
+    results, elapsed = _timed(search)
+
+    assert search.started == ["a", "b"]
+    assert elapsed >= 0.2
+    assert len(results) == 2
+
+
+def test_order_adapts_to_observed_latency_and_failures():
+    stats = ProviderLatencyStats(min_samples=2)
+    for _ in range(3):
+        stats.record("slow", 3.0, "success")
+        stats.record("flaky", 0.05, "error")
+        stats.record("quick", 0.2, "success")
+
+    assert stats.order(["slow", "flaky", "quick", "new"], penalty=15) == ["quick", "slow", "flaky", "new"]
+
+    search = FakeProviders({"slow": (0.01, 3), "flaky": (0.01, 3), "quick": (0.01, 3)},
+                           latency_stats=stats)
+    _timed(search)
+    assert search.started == ["quick"]
+
+    search = FakeProviders({"slow": (0.01, 3), "quick": (0.01, 3)}, latency_stats=stats,
+                           adaptive_order=False)
+    _timed(search)
+    assert search.started == ["slow"]
+
+
+def test_unsampled_providers_keep_their_slots():
+    stats = ProviderLatencyStats(min_samples=5)
+    for _ in range(5):
+        stats.record("duckduckgo", 0.1, "success")
+    # One fast sampled provider doesn't lose its slot to untried ones
+    assert stats.order(["duckduckgo", "brave", "serp"], penalty=15) == ["duckduckgo", "brave", "serp"]
+
+    for _ in range(5):
+        stats.record("serp", 0.05, "success")
+    # Sampled providers trade places around the untried one
+    assert stats.order(["duckduckgo", "brave", "serp"], penalty=15) == ["serp", "brave", "duckduckgo"]
+
+    for _ in range(5):
+        stats.record("slow", 3.0, "success")
+    assert stats.order(["new", "slow"], penalty=15) == ["new", "slow"]
+
+
+def test_histogram_percentiles():
+    stats = ProviderLatencyStats(min_samples=4)
+    assert stats.percentile("p", 0.5) is None
+
+    for seconds in (0.04, 0.3, 0.4, 1.5):
+        stats.record("p", seconds, "success")
+
+    assert stats.percentile("p", 0.5) == 0.5
+    assert stats.percentile("p", 0.9) == 2.0
+    provider = stats.get_stats()["providers"]["p"]
+    assert provider["count"] == 4
+    assert provider["mean_seconds"] == pytest.approx(0.56)
+
+
+def test_hedge_delay_shrinks_to_provider_p90():
+    stats = ProviderLatencyStats(min_samples=2)
+    stats.record("a", 0.08, "success")
+    stats.record("a", 0.09, "success")
+
+    search = FakeProviders({"a": (0.01, 3)}, hedge_delay=1.0, latency_stats=stats)
+    assert search._hedge_delay_for("a") == 0.1
+    assert search._hedge_delay_for("unknown") == 1.0
@@ -0,0 +1,99 @@
+"""
+Tests for lazy and batched decryption of sensitive fields
+(DataEncryption.decrypt_many, DecryptedContext, SemanticMemory.decrypt_results).
+"""
+
+import hashlib
+
+import numpy as np
+import pytest
+
+import src.memory.semantic_memory as semantic_memory_module
+from src.memory.embedding_generator import EmbeddingGenerator
+from src.memory.semantic_memory import DecryptedContext, SemanticMemory
+from src.security.encryption import DataEncryption
+
+
+class HashModel:
+    common = np.random.default_rng(42).standard_normal(384).astype("float32")
+
+    def encode(self, texts, normalize_embeddings=True, show_progress_bar=False):
+        rows = []
+        for text in texts:
+            seed = int(hashlib.md5(text.encode()).hexdigest()[:8], 16)
+            v = self.common + 0.5 * np.random.default_rng(seed).standard_normal(384).astype("float32")
+            rows.append(v / np.linalg.norm(v))
+        return np.stack(rows)
+
+
+class CountingEncryption(DataEncryption):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.batches = []
+
+    def decrypt_many(self, encrypted_values):
+        encrypted_values = list(encrypted_values)
+        self.batches.append(len(encrypted_values))
+        return super().decrypt_many(encrypted_values)
+
+
+@pytest.fixture
+def encryption(tmp_path):
+    return CountingEncryption(key_file=tmp_path / "key")
+
+
+@pytest.fixture
+def memory(tmp_path, monkeypatch, encryption):
+    monkeypatch.setattr(semantic_memory_module, "get_encryption", lambda: encryption)
+    memory = SemanticMemory(encrypt_sensitive=True, storage_path=str(tmp_path / "vs"))
+    memory.embedding_generator = EmbeddingGenerator(batching=False)
+    memory.embedding_generator.model = HashModel()
+    yield memory
+    memory.vector_store.close()
+
+
+def test_decrypt_many_dedupes_caches_and_tolerates_bad_tokens(tmp_path):
+    enc = DataEncryption(key_file=tmp_path / "key", plaintext_cache_size=2)
+    joy, sad = enc.encrypt("joy"), enc.encrypt("sadness")
+
+    assert enc.decrypt_many([joy, sad, joy, "", "not-a-token"]) == ["joy", "sadness", "joy", "", None]
+    assert list(enc._plaintext_cache) == [joy, sad]
+
+    enc.decrypt_many([enc.encrypt("fear")])
+    assert len(enc._plaintext_cache) == 2  # bounded LRU
+
+
+def test_search_does_not_decrypt_until_field_is_read(memory, encryption):
+    memory.add_conversation_turn("I feel great", "Nice!", context={
+        "emotion": "joy", "sentiment": "positive", "sentiment_score": 0.9, "research_used": False
+    })
+
+    result, = memory.semantic_search("great", k=1)
+    assert result["user_input"] == "I feel great"
+    assert result["context"]["research_used"] is False
+    assert encryption.batches == []
+
+    assert result["context"]["emotion"] == "joy"
+    assert result["context"]["emotion"] == "joy"
+    assert encryption.batches == [1]
+    assert result["context"].get("sentiment_score") == 0.9
+
+    plain = result["context"].copy()
+    assert isinstance(plain, dict)
+    assert plain["sentiment"] == "positive"
+
+
+def test_decrypt_results_uses_one_batch(memory, encryption):
+    for i in range(5):
+        memory.add_conversation_turn(f"turn {i}", "ok", context={
+            "emotion": "joy" if i % 2 else "sadness", "sentiment_score": i / 10
+        })
+
+    results = memory.semantic_search("turn", k=5)
+    assert all(isinstance(r["context"], DecryptedContext) for r in results)
+
+    memory.decrypt_results(results)
+    assert encryption.batches == [10]
+    assert {r["context"]["emotion"] for r in results} == {"joy", "sadness"}
+    assert sorted(r["context"]["sentiment_score"] for r in results) == [0.0, 0.1, 0.2, 0.3, 0.4]
+    assert encryption.batches == [10]  # reads after the batch are free
@@ -0,0 +1,220 @@
+"""
+Tests for streaming completion (OpenAICompatLLM.stream) and sentence dispatch
+into TTS (src/adapters/tts/sentence_dispatcher.py).
+
+A local stub HTTP server plays the OpenAI-compatible SSE endpoint.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.adapters.llm.openai_compat import OpenAICompatLLM
+from src.adapters.tts.sentence_dispatcher import SentenceChunker, SentenceDispatcher
+
+TOKENS = ["Hello", " there", ", friend.", " The weather", " is sunny today!", " Dr. Smith",
+          " agrees", " with 3.5 degrees", " of confidence."]
+
+
+class SSEHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    delay = 0.0
+    requests = []
+    disconnected = threading.Event()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        SSEHandler.requests.append(body)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for token in TOKENS:
+                chunk = {"choices": [{"delta": {"content": token}}]}
+                self._write_chunk(f"data: {json.dumps(chunk)}\n\n".encode())
+                time.sleep(SSEHandler.delay)
+            self._write_chunk(b"data: [DONE]\n\n")
+            self._write_chunk(b"")
+        except (BrokenPipeError, ConnectionResetError):
+            SSEHandler.disconnected.set()
+
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def llm():
+    SSEHandler.delay = 0.0
+    SSEHandler.requests = []
+    SSEHandler.disconnected = threading.Event()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SSEHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield OpenAICompatLLM({"llm": {"base_url": f"http://127.0.0.1:{server.server_port}/v1"}})
+    server.shutdown()
+
+
+class FakeTTS:
+    def __init__(self):
+        self.spoken = []
+        self.stopped = False
+
+    def speak(self, text, **kwargs):
+        self.spoken.append((time.perf_counter(), text))
+        return True
+
+    def stop(self):
+        self.stopped = True
+
+
+def test_stream_yields_deltas(llm):
+    assert "".join(llm.stream("hi", system_prompt="sys")) == "".join(TOKENS)
+    assert SSEHandler.requests[0]["stream"] is True
+    assert SSEHandler.requests[0]["messages"][0] == {"role": "system", "content": "sys"}
+
+
+def test_stream_reports_connection_errors():
+    down = OpenAICompatLLM({"llm": {"base_url": "http://127.0.0.1:9/v1", "timeout": 1}})
+    out = list(down.stream("hi", system_prompt="sys"))
+    assert len(out) == 1 and out[0].startswith("[llm error]")
+
+
+def test_chunker_splits_on_sentence_boundaries():
+    chunker = SentenceChunker(min_chars=10)
+    sentences = []
+    for token in TOKENS:
+        sentences += chunker.feed(token)
+    sentences.append(chunker.flush())
+    assert sentences == [
+        "Hello there, friend.",
+        "The weather is sunny today!",
+        "Dr. Smith agrees with 3.5 degrees of confidence.",
+    ]
+
+
+def test_chunker_merges_short_and_splits_long():
+    chunker = SentenceChunker(min_chars=10, max_chars=40)
+    assert chunker.feed("Sure. ") == []
+    assert chunker.feed("That works for me. ") == ["Sure. That works for me."]
+    long = chunker.feed("one, two, three, four, five, six, seven, eight, nine")
+    assert long and all(len(s) <= 40 for s in long)
+
+
+def test_first_sentence_is_spoken_before_stream_ends(llm):
+    SSEHandler.delay = 0.05
+    tts = FakeTTS()
+    dispatcher = SentenceDispatcher(tts)
+    started = time.perf_counter()
+    reply = dispatcher.run(llm.stream("hi", system_prompt="sys", cancel_event=dispatcher.cancel_event))
+    finished = time.perf_counter()
+    dispatcher.wait(5)
+
+    assert reply == "".join(TOKENS)
+    assert [t for _, t in tts.spoken][0] == "Hello there, friend."
+    assert len(tts.spoken) == 3
+    # First audio was dispatched well before the final token arrived
+    assert tts.spoken[0][0] - started < (finished - started) / 2
+    assert dispatcher.stats["first_audio_ms"] is not None
+
+
+def test_barge_in_closes_stream(llm):
+    SSEHandler.delay = 0.1
+    tts = FakeTTS()
+    dispatcher = SentenceDispatcher(tts)
+
+    def interrupt():
+        while not tts.spoken:
+            time.sleep(0.01)
+        dispatcher.cancel()
+
+    threading.Thread(target=interrupt, daemon=True).start()
+    reply = dispatcher.run(llm.stream("hi", system_prompt="sys", cancel_event=dispatcher.cancel_event))
+    dispatcher.wait(5)
+
+    assert tts.stopped
+    assert len(reply) < len("".join(TOKENS))
+    assert SSEHandler.disconnected.wait(5)  # server saw the HTTP stream closed
+
+
+def test_barge_in_closes_a_stalled_stream(llm):
+    SSEHandler.delay = 2.0  # the server goes quiet after every token
+    tts = FakeTTS()
+    dispatcher = SentenceDispatcher(tts, chunker=SentenceChunker(min_chars=1))
+    threading.Timer(0.3, dispatcher.cancel).start()
+
+    started = time.perf_counter()
+    reply = dispatcher.run(llm.stream("hi", system_prompt="sys", cancel_event=dispatcher.cancel_event,
+                                      on_open=dispatcher.attach_stream))
+    elapsed = time.perf_counter() - started
+
+    # Cut off without waiting for the next chunk, and no error text leaks into the reply
+    assert elapsed < 1.0
+    assert reply == "Hello"
+
+
+class _Telemetry:
+    def __init__(self):
+        self.events = []
+
+    def log_event(self, name, data=None):
+        self.events.append(name)
+
+
+def _streaming_loop(llm, tts):
+    from src.core.pipeline import PipelineLoop, State
+
+    loop = PipelineLoop.__new__(PipelineLoop)  # skip config/STT/TTS factories
+    loop.llm, loop.tts, loop.telemetry = llm, tts, _Telemetry()
+    loop.barge_in_enabled = True
+    loop._dispatcher = None
+    loop.last_stream_stats = {}
+    loop.state = State.THINKING
+    return loop, State
+
+
+def test_pipeline_barge_in_cancels_while_still_thinking(llm):
+    SSEHandler.delay = 2.0  # nothing is spoken before the barge-in
+    tts = FakeTTS()
+    loop, State = _streaming_loop(llm, tts)
+    replies = []
+    loop._after_streamed_reply = lambda user_text, reply, tone: replies.append(reply)
+
+    def interrupt():
+        while loop._dispatcher is None:
+            time.sleep(0.01)
+        time.sleep(0.2)
+        assert loop.state == State.THINKING
+        assert loop.handle_barge_in()
+
+    threading.Thread(target=interrupt, daemon=True).start()
+    started = time.perf_counter()
+    reply = loop.think_and_speak_streaming("tell me something")
+
+    assert time.perf_counter() - started < 1.5
+    assert reply == replies[0] == "Hello"
+    assert loop.state == State.IDLE
+    assert loop.last_stream_stats["cancelled"] is True
+    assert tts.stopped and not tts.spoken
+    assert "barge_in" in loop.telemetry.events
+
+
+def test_pipeline_streams_prompt_from_hook(llm):
+    tts = FakeTTS()
+    loop, State = _streaming_loop(llm, tts)
+    loop._streaming_prompt = lambda user_text: f"CONTEXT\n\nUser: {user_text}"
+
+    reply = loop.think_and_speak_streaming("hi")
+
+    assert reply == "".join(TOKENS)
+    assert SSEHandler.requests[0]["messages"][1]["content"].startswith("CONTEXT\n\nUser: hi")
+    assert len(tts.spoken) == 3
+    assert loop.state == State.IDLE
+    # Nothing to interrupt once the turn is over
+    assert not loop.handle_barge_in()
@@ -0,0 +1,157 @@
+"""
+Tests for the process-wide event loop runtime (src/core/loop_runtime.py).
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.core.loop_runtime import LoopRuntime, get_loop_runtime, run_sync
+
+
+@pytest.fixture
+def runtime():
+    rt = LoopRuntime(name="test-loop").start()
+    yield rt
+    rt.shutdown()
+
+
+def test_run_sync_returns_result_and_propagates_errors(runtime):
+    async def add(a, b):
+        await asyncio.sleep(0)
+        return a + b
+
+    async def boom():
+        raise ValueError("bad")
+
+    assert runtime.run_sync(add(2, 3)) == 5
+    with pytest.raises(ValueError):
+        runtime.run_sync(boom())
+
+
+def test_same_loop_reused_across_calls(runtime):
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    loops = {runtime.run_sync(current_loop()) for _ in range(5)}
+    assert loops == {runtime.loop}
+    assert runtime.stats["calls"] == 5
+
+
+def test_loop_bound_state_survives_between_calls(runtime):
+    """Resources created on the loop (sessions, queues, locks) stay usable."""
+    async def make_queue():
+        return asyncio.Queue()
+
+    async def put_get(q, item):
+        await q.put(item)
+        return await q.get()
+
+    q = runtime.run_sync(make_queue())
+    assert runtime.run_sync(put_get(q, "a")) == "a"
+    assert runtime.run_sync(put_get(q, "b")) == "b"
+
+
+def test_run_sync_from_inside_another_running_loop(runtime):
+    async def value():
+        return 42
+
+    async def outer():
+        # asyncio.run() would fail here ("cannot be called from a running event loop")
+        return runtime.run_sync(value())
+
+    assert asyncio.run(outer()) == 42
+
+
+def test_run_sync_timeout_cancels_coroutine(runtime):
+    cancelled = threading.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(TimeoutError):
+        runtime.run_sync(slow(), timeout=0.05)
+    assert cancelled.wait(1)
+    assert runtime.stats["timeouts"] == 1
+
+
+def test_run_sync_on_loop_thread_raises(runtime):
+    async def inner():
+        return 1
+
+    async def reentrant():
+        return runtime.run_sync(inner())
+
+    with pytest.raises(RuntimeError):
+        runtime.run_sync(reentrant())
+
+
+def test_concurrent_callers_share_the_loop(runtime):
+    async def work(i):
+        await asyncio.sleep(0.05)
+        return i
+
+    results = []
+    threads = [threading.Thread(target=lambda i=i: results.append(runtime.run_sync(work(i))))
+               for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(results) == list(range(8))
+
+
+def test_shutdown_runs_callbacks_and_cancels_tasks():
+    rt = LoopRuntime(name="test-loop-shutdown").start()
+    closed = []
+    cancelled = threading.Event()
+
+    async def close_session():
+        closed.append(True)
+
+    async def forever():
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    rt.add_shutdown_callback(close_session)
+    rt.submit(forever())
+    rt.shutdown()
+
+    assert closed == [True]
+    assert cancelled.is_set()
+    assert not rt.running
+
+
+def test_shared_runtime_singleton():
+    assert get_loop_runtime() is get_loop_runtime()
+
+    async def thread_name():
+        return threading.current_thread().name
+
+    assert run_sync(thread_name()) == get_loop_runtime().name
+
+
+def test_personality_prompt_builds_on_the_loop_thread(monkeypatch):
+    import personality_prompt_builder
+
+    async def build(self, base_prompt=None, context=None):
+        await asyncio.sleep(0)
+        return f"{base_prompt} + personality"
+
+    monkeypatch.setattr(personality_prompt_builder.PersonalityPromptBuilder,
+                        "build_personality_prompt", build)
+
+    async def from_loop():
+        # e.g. a sync LLM call made directly on the shared loop
+        return personality_prompt_builder.get_personality_prompt("base")
+
+    assert run_sync(from_loop()) == "base + personality"
+    assert personality_prompt_builder.get_personality_prompt("base") == "base + personality"
@@ -0,0 +1,134 @@
+"""
+Tests for the SQLite metadata store and filtered vector search
+(src/memory/metadata_store.py, VectorStore.search(filters=...),
+SemanticMemory.semantic_search(filters=...)).
+"""
+
+import hashlib
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+import src.memory.semantic_memory as semantic_memory_module
+from src.memory.embedding_generator import EmbeddingGenerator
+from src.memory.metadata_store import MetadataStore
+from src.memory.semantic_memory import SemanticMemory
+from src.memory.vector_store import VectorStore
+from src.security.encryption import DataEncryption
+
+
+class HashModel:
+    common = np.random.default_rng(42).standard_normal(384).astype("float32")
+
+    def encode(self, texts, normalize_embeddings=True, show_progress_bar=False):
+        rows = []
+        for text in texts:
+            seed = int(hashlib.md5(text.encode()).hexdigest()[:8], 16)
+            v = self.common + 0.5 * np.random.default_rng(seed).standard_normal(384).astype("float32")
+            rows.append(v / np.linalg.norm(v))
+        return np.stack(rows)
+
+
+def _meta(i, research, group, days_ago=0):
+    return {
+        "turn_id": f"t{i}",
+        "timestamp": (datetime(2026, 1, 31) - timedelta(days=days_ago)).isoformat(),
+        "context": {"research_used": research, "ab_test_group": group},
+    }
+
+
+def test_metadata_store_mapping_and_filters(tmp_path):
+    store = MetadataStore(str(tmp_path / "meta.db"))
+    store.put_many({
+        0: _meta(0, True, "control", days_ago=10),
+        1: _meta(1, False, "treatment", days_ago=1),
+        2: _meta(2, True, "treatment", days_ago=2),
+    })
+
+    assert len(store) == 3
+    assert store[1]["turn_id"] == "t1"
+    assert store.get(99) is None
+    assert 2 in store and 99 not in store
+
+    assert store.filter_ids({"research_used": True}).tolist() == [0, 2]
+    assert store.filter_ids({"ab_test_group": "treatment", "research_used": True}).tolist() == [2]
+    assert store.filter_ids({"since": datetime(2026, 1, 25)}).tolist() == [1, 2]
+    assert store.column("turn_id") == [(0, "t0"), (1, "t1"), (2, "t2")]
+
+    store.delete_many([0])
+    assert store.pop(0, None) is None
+    assert sorted(store) == [1, 2]
+
+    with pytest.raises(ValueError):
+        store.filter_ids({"payload": "x"})
+
+
+def test_vector_search_scores_only_filtered_candidates(tmp_path):
+    store = VectorStore(embedding_dim=8, storage_path=str(tmp_path / "vs"))
+    x = np.random.default_rng(0).standard_normal((6, 8)).astype("float32")
+    store.add(x, metadata=[_meta(i, i % 2 == 0, "control") for i in range(6)])
+
+    # The query's exact match (id 1) is excluded by the filter
+    results = store.search(x[1], k=5, filters={"research_used": True})
+    assert sorted(r[0] for r in results) == [0, 2, 4]
+    assert store.search(x[1], k=5, filters={"ab_test_group": "nope"}) == []
+    store.close()
+
+
+def test_metadata_survives_reopen_without_snapshot_dict(tmp_path):
+    path = str(tmp_path / "vs")
+    store = VectorStore(embedding_dim=8, storage_path=path)
+    store.add(np.ones((2, 8), dtype="float32"), metadata=[_meta(0, True, "a"), _meta(1, False, "b")])
+    store.save()
+    store.close()
+
+    reopened = VectorStore(embedding_dim=8, storage_path=path)
+    assert reopened.get_by_id(1)["turn_id"] == "t1"
+    assert reopened.id_to_metadata.filter_ids({"ab_test_group": "a"}).tolist() == [0]
+    reopened.close()
+
+
+def test_orphaned_rows_reconciled_on_load(tmp_path):
+    path = str(tmp_path / "vs")
+    store = VectorStore(embedding_dim=8, storage_path=path)
+    store.add(np.ones((1, 8), dtype="float32"), metadata=[_meta(0, True, "a")])
+    # Simulate a crash after the metadata commit but before the WAL append
+    store.id_to_metadata.put_many({5: _meta(5, True, "a")})
+    store.close()
+
+    reopened = VectorStore(embedding_dim=8, storage_path=path)
+    assert 5 not in reopened.id_to_metadata
+    assert len(reopened.id_to_metadata) == 1
+    reopened.close()
+
+
+def test_semantic_search_filters_with_encrypted_emotion(tmp_path, monkeypatch):
+    encryption = DataEncryption(key_file=tmp_path / "key")
+    monkeypatch.setattr(semantic_memory_module, "get_encryption", lambda: encryption)
+
+    memory = SemanticMemory(encrypt_sensitive=True, storage_path=str(tmp_path / "vs"))
+    memory.embedding_generator = EmbeddingGenerator(batching=False)
+    memory.embedding_generator.model = HashModel()
+
+    memory.add_conversation_turn("I got the job", "Congrats!", turn_id="happy",
+                                 context={"emotion": "joy", "research_used": False})
+    memory.add_conversation_turn("What's the GDP of France?", "About $3T",
+                                 context={"emotion": "neutral", "research_used": True})
+    memory.add_conversation_turn("Old news", "Yep", turn_id="old",
+                                 timestamp=datetime.now() - timedelta(days=30),
+                                 context={"emotion": "joy", "research_used": False})
+
+    joy = memory.semantic_search("job", k=5, filters={"emotion": "joy"})
+    assert {r["turn_id"] for r in joy} == {"happy", "old"}
+    assert all(r["context"]["emotion"] == "joy" for r in joy)
+
+    recent_joy = memory.semantic_search("job", k=5, filters={"emotion": "joy", "last_days": 7})
+    assert [r["turn_id"] for r in recent_joy] == ["happy"]
+
+    research = memory.semantic_search("GDP", k=5, filters={"research_used": True})
+    assert [r["user_input"] for r in research] == ["What's the GDP of France?"]
+
+    # The plaintext emotion never reaches the metadata table
+    assert "joy" not in {v for _, v in memory.vector_store.id_to_metadata.column("emotion")}
+    memory.vector_store.close()
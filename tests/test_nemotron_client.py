@@ -0,0 +1,150 @@
+"""
+Tests for the Ollama HTTP client behind NemotronClient (src/llm/nemotron_client.py).
+
+A local stub server plays the Ollama API (/api/tags, /api/chat, /api/generate).
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.llm.nemotron_client import NemotronClient, _ReasoningTraceFilter
+
+PIECES = ["<think>we need", " to add</think>", "Four", " is the", " answer."]
+
+
+class OllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    models = ["nemotron-3-nano:latest"]
+    delay = 0.0
+    bodies = []
+    client_ports = set()
+    disconnected = threading.Event()
+
+    def _send_json(self, payload, status=200):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_GET(self):
+        OllamaHandler.client_ports.add(self.client_address[1])
+        self._send_json({"models": [{"name": n} for n in self.models]})
+
+    def do_POST(self):
+        OllamaHandler.client_ports.add(self.client_address[1])
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        OllamaHandler.bodies.append((self.path, body))
+
+        if self.path == "/api/generate":
+            self._send_json({"model": body["model"], "done": True})
+        elif body["model"] not in self.models:
+            self._send_json({"error": f"model '{body['model']}' not found"}, status=404)
+        elif not body["stream"]:
+            self._send_json({"message": {"role": "assistant", "content": "".join(PIECES)}, "done": True})
+        else:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            try:
+                for piece in PIECES:
+                    self._write_chunk(json.dumps({"message": {"content": piece}, "done": False}).encode() + b"\n")
+                    time.sleep(OllamaHandler.delay)
+                self._write_chunk(json.dumps({"message": {"content": ""}, "done": True}).encode() + b"\n")
+                self._write_chunk(b"")
+            except (BrokenPipeError, ConnectionResetError):
+                OllamaHandler.disconnected.set()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    OllamaHandler.delay = 0.0
+    OllamaHandler.bodies = []
+    OllamaHandler.client_ports = set()
+    OllamaHandler.disconnected = threading.Event()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OllamaHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+def test_generate_over_one_keep_alive_connection(server):
+    client = NemotronClient(base_url=server + "/v1", reasoning_mode=False, keep_alive="1h")
+    assert client.base_url == server
+
+    assert client.generate("What is 2+2?", system_prompt="Be brief", max_tokens=32) == "Four is the answer."
+    assert client.complete("again") == "Four is the answer."
+
+    path, body = OllamaHandler.bodies[0]
+    assert path == "/api/chat"
+    assert body["keep_alive"] == "1h"
+    assert body["options"] == {"temperature": 0.7, "num_predict": 32}
+    assert body["messages"] == [{"role": "system", "content": "Be brief"},
+                                {"role": "user", "content": "What is 2+2?"}]
+    # tags check + two generations reused a single pooled connection
+    assert len(OllamaHandler.client_ports) == 1
+    client.close()
+
+
+def test_missing_model_and_unreachable_server(server, monkeypatch):
+    monkeypatch.setattr(OllamaHandler, "models", ["llama3:8b"])
+    with pytest.raises(RuntimeError, match="not found"):
+        NemotronClient(base_url=server)
+    with pytest.raises(RuntimeError, match="not reachable"):
+        NemotronClient(base_url="http://127.0.0.1:9")
+
+
+def test_stream_strips_think_spans(server):
+    client = NemotronClient(base_url=server, reasoning_mode=False)
+    assert list(client.stream([{"role": "user", "content": "2+2?"}])) == ["Four", " is the", " answer."]
+    assert OllamaHandler.bodies[-1][1]["stream"] is True
+
+
+@pytest.mark.parametrize("reply", [
+    "<think>we need to add</think>Four is the answer.",
+    "Four <think>hmm</think> is the answer.\nIt really is.",
+    "Thinking...\nwe should add.\n...done thinking.\n\nFour is the answer.",
+    "We need to add these.\nFour is the answer.\n\n   Done.",
+    "Let me think about it.\nFour.\nI need to",
+])
+def test_stream_cleanup_matches_batch_at_every_chunk_boundary(server, reply):
+    client = NemotronClient(base_url=server, reasoning_mode=False)
+    expected = client._clean_reasoning_traces(reply)
+    splits = [[reply[:i], reply[i:]] for i in range(len(reply) + 1)] + [list(reply)]
+    for pieces in splits:
+        traces = _ReasoningTraceFilter(client._clean_reasoning_traces)
+        streamed = "".join(traces.feed(piece) for piece in pieces) + traces.flush()
+        assert streamed == expected, pieces
+
+
+def test_stream_cancellation_closes_connection(server):
+    OllamaHandler.delay = 0.2
+    client = NemotronClient(base_url=server, reasoning_mode=False)
+    cancel = threading.Event()
+
+    received = []
+    for text in client.stream("2+2?", cancel_event=cancel):
+        received.append(text)
+        cancel.set()
+
+    assert received == ["Four"]
+    assert OllamaHandler.disconnected.wait(5)
+
+
+def test_warm_up_pins_model(server):
+    client = NemotronClient(base_url=server, keep_alive=-1)
+    client.warm_up()
+    assert OllamaHandler.bodies[-1] == ("/api/generate", {"model": "nemotron-3-nano:latest", "keep_alive": -1})
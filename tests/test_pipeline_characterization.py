@@ -60,7 +60,17 @@ def pipeline():
     p.ab_test.is_control_group = lambda *a, **k: False
     p.ab_test.record_metrics = lambda *a, **k: None
     p.research_manager.requires_research = lambda x: False  # keep tests offline
+    _think = p.think
+
+    def think(user_text):
+        # Post-turn persistence is write-behind; drain it so its effects can be asserted
+        response = _think(user_text)
+        p.flush_persistence()
+        return response
+
+    p.think = think
     yield p, d
+    p.shutdown()
     shutil.rmtree(d, ignore_errors=True)
 
 
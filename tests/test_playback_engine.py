@@ -0,0 +1,212 @@
+"""
+Tests for the in-memory PCM playback engine (src/audio/playback_engine.py),
+run headless through NullSink, and the TTS adapters that feed it.
+"""
+
+import io
+import time
+import wave
+
+import numpy as np
+import pytest
+
+from src.audio.playback_engine import (
+    NullSink, PCMRingBuffer, PlaybackEngine, decode_audio, pcm16_to_float, resample
+)
+
+RATE = 8000
+BLOCK = 80  # 10 ms
+
+
+@pytest.fixture
+def engine():
+    sink = NullSink(realtime=True)
+    e = PlaybackEngine(sink, sample_rate=RATE, block_size=BLOCK)
+    yield e
+    e.close()
+
+
+def _chunk(value, seconds):
+    return np.full(int(RATE * seconds), value, dtype=np.float32)
+
+
+def _voiced(sink):
+    recorded = sink.recorded
+    return recorded[recorded != 0]
+
+
+def _wav_bytes(samples, rate):
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes((np.asarray(samples) * 32767).astype('<i2').tobytes())
+    return buffer.getvalue()
+
+
+def test_ring_buffer_wraps_around():
+    ring = PCMRingBuffer(5)
+    assert ring.write(np.arange(4, dtype=np.float32)) == 4
+    out = np.zeros(3, dtype=np.float32)
+    assert ring.read_into(out) == 3
+    assert ring.write(np.array([4, 5, 6, 7], dtype=np.float32)) == 4
+    assert ring.write(np.array([9], dtype=np.float32)) == 0  # full
+    out = np.zeros(6, dtype=np.float32)
+    assert ring.read_into(out) == 5
+    assert out[:5].tolist() == [3, 4, 5, 6, 7]
+
+
+def test_queued_chunks_play_back_to_back(engine):
+    chunks = [_chunk(0.1, 0.1), _chunk(0.2, 0.1), _chunk(0.3, 0.1)]
+    utterance = engine.begin_utterance()
+    for chunk in chunks:
+        assert engine.enqueue_pcm(chunk, utterance=utterance)
+    engine.finish(utterance)
+    assert engine.wait(timeout=2.0)
+
+    recorded = engine.sink.recorded
+    voiced = np.flatnonzero(recorded)
+    # One contiguous run equal to the concatenated chunks: no gaps, nothing lost
+    assert np.array_equal(recorded[voiced[0]:voiced[-1] + 1], np.concatenate(chunks))
+    stats = engine.get_stats()
+    assert stats['underruns'] == 0
+    assert stats['chunks_started'] == 3
+    assert stats['first_audio_ms'] is not None
+
+
+def test_chunks_arriving_while_playing_stay_gapless(engine):
+    utterance = engine.begin_utterance()
+    for i in range(4):
+        engine.enqueue_pcm(_chunk(0.1 * (i + 1), 0.2), utterance=utterance)
+        time.sleep(0.1)  # next chunk "synthesizes" while this one plays
+    engine.finish(utterance)
+    assert engine.wait(timeout=3.0)
+
+    assert engine.get_stats()['underruns'] == 0
+    assert len(_voiced(engine.sink)) == 4 * int(RATE * 0.2)
+
+
+def test_late_chunk_is_counted_as_gap(engine):
+    utterance = engine.begin_utterance()
+    engine.enqueue_pcm(_chunk(0.5, 0.05), utterance=utterance)
+    time.sleep(0.2)
+    engine.enqueue_pcm(_chunk(0.5, 0.05), utterance=utterance)
+    engine.finish(utterance)
+    engine.wait(timeout=2.0)
+
+    stats = engine.get_stats()
+    assert stats['underruns'] > 0
+    assert stats['gap_ms'] >= 50
+
+
+def test_stop_silences_within_one_block(engine):
+    utterance = engine.begin_utterance()
+    engine.enqueue_pcm(_chunk(0.5, 2.0), utterance=utterance)
+    engine.finish(utterance)
+    time.sleep(0.1)
+
+    engine.stop()
+    assert engine.wait(timeout=0.1)
+    assert not engine.is_playing()
+    time.sleep(0.05)
+
+    stats = engine.get_stats()
+    assert stats['stops'] == 1
+    assert stats['last_stop_latency_ms'] <= stats['block_ms'] + 30
+    assert len(_voiced(engine.sink)) < RATE * 0.5
+
+    # Chunks for the cut-off utterance are dropped
+    assert engine.enqueue_pcm(_chunk(0.5, 0.1), utterance=utterance) is False
+
+
+def test_enqueue_blocks_on_full_buffer_then_drains():
+    engine = PlaybackEngine(NullSink(realtime=False), sample_rate=RATE, block_size=BLOCK,
+                            buffer_seconds=0.05)
+    try:
+        utterance = engine.begin_utterance()
+        audio = _chunk(0.25, 0.3)
+        assert engine.enqueue_pcm(audio, utterance=utterance, timeout=2.0)
+        engine.finish(utterance)
+        assert engine.wait(timeout=2.0)
+        assert len(_voiced(engine.sink)) == len(audio)
+    finally:
+        engine.close()
+
+
+def test_conversion_and_decoding():
+    assert pcm16_to_float(np.array([16384, -32768], dtype='<i2').tobytes()).tolist() == [0.5, -1.0]
+    assert len(resample(np.ones(100, dtype=np.float32), 16000, 8000)) == 50
+
+    samples, rate = decode_audio(_wav_bytes(np.full(400, 0.5), 16000))
+    assert rate == 16000 and len(samples) == 400
+    assert abs(samples[0] - 0.5) < 1e-3
+
+    with pytest.raises(ValueError):
+        decode_audio(b"not audio")
+
+
+def test_google_tts_plays_in_memory(engine, tmp_path, monkeypatch):
+    from src.adapters.tts import google_tts_adapter
+    from src.adapters.tts.audio_store import AudioStore
+
+    synthesized = []
+
+    class FakeGTTS:
+        def __init__(self, text, lang):
+            self.text = text
+
+        def write_to_fp(self, fp):
+            synthesized.append(self.text)
+            fp.write(_wav_bytes(np.full(RATE // 10, 0.5), RATE))
+
+        def save(self, path):
+            raise AssertionError("speaking path must not write files")
+
+    monkeypatch.setattr(google_tts_adapter, "GTTS_AVAILABLE", True)
+    monkeypatch.setattr(google_tts_adapter, "gTTS", FakeGTTS)
+
+    tts = google_tts_adapter.GoogleTTS({}, store=AudioStore(str(tmp_path / "store")), engine=engine)
+    assert tts.speak("Hello there") is True
+    assert tts.is_speaking()
+    assert engine.wait(timeout=2.0)
+    assert tts.speak("Hello there") is True
+    assert engine.wait(timeout=2.0)
+
+    assert synthesized == ["Hello there"]  # second time from the audio store
+    assert len(_voiced(engine.sink)) == 2 * (RATE // 10)
+
+
+def test_streaming_elevenlabs_queues_chunks_in_order(engine, tmp_path, monkeypatch):
+    from src.adapters.tts import streaming_elevenlabs_tts
+    from src.adapters.tts.audio_store import AudioStore
+
+    class Response:
+        status_code = 200
+
+        def __init__(self, content):
+            self.content = content
+
+    def fake_post(url, json, params, timeout):
+        # Later chunks finish first; playback order must still follow the text
+        index = int(json["text"].split()[1])
+        time.sleep(0.05 * (3 - index))
+        assert params["output_format"] == "pcm_22050"
+        pcm = np.full(2205, (index + 1) * 1000, dtype='<i2')
+        return Response(pcm.tobytes())
+
+    monkeypatch.setenv("ELEVENLABS_API_KEY", "test")
+
+    tts = streaming_elevenlabs_tts.StreamingElevenLabsTTS(
+        {}, store=AudioStore(str(tmp_path / "store")), engine=engine)
+    monkeypatch.setattr(tts.session, "post", fake_post)
+    monkeypatch.setattr(tts, "_split_into_chunks", lambda text: [f"chunk {i} text" for i in range(3)])
+
+    assert tts.speak("three chunks") is True
+
+    voiced = _voiced(engine.sink)
+    # 0.1 s of 22.05 kHz PCM per chunk, resampled to the engine rate
+    levels = [round(v * 32768 / 1000) for v in voiced]
+    runs = [levels[0]] + [b for a, b in zip(levels, levels[1:]) if a != b]
+    assert runs == [1, 2, 3]
+    assert engine.get_stats()['chunks_started'] == 3
@@ -0,0 +1,134 @@
+"""
+Tests for prefix-stable prompt assembly (src/llm/prompt_assembly.py) and the
+cache hints sent by the OpenAI-compatible adapter.
+"""
+
+from src.adapters.llm.openai_compat import OpenAICompatLLM
+from src.llm.prompt_assembly import (
+    SESSION, STATIC, TURN, PromptAssembler, PromptSection, common_prefix_length,
+    render_messages
+)
+
+
+def _turn(assembler, history, query, emotion="neutral"):
+    return assembler.assemble([
+        PromptSection("conversation", history),
+        PromptSection("tools", "TOOLS", STATIC),
+        PromptSection("emotion", f"emotion: {emotion}"),
+        PromptSection("persona", "PERSONA", STATIC),
+        PromptSection("research_mode", "KNOWLEDGE STRATEGY", SESSION),
+        PromptSection("user_query", f"User query: {query}", TURN),
+        PromptSection("empty", "", STATIC),
+    ])
+
+
+def test_sections_ordered_static_to_volatile():
+    prompt = _turn(PromptAssembler(), "User: hi", "hello")
+
+    # Stable within a tier, empty sections dropped
+    assert prompt.sections == ["tools", "persona", "research_mode", "conversation", "emotion", "user_query"]
+    assert prompt.text.startswith("TOOLS\n\nPERSONA\n\nKNOWLEDGE STRATEGY\n\nUser: hi")
+    assert prompt.text.endswith("User query: hello")
+    assert prompt.static_chars == len("TOOLS\n\nPERSONA")
+
+
+def test_prefix_hit_ratio_tracks_shared_prefix():
+    assembler = PromptAssembler()
+    first = _turn(assembler, "User: hi", "hello")
+    assert first.prefix_hit_chars == 0
+
+    second = _turn(assembler, "User: hi\nUser: hello", "what's new", emotion="joy")
+    # Everything up to and including the old history (plus the newline that
+    # happens to follow it in both prompts) is reused
+    assert second.prefix_hit_chars == len("TOOLS\n\nPERSONA\n\nKNOWLEDGE STRATEGY\n\nUser: hi\n")
+    assert 0 < second.prefix_hit_ratio < 1
+
+    repeat = _turn(assembler, "User: hi\nUser: hello", "what's new", emotion="joy")
+    assert repeat.prefix_hit_ratio == 1.0
+
+    stats = assembler.get_stats()
+    assert stats["prompts"] == 3
+    assert 0 < stats["avg_prefix_hit_ratio"] < 1
+
+
+def test_static_block_memoised_until_invalidated():
+    calls = []
+
+    def manifest():
+        calls.append(1)
+        return f"TOOLS v{len(calls)}"
+
+    assembler = PromptAssembler()
+    assert assembler.static_block("tool_manifest", manifest) == "TOOLS v1"
+    assert assembler.static_block("tool_manifest", manifest) == "TOOLS v1"
+    assert len(calls) == 1
+
+    assembler.invalidate("tool_manifest")
+    assert assembler.static_block("tool_manifest", manifest) == "TOOLS v2"
+
+
+def test_common_prefix_length():
+    assert common_prefix_length("", "abc") == 0
+    assert common_prefix_length("abc", "abc") == 3
+    assert common_prefix_length("abcdef", "abcxyz") == 3
+    assert common_prefix_length("abc", "abcdef") == 3
+    assert common_prefix_length("x" * 5000 + "a", "x" * 5000 + "b") == 5000
+
+
+def test_openai_compat_sends_cache_prompt_hint():
+    llm = OpenAICompatLLM({"llm": {}})
+    assert llm._chat_body("hi", system_prompt="sys")["cache_prompt"] is True
+
+    off = OpenAICompatLLM({"llm": {"cache_prompt": False}})
+    assert "cache_prompt" not in off._chat_body("hi", system_prompt="sys")
+
+
+def test_openai_compat_reads_cached_token_counts():
+    openai_style = {"usage": {"prompt_tokens": 900, "prompt_tokens_details": {"cached_tokens": 850}}}
+    llama_cpp = {"timings": {"prompt_n": 40, "cache_n": 860}}
+
+    assert OpenAICompatLLM._usage(openai_style) == {"prompt_tokens": 900, "cached_prompt_tokens": 850}
+    assert OpenAICompatLLM._usage(llama_cpp) == {"prompt_tokens": 900, "cached_prompt_tokens": 860}
+    assert OpenAICompatLLM._usage({}) == {}
+
+
+def test_openai_compat_system_message_stable_across_tones_and_turns():
+    llm = OpenAICompatLLM({"llm": {}})
+    builds = []
+
+    def persona():
+        builds.append(1)
+        return f"PERSONA (Confidence: {40 + len(builds)}%)"
+
+    llm._build_persona = persona
+    first = llm._chat_body("User query: hi", tone="playful")["messages"]
+    second = llm._chat_body("User query: and now?", tone="serious")["messages"]
+
+    # Built once, tone-free; tone trails the user message instead
+    assert len(builds) == 1
+    assert first[0] == second[0] == {"role": "system", "content": "PERSONA (Confidence: 41%)"}
+    assert first[1]["content"] == "User query: hi\n\nTone: playful"
+    assert second[1]["content"].endswith("Tone: serious")
+
+    llm.refresh_persona()
+    assert llm._chat_body("hi")["messages"][0]["content"] == "PERSONA (Confidence: 42%)"
+
+
+def test_openai_compat_measures_prefix_over_sent_messages():
+    llm = OpenAICompatLLM({"llm": {}})
+    llm._build_persona = lambda: "PERSONA"
+
+    llm._record_prefix(llm._chat_body("TOOLS\n\nUser query: hi"))
+    assert llm.last_prompt_stats["prefix_hit_chars"] == 0
+
+    body = llm._chat_body("TOOLS\n\nUser query: bye")
+    llm._record_prefix(body)
+    sent = render_messages(body["messages"])
+    assert sent.startswith("system: PERSONA\n\nuser: TOOLS")
+    # The system message counts towards the shared prefix
+    assert llm.last_prompt_stats["prefix_hit_chars"] == len("system: PERSONA\n\nuser: TOOLS\n\nUser query: ")
+    assert llm.last_prompt_stats["sent_chars"] == len(sent)
+
+    # A different system message breaks the prefix at its first differing char
+    llm._record_prefix(llm._chat_body("TOOLS\n\nUser query: bye", system_prompt="OTHER"))
+    assert llm.last_prompt_stats["prefix_hit_chars"] == len("system: ")
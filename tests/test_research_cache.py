@@ -0,0 +1,170 @@
+"""
+Tests for the research result cache (src/memory/research_cache.py) and its use
+in ResearchManager.run_research. A bag-of-words embedder stands in for the
+sentence-transformer so no model is loaded, and the research chain is stubbed.
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from factual_research_manager import ResearchManager, ResearchResult
+from src.memory.research_cache import ResearchResultCache, normalize_research_query
+
+STOPWORDS = {"what", "is", "the", "of", "how", "a", "me", "tell", "about", "s"}
+SYNONYMS = {"tall": "height", "high": "height"}
+VOCAB = ["eiffel", "tower", "height", "iphone", "release", "date", "bitcoin", "price", "news", "robot"]
+
+
+def bag_of_words(text):
+    vector = np.zeros(len(VOCAB) + 1, dtype="float32")
+    for word in text.lower().split():
+        word = SYNONYMS.get(word.strip("?.!,"), word.strip("?.!,"))
+        if word in STOPWORDS or word.isdigit():
+            continue
+        vector[VOCAB.index(word) if word in VOCAB else len(VOCAB)] += 1
+    return vector
+
+
+def _result(query, summary="answer"):
+    return ResearchResult(query=query, success=True, summary=summary, key_insights=["k"],
+                          recommendations=[], findings=[{"f": 1}], confidence=0.8,
+                          execution_time=2.0)
+
+
+class StubManager(ResearchManager):
+    """ResearchManager whose research chain is a counter"""
+
+    def __init__(self, cache, succeed=True):
+        super().__init__(cache=cache)
+        self.runs = []
+        self.succeed = succeed
+
+    async def _run_research_async(self, query, conversation_history):
+        self.runs.append(query)
+        if not self.succeed:
+            return self._failure_result(query, time.time(), "no findings")
+        return _result(query, summary=f"answer {len(self.runs)}")
+
+
+@pytest.fixture
+def cache():
+    return ResearchResultCache(embedder=bag_of_words)
+
+
+def test_repeat_query_skips_research(cache):
+    manager = StubManager(cache)
+    first = manager.run_research("How tall is the Eiffel Tower?")
+    second = manager.run_research("how tall is the eiffel tower")
+
+    assert manager.runs == ["How tall is the Eiffel Tower?"]
+    assert not first.cached and second.cached
+    assert second.summary == first.summary
+    assert second.query == "how tall is the eiffel tower"
+    assert cache.get_stats()["exact_hits"] == 1
+
+
+def test_paraphrase_hits_semantically(cache):
+    manager = StubManager(cache)
+    manager.run_research("How tall is the Eiffel Tower?")
+    hit = cache.lookup("What is the height of the Eiffel Tower", "general")
+
+    assert hit is not None and hit.match == "semantic"
+    assert hit.similarity == pytest.approx(1.0)
+    assert cache.lookup("Tell me about the iPhone release date", "general") is None
+
+
+def test_numbers_must_match_for_semantic_hits(cache):
+    cache.put("iPhone 15 release date", "general", _result("iPhone 15"))
+    assert cache.lookup("release date of the iPhone 16", "general") is None
+    assert cache.lookup("release date of the iPhone 15", "general").match == "semantic"
+
+
+def test_topics_do_not_mix_and_have_their_own_ttls():
+    cache = ResearchResultCache(embedder=bag_of_words, topic_ttls={"finance": 0.05})
+    cache.put("bitcoin price", "finance", _result("bitcoin price"))
+    cache.put("eiffel tower height", "general", _result("eiffel tower height"))
+
+    assert cache.lookup("bitcoin price", "general") is None
+    assert cache.lookup("bitcoin price", "finance") is not None
+    time.sleep(0.08)
+    assert cache.lookup("bitcoin price", "finance") is None
+    assert cache.lookup("eiffel tower height", "general") is not None
+    assert cache.get_stats()["expired"] == 1
+
+
+def test_manager_topic_classification(cache):
+    manager = StubManager(cache)
+    assert manager.topic_for("What is the current bitcoin price?") == "finance"
+    assert manager.topic_for("latest news about Boston Dynamics") == "news"
+    assert manager.topic_for("How tall is the Eiffel Tower?") == "general"
+
+
+def test_context_dependent_follow_ups_bypass_the_cache(cache):
+    manager = StubManager(cache)
+    history = [{"user": "Who founded SpaceX?", "assistant": "Elon Musk."}]
+
+    manager.run_research("How old is he?", history)
+    manager.run_research("How old is he?", [{"user": "Who wrote Dune?", "assistant": "Frank Herbert."}])
+    manager.run_research("what about Tesla?", history)
+    assert len(manager.runs) == 3
+    assert cache.get_stats()["size"] == 0
+
+    # Self-contained questions are still shared across conversations
+    manager.run_research("How tall is the Eiffel Tower?", history)
+    assert manager.run_research("How tall is the Eiffel Tower?").cached
+    assert manager.run_research("robot news this week", history).cached is False
+    assert manager.run_research("robot news this week").cached
+    assert not manager.is_context_dependent("How old is he?", [])
+
+
+def test_failed_research_is_not_cached(cache):
+    manager = StubManager(cache, succeed=False)
+    manager.run_research("robot news")
+    manager.run_research("robot news")
+    assert len(manager.runs) == 2
+    assert cache.get_stats()["size"] == 0
+
+
+def test_hot_entry_refreshes_in_background():
+    cache = ResearchResultCache(embedder=bag_of_words, topic_ttls={"general": 0.3},
+                                refresh_window=0.5, hot_hits=2)
+    manager = StubManager(cache)
+    manager.run_research("eiffel tower height")
+    manager.run_research("eiffel tower height")  # hot, but not near expiry yet
+    time.sleep(0.2)
+    stale = manager.run_research("eiffel tower height")  # inside the refresh window
+
+    assert stale.cached and stale.summary == "answer 1"
+    deadline = time.time() + 2
+    while len(manager.runs) < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.05)
+
+    assert len(manager.runs) == 2
+    assert manager.run_research("eiffel tower height").summary == "answer 2"
+    assert cache.get_stats()["refreshes_scheduled"] == 1
+
+
+def test_semantic_lookup_disabled_when_embedder_fails():
+    def broken(text):
+        raise OSError("model not available")
+
+    cache = ResearchResultCache(embedder=broken)
+    cache.put("eiffel tower height", "general", _result("x"))
+    assert cache.lookup("eiffel tower height", "general") is not None
+    assert cache.lookup("height of eiffel tower", "general") is None
+    assert cache.get_stats()["semantic_enabled"] is False
+
+
+def test_cached_results_are_copies(cache):
+    manager = StubManager(cache)
+    manager.run_research("eiffel tower height")
+    hit = manager.run_research("eiffel tower height")
+    hit.key_insights.append("mutated")
+    assert manager.run_research("eiffel tower height").key_insights == ["k"]
+
+
+def test_normalize_research_query():
+    assert normalize_research_query("  What's the  price of $AAPL?? ") == "what s the price of $aapl"
@@ -0,0 +1,166 @@
+"""
+Tests for concurrent research-plan execution in
+autonomous_research_tool_server.ResearchExecutor.
+"""
+
+import asyncio
+import time
+from datetime import datetime
+
+from autonomous_research_tool_server import (
+    ResearchExecutor, ResearchFinding, ResearchPlan, ResearchQuestion,
+    ResearchScope, ResearchSource, ResearchStatus
+)
+
+
+def _question(i, priority=5):
+    return ResearchQuestion(
+        question_id=f"q{i}", question=f"question {i}", question_type="factual",
+        knowledge_gap_id="gap", priority=priority, expected_sources=["web"],
+        time_estimate=10, created_at=datetime.now()
+    )
+
+
+def _plan(n, time_limit=30):
+    return ResearchPlan(
+        plan_id="plan_gap", knowledge_gap_id="gap",
+        research_questions=[_question(i) for i in range(n)],
+        research_scope=ResearchScope.QUICK,
+        time_limit=time_limit, source_types=["web", "documents"],
+        priority_order=[f"q{i}" for i in range(n)], created_at=datetime.now(),
+        status=ResearchStatus.PENDING
+    )
+
+
+def _finding(question, confidence):
+    return ResearchFinding(
+        finding_id=f"f_{question.question_id}", research_question_id=question.question_id,
+        summary=question.question, key_insights=[], supporting_sources=[],
+        confidence_level=confidence, actionable_recommendations=[], related_topics=[],
+        created_at=datetime.now()
+    )
+
+
+class StubExecutor(ResearchExecutor):
+    """Each question sleeps for delays[i] seconds and returns one finding"""
+
+    def __init__(self, delays, confidences=None, fail=(), **kwargs):
+        super().__init__(**kwargs)
+        self.delays = delays
+        self.confidences = confidences or {}
+        self.fail = set(fail)
+        self.running = 0
+        self.peak = 0
+        self.cancelled = []
+
+    async def _research_question(self, question, plan, user_id):
+        i = int(question.question_id[1:])
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(self.delays[i])
+            if i in self.fail:
+                raise RuntimeError(f"search failed for {i}")
+            return [_finding(question, self.confidences.get(i, 0.5))]
+        except asyncio.CancelledError:
+            self.cancelled.append(i)
+            raise
+        finally:
+            self.running -= 1
+
+
+def test_questions_run_concurrently_within_fan_out_limit():
+    executor = StubExecutor([0.2] * 6, max_concurrent_questions=3, confidence_target=None)
+    plan = _plan(6)
+
+    start = time.perf_counter()
+    findings = asyncio.run(executor.execute_research_plan(plan, "user"))
+    elapsed = time.perf_counter() - start
+
+    assert [f.research_question_id for f in findings] == [f"q{i}" for i in range(6)]
+    assert executor.peak == 3
+    assert elapsed < 0.9  # two waves of 0.2s, not six
+    assert plan.status == ResearchStatus.COMPLETED
+    assert executor.active_research_sessions == {}
+
+
+def test_progress_reported_per_completed_question():
+    updates = []
+
+    async def on_progress(update):
+        updates.append(update)
+
+    executor = StubExecutor([0.05, 0.01, 0.03], confidence_target=None)
+    asyncio.run(executor.execute_research_plan(_plan(3), "user", progress_callback=on_progress))
+
+    assert [u["current_question"] for u in updates] == ["question 1", "question 2", "question 0"]
+    assert [u["completed_questions"] for u in updates] == [1, 2, 3]
+    assert updates[-1]["progress"] == 100
+
+    # Sync callbacks work too
+    sync_updates = []
+    asyncio.run(StubExecutor([0.0, 0.0], confidence_target=None).execute_research_plan(
+        _plan(2), "user", progress_callback=sync_updates.append))
+    assert len(sync_updates) == 2
+
+
+def test_confident_finding_cancels_remaining_questions():
+    executor = StubExecutor([0.02, 1.0, 1.0], confidences={0: 0.95}, confidence_target=0.9)
+    plan = _plan(3)
+
+    start = time.perf_counter()
+    findings = asyncio.run(executor.execute_research_plan(plan, "user"))
+
+    assert time.perf_counter() - start < 0.5
+    assert [f.research_question_id for f in findings] == ["q0"]
+    assert sorted(executor.cancelled) == [1, 2]
+    assert plan.status == ResearchStatus.COMPLETED
+
+
+def test_per_question_deadline_from_time_limit():
+    # 2 questions, fan-out 1 -> two waves -> each question gets time_limit / 2
+    executor = StubExecutor([5.0, 0.01], max_concurrent_questions=1, confidence_target=None)
+    plan = _plan(2, time_limit=0.2)
+
+    start = time.perf_counter()
+    findings = asyncio.run(executor.execute_research_plan(plan, "user"))
+
+    assert time.perf_counter() - start < 0.5
+    assert [f.research_question_id for f in findings] == ["q1"]
+
+
+def test_failed_question_does_not_sink_the_plan():
+    executor = StubExecutor([0.01, 0.01], fail={0}, confidence_target=None)
+    findings = asyncio.run(executor.execute_research_plan(_plan(2), "user"))
+    assert [f.research_question_id for f in findings] == ["q1"]
+
+
+def test_all_questions_failing_marks_plan_failed():
+    executor = StubExecutor([0.01, 0.01], fail={0, 1}, confidence_target=None)
+    plan = _plan(2)
+    try:
+        asyncio.run(executor.execute_research_plan(plan, "user"))
+        raised = False
+    except RuntimeError:
+        raised = True
+    assert raised
+    assert plan.status == ResearchStatus.FAILED
+
+
+def test_web_and_document_search_overlap():
+    class Sources(ResearchExecutor):
+        async def _web_search(self, query, user_id):
+            await asyncio.sleep(0.2)
+            return [ResearchSource("w", "http://w", "web", "web text", 0.9, 0.9, datetime.now(), "web")]
+
+        async def _document_search(self, query, user_id):
+            await asyncio.sleep(0.2)
+            return [ResearchSource("d", "file://d", "doc", "doc text", 0.8, 0.8, datetime.now(), "documents")]
+
+        async def _synthesize_finding(self, question, sources):
+            return _finding(question, 0.7 if len(sources) == 2 else 0.1)
+
+    start = time.perf_counter()
+    findings = asyncio.run(Sources()._research_question(_question(0), _plan(1), "user"))
+    assert time.perf_counter() - start < 0.35
+    assert findings[0].confidence_level == 0.7
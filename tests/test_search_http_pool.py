@@ -0,0 +1,171 @@
+"""
+Tests for the shared search HTTP pool and response cache
+(src/tools/http_pool.py), run against a local aiohttp stub server.
+"""
+
+import asyncio
+import json
+
+import pytest
+from aiohttp import web
+
+from enhanced_web_search import EnhancedWebSearch, ProviderLatencyStats
+from src.tools.http_pool import SearchHTTPPool, cache_key
+
+
+class StubServer:
+    """Local search API that counts requests and the client ports they came from"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.hits = 0
+        self.peers = set()
+        self.status = 200
+
+    async def handle(self, request):
+        self.hits += 1
+        self.peers.add(request.transport.get_extra_info("peername")[1])
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        body = {"q": request.query.get("q"), "hit": self.hits,
+                "Abstract": f"About {request.query.get('q')}", "AbstractURL": "https://example.com/a",
+                "Heading": "Example", "RelatedTopics": []}
+        return web.Response(status=self.status, text=json.dumps(body), content_type="application/json")
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_get("/search", self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = self.runner.addresses[0][1]
+        self.url = f"http://127.0.0.1:{port}/search"
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.runner.cleanup()
+
+
+def run(coro_fn, **server_kwargs):
+    async def main():
+        pool = SearchHTTPPool(**{k: v for k, v in server_kwargs.items() if k != "delay"})
+        async with StubServer(delay=server_kwargs.get("delay", 0.0)) as server:
+            try:
+                return await coro_fn(pool, server)
+            finally:
+                await pool.aclose()
+    return asyncio.run(main())
+
+
+def test_repeated_query_served_from_cache():
+    async def scenario(pool, server):
+        first = await pool.get("stub", server.url, query="NEO robot", params={"q": "NEO robot"})
+        again = await pool.get("stub", server.url, query="  neo   ROBOT ", params={"q": "  neo   ROBOT "})
+        assert first.json()["hit"] == 1 and not first.from_cache
+        assert again.from_cache and again.json() == first.json()
+        assert server.hits == 1
+
+    run(scenario)
+
+
+def test_providers_share_one_keep_alive_session():
+    async def scenario(pool, server):
+        for provider, query in [("a", "one"), ("b", "two"), ("a", "three")]:
+            await pool.get(provider, server.url, query=query, params={"q": query})
+        assert server.hits == 3
+        assert len(server.peers) == 1  # one pooled connection reused
+        assert pool.get_stats()["sessions_created"] == 1
+
+    run(scenario)
+
+
+def test_cache_key_ignores_secrets_but_not_other_params():
+    base = cache_key("p", "u", "Query", {"q": "Query", "count": 5, "key": "secret-1"})
+    assert base == cache_key("p", "u", "query", {"q": "query", "count": 5, "key": "secret-2"})
+    assert base != cache_key("p", "u", "query", {"q": "query", "count": 10})
+    assert base != cache_key("other", "u", "query", {"q": "query", "count": 5})
+
+
+def test_errors_are_not_cached():
+    async def scenario(pool, server):
+        server.status = 500
+        assert (await pool.get("stub", server.url, query="x", params={"q": "x"})).status == 500
+        server.status = 200
+        assert (await pool.get("stub", server.url, query="x", params={"q": "x"})).status == 200
+        assert server.hits == 2
+
+    run(scenario)
+
+
+def test_stale_while_revalidate():
+    async def scenario(pool, server):
+        await pool.get("stub", server.url, query="x", params={"q": "x"})
+        await asyncio.sleep(0.1)
+
+        stale = await pool.get("stub", server.url, query="x", params={"q": "x"})
+        assert stale.stale and stale.json()["hit"] == 1
+        await asyncio.sleep(0.05)  # background refresh lands
+
+        fresh = await pool.get("stub", server.url, query="x", params={"q": "x"})
+        assert fresh.from_cache and not fresh.stale and fresh.json()["hit"] == 2
+        assert server.hits == 2
+        assert pool.get_stats()["refreshes"] == 1
+
+    run(scenario, ttl=0.08, stale_ttl=10)
+
+
+def test_expired_entries_are_refetched():
+    async def scenario(pool, server):
+        await pool.get("stub", server.url, query="x", params={"q": "x"})
+        await asyncio.sleep(0.05)
+        response = await pool.get("stub", server.url, query="x", params={"q": "x"})
+        assert not response.from_cache and server.hits == 2
+
+    run(scenario, ttl=0.01, stale_ttl=0.01)
+
+
+def test_concurrent_identical_requests_share_one_fetch():
+    async def scenario(pool, server):
+        responses = await asyncio.gather(*[
+            pool.get("stub", server.url, query="x", params={"q": "x"}) for _ in range(5)
+        ])
+        assert server.hits == 1
+        assert {r.json()["hit"] for r in responses} == {1}
+        assert pool.get_stats()["coalesced"] == 4
+
+    run(scenario, delay=0.1)
+
+
+def test_before_fetch_runs_only_for_network_requests():
+    calls = []
+
+    async def scenario(pool, server):
+        for _ in range(3):
+            await pool.get("stub", server.url, query="x", params={"q": "x"},
+                           before_fetch=lambda: calls.append(1))
+        assert calls == [1]
+
+        def over_quota():
+            raise RuntimeError("quota")
+
+        with pytest.raises(RuntimeError):
+            await pool.get("stub", server.url, query="y", params={"q": "y"}, before_fetch=over_quota)
+        assert server.hits == 1
+
+    run(scenario)
+
+
+def test_enhanced_web_search_uses_pool_and_cache():
+    async def scenario(pool, server):
+        for _ in range(2):
+            search = EnhancedWebSearch(http_pool=pool, latency_stats=ProviderLatencyStats())
+            search.providers = ["duckduckgo"]
+            search.duckduckgo_url = server.url
+            async with search:
+                results = await search.search("NEO robot", max_results=1)
+            assert results[0].snippet == "About NEO robot"
+        assert server.hits == 1
+        assert pool.get_stats()["sessions_created"] == 1
+
+    run(scenario)
@@ -0,0 +1,118 @@
+"""
+Tests for index-only similarity lookups: VectorStore.reconstruct /
+search_by_id / neighbors_for_all and SemanticMemory.find_similar_conversations.
+"""
+
+import hashlib
+
+import numpy as np
+import pytest
+
+from src.memory.embedding_generator import EmbeddingGenerator
+from src.memory.semantic_memory import SemanticMemory
+from src.memory.vector_store import VectorStore
+
+DIM = 384
+
+
+class HashModel:
+    """Deterministic per-text vectors sharing a common direction (all similarities > 0)"""
+
+    common = np.random.default_rng(42).standard_normal(DIM).astype("float32")
+
+    def encode(self, texts, normalize_embeddings=True, show_progress_bar=False):
+        rows = []
+        for text in texts:
+            seed = int(hashlib.md5(text.encode()).hexdigest()[:8], 16)
+            v = self.common + 0.5 * np.random.default_rng(seed).standard_normal(DIM).astype("float32")
+            rows.append(v / np.linalg.norm(v))
+        return np.stack(rows)
+
+
+def _memory(tmp_path):
+    memory = SemanticMemory(encrypt_sensitive=False, storage_path=str(tmp_path / "vs"))
+    memory.embedding_generator = EmbeddingGenerator(batching=False)
+    memory.embedding_generator.model = HashModel()
+    return memory
+
+
+def _vectors(n, dim=8):
+    x = np.random.default_rng(0).standard_normal((n, dim)).astype("float32")
+    return x / np.linalg.norm(x, axis=1, keepdims=True)
+
+
+def test_reconstruct_and_search_by_id(tmp_path):
+    store = VectorStore(embedding_dim=8, storage_path=str(tmp_path / "vs"))
+    x = _vectors(6)
+    ids = store.add(x)
+
+    assert np.allclose(store.reconstruct(ids[2]), x[2], atol=1e-6)
+    assert store.reconstruct(999) is None
+
+    hits = store.search_by_id(ids[2], k=3)
+    assert len(hits) == 3
+    assert ids[2] not in [h[0] for h in hits]
+
+    store.delete([ids[2]])
+    assert store.reconstruct(ids[2]) is None
+    assert store.search_by_id(ids[2]) == []
+    store.close()
+
+
+def test_neighbors_for_all_matches_per_id_search(tmp_path):
+    store = VectorStore(embedding_dim=8, storage_path=str(tmp_path / "vs"))
+    ids = store.add(_vectors(20))
+
+    graph_ids, neighbor_ids, sims = store.neighbors_for_all(k=3)
+    assert neighbor_ids.shape == (20, 3)
+    assert not (neighbor_ids == graph_ids[:, None]).any()
+
+    row = list(graph_ids).index(ids[5])
+    assert list(neighbor_ids[row]) == [h[0] for h in store.search_by_id(ids[5], k=3)]
+    assert np.all(np.diff(sims[row]) <= 1e-6)
+    store.close()
+
+
+def test_neighbors_for_all_pads_small_store(tmp_path):
+    store = VectorStore(embedding_dim=8, storage_path=str(tmp_path / "vs"))
+    store.add(_vectors(2))
+    _, neighbor_ids, sims = store.neighbors_for_all(k=3)
+    assert neighbor_ids.shape == (2, 3)
+    assert (neighbor_ids[:, 1:] == -1).all()
+    assert np.isneginf(sims[:, 1:]).all()
+    store.close()
+
+
+def test_find_similar_conversations_does_not_re_encode(tmp_path, monkeypatch):
+    memory = _memory(tmp_path)
+    turns = [
+        memory.add_conversation_turn(f"question {i}", f"answer {i}", turn_id=f"t{i}")
+        for i in range(5)
+    ]
+
+    def _no_encode(*args, **kwargs):
+        raise AssertionError("find_similar_conversations must not call the embedding model")
+
+    monkeypatch.setattr(memory.embedding_generator, "encode", _no_encode)
+    similar = memory.find_similar_conversations("t1", k=3)
+
+    assert len(similar) == 3
+    assert "t1" not in [r["turn_id"] for r in similar]
+    assert {"user_input", "similarity", "context"} <= set(similar[0])
+
+    graph = memory.neighbors_for_all(k=2)
+    assert set(graph) == set(turns)
+    assert all(len(v) == 2 for v in graph.values())
+    memory.vector_store.close()
+
+
+def test_turn_index_rebuilt_on_reopen(tmp_path):
+    memory = _memory(tmp_path)
+    memory.add_conversation_turn("hi", "hello", turn_id="keep")
+    memory.add_conversation_turn("bye", "later", turn_id="other")
+    memory.vector_store.close()
+
+    reopened = _memory(tmp_path)
+    assert reopened.get_conversation_by_id("keep")["user_input"] == "hi"
+    assert [r["turn_id"] for r in reopened.find_similar_conversations("keep", k=1)] == ["other"]
+    reopened.vector_store.close()
@@ -0,0 +1,135 @@
+"""
+Tests for the per-turn stage graph (src/core/stage_graph.py).
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.core.stage_graph import Stage, StageGraph, StageTimeout
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        yield ex
+
+
+def _sleepy(value, seconds=0.2):
+    def fn(**_):
+        time.sleep(seconds)
+        return value
+    return fn
+
+
+def test_independent_stages_overlap(executor):
+    graph = StageGraph([Stage(name, _sleepy(name)) for name in ("emotion", "research", "semantic")])
+    results = graph.run(executor)
+
+    assert results.values == {"emotion": "emotion", "research": "research", "semantic": "semantic"}
+    assert results.total_ms < 450  # ~slowest stage, not the 600ms sum
+    assert all(ms >= 190 for ms in results.stage_ms.values())
+
+
+def test_dependencies_receive_upstream_results(executor):
+    order = []
+
+    def record(name, fn):
+        def wrapped(**kwargs):
+            order.append(name)
+            return fn(**kwargs)
+        return wrapped
+
+    graph = StageGraph([
+        Stage("prompt", record("prompt", lambda emotion, memory: f"{emotion}+{memory}"), deps=("emotion", "memory")),
+        Stage("emotion", record("emotion", lambda: "joy")),
+        Stage("memory", record("memory", _sleepy("3 hits", 0.05))),
+    ])
+    results = graph.run(executor)
+    assert results["prompt"] == "joy+3 hits"
+    assert order[-1] == "prompt"
+
+
+def test_gate_short_circuits_and_cancels_downstream(executor):
+    ran = threading.Event()
+    graph = StageGraph([
+        Stage("judgment", lambda: "Which one do you mean?", gate=True),
+        Stage("research", _sleepy("slow", 0.5)),
+        Stage("prompt", lambda judgment, research: ran.set(), deps=("judgment", "research")),
+    ])
+    started = time.perf_counter()
+    results = graph.run(executor)
+
+    assert results.short_circuit == "judgment"
+    assert results["judgment"] == "Which one do you mean?"
+    assert "research" not in results.values
+    assert time.perf_counter() - started < 0.3  # didn't wait for research
+    time.sleep(0.6)
+    assert not ran.is_set()
+
+
+def test_side_effect_stages_wait_for_the_gate(executor):
+    # Pipeline shape: emotion/research write state, so they hang off judgment
+    started = []
+    graph = StageGraph([
+        Stage("judgment", lambda: time.sleep(0.1) or "Which one do you mean?", gate=True),
+        Stage("emotion", lambda judgment: started.append("emotion"), deps=("judgment",)),
+        Stage("research", lambda judgment: started.append("research"), deps=("judgment",)),
+        Stage("semantic", lambda: started.append("semantic") or []),
+    ])
+    results = graph.run(executor)
+    time.sleep(0.1)
+
+    assert results.short_circuit == "judgment"
+    assert started == ["semantic"]
+
+
+def test_gate_passing_none_lets_turn_continue(executor):
+    graph = StageGraph([
+        Stage("judgment", lambda: None, gate=True),
+        Stage("prompt", lambda judgment: "answer", deps=("judgment",)),
+    ])
+    results = graph.run(executor)
+    assert results.short_circuit is None
+    assert results["prompt"] == "answer"
+
+
+def test_timeouts_and_errors_fall_back_to_defaults(executor):
+    def broken():
+        raise ConnectionError("search down")
+
+    graph = StageGraph([
+        Stage("semantic", _sleepy(["hit"], 1.0), timeout=0.1, default=[]),
+        Stage("financial", broken, default=False),
+        Stage("emotion", lambda: "joy"),
+    ])
+    results = graph.run(executor)
+    assert results.values == {"semantic": [], "financial": False, "emotion": "joy"}
+    assert results.timed_out == ("semantic",)
+    assert results.total_ms < 500
+
+
+def test_critical_failures_propagate(executor):
+    def broken():
+        raise RuntimeError("model crashed")
+
+    with pytest.raises(RuntimeError, match="model crashed"):
+        StageGraph([Stage("emotion", broken), Stage("other", _sleepy(1))]).run(executor)
+    with pytest.raises(StageTimeout):
+        StageGraph([Stage("research", _sleepy(1, 1.0), timeout=0.05)]).run(executor)
+
+
+def test_external_cancellation(executor):
+    cancel = threading.Event()
+    threading.Timer(0.05, cancel.set).start()
+    results = StageGraph([Stage("slow", _sleepy(1, 1.0))]).run(executor, cancel_event=cancel)
+    assert results.cancelled and results.values == {}
+
+
+def test_invalid_graphs_rejected():
+    with pytest.raises(ValueError, match="unknown"):
+        StageGraph([Stage("a", lambda b: b, deps=("b",))])
+    with pytest.raises(ValueError, match="cycle"):
+        StageGraph([Stage("a", lambda b: b, deps=("b",)), Stage("b", lambda a: a, deps=("a",))])
@@ -0,0 +1,159 @@
+"""
+Tests for incremental sliding-window transcription (src/audio/streaming_stt.py).
+
+A fake Whisper model reads one "word" per 0.5 s block of audio (its level
+encodes which word), garbles a block cut off by the window edge, and takes
+time proportional to the audio it decodes -- enough to exercise agreement,
+commits and tail-only finalization without Whisper weights.
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from src.audio.capture import AudioCapture, FileReplaySource, VADEndpointer
+from src.audio.streaming_stt import StreamingTranscriber, TranscriptionSession
+from src.audio.whisper_service import WhisperSTTService
+
+RATE = 16000
+WORD = RATE // 2
+MS_PER_AUDIO_SECOND = 40
+
+
+class FakeWhisper:
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio, initial_prompt=None, **options):
+        self.calls.append((len(audio) / RATE, initial_prompt))
+        time.sleep(len(audio) / RATE * MS_PER_AUDIO_SECOND / 1000)
+        segments = []
+        for offset in range(0, len(audio), WORD):
+            block = audio[offset:offset + WORD]
+            level = int(round(float(np.sqrt(np.mean(block ** 2))) * 100))
+            if not level:
+                continue
+            text = f"word{level}" if len(block) == WORD else f"wo{level}-"
+            segments.append({"start": offset / RATE, "end": (offset + len(block)) / RATE,
+                             "text": f" {text}"})
+        return {"text": " ".join(s["text"].strip() for s in segments), "segments": segments}
+
+
+@pytest.fixture
+def model():
+    return FakeWhisper()
+
+
+@pytest.fixture
+def service(model):
+    s = WhisperSTTService("fake", warmup=False, model_loader=lambda name: model).start(wait=True, timeout=5)
+    yield s
+    s.stop()
+
+
+def _words(count):
+    return np.concatenate([np.full(WORD, (k + 1) / 100, dtype=np.float32) for k in range(count)])
+
+
+def _expected(count):
+    return " ".join(f"word{k + 1}" for k in range(count))
+
+
+def _feed(session, audio, chunk_s=0.1, speed=4.0):
+    step = int(RATE * chunk_s)
+    for offset in range(0, len(audio), step):
+        session.feed(audio[offset:offset + step])
+        time.sleep(chunk_s / speed)
+
+
+def test_service_returns_segments_with_per_request_options(service, model):
+    result = service.submit(_words(2), detailed=True, initial_prompt="earlier").result(timeout=5)
+    assert result["text"] == "word1 word2"
+    assert result["segments"] == [(0.0, 0.5, "word1"), (0.5, 1.0, "word2")]
+    assert model.calls[-1][1] == "earlier"
+    assert service.transcribe(_words(1), timeout=5) == "word1"
+
+
+def test_stable_prefix_commits_while_speaking(service, model):
+    partials = []
+    session = TranscriptionSession(service, on_partial=partials.append, step_s=0.5)
+    _feed(session, _words(12), chunk_s=0.15)  # windows often end mid-word
+    final = session.finish().result(timeout=5)
+
+    assert final.final and final.text == _expected(12)
+    # Most of the utterance was committed before the endpoint
+    assert session.stats["committed_segments"] >= 6
+    assert final.tail_seconds <= 3.0
+    assert final.stable_text and _expected(12).startswith(final.stable_text)
+
+    # Partials arrive during capture; stable text only ever grows
+    assert len(partials) >= 5 and not any(p.final for p in partials)
+    stables = [p.stable_text for p in partials]
+    assert all(b.startswith(a) for a, b in zip(stables, stables[1:]))
+    assert any(p.unstable_text.endswith("-") for p in partials)  # tentative edge word
+    assert all(_expected(12).startswith(p.stable_text) for p in partials)
+
+    # Committed text conditions later windows
+    assert any(prompt for _, prompt in model.calls)
+
+
+def test_post_utterance_latency_is_the_tail_decode(service):
+    audio = _words(16)
+    start = time.perf_counter()
+    full = service.transcribe(audio, timeout=5)
+    full_ms = (time.perf_counter() - start) * 1000
+
+    session = TranscriptionSession(service, step_s=0.5)
+    _feed(session, audio)
+    final = session.finish().result(timeout=5)
+
+    assert final.text == full
+    assert final.tail_seconds < len(audio) / RATE / 2
+    assert final.post_utterance_ms < full_ms
+
+
+def test_long_window_is_force_committed(service):
+    # No two decodes agree while the edge guard covers the whole window
+    session = TranscriptionSession(service, step_s=0.5, max_window_s=2.0, edge_guard_s=10.0)
+    _feed(session, _words(8))
+    final = session.finish().result(timeout=5)
+    assert session.stats["forced_commits"] >= 1
+    assert final.text == _expected(8)
+
+
+def test_short_utterance_and_cancel(service):
+    session = TranscriptionSession(service)
+    session.feed(_words(1))
+    final = session.finish().result(timeout=5)
+    assert final.text == "word1" and final.stable_text == ""
+
+    session = TranscriptionSession(service, step_s=0.5)
+    _feed(session, _words(4))
+    session.cancel()
+    assert session.finish().cancelled()
+
+
+def _voice(seconds):
+    t = np.arange(int(RATE * seconds)) / RATE
+    tone = sum(np.sin(2 * np.pi * 140 * k * t) / k for k in range(1, 20))
+    return (0.2 * tone * (1 + 0.3 * np.sin(2 * np.pi * 4 * t))).astype(np.float32)
+
+
+def test_capture_streams_speech_into_transcriber(service):
+    partials = []
+    transcriber = StreamingTranscriber(service, on_partial=partials.append, step_s=0.5)
+    audio = np.concatenate([np.zeros(RATE // 2, np.float32), _voice(3.0), np.zeros(RATE, np.float32),
+                            _voice(0.1), np.zeros(RATE, np.float32)])
+    capture = AudioCapture(FileReplaySource(audio, realtime=True),
+                           VADEndpointer(hangover_ms=300, start_ms=60, min_speech_ms=250),
+                           speech_listener=transcriber)
+    with capture:
+        utterance = capture.listen(timeout=10)
+        final = utterance.transcript.result(timeout=5)
+        assert capture.listen(timeout=10) is None  # the 0.1 s click is discarded
+
+    assert final.final and final.text
+    assert final.audio_seconds == pytest.approx(utterance.duration)
+    assert partials and partials[0].audio_seconds < utterance.duration
+    assert transcriber.session is None
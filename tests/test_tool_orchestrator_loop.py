@@ -0,0 +1,179 @@
+"""
+Tests for the message-based tool loop in ToolOrchestrator
+(src/tools/tool_orchestrator.py): multiple calls per output, concurrent
+execution with timeouts, result reuse, and repeated-output short-circuit.
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from src.tools.tool_orchestrator import ToolCallParser, ToolOrchestrator, render_tool_exchange
+
+
+def _call(channel, args):
+    return f"<|channel|>{channel}<|message|>{json.dumps(args)}"
+
+
+class ScriptedLLM:
+    """Returns scripted outputs and records the message list for each call"""
+
+    def __init__(self, *outputs):
+        self.outputs = list(outputs)
+        self.seen = []
+
+    def __call__(self, messages):
+        self.seen.append([dict(m) for m in messages])
+        return self.outputs.pop(0)
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_parser_extracts_multiple_calls_with_nested_args():
+    output = (_call("browser.run", {"query": "NEO robot"}) + " and "
+              + _call("calculator", {"expression": "2+2", "opts": {"precision": {"digits": 2}}}))
+    calls = ToolCallParser().parse_all(output)
+
+    assert [c.tool_name for c in calls] == ["web.search", "math.calc"]
+    assert calls[1].arguments == {"expression": "2+2", "opts": {"precision": {"digits": 2}}}
+
+
+def test_parser_final_answer_and_bad_json():
+    parser = ToolCallParser()
+    assert parser.parse_all("Just an answer.") == []
+    assert parser.parse("Just an answer.").content == "Just an answer."
+    assert parser.parse_all("<|channel|>calculator<|message|>{not json}") == []
+
+
+def test_tool_results_are_appended_as_messages():
+    orchestrator = ToolOrchestrator()
+    orchestrator.register_tool("math.calc", lambda args: 4)
+    llm = ScriptedLLM(_call("calculator", {"expression": "2+2"}), "It's 4.")
+
+    assert _run(orchestrator.orchestrate("what is 2+2", llm)) == "It's 4."
+
+    first, second = llm.seen
+    assert first == [{"role": "user", "content": "what is 2+2"}]
+    assert [m["role"] for m in second] == ["user", "assistant", "tool", "system"]
+    assert second[2]["name"] == "math.calc"
+    assert "TOOL_RESULT (math.calc):\n4" in second[2]["content"]
+    assert orchestrator.last_run_stats["llm_calls"] == 2
+
+
+def test_independent_calls_run_concurrently():
+    def slow_search(args):
+        time.sleep(0.3)
+        return f"results for {args['query']}"
+
+    async def slow_calc(args):
+        await asyncio.sleep(0.3)
+        return 42
+
+    orchestrator = ToolOrchestrator()
+    orchestrator.register_tool("web.search", slow_search)
+    orchestrator.register_tool("math.calc", slow_calc)
+    llm = ScriptedLLM(
+        _call("browser.run", {"query": "a"}) + _call("browser.run", {"query": "b"})
+        + _call("calculator", {"expression": "6*7"}),
+        "done"
+    )
+
+    start = time.perf_counter()
+    assert _run(orchestrator.orchestrate("q", llm)) == "done"
+    assert time.perf_counter() - start < 0.8  # ~0.3s, not 0.9s
+
+    tool_messages = [m["content"] for m in llm.seen[1] if m["role"] == "tool"]
+    assert tool_messages == [
+        "TOOL_RESULT (web.search):\nresults for a",
+        "TOOL_RESULT (web.search):\nresults for b",
+        "TOOL_RESULT (math.calc):\n42",
+    ]
+
+
+def test_per_tool_timeout():
+    async def hang(args):
+        await asyncio.sleep(5)
+
+    orchestrator = ToolOrchestrator(tool_timeout=5, tool_timeouts={"web.search": 0.05})
+    orchestrator.register_tool("web.search", hang)
+    llm = ScriptedLLM(_call("browser.run", {"query": "x"}), "sorry")
+
+    start = time.perf_counter()
+    assert _run(orchestrator.orchestrate("q", llm)) == "sorry"
+    assert time.perf_counter() - start < 1.0
+    assert "timed out" in [m for m in llm.seen[1] if m["role"] == "tool"][0]["content"]
+
+
+def test_identical_calls_execute_once():
+    calls = []
+
+    def search(args):
+        calls.append(args["query"])
+        return "r"
+
+    orchestrator = ToolOrchestrator(max_iterations=4)
+    orchestrator.register_tool("web.search", search)
+    same = _call("browser.run", {"query": "x"})
+    llm = ScriptedLLM(same + same, same + _call("browser.run", {"query": "y"}), "answer")
+
+    assert _run(orchestrator.orchestrate("q", llm)) == "answer"
+    assert calls == ["x", "y"]
+    assert orchestrator.last_run_stats["reused_results"] == 2
+
+
+def test_repeated_output_short_circuits():
+    orchestrator = ToolOrchestrator(max_iterations=5)
+    orchestrator.register_tool("web.search", lambda args: "Paris is the capital of France.")
+    same = _call("browser.run", {"query": "x"})
+    llm = ScriptedLLM(same, same, same, same, same)
+
+    result = _run(orchestrator.orchestrate("q", llm))
+
+    # Answered from the results the tools already returned, not the retry message
+    assert "Paris is the capital of France." in result
+    assert result != orchestrator.RETRY_MESSAGE
+    assert orchestrator.last_run_stats["llm_calls"] == 2
+    assert orchestrator.last_run_stats["repeated_output"] is True
+
+    # Only failed tool calls: nothing to answer with
+    failing = ToolOrchestrator(max_iterations=5)
+    result = _run(failing.orchestrate("q", ScriptedLLM(same, same, same)))
+    assert result == failing.RETRY_MESSAGE
+
+
+def test_sync_llm_runs_off_the_event_loop_thread():
+    import threading
+
+    orchestrator = ToolOrchestrator()
+    llm_threads = []
+
+    def llm(messages):
+        llm_threads.append(threading.current_thread())
+        return "done"
+
+    async def main():
+        return threading.current_thread(), await orchestrator.orchestrate("q", llm)
+
+    loop_thread, result = _run(main())
+    assert result == "done"
+    assert llm_threads and llm_threads[0] is not loop_thread
+
+    async def async_llm(messages):
+        return "async done"
+
+    assert _run(orchestrator.orchestrate("q", async_llm)) == "async done"
+
+
+def test_render_tool_exchange():
+    assert render_tool_exchange({}) == ""
+    assert render_tool_exchange([{"role": "user", "content": "q"}]) == ""
+    messages = [
+        {"role": "user", "content": "q"},
+        {"role": "assistant", "content": "[TOOL_CALL: math.calc({})]"},
+        {"role": "tool", "name": "math.calc", "content": "TOOL_RESULT (math.calc):\n4"},
+    ]
+    assert render_tool_exchange(messages) == "[TOOL_CALL: math.calc({})]\n\nTOOL_RESULT (math.calc):\n4"
@@ -0,0 +1,172 @@
+"""
+Tests for the unified content-addressed TTS audio store
+(src/adapters/tts/audio_store.py) and the adapters that share it.
+"""
+
+import os
+
+import pytest
+
+from src.adapters.tts import google_tts_adapter
+from src.adapters.tts.audio_store import AudioStore, audio_key
+from src.adapters.tts.cache import TTSCache
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = AudioStore(str(tmp_path / "store"), max_bytes=1000)
+    yield s
+    s.close()
+
+
+def _source(tmp_path, name, size, suffix=".mp3"):
+    path = tmp_path / f"{name}{suffix}"
+    path.write_bytes(b"x" * size)
+    return str(path)
+
+
+def test_key_normalises_whitespace_and_settings_order():
+    assert audio_key("  Hello   there ", "google") == audio_key("Hello there", "google")
+    assert audio_key("Hello", "google") != audio_key("hello", "google")
+    assert audio_key("Hello", "google") != audio_key("Hello", "say")
+    assert audio_key("Hello", "elevenlabs", "v1", {"a": 1, "b": 2}) == \
+        audio_key("Hello", "elevenlabs", "v1", {"b": 2, "a": 1})
+    assert audio_key("Hello", "elevenlabs", "v1", {"a": 1}) != \
+        audio_key("Hello", "elevenlabs", "v2", {"a": 1})
+
+
+def test_put_get_and_persistence(store, tmp_path):
+    src = _source(tmp_path, "hello", 100)
+    stored = store.put_file("Hello", "google", src)
+
+    assert stored.endswith(".mp3") and os.path.exists(stored)
+    assert os.path.exists(src)  # copied, not moved
+    assert store.get("Hello", "google") == stored
+    assert store.get("Hello", "say") is None
+    assert store.get_bytes(" Hello ", "google") == b"x" * 100
+
+    store.close()
+    reopened = AudioStore(str(store.root), max_bytes=1000)
+    assert reopened.get("Hello", "google") == stored
+    assert reopened.total_bytes == 100
+    reopened.close()
+
+
+def test_move_and_put_bytes(store, tmp_path):
+    src = _source(tmp_path, "moved", 50)
+    stored = store.put_file("Moved", "google", src, move=True)
+    assert not os.path.exists(src) and os.path.exists(stored)
+
+    stored = store.put_bytes("Bytes", "elevenlabs", b"abc", ext=".mp3", voice="v1")
+    assert store.get_bytes("Bytes", "elevenlabs", "v1") == b"abc"
+    assert stored.endswith(".mp3")
+
+
+def test_ledger_tracks_inserts_replacements_and_removals(store, tmp_path):
+    store.put_file("a", "google", _source(tmp_path, "a", 100))
+    store.put_file("b", "google", _source(tmp_path, "b", 200))
+    assert store.total_bytes == 300
+
+    store.put_file("a", "google", _source(tmp_path, "a2", 150))
+    assert store.total_bytes == 350
+    assert store.count() == 2
+
+    store.remove("b", "google")
+    assert store.total_bytes == 150
+    store.clear()
+    assert store.total_bytes == 0 and store.count() == 0
+
+
+def test_lru_eviction_under_byte_budget(store, tmp_path):
+    for name in "abc":
+        store.put_file(name, "google", _source(tmp_path, name, 300))
+    store.get("a", "google")  # a is now most recently used
+
+    store.put_file("d", "google", _source(tmp_path, "d", 300))
+
+    assert store.total_bytes <= store.max_bytes
+    assert not store.contains("b", "google")
+    assert all(store.contains(n, "google") for n in "acd")
+    assert store.get_stats()["evictions"] == 1
+
+
+def test_lfu_eviction_keeps_frequently_used(tmp_path):
+    store = AudioStore(str(tmp_path / "lfu"), max_bytes=1000, policy="lfu")
+    for name in "abc":
+        store.put_file(name, "google", _source(tmp_path, name, 300))
+    for _ in range(3):
+        store.get("a", "google")
+    store.get("b", "google")
+    store.get("c", "google")
+    store.get("c", "google")
+
+    store.put_file("d", "google", _source(tmp_path, "d", 300))
+
+    assert not store.contains("b", "google")
+    assert all(store.contains(n, "google") for n in "acd")
+    store.close()
+
+
+def test_oversized_object_rejected(store, tmp_path):
+    assert store.put_file("big", "google", _source(tmp_path, "big", 2000)) is None
+    assert store.count() == 0 and store.total_bytes == 0
+
+
+def test_entry_with_missing_file_is_dropped(store, tmp_path):
+    stored = store.put_file("gone", "google", _source(tmp_path, "gone", 100))
+    os.unlink(stored)
+    assert store.get("gone", "google") is None
+    assert store.count() == 0 and store.total_bytes == 0
+
+
+def test_clear_by_backend(store, tmp_path):
+    store.put_file("a", "google", _source(tmp_path, "a", 10))
+    store.put_file("a", "elevenlabs", _source(tmp_path, "b", 10), voice="v1")
+    store.clear(backend="google")
+    assert store.count() == 1 and store.count("elevenlabs") == 1
+
+
+def test_google_tts_and_tts_cache_share_audio(store, monkeypatch):
+    synthesized = []
+
+    class FakeGTTS:
+        def __init__(self, text, lang):
+            self.text = text
+
+        def save(self, path):
+            synthesized.append(self.text)
+            with open(path, "wb") as f:
+                f.write(b"mp3:" + self.text.encode())
+
+    monkeypatch.setattr(google_tts_adapter, "GTTS_AVAILABLE", True)
+    monkeypatch.setattr(google_tts_adapter, "gTTS", FakeGTTS)
+
+    tts = google_tts_adapter.GoogleTTS({}, store=store)
+    first = tts._synthesize_audio("Got it")
+    second = tts._synthesize_audio("Got it")
+    assert first == second and synthesized == ["Got it"]
+
+    cache = TTSCache(store=store, enable_pregeneration=False)
+    assert cache.get_cached_audio("Got it") == first
+    assert cache.get_stats()["cached_phrases"] == 1
+
+    cache.clear_cache()
+    assert store.count("google") == 0
+    tts._synthesize_audio("Got it")
+    assert synthesized == ["Got it", "Got it"]
+
+
+def test_elevenlabs_adapters_share_cache_entries(store, tmp_path, monkeypatch):
+    from src.adapters.tts.elevenlabs_tts_adapter import ElevenLabsTTS
+    from src.adapters.tts.streaming_elevenlabs_tts import StreamingElevenLabsTTS
+
+    monkeypatch.setenv("ELEVENLABS_API_KEY", "stub-key")
+    tts = ElevenLabsTTS({}, store=store)
+    stored = tts._cache_file("Got it", _source(tmp_path, "got-it", 10))
+    assert stored and tts._get_cached_file("Got it") == stored
+
+    streaming = StreamingElevenLabsTTS({}, store=store)
+    # Same voice settings and model: the streaming adapter reuses the entry
+    streaming.personality_settings["default"] = dict(tts.voice_settings)
+    monkeypatch.setattr(streaming.session, "post", lambda *a, **k: pytest.fail("cache miss"))
+    assert streaming._synthesize_chunk("Got it", 0) == (0, stored)
@@ -0,0 +1,232 @@
+"""
+Tests for adaptive chunk planning and synthesize-ahead scheduling
+(src/adapters/tts/chunk_scheduler.py), including StreamingElevenLabsTTS
+against a local stub TTS HTTP server.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pytest
+
+from src.adapters.tts.chunk_scheduler import ChunkScheduler, plan_chunks
+from src.audio.playback_engine import NullSink, PlaybackEngine
+
+TEXT = (
+    "Sure, here's the quick version. Dr. Smith moved the meeting to Thursday at ten, "
+    "so the review slides need to be ready by Wednesday evening. "
+    "I pulled last quarter's numbers into the shared folder, and the chart on page four "
+    "now uses the corrected baseline. "
+    "If you want, I can draft the summary email as well; it would take a couple of minutes. "
+    "Let me know which version of the budget table you'd like to keep."
+)
+
+
+def test_first_chunk_is_short_and_later_chunks_grow():
+    chunks = plan_chunks(TEXT, first_chars=40, growth=2.0, max_chars=200)
+
+    assert len(chunks[0]) <= 40
+    assert chunks[0] == "Sure, here's the quick version."
+    assert max(len(c) for c in chunks[1:]) > 2 * len(chunks[0])
+    assert all(len(c) <= 200 for c in chunks)
+    # Nothing lost, reordered, or split mid-word; abbreviations don't end sentences
+    assert " ".join(chunks).split() == TEXT.split()
+    assert not any(c.endswith("Dr.") for c in chunks)
+
+
+def test_long_sentence_splits_at_clause_then_word_boundary():
+    sentence = "alpha beta gamma delta, epsilon zeta eta theta iota kappa lambda mu"
+    head, *rest = plan_chunks(sentence, first_chars=30, growth=1.0, max_chars=30)
+    assert head == "alpha beta gamma delta,"
+    assert all(len(c) <= 30 for c in rest)
+    assert " ".join([head] + rest).split() == sentence.split()
+
+    assert plan_chunks("Short reply.") == ["Short reply."]
+    assert plan_chunks("") == []
+
+
+def test_scheduler_consumes_in_order_within_window():
+    in_flight = 0
+    peak = 0
+    ahead = []
+    consumed = []
+    lock = threading.Lock()
+
+    def synthesize(text, index):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+            ahead.append(index - len(consumed))
+        time.sleep(0.05 if index % 2 == 0 else 0.01)  # odd chunks finish first
+        with lock:
+            in_flight -= 1
+        return f"audio {index}"
+
+    def consume(index, audio):
+        consumed.append((index, audio))
+        time.sleep(0.02)
+
+    scheduler = ChunkScheduler(synthesize, consume, window=2)
+    stats = scheduler.run([f"chunk {i}" for i in range(8)])
+
+    assert consumed == [(i, f"audio {i}") for i in range(8)]
+    assert peak <= 2
+    assert max(ahead) <= 2
+    assert stats['consumed'] == 8 and stats['first_audio_ms'] is not None
+    assert all(ms is not None for ms in stats['synth_ms'])
+
+
+def test_scheduler_skips_failures_and_stops_on_consumer_false():
+    def synthesize(text, index):
+        if index == 1:
+            raise RuntimeError("synthesis failed")
+        return None if index == 2 else index
+
+    consumed = []
+
+    def consume(index, audio):
+        consumed.append(index)
+        return index < 4
+
+    stats = ChunkScheduler(synthesize, consume, window=3).run([str(i) for i in range(8)])
+    assert consumed == [0, 3, 4]
+    assert stats['failed'] == 2
+
+
+def test_scheduler_cancel_stops_promptly():
+    scheduler = ChunkScheduler(lambda text, i: time.sleep(0.05) or i, lambda i, a: time.sleep(0.1), window=2)
+    threading.Timer(0.15, scheduler.cancel).start()
+
+    start = time.perf_counter()
+    stats = scheduler.run([str(i) for i in range(20)])
+    assert time.perf_counter() - start < 0.6
+    assert stats['consumed'] < 5
+
+
+def test_scheduler_consumer_error_ends_the_run():
+    def consume(index, audio):
+        if index == 1:
+            raise RuntimeError("sink closed")
+
+    scheduler = ChunkScheduler(lambda text, i: i, consume, window=2)
+    done = threading.Event()
+    result = {}
+    worker = threading.Thread(target=lambda: result.update(scheduler.run([str(i) for i in range(10)])) or done.set(),
+                              daemon=True)
+    worker.start()
+
+    assert done.wait(2), "run() hung after the consumer failed"
+    assert result['consumed'] == 1
+    assert result['error'] == "sink closed"
+
+
+def test_streaming_elevenlabs_speaks_until_playback_drains(monkeypatch):
+    from src.adapters.tts.streaming_elevenlabs_tts import StreamingElevenLabsTTS
+
+    class WaitingEngine:
+        def __init__(self):
+            self.speaking_during_wait = None
+
+        def begin_utterance(self):
+            return 1
+
+        def enqueue_pcm(self, samples, rate, utterance=None):
+            return True
+
+        def finish(self, utterance):
+            pass
+
+        def wait(self):
+            self.speaking_during_wait = tts.is_speaking()
+
+        def stop(self):
+            pass
+
+    monkeypatch.setenv("ELEVENLABS_API_KEY", "stub-key")
+    engine = WaitingEngine()
+    tts = StreamingElevenLabsTTS({"tts": {"cache_enabled": False}}, engine=engine)
+    monkeypatch.setattr(tts, "_synthesize_chunk_pcm", lambda text, i: (i, np.zeros(10, np.float32)))
+
+    assert tts.speak("Hello there. This is a test.") is True
+    assert engine.speaking_during_wait is True
+    assert tts.is_speaking() is False
+
+
+class _StubTTSHandler(BaseHTTPRequestHandler):
+    """ElevenLabs-shaped endpoint returning 2 ms of 22.05 kHz PCM per character"""
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        query = parse_qs(urlparse(self.path).query)
+        server = self.server
+        with server.lock:
+            server.requests.append({
+                "text": body["text"], "port": self.client_address[1],
+                "format": query.get("output_format", [None])[0],
+                "api_key": self.headers.get("xi-api-key")
+            })
+        time.sleep(0.03 + 0.0002 * len(body["text"]))
+        pcm = np.full(len(body["text"]) * 44, 1000, dtype="<i2").tobytes()
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/pcm")
+        self.send_header("Content-Length", str(len(pcm)))
+        self.end_headers()
+        self.wfile.write(pcm)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_tts_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubTTSHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_streaming_elevenlabs_against_stub_server(stub_tts_server, monkeypatch):
+    from src.adapters.tts.streaming_elevenlabs_tts import StreamingElevenLabsTTS
+
+    monkeypatch.setenv("ELEVENLABS_API_KEY", "stub-key")
+    port = stub_tts_server.server_address[1]
+    config = {"tts": {
+        "elevenlabs_base_url": f"http://127.0.0.1:{port}/v1",
+        "cache_enabled": False,
+        "first_chunk_chars": 40,
+        "synthesis_window": 2,
+    }}
+    engine = PlaybackEngine(NullSink(realtime=True))
+    try:
+        tts = StreamingElevenLabsTTS(config, engine=engine)
+        assert tts.speak(TEXT) is True
+
+        requests_seen = stub_tts_server.requests
+        chunks = tts._split_into_chunks(TEXT)
+        assert len(requests_seen) == len(chunks) >= 4
+        assert len(chunks[0]) <= 40
+        assert {r["text"] for r in requests_seen} == set(chunks)
+        assert all(r["format"] == "pcm_22050" and r["api_key"] == "stub-key" for r in requests_seen)
+        # Keep-alive: at most one connection per window slot, reused across chunks
+        assert len({r["port"] for r in requests_seen}) <= 2
+
+        # Synthesize-ahead hides every chunk boundary: no underruns, all audio played
+        stats = engine.get_stats()
+        assert stats["underruns"] == 0
+        assert stats["chunks_started"] == len(requests_seen)
+        played = np.count_nonzero(engine.sink.recorded)
+        assert played == sum(len(r["text"]) * 44 for r in requests_seen)
+        assert tts.last_schedule_stats["first_audio_ms"] < 500
+    finally:
+        engine.close()
@@ -8,6 +8,7 @@ import time
 from unittest.mock import patch, MagicMock, call
 from pathlib import Path
 
+from src.adapters.tts.audio_store import AudioStore, audio_key
 from src.adapters.tts.google_tts_adapter import GoogleTTS
 
 
@@ -25,27 +26,30 @@ class TestGoogleTTSResilience:
         }
 
     @pytest.fixture
-    def tts_adapter(self, config):
+    def store(self, tmp_path):
+        """Private audio store so tests don't touch the shared one."""
+        return AudioStore(str(tmp_path / "audio_store"))
+
+    @pytest.fixture
+    def tts_adapter(self, config, store):
         """Create TTS adapter instance."""
-        return GoogleTTS(config)
+        return GoogleTTS(config, store=store)
 
-    def test_initialization(self, tts_adapter):
+    def test_initialization(self, tts_adapter, store):
         """Test adapter initialization."""
         assert tts_adapter.cache_enabled is True
-        assert tts_adapter.cache_dir.name == 'pennygpt_tts_cache'
-        assert isinstance(tts_adapter.memory_cache, dict)
-        assert tts_adapter.max_cache_phrase_length == 60
+        assert tts_adapter.store is store
 
-    def test_cache_key_generation(self, tts_adapter):
+    def test_cache_key_generation(self):
         """Test cache key generation consistency."""
         text = "Hello, world!"
-        key1 = tts_adapter._get_cache_key(text)
-        key2 = tts_adapter._get_cache_key(text)
+        key1 = audio_key(text, GoogleTTS.BACKEND)
+        key2 = audio_key(text, GoogleTTS.BACKEND)
         assert key1 == key2
-        assert len(key1) == 32  # MD5 hash length
+        assert len(key1) == 64  # SHA-256 hex length
         
         # Different text should generate different keys
-        key3 = tts_adapter._get_cache_key("Different text")
+        key3 = audio_key("Different text", GoogleTTS.BACKEND)
         assert key1 != key3
 
     @patch('src.adapters.tts.google_tts_adapter.GTTS_AVAILABLE', False)
@@ -85,33 +89,35 @@ class TestGoogleTTSResilience:
         # Error should be logged only once
         assert tts_adapter._error_logged is True
 
-    def test_cache_functionality(self, tts_adapter):
-        """Test memory cache functionality."""
-        short_text = "Hello!"  # Under 60 chars
-        cache_key = tts_adapter._get_cache_key(short_text)
-        test_file = "/tmp/test.mp3"
-        
-        # Cache the file
-        tts_adapter._cache_file(short_text, test_file)
+    def test_cache_functionality(self, tts_adapter, store, tmp_path):
+        """Test audio store caching."""
+        short_text = "Hello!"
+        test_file = tmp_path / "test.mp3"
+        test_file.write_bytes(b"audio")
         
-        # Should be in memory cache
-        assert cache_key in tts_adapter.memory_cache
-        assert tts_adapter.memory_cache[cache_key] == test_file
+        # Cache the file (moved into the store)
+        stored = tts_adapter._cache_file(short_text, str(test_file))
+        assert stored and os.path.exists(stored)
+        assert not test_file.exists()
+        assert store.contains(short_text, GoogleTTS.BACKEND)
         
         # Should retrieve from cache
         cached_file = tts_adapter._get_cached_file(short_text)
-        assert cached_file == test_file
+        assert cached_file == stored
 
-    def test_cache_disabled(self):
+    def test_cache_disabled(self, tmp_path):
         """Test behavior when cache is disabled."""
         config = {"tts": {"cache_enabled": False}}
         tts = GoogleTTS(config)
         
         assert tts.cache_enabled is False
+        assert tts.store is None
         
         # Should not cache
-        tts._cache_file("Test", "/tmp/test.mp3")
-        assert len(tts.memory_cache) == 0
+        test_file = tmp_path / "test.mp3"
+        test_file.write_bytes(b"audio")
+        assert tts._cache_file("Test", str(test_file)) is None
+        assert test_file.exists()
         
         # Should not retrieve from cache
         cached_file = tts._get_cached_file("Test")
@@ -211,19 +217,16 @@ class TestGoogleTTSResilience:
             # Should have called gTTS multiple times for common phrases
             assert mock_gtts.call_count >= 5  # At least 5 common phrases
 
-    def test_clear_cache(self, tts_adapter):
+    def test_clear_cache(self, tts_adapter, store):
         """Test cache clearing functionality."""
-        # Add something to memory cache
-        tts_adapter.memory_cache["test"] = "/tmp/test.mp3"
+        store.put_bytes("test", GoogleTTS.BACKEND, b"audio")
+        store.put_bytes("test", "elevenlabs", b"audio")
         
-        with patch('shutil.rmtree') as mock_rmtree:
-            tts_adapter.clear_cache()
-            
-            # Memory cache should be cleared
-            assert len(tts_adapter.memory_cache) == 0
-            
-            # Should attempt to clear disk cache
-            mock_rmtree.assert_called_once_with(tts_adapter.cache_dir)
+        tts_adapter.clear_cache()
+
+        # Only Google audio is dropped
+        assert store.count(GoogleTTS.BACKEND) == 0
+        assert store.count("elevenlabs") == 1
 
     @patch('src.adapters.tts.google_tts_adapter.gTTS')
     def test_integration_flow(self, mock_gtts, tts_adapter):
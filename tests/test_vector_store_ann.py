@@ -0,0 +1,78 @@
+"""
+Tests for the approximate-nearest-neighbour tier (src/memory/ann_index.py and
+its promotion inside src/memory/vector_store.py).
+"""
+
+import numpy as np
+import pytest
+
+from src.memory.ann_index import AnnIndex, measure_recall
+from src.memory.vector_store import VectorStore
+
+DIM = 16
+
+
+def _vectors(n, seed=0):
+    x = np.random.default_rng(seed).standard_normal((n, DIM)).astype("float32")
+    return x / np.linalg.norm(x, axis=1, keepdims=True)
+
+
+@pytest.mark.parametrize("kind", ["hnsw", "ivf"])
+def test_ann_index_recall_against_brute_force(kind):
+    x = _vectors(500)
+    ids = np.arange(500, dtype="int64")
+    ann = AnnIndex(DIM, kind=kind, nprobe=64, ef_search=128)
+    ann.build(x, ids)
+
+    stats = measure_recall(ann, x, ids, x[:20], k=5)
+    assert stats["recall"] >= 0.9
+    assert stats["queries"] == 20
+
+
+def test_unknown_kind_rejected():
+    with pytest.raises(ValueError):
+        AnnIndex(DIM, kind="lsh")
+
+
+def test_small_store_stays_exact(tmp_path):
+    store = VectorStore(embedding_dim=DIM, storage_path=str(tmp_path / "vs"), ann_threshold=100)
+    store.add(_vectors(50))
+    store.close()
+    assert store.get_stats()["index_tier"] == "flat"
+
+
+def test_store_promotes_past_threshold_and_keeps_adding(tmp_path):
+    store = VectorStore(
+        embedding_dim=DIM,
+        storage_path=str(tmp_path / "vs"),
+        ann_kind="hnsw",
+        ann_threshold=200,
+        target_recall=0.9
+    )
+    x = _vectors(300)
+    store.add(x[:250])
+    store.close()  # waits for the background build
+
+    stats = store.get_stats()
+    assert stats["index_tier"] == "hnsw"
+    assert stats["ann"]["recall"] >= 0.9
+
+    # Vectors added after the swap are searchable through the ANN tier
+    store.add(x[250:])
+    top_id, score, _ = store.search(x[299], k=1)[0]
+    assert top_id == 299
+    assert score == pytest.approx(1.0, abs=1e-5)
+
+    assert store.check_recall(sample_size=20, k=5)["recall"] >= 0.9
+    store.close()
+
+
+def test_clear_drops_ann_tier(tmp_path):
+    store = VectorStore(embedding_dim=DIM, storage_path=str(tmp_path / "vs"), ann_threshold=50)
+    store.add(_vectors(60))
+    store.promote_index(background=False)
+    assert store.get_stats()["index_tier"] == "hnsw"
+
+    store.clear()
+    assert store.get_stats()["index_tier"] == "flat"
+    store.close()
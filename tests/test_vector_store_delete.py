@@ -0,0 +1,109 @@
+"""
+Tests for real deletion in VectorStore (src/memory/vector_store.py): vectors
+are removed from the exact index, tombstoned in the approximate tier, and
+search still returns k live results.
+"""
+
+import pickle
+
+import faiss
+import numpy as np
+import pytest
+
+from src.memory.vector_store import VectorStore
+
+DIM = 16
+
+
+def _vectors(n, seed=0):
+    x = np.random.default_rng(seed).standard_normal((n, DIM)).astype("float32")
+    return x / np.linalg.norm(x, axis=1, keepdims=True)
+
+
+def test_delete_removes_vector_from_exact_index(tmp_path):
+    store = VectorStore(embedding_dim=DIM, storage_path=str(tmp_path / "vs"))
+    x = _vectors(10)
+    ids = store.add(x, metadata=[{"n": i} for i in range(10)])
+
+    store.delete([ids[3]])
+    assert store.size() == 9
+
+    results = store.search(x[3], k=9)
+    assert len(results) == 9
+    assert ids[3] not in [r[0] for r in results]
+    assert all(meta for _, _, meta in results)  # no empty-metadata ghosts
+    store.close()
+
+
+def test_ann_tier_tombstones_and_overfetch(tmp_path):
+    store = VectorStore(
+        embedding_dim=DIM,
+        storage_path=str(tmp_path / "vs"),
+        ann_threshold=100,
+        tombstone_ratio=0.9  # keep tombstones around for this test
+    )
+    x = _vectors(200)
+    store.add(x, metadata=[{"n": i} for i in range(200)])
+    store.promote_index(background=False)
+
+    # Delete the query's nearest neighbours so they would crowd out k slots
+    neighbours = [r[0] for r in store.search(x[0], k=10)]
+    store.delete(neighbours)
+
+    stats = store.get_stats()
+    assert stats["index_tier"] == "hnsw"
+    assert stats["tombstones"] == 10
+
+    results = store.search(x[0], k=5)
+    assert len(results) == 5
+    assert not set(r[0] for r in results) & set(neighbours)
+    store.close()
+
+
+def test_tombstone_ratio_triggers_rebuild(tmp_path):
+    store = VectorStore(
+        embedding_dim=DIM,
+        storage_path=str(tmp_path / "vs"),
+        ann_threshold=50,
+        tombstone_ratio=0.2
+    )
+    ids = store.add(_vectors(100))
+    store.promote_index(background=False)
+
+    store.delete(ids[:30])
+    store.close()  # waits for the background rebuild
+
+    stats = store.get_stats()
+    assert stats["index_tier"] == "hnsw"
+    assert stats["tombstones"] == 0
+    assert store._ann.ntotal == 70
+
+
+def test_deleted_vectors_not_in_snapshot(tmp_path):
+    path = str(tmp_path / "vs")
+    store = VectorStore(embedding_dim=DIM, storage_path=path)
+    ids = store.add(_vectors(5))
+    store.delete(ids[:2])
+    store.save()
+    store.close()
+
+    reopened = VectorStore(embedding_dim=DIM, storage_path=path)
+    assert reopened.size() == 3
+    assert reopened.next_id == 5
+    assert reopened.add(_vectors(1, seed=9)) == [5]
+    reopened.close()
+
+
+def test_legacy_split_format_upgraded_and_orphans_dropped(tmp_path):
+    base = tmp_path / "vs"
+    legacy = faiss.IndexFlatIP(DIM)
+    legacy.add(_vectors(4))
+    faiss.write_index(legacy, str(base.with_suffix(".index")))
+    with open(base.with_suffix(".pkl"), "wb") as f:
+        # ID 1 was "deleted" by the old metadata-only delete()
+        pickle.dump({"id_to_metadata": {0: {}, 2: {}, 3: {}}, "next_id": 4, "embedding_dim": DIM}, f)
+
+    store = VectorStore(embedding_dim=DIM, storage_path=str(base))
+    assert store.size() == 3
+    assert 1 not in [r[0] for r in store.search(_vectors(4)[1], k=3)]
+    store.close()
@@ -0,0 +1,98 @@
+"""
+Tests for VectorStore append-only persistence (src/memory/vector_store.py).
+
+Covers WAL replay on reopen, torn-tail recovery, and compaction into the base
+snapshot. Uses random vectors so no embedding model is needed.
+"""
+
+import numpy as np
+import pytest
+
+from src.memory.vector_store import VectorStore
+
+DIM = 8
+
+
+def _vec(seed):
+    return np.random.default_rng(seed).standard_normal(DIM).astype("float32")
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    return str(tmp_path / "vector_store")
+
+
+def test_add_appends_to_wal_without_snapshot(store_path):
+    store = VectorStore(embedding_dim=DIM, storage_path=store_path)
+    store.add(_vec(1), metadata=[{"turn_id": "a"}])
+    store.add(_vec(2), metadata=[{"turn_id": "b"}])
+
+    assert not store.metadata_path.exists()
+    assert store.get_stats()["wal_records"] == 2
+    store.close()
+
+
+def test_reopen_replays_wal(store_path):
+    store = VectorStore(embedding_dim=DIM, storage_path=store_path)
+    ids = [store.add(_vec(i), metadata=[{"turn_id": str(i)}])[0] for i in range(5)]
+    store.delete([ids[0]])
+    store.close()
+
+    reopened = VectorStore(embedding_dim=DIM, storage_path=store_path)
+    assert reopened.size() == 4  # deleted vector is gone, not just its metadata
+    assert reopened.next_id == 5
+    assert reopened.get_by_id(ids[0]) is None
+    assert reopened.get_by_id(ids[3]) == {"turn_id": "3"}
+
+    top_id, score, meta = reopened.search(_vec(2), k=1)[0]
+    assert top_id == 2
+    assert score == pytest.approx(1.0, abs=1e-5)
+    reopened.close()
+
+
+def test_torn_tail_is_truncated_on_load(store_path):
+    store = VectorStore(embedding_dim=DIM, storage_path=store_path)
+    store.add(_vec(1), metadata=[{"turn_id": "a"}])
+    store.add(_vec(2), metadata=[{"turn_id": "b"}])
+    store.close()
+
+    (gen, segment), = store._list_segments()
+    intact_size = segment.stat().st_size
+    with open(segment, "ab") as f:
+        f.write(b"\x10\x00\x00\x00garbage")  # half-written frame
+
+    reopened = VectorStore(embedding_dim=DIM, storage_path=store_path)
+    assert reopened.size() == 2
+    assert segment.stat().st_size == intact_size
+
+    # New appends land after the last good record and survive another reopen
+    reopened.add(_vec(3), metadata=[{"turn_id": "c"}])
+    reopened.close()
+    assert VectorStore(embedding_dim=DIM, storage_path=store_path).size() == 3
+
+
+def test_compaction_folds_segments_into_snapshot(store_path):
+    store = VectorStore(embedding_dim=DIM, storage_path=store_path, compact_every=3)
+    for i in range(7):
+        store.add(_vec(i), metadata=[{"turn_id": str(i)}])
+    store.close()
+
+    assert store.metadata_path.exists()
+    # Only segments newer than the snapshot remain
+    assert len(store._list_segments()) <= 2
+
+    reopened = VectorStore(embedding_dim=DIM, storage_path=store_path)
+    assert reopened.size() == 7
+    assert reopened.get_by_id(6) == {"turn_id": "6"}
+    reopened.close()
+
+
+def test_save_then_clear(store_path):
+    store = VectorStore(embedding_dim=DIM, storage_path=store_path)
+    store.add(_vec(1))
+    store.save()
+    assert store._list_segments() == []
+
+    store.clear()
+    store.close()
+    assert VectorStore(embedding_dim=DIM, storage_path=store_path).size() == 0
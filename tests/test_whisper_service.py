@@ -0,0 +1,78 @@
+"""
+Tests for the warm Whisper STT service (src/audio/whisper_service.py).
+
+Uses a fake model loader so no Whisper weights are needed.
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from src.audio.whisper_service import WhisperSTTService, to_whisper_audio
+
+
+class FakeWhisper:
+    loads = 0
+
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio, **options):
+        assert isinstance(audio, np.ndarray) and audio.dtype == np.float32 and audio.ndim == 1
+        self.calls.append(len(audio))
+        return {"text": f" {len(audio)} samples "}
+
+
+def fake_loader(model_name):
+    FakeWhisper.loads += 1
+    time.sleep(0.05)
+    return FakeWhisper()
+
+
+def failing_loader(model_name):
+    raise OSError("no weights")
+
+
+def test_to_whisper_audio_flattens_capture_buffers():
+    stereo = np.ones((4, 2), dtype=np.float64)
+    assert to_whisper_audio(stereo).shape == (4,)
+    assert to_whisper_audio(np.zeros((5, 1))).dtype == np.float32
+
+
+def test_model_loads_once_and_reports_latencies():
+    FakeWhisper.loads = 0
+    service = WhisperSTTService("base", model_loader=fake_loader).start(wait=True, timeout=5)
+
+    assert service.transcribe(np.zeros((16000, 1), dtype=np.float32), timeout=5) == "16000 samples"
+    futures = [service.submit(np.zeros(n, dtype=np.float32)) for n in (100, 200)]
+    assert [f.result(timeout=5) for f in futures] == ["100 samples", "200 samples"]
+    assert FakeWhisper.loads == 1
+
+    stats = service.get_stats()
+    assert stats["ready"] and stats["mode"] == "thread"
+    assert stats["model_load_ms"] >= 50
+    assert stats["warmup_ms"] is not None
+    assert stats["requests"] == 3
+    assert stats["last_inference_ms"] < stats["model_load_ms"]
+    service.stop()
+
+
+def test_load_failure_surfaces_to_callers():
+    service = WhisperSTTService("base", model_loader=failing_loader).start()
+    with pytest.raises(RuntimeError, match="no weights"):
+        service.wait_ready(timeout=5)
+    with pytest.raises(RuntimeError):
+        service.transcribe(np.zeros(10, dtype=np.float32), timeout=5)
+    service.stop()
+
+
+def test_dedicated_worker_process():
+    service = WhisperSTTService("base", use_process=True, mp_context="fork", model_loader=fake_loader)
+    service.start(wait=True, timeout=30)
+
+    assert service.transcribe(np.zeros(320, dtype=np.float32), timeout=10) == "320 samples"
+    stats = service.get_stats()
+    assert stats["mode"] == "process"
+    assert stats["requests"] == 1 and stats["model_load_ms"] >= 50
+    service.stop()
@@ -0,0 +1,209 @@
+"""
+Tests for the write-behind post-turn worker (src/core/write_behind.py).
+"""
+
+import json
+import threading
+import time
+
+import pytest
+
+from src.core.write_behind import WriteBehindWorker
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return tmp_path / "journal.jsonl"
+
+
+def test_tasks_run_in_submission_order():
+    done = []
+    worker = WriteBehindWorker({"save": lambda payload, ctx: done.append(payload["n"])})
+    futures = [worker.submit("save", {"n": n}) for n in range(20)]
+
+    assert worker.flush(timeout=5)
+    assert done == list(range(20))
+    assert all(f.done() for f in futures)
+    worker.close()
+
+
+def test_submit_returns_without_waiting_for_handler():
+    release = threading.Event()
+    worker = WriteBehindWorker({"slow": lambda payload, ctx: release.wait(5)})
+
+    start = time.perf_counter()
+    future = worker.submit("slow", {})
+    assert time.perf_counter() - start < 0.1
+    assert not future.done()
+
+    release.set()
+    assert future.result(timeout=5) is True
+    worker.close()
+
+
+def test_context_passed_live_and_result_on_future():
+    marker = object()
+    worker = WriteBehindWorker({"echo": lambda payload, ctx: (payload["x"], ctx)})
+    assert worker.submit("echo", {"x": 1}, context=marker).result(timeout=5) == (1, marker)
+    worker.close()
+
+
+def test_handler_failure_is_isolated():
+    def handler(payload, ctx):
+        if payload["fail"]:
+            raise RuntimeError("disk full")
+        return "ok"
+
+    worker = WriteBehindWorker({"t": handler})
+    bad = worker.submit("t", {"fail": True})
+    good = worker.submit("t", {"fail": False})
+
+    with pytest.raises(RuntimeError):
+        bad.result(timeout=5)
+    assert good.result(timeout=5) == "ok"
+    assert worker.stats["failed"] == 1 and worker.stats["completed"] == 1
+    worker.close()
+
+
+def test_unknown_kind_rejected():
+    worker = WriteBehindWorker({"t": lambda p, c: None})
+    with pytest.raises(ValueError):
+        worker.submit("nope", {})
+    worker.close()
+
+
+def test_full_queue_applies_backpressure():
+    release = threading.Event()
+
+    def handler(payload, ctx):
+        release.wait(5)
+
+    worker = WriteBehindWorker({"t": handler}, max_pending=1, block_timeout=0.1, name="wb-test")
+    worker.submit("t", {})  # picked up by the worker, blocks on release
+    time.sleep(0.05)
+    worker.submit("t", {})  # fills the queue
+
+    release.set()
+    start = time.perf_counter()
+    worker.submit("t", {})  # waits for space (worker is draining now)
+    assert time.perf_counter() - start < 1.0
+    assert worker.flush(timeout=5)
+    assert worker.stats["backpressure_waits"] >= 1
+    worker.close()
+
+
+def test_stalled_queue_keeps_submission_order():
+    # A queue that stays full makes the producer wait; nothing jumps the queue
+    stuck = threading.Event()
+    ran = []
+
+    def handler(payload, ctx):
+        if payload["n"] == 0:
+            stuck.wait(5)
+        ran.append((payload["n"], threading.current_thread().name))
+
+    worker = WriteBehindWorker({"t": handler}, max_pending=1, block_timeout=0.05, name="wb-test")
+    worker.submit("t", {"n": 0})
+    time.sleep(0.05)
+    worker.submit("t", {"n": 1})
+    threading.Timer(0.2, stuck.set).start()
+    worker.submit("t", {"n": 2})  # blocks past several block_timeouts
+    worker.close()
+
+    assert [n for n, _ in ran] == [0, 1, 2]
+    assert {name for _, name in ran} == {"wb-test"}
+    assert worker.stats["backpressure_stalls"] >= 1
+
+
+def test_close_flushes_pending_tasks():
+    done = []
+
+    def handler(payload, ctx):
+        time.sleep(0.01)
+        done.append(payload["n"])
+
+    worker = WriteBehindWorker({"t": handler})
+    for n in range(10):
+        worker.submit("t", {"n": n})
+    worker.close()
+    assert done == list(range(10))
+
+    # Submissions after close run inline
+    worker.submit("t", {"n": 10})
+    assert done[-1] == 10
+
+
+def test_journal_reset_after_drain(journal):
+    worker = WriteBehindWorker({"t": lambda p, c: None}, journal_path=str(journal))
+    for n in range(3):
+        worker.submit("t", {"n": n})
+    worker.close()
+    assert journal.read_text() == ""
+
+
+def test_unacknowledged_entries_replayed_in_order(journal):
+    journal.write_text("\n".join(json.dumps(r) for r in [
+        {"seq": 1, "kind": "t", "payload": {"n": 1}},
+        {"seq": 2, "kind": "t", "payload": {"n": 2}},
+        {"ack": 1},
+        {"seq": 3, "kind": "t", "payload": {"n": 3}},
+        '{"seq": 4, "kind": "t", "pay',  # torn final write
+    ]) + "\n")
+
+    replayed = []
+    worker = WriteBehindWorker({"t": lambda p, c: replayed.append((p["n"], c))},
+                               journal_path=str(journal))
+    assert worker.flush(timeout=5)
+    assert replayed == [(2, None), (3, None)]
+    assert worker.stats["replayed"] == 2
+
+    # New work continues the sequence and the journal empties once drained
+    worker.submit("t", {"n": 4})
+    worker.close()
+    assert replayed[-1] == (4, None)
+    assert journal.read_text() == ""
+
+
+def test_crash_before_run_leaves_entry_for_replay(journal):
+    block = threading.Event()
+    worker = WriteBehindWorker({"t": lambda p, c: block.wait(5)}, journal_path=str(journal))
+    worker.submit("t", {"n": 1})
+    worker.submit("t", {"n": 2})
+    time.sleep(0.05)
+
+    # Simulate a crash: read the journal while both tasks are outstanding
+    records = [json.loads(line) for line in journal.read_text().splitlines()]
+    assert [r["payload"]["n"] for r in records if "payload" in r] == [1, 2]
+    block.set()
+    worker.close()
+
+
+def test_encrypted_journal(journal):
+    encryption = pytest.importorskip("src.security.encryption")
+    enc = encryption.DataEncryption(key_file=str(journal.parent / "key"))
+
+    block = threading.Event()
+    worker = WriteBehindWorker({"t": lambda p, c: block.wait(5)}, journal_path=str(journal),
+                               encryption=enc)
+    worker.submit("t", {"user_input": "I feel anxious about money"})
+    time.sleep(0.05)
+    assert "anxious" not in journal.read_text()
+    block.set()
+    worker.close()
+
+    # Replay decrypts
+    journal.write_text(json.dumps({"seq": 1, "kind": "t", "enc": enc.encrypt_dict({"n": 7})}) + "\n")
+    seen = []
+    worker = WriteBehindWorker({"t": lambda p, c: seen.append(p)}, journal_path=str(journal),
+                               encryption=enc)
+    worker.close()
+    assert seen == [{"n": 7}]
+
+
+def test_unserializable_payload_still_runs(journal):
+    seen = []
+    worker = WriteBehindWorker({"t": lambda p, c: seen.append(p["obj"])}, journal_path=str(journal))
+    obj = object()
+    worker.submit("t", {"obj": obj})
+    worker.close()
+    assert seen == [obj]
@@ -4,12 +4,12 @@ Voice Activity Detection for Natural Conversation Flow
 Detects speech vs silence to trigger responses naturally
 """
 
-import sounddevice as sd
 import numpy as np
-import time
 from typing import Tuple, Optional
 import threading
 
+from src.audio.capture import AudioCapture, MicrophoneSource, VADEndpointer
+
 
 class VoiceActivityDetector:
     """Detects when user is speaking vs when they've finished"""
@@ -28,9 +28,28 @@ class VoiceActivityDetector:
         # Internal state
         self.is_recording = False
         self.audio_buffer = []
-        self.last_speech_time = 0.0
-        self.recording_start = 0.0
+        self.last_utterance = None
+
+        # One input stream for the detector's lifetime, opened on first use
+        self.capture: Optional[AudioCapture] = None
+        self.device = None
         
+    def _get_capture(self, device: Optional[int]) -> AudioCapture:
+        if self.capture is not None and device != self.device:
+            self.close()
+        if self.capture is None:
+            # silence_threshold is kept as a peak-level floor under WebRTC VAD
+            endpointer = VADEndpointer(
+                sample_rate=self.sample_rate,
+                hangover_ms=int(self.silence_duration * 1000),
+                min_speech_ms=300,
+                max_utterance_s=self.max_recording_time,
+                energy_floor=self.silence_threshold
+            )
+            self.capture = AudioCapture(MicrophoneSource(self.sample_rate, device=device), endpointer)
+            self.device = device
+        return self.capture
+
     def record_until_silence(self, device: Optional[int] = None) -> np.ndarray:
         """
         Record audio until user stops speaking (detected by silence)
@@ -39,53 +58,18 @@ class VoiceActivityDetector:
         print("🎤 Listening... (speak naturally, I'll respond when you pause)")
         
         self.audio_buffer = []
+        self.last_utterance = None
         self.is_recording = True
-        self.recording_start = time.time()
-        self.last_speech_time = time.time()
-        
-        # Use a smaller chunk size for more responsive detection
-        chunk_duration = 0.1  # 100ms chunks
-        chunk_samples = int(chunk_duration * self.sample_rate)
         
         try:
-            while self.is_recording:
-                # Record a small chunk
-                chunk = sd.rec(chunk_samples, 
-                             samplerate=self.sample_rate, 
-                             channels=1, 
-                             device=device,
-                             dtype='float32')
-                sd.wait()
-                
-                # Add to buffer
-                self.audio_buffer.append(chunk.flatten())
-                
-                # Check if this chunk contains speech
-                chunk_volume = np.max(np.abs(chunk))
-                current_time = time.time()
-                
-                if chunk_volume > self.silence_threshold:
-                    # Speech detected
-                    self.last_speech_time = current_time
-                    print(f"🗣️{chunk_volume:.4f}", end="", flush=True)  # Show volume level
-                else:
-                    # Silence detected
-                    silence_duration = current_time - self.last_speech_time
-                    
-                    # Only stop if we've had some speech first and enough silence
-                    speech_duration = self.last_speech_time - self.recording_start
-                    if speech_duration > 0.3 and silence_duration > self.silence_duration:
-                        print(f" (silence {silence_duration:.1f}s - processing...)")
-                        break
-                    # Show silence counter only occasionally to avoid spam
-                    elif silence_duration > 0.5 and int(silence_duration * 10) % 3 == 0:
-                        print(f"⏸️{silence_duration:.1f}s", end="", flush=True)
-                
-                # Safety timeout
-                total_duration = current_time - self.recording_start
-                if total_duration > self.max_recording_time:
-                    print(" (max time reached - processing...)")
-                    break
+            capture = self._get_capture(device)
+            capture.start()
+            # Anything captured while we weren't listening (e.g. our own TTS) is stale
+            capture.discard_pending()
+            # None (an empty recording) if nobody starts speaking within
+            # max_recording_time; speech under way at that point is kept and
+            # capped by the endpointer's max_utterance_s
+            utterance = capture.listen(timeout=self.max_recording_time)
         
         except KeyboardInterrupt:
             print(" (interrupted)")
@@ -94,13 +78,24 @@ class VoiceActivityDetector:
         finally:
             self.is_recording = False
         
-        # Combine all chunks
-        if self.audio_buffer:
-            complete_audio = np.concatenate(self.audio_buffer)
-            print(f"📝 Recorded {len(complete_audio)/self.sample_rate:.1f} seconds")
-            return complete_audio
-        else:
+        if utterance is None:
             return np.array([])
+
+        if utterance.reason == 'max_duration':
+            print(" (max time reached - processing...)")
+        else:
+            print(f" (silence {self.silence_duration:.1f}s - processing...)")
+
+        self.last_utterance = utterance
+        self.audio_buffer = [utterance.audio]
+        print(f"📝 Recorded {utterance.duration:.1f} seconds")
+        return utterance.audio
+
+    def close(self):
+        """Close the input stream"""
+        if self.capture is not None:
+            self.capture.stop()
+            self.capture = None
     
     def get_recording_stats(self) -> dict:
         """Get statistics about the last recording"""
@@ -112,7 +107,8 @@ class VoiceActivityDetector:
             'duration_seconds': len(complete_audio) / self.sample_rate,
             'max_volume': float(np.max(np.abs(complete_audio))),
             'mean_volume': float(np.mean(np.abs(complete_audio))),
-            'chunks_recorded': len(self.audio_buffer)
+            'chunks_recorded': len(self.audio_buffer),
+            'endpoint_latency_ms': self.last_utterance.endpoint_latency_ms if self.last_utterance else None
         }
 
 
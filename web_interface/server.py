@@ -12,7 +12,6 @@ from flask import Flask, request, jsonify, send_from_directory
 from flask_cors import CORS
 import sys
 import os
-import asyncio
 from pathlib import Path
 
 # Set HuggingFace cache to local project directory BEFORE any imports
@@ -23,6 +22,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from research_first_pipeline import ResearchFirstPipeline
 from personality_tracker import PersonalityTracker
+from src.core.loop_runtime import run_sync
 
 # Phase 3A Week 2: Milestone & Achievement System
 try:
@@ -88,6 +88,7 @@ def chat():
         metadata = {
             'research': research_success,  # Only show as "researched" if actually successful
             'research_attempted': research_triggered,
+            'research_cached': getattr(pipeline, 'last_research_cached', False),
             'adjustments': [],  # TODO: Extract from personality post-processor
         }
 
@@ -133,15 +134,26 @@ def achievements():
         print(f"Error getting achievements: {e}")
         return jsonify({'error': str(e), 'available': False}), 500
 
+@app.route('/research/cache', methods=['GET'])
+def research_cache():
+    """Get research result cache hit/miss metrics"""
+    try:
+        stats = pipeline.research_manager.get_cache_stats()
+        if not stats:
+            return jsonify({'available': False})
+        return jsonify(dict(
+            stats,
+            available=True,
+            hit_rate=f"{stats.get('hit_rate', 0) * 100:.1f}%"
+        ))
+    except Exception as e:
+        print(f"Error getting research cache stats: {e}")
+        return jsonify({'error': str(e), 'available': False}), 500
+
 def get_personality_info():
     """Helper to get personality information"""
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        state = loop.run_until_complete(
-            personality_tracker.get_current_personality_state()
-        )
-        loop.close()
+        state = run_sync(personality_tracker.get_current_personality_state())
 
         # Extract key metrics - state is dict of PersonalityDimension objects
         formality = state.get('communication_formality')